@@ -0,0 +1,59 @@
+"""
+Benchmark antrean ekspor: berapa lama thread script Streamlit terblokir.
+Cara lama menulis workbook langsung di thread script (tulis_workbook);
+dengan simaya.antrean thread script hanya mengajukan tugas lalu kembali.
+Juga diukur --ulang pengajuan identik berturut-turut (klik berulang / sesi
+lain dengan data sama) yang harus digabung menjadi satu tugas.
+
+Jalankan:
+    python benchmarks/bench_antrean_ekspor.py
+    python benchmarks/bench_antrean_ekspor.py --ukuran 10000 100000 --ulang 20
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from bench_ekspor_excel import siapkan_sheet
+from simaya.antrean import AntreanEkspor
+from simaya.ekspor import tulis_workbook
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--ulang", type=int, default=10, help="jumlah pengajuan identik per ukuran")
+    args = parser.parse_args()
+
+    antrean = AntreanEkspor()
+    print(f"{'Baris':>10} | {'Blokir lama (s)':>15} | {'Blokir antrean (ms)':>19} | {'Selesai (s)':>11} | {'Tugas':>5}")
+    print("-" * 73)
+    with tempfile.TemporaryDirectory() as folder:
+        for n in args.ukuran:
+            daftar_sheet = siapkan_sheet(n)
+
+            mulai = time.perf_counter()
+            tulis_workbook(os.path.join(folder, f"lama_{n}.xlsx"), daftar_sheet)
+            waktu_lama = time.perf_counter() - mulai
+
+            tugas_sebelum = antrean.statistik()["tugas"]
+            blokir = []
+            mulai = time.perf_counter()
+            for _ in range(args.ulang):
+                awal = time.perf_counter()
+                tugas = antrean.ajukan(("bench", n), daftar_sheet)
+                blokir.append(time.perf_counter() - awal)
+            antrean.tunggu(tugas.id)
+            waktu_selesai = time.perf_counter() - mulai
+
+            assert tugas.tersedia(), tugas.pesan
+            assert tugas.baris_ditulis == tugas.baris_total and tugas.sheet_selesai == tugas.sheet_total
+            jumlah_tugas = antrean.statistik()["tugas"] - tugas_sebelum
+            assert jumlah_tugas == 1, "Pengajuan identik tidak digabung"
+            print(f"{n:>10,} | {waktu_lama:>15.3f} | {max(blokir) * 1e3:>19.3f} | {waktu_selesai:>11.3f} | "
+                  f"{jumlah_tugas:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark buku besar: loop iterrows lama vs mesin vektor simaya.ledger.
+
+Jalankan:
+    python benchmarks/bench_buku_besar.py
+    python benchmarks/bench_buku_besar.py --ukuran 1000 10000 --tanpa-lama
+"""
+
+import argparse
+import time
+from datetime import date
+
+import pandas as pd
+
+from data_sintetis import buat_jurnal_ket, buat_jurnal_umum, buat_saldo_awal
+from simaya.ledger import bangun_buku_besar
+
+
+def safe_float_convert(value, default=0.0):
+    """Salinan safe_float_convert dari main.py (referensi versi lama)"""
+    try:
+        if pd.isna(value) or value == '' or value is None:
+            return default
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            cleaned = str(value).replace('Rp', '').replace('.', '').replace(',', '.').replace(' ', '').strip()
+            cleaned = ''.join(ch for ch in cleaned if ch.isdigit() or ch in ['.', '-'])
+            if cleaned == '' or cleaned == '-' or cleaned == '.':
+                return default
+            return float(cleaned)
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def buku_besar_lama(df_saldo_awal, jurnal, tanggal_awal_periode, periode):
+    """Algoritma update_buku_besar_per_akun_fixed sebelum divektorkan"""
+    semua_transaksi = []
+    for _, row in df_saldo_awal.iterrows():
+        saldo_awal = safe_float_convert(row["Debit (Rp)"]) - safe_float_convert(row["Kredit (Rp)"])
+        if saldo_awal != 0:
+            semua_transaksi.append({
+                "Tanggal": tanggal_awal_periode, "Sumber": "Saldo Awal",
+                "Keterangan": f"Saldo Awal Periode {periode}", "Nama Akun": row["Nama Akun"],
+                "Debit (Rp)": saldo_awal if saldo_awal > 0 else 0.0,
+                "Kredit (Rp)": 0.0 if saldo_awal > 0 else abs(saldo_awal), "No_Transaksi": 0,
+            })
+    for kunci, sumber in (("df_jurnal_umum", "Jurnal Umum"), ("df_jurnal_penyesuaian", "Jurnal Penyesuaian"),
+                          ("df_jurnal_penutup", "Jurnal Penutup")):
+        df = jurnal.get(kunci)
+        if df is None or df.empty:
+            continue
+        for _, row in df.iterrows():
+            debit_val = safe_float_convert(row["Debit (Rp)"])
+            kredit_val = safe_float_convert(row["Kredit (Rp)"])
+            ket = f"Transaksi No {row['No']}" if sumber == "Jurnal Umum" else str(row["Keterangan"])
+            if debit_val > 0:
+                semua_transaksi.append({
+                    "Tanggal": row["Tanggal"], "Sumber": sumber, "Keterangan": ket,
+                    "Nama Akun": str(row["Akun Debit"]), "Debit (Rp)": debit_val, "Kredit (Rp)": 0.0,
+                    "No_Transaksi": safe_float_convert(row["No"], 0),
+                })
+            if kredit_val > 0:
+                semua_transaksi.append({
+                    "Tanggal": row["Tanggal"], "Sumber": sumber, "Keterangan": ket,
+                    "Nama Akun": str(row["Akun Kredit"]), "Debit (Rp)": 0.0, "Kredit (Rp)": kredit_val,
+                    "No_Transaksi": safe_float_convert(row["No"], 0),
+                })
+
+    df_semua = pd.DataFrame(semua_transaksi)
+    df_semua['Tanggal'] = pd.to_datetime(df_semua['Tanggal'], errors='coerce').dt.date
+    df_semua['Debit (Rp)'] = df_semua['Debit (Rp)'].apply(safe_float_convert)
+    df_semua['Kredit (Rp)'] = df_semua['Kredit (Rp)'].apply(safe_float_convert)
+    df_semua['No_Transaksi'] = df_semua['No_Transaksi'].apply(lambda x: int(safe_float_convert(x, 0)))
+    df_semua = df_semua[df_semua['Nama Akun'].notna() & (df_semua['Nama Akun'] != '')]
+    df_semua = df_semua.sort_values(["Nama Akun", "Tanggal", "No_Transaksi"], kind="mergesort").reset_index(drop=True)
+
+    buku_besar_per_akun = {}
+    for akun in df_semua["Nama Akun"].unique():
+        transaksi_akun = df_semua[df_semua["Nama Akun"] == akun].copy()
+        transaksi_akun = transaksi_akun.sort_values(["Tanggal", "No_Transaksi"], kind="mergesort").reset_index(drop=True)
+        saldo_running = 0.0
+        detail_akun = []
+        for idx, transaksi in transaksi_akun.iterrows():
+            debit = safe_float_convert(transaksi["Debit (Rp)"])
+            kredit = safe_float_convert(transaksi["Kredit (Rp)"])
+            saldo_running += debit - kredit
+            detail_akun.append({
+                "No": idx + 1, "Tanggal": transaksi["Tanggal"], "Sumber": transaksi["Sumber"],
+                "Keterangan": transaksi["Keterangan"], "No_Transaksi": int(transaksi["No_Transaksi"]),
+                "Debit (Rp)": debit, "Kredit (Rp)": kredit, "Saldo (Rp)": saldo_running,
+            })
+        buku_besar_per_akun[akun] = pd.DataFrame(detail_akun)
+
+    semua_detail = []
+    for akun, df_akun in buku_besar_per_akun.items():
+        for _, row in df_akun.iterrows():
+            semua_detail.append({
+                "No": int(row["No"]), "Tanggal": row["Tanggal"], "Sumber": row["Sumber"],
+                "Keterangan": row["Keterangan"], "Nama Akun": akun,
+                "Debit (Rp)": row["Debit (Rp)"], "Kredit (Rp)": row["Kredit (Rp)"], "Saldo (Rp)": row["Saldo (Rp)"],
+            })
+    return buku_besar_per_akun, pd.DataFrame(semua_detail)
+
+
+def siapkan_data(jumlah_baris):
+    """Jurnal umum + penyesuaian + penutup dengan total jumlah_baris"""
+    jurnal = {
+        "df_jurnal_umum": buat_jurnal_umum(int(jumlah_baris * 0.9), seed=1),
+        "df_jurnal_penyesuaian": buat_jurnal_ket(int(jumlah_baris * 0.06), seed=2, keterangan="Penyesuaian"),
+        "df_jurnal_penutup": buat_jurnal_ket(int(jumlah_baris * 0.04), seed=3, keterangan="Penutup"),
+    }
+    return buat_saldo_awal(), jurnal
+
+
+def ukur(fungsi, *args):
+    mulai = time.perf_counter()
+    hasil = fungsi(*args)
+    return hasil, time.perf_counter() - mulai
+
+
+def cocokkan(hasil_lama, hasil_baru):
+    """Pastikan kedua implementasi menghasilkan buku besar yang sama"""
+    per_akun_lama, flat_lama = hasil_lama
+    per_akun_baru, flat_baru = hasil_baru
+    assert list(per_akun_lama) == list(per_akun_baru), "Urutan/daftar akun berbeda"
+    for akun in per_akun_lama:
+        pd.testing.assert_frame_equal(
+            per_akun_lama[akun].reset_index(drop=True), per_akun_baru[akun], check_dtype=False
+        )
+    pd.testing.assert_frame_equal(flat_lama, flat_baru, check_dtype=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--tanpa-lama", action="store_true", help="Lewati implementasi lama (lambat)")
+    args = parser.parse_args()
+
+    tanggal_awal, periode = date(2025, 1, 1), "Januari 2025"
+    print(f"{'Baris':>10} | {'Lama (s)':>10} | {'Vektor (s)':>10} | {'Speedup':>8}")
+    print("-" * 48)
+    for n in args.ukuran:
+        saldo_awal, jurnal = siapkan_data(n)
+        hasil_baru, waktu_baru = ukur(bangun_buku_besar, saldo_awal, jurnal, tanggal_awal, periode)
+        if args.tanpa_lama:
+            print(f"{n:>10,} | {'-':>10} | {waktu_baru:>10.3f} | {'-':>8}")
+            continue
+        hasil_lama, waktu_lama = ukur(buku_besar_lama, saldo_awal, jurnal, tanggal_awal, periode)
+        cocokkan(hasil_lama, hasil_baru)
+        print(f"{n:>10,} | {waktu_lama:>10.3f} | {waktu_baru:>10.3f} | {waktu_lama / waktu_baru:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark ekspor sheet buku besar per akun (default 60 akun x 5.000 baris)
+plus sheet Ringkasan_Buku_Besar:
+
+- lama: pd.ExcelWriter, df.copy() + to_excel per akun, ringkasan dihitung
+  di loop yang sama;
+- baru: simaya.ekspor.tulis_workbook (xlsxwriter constant_memory, nilai
+  per blok langsung dari kolom bertipe, ringkasan satu kali jalan).
+
+Ringkasan dihitung dengan simaya.ekspor.ringkasan_buku_besar di kedua cara.
+Isi kedua workbook dibaca ulang dan dicek sama (--tanpa-cek untuk melewati).
+
+Jalankan:
+    python benchmarks/bench_ekspor_buku_besar.py
+    python benchmarks/bench_ekspor_buku_besar.py --akun 120 --baris 5000
+"""
+
+import argparse
+import functools
+import os
+import tempfile
+import time
+from datetime import date
+
+import pandas as pd
+
+from data_sintetis import buat_jurnal_umum, buat_saldo_awal
+from simaya.ekspor import nama_sheet, ringkasan_buku_besar, tulis_workbook
+from simaya.ledger import bangun_buku_besar
+
+
+def siapkan_buku_besar(jumlah_akun, baris_per_akun):
+    """Buku besar per akun dari jurnal acak; tiap akun rata-rata baris_per_akun baris"""
+    jurnal = buat_jurnal_umum(jumlah_akun * baris_per_akun, seed=9, jumlah_akun=jumlah_akun)
+    buku_besar_per_akun, _ = bangun_buku_besar(
+        buat_saldo_awal(), {"df_jurnal_umum": jurnal}, date(2025, 1, 1), "Januari 2025"
+    )
+    return buku_besar_per_akun
+
+
+def ekspor_lama(path, buku_besar_per_akun):
+    terpakai = set()
+    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
+        for akun, df_akun in buku_besar_per_akun.items():
+            df_akun.copy().to_excel(writer, sheet_name=nama_sheet(f"Buku Besar - {akun}", terpakai), index=False)
+        ringkasan_buku_besar(buku_besar_per_akun).to_excel(
+            writer, sheet_name=nama_sheet("Ringkasan_Buku_Besar", terpakai), index=False
+        )
+
+
+def ekspor_baru(path, buku_besar_per_akun):
+    daftar_sheet = [(f"Buku Besar - {akun}", df) for akun, df in buku_besar_per_akun.items()]
+    daftar_sheet.append(("Ringkasan_Buku_Besar", functools.partial(ringkasan_buku_besar, buku_besar_per_akun)))
+    tulis_workbook(path, daftar_sheet)
+
+
+def baca_normal(path):
+    hasil = pd.read_excel(path, sheet_name=None)
+    for df in hasil.values():
+        if "Tanggal" in df.columns:
+            df["Tanggal"] = pd.to_datetime(df["Tanggal"]).dt.date
+    return hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--akun", type=int, default=60)
+    parser.add_argument("--baris", type=int, default=5_000, help="baris per akun")
+    parser.add_argument("--tanpa-cek", action="store_true")
+    args = parser.parse_args()
+
+    buku_besar_per_akun = siapkan_buku_besar(args.akun, args.baris)
+    total = sum(len(df) for df in buku_besar_per_akun.values())
+    print(f"{len(buku_besar_per_akun)} sheet akun, {total:,} baris")
+    print(f"{'Cara':>22} | {'Waktu (s)':>9} | {'Speedup':>8}")
+    print("-" * 46)
+    with tempfile.TemporaryDirectory() as folder:
+        hasil = {}
+        for cara, fungsi in [
+            ("lama (to_excel)", lambda p: ekspor_lama(p, buku_besar_per_akun)),
+            ("baru (tulis_workbook)", lambda p: ekspor_baru(p, buku_besar_per_akun)),
+        ]:
+            path = os.path.join(folder, f"{len(hasil)}.xlsx")
+            mulai = time.perf_counter()
+            fungsi(path)
+            hasil[cara] = (path, time.perf_counter() - mulai)
+
+        waktu_lama = hasil["lama (to_excel)"][1]
+        for cara, (_, waktu) in hasil.items():
+            print(f"{cara:>22} | {waktu:>9.3f} | {waktu_lama / waktu:>7.2f}x")
+
+        if not args.tanpa_cek:
+            acuan = baca_normal(hasil["lama (to_excel)"][0])
+            for cara, (path, _) in list(hasil.items())[1:]:
+                isi = baca_normal(path)
+                assert list(acuan) == list(isi), f"Daftar sheet berbeda ({cara})"
+                for nama in acuan:
+                    pd.testing.assert_frame_equal(acuan[nama], isi[nama], check_dtype=False, obj=f"{cara}: {nama}")
+            print("Isi workbook sama ✅")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark ekspor workbook Excel: cara lama (pd.ExcelWriter ke BytesIO,
+df.copy() + to_excel per tabel dan per akun buku besar) vs
+simaya.ekspor.tulis_workbook (xlsxwriter constant_memory, baris ditulis
+langsung dari tabel ke file sementara).
+
+Diukur waktu dan puncak alokasi memori Python (tracemalloc, pada jalankan
+terpisah). Untuk ukuran sampai --cek-maks baris, isi kedua workbook dibaca
+ulang dan dicek sama.
+
+Jalankan:
+    python benchmarks/bench_ekspor_excel.py
+    python benchmarks/bench_ekspor_excel.py --ukuran 10000 100000 --cek-maks 0
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from io import BytesIO
+
+import pandas as pd
+
+from bench_buku_besar import siapkan_data
+from data_sintetis import buat_riwayat_persediaan
+from simaya.ekspor import nama_sheet, tulis_workbook
+from simaya.ledger import bangun_buku_besar
+
+
+def siapkan_sheet(n):
+    """Tabel seperti di session state: jurnal, buku besar flat + per akun, riwayat persediaan"""
+    saldo_awal, jurnal = siapkan_data(n)
+    buku_besar_per_akun, df_buku_besar = bangun_buku_besar(saldo_awal, jurnal, date(2025, 1, 1), "Januari 2025")
+    daftar = [
+        ("Jurnal Umum", jurnal["df_jurnal_umum"]),
+        ("Jurnal Penyesuaian", jurnal["df_jurnal_penyesuaian"]),
+        ("Jurnal Penutup", jurnal["df_jurnal_penutup"]),
+        ("Buku Besar", df_buku_besar),
+        ("Riwayat Persediaan", buat_riwayat_persediaan(n // 10)),
+    ]
+    daftar += [(f"Buku Besar - {akun}", df) for akun, df in buku_besar_per_akun.items()]
+    return daftar
+
+
+def ekspor_lama(daftar_sheet):
+    buffer = BytesIO()
+    terpakai = set()
+    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+        for nama, df in daftar_sheet:
+            df_to_export = df.copy()
+            if "Tanggal" in df_to_export.columns and not nama.startswith("Buku Besar - "):
+                df_to_export["Tanggal"] = df_to_export["Tanggal"].astype(str)
+            df_to_export.to_excel(writer, sheet_name=nama_sheet(nama, terpakai), index=False)
+    buffer.seek(0)
+    return buffer
+
+
+def ukur(fungsi, *args):
+    """(hasil, detik, puncak MB); memori diukur pada jalankan kedua agar waktu tidak terganggu tracemalloc"""
+    mulai = time.perf_counter()
+    hasil = fungsi(*args)
+    waktu = time.perf_counter() - mulai
+    tracemalloc.start()
+    fungsi(*args)
+    puncak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return hasil, waktu, puncak / 2**20
+
+
+def baca_normal(sumber):
+    """Baca semua sheet; Tanggal disamakan (Excel date vs teks ISO)"""
+    hasil = pd.read_excel(sumber, sheet_name=None)
+    for df in hasil.values():
+        if "Tanggal" in df.columns:
+            df["Tanggal"] = pd.to_datetime(df["Tanggal"]).dt.date
+    return hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--cek-maks", type=int, default=10_000, help="ukuran terbesar yang isinya dibandingkan")
+    args = parser.parse_args()
+
+    print(f"{'Baris':>10} | {'Lama (s)':>9} | {'Lama (MB)':>9} | {'Baru (s)':>9} | {'Baru (MB)':>9} | {'Speedup':>8}")
+    print("-" * 68)
+    with tempfile.TemporaryDirectory() as folder:
+        for n in args.ukuran:
+            daftar_sheet = siapkan_sheet(n)
+            path = os.path.join(folder, f"ekspor_{n}.xlsx")
+
+            buffer, waktu_lama, memori_lama = ukur(ekspor_lama, daftar_sheet)
+            _, waktu_baru, memori_baru = ukur(tulis_workbook, path, daftar_sheet)
+
+            if n <= args.cek_maks:
+                lama, baru = baca_normal(buffer), baca_normal(path)
+                assert list(lama) == list(baru), "Daftar sheet berbeda"
+                for nama in lama:
+                    pd.testing.assert_frame_equal(lama[nama], baru[nama], check_dtype=False, obj=nama)
+            print(f"{n:>10,} | {waktu_lama:>9.3f} | {memori_lama:>9.1f} | {waktu_baru:>9.3f} | {memori_baru:>9.1f} | "
+                  f"{waktu_lama / waktu_baru:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
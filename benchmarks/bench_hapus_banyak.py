@@ -0,0 +1,75 @@
+"""
+Benchmark hapus massal jurnal umum: N kali hapus satu transaksi (penomoran
+ulang unique + map lalu bangun ulang buku besar per hapus, seperti
+delete_transaction lama) vs satu hapus_transaksi_jurnal dengan daftar No
+lalu satu kali bangun ulang buku besar (hapus_transaksi_banyak).
+
+Jalankan:
+    python benchmarks/bench_hapus_banyak.py
+    python benchmarks/bench_hapus_banyak.py --ukuran 10000 100000 --hapus 200
+"""
+
+import argparse
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from bench_buku_besar import cocokkan, siapkan_data
+from simaya.ledger import bangun_buku_besar, hapus_transaksi_jurnal
+
+
+def hapus_transaksi_jurnal_lama(df_jurnal, no):
+    """hapus_transaksi_jurnal sebelum mendukung daftar No"""
+    df = df_jurnal[df_jurnal["No"] != no].reset_index(drop=True)
+    nomor = np.sort(df["No"].unique())
+    df["No"] = df["No"].map({lama: baru for baru, lama in enumerate(nomor, 1)})
+    return df
+
+
+def hapus_satu_per_satu(saldo_awal, jurnal, daftar_no, tanggal_awal, periode):
+    """Urutan No tetap merujuk ke jurnal awal: No yang lebih besar bergeser setiap hapus"""
+    df = jurnal["df_jurnal_umum"]
+    for i, no in enumerate(sorted(daftar_no)):
+        df = hapus_transaksi_jurnal_lama(df, no - i)
+        hasil = bangun_buku_besar(saldo_awal, {**jurnal, "df_jurnal_umum": df}, tanggal_awal, periode)
+    return df, hasil
+
+
+def hapus_sekaligus(saldo_awal, jurnal, daftar_no, tanggal_awal, periode):
+    df = hapus_transaksi_jurnal(jurnal["df_jurnal_umum"], list(daftar_no))
+    return df, bangun_buku_besar(saldo_awal, {**jurnal, "df_jurnal_umum": df}, tanggal_awal, periode)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--hapus", type=int, default=50, help="jumlah transaksi yang dihapus")
+    args = parser.parse_args()
+
+    tanggal_awal, periode = date(2025, 1, 1), "Januari 2025"
+    print(f"{'Baris':>10} | {'Hapus':>6} | {'Satu per satu (s)':>17} | {'Sekaligus (s)':>13} | {'Speedup':>8}")
+    print("-" * 68)
+    for n in args.ukuran:
+        saldo_awal, jurnal = siapkan_data(n)
+        jumlah_transaksi = int(jurnal["df_jurnal_umum"]["No"].max())
+        rng = np.random.default_rng(5)
+        daftar_no = rng.choice(np.arange(1, jumlah_transaksi + 1), min(args.hapus, jumlah_transaksi), replace=False)
+
+        mulai = time.perf_counter()
+        df_lama, hasil_lama = hapus_satu_per_satu(saldo_awal, jurnal, daftar_no.tolist(), tanggal_awal, periode)
+        waktu_lama = time.perf_counter() - mulai
+
+        mulai = time.perf_counter()
+        df_baru, hasil_baru = hapus_sekaligus(saldo_awal, jurnal, daftar_no.tolist(), tanggal_awal, periode)
+        waktu_baru = time.perf_counter() - mulai
+
+        pd.testing.assert_frame_equal(df_lama, df_baru, check_dtype=False)
+        cocokkan(hasil_lama, hasil_baru)
+        print(f"{n:>10,} | {len(daftar_no):>6} | {waktu_lama:>17.3f} | {waktu_baru:>13.3f} | "
+              f"{waktu_lama / waktu_baru:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark pencarian catatan terkait untuk hapus transaksi berurutan:
+pencocokan nominal lama (mask Total atas seluruh riwayat per hapus) vs
+simaya.dokumen.IndeksDokumen (No -> ID dokumen -> posisi baris, diperbarui di
+tempat setelah setiap hapus). Setiap langkah dicek terhadap pemindaian penuh
+kolom ID Dokumen.
+
+Kolom "salah cocok" menghitung hapus yang pada cara lama ikut mengenai baris
+dokumen lain karena totalnya sama.
+
+Jalankan:
+    python benchmarks/bench_hapus_dokumen.py
+    python benchmarks/bench_hapus_dokumen.py --ukuran 10000 100000 --hapus 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_sintetis import buat_riwayat_persediaan
+from simaya.dokumen import AWALAN_PEMBELIAN, AWALAN_PENJUALAN, KOLOM_ID, IndeksDokumen
+from simaya.ledger import hapus_transaksi_jurnal
+
+
+def siapkan_data(n):
+    """Riwayat persediaan + jurnal (2 baris per dokumen) yang berbagi ID dokumen"""
+    riwayat = buat_riwayat_persediaan(n)
+    awalan = np.where(riwayat["Jenis"] == "Penjualan", AWALAN_PENJUALAN, AWALAN_PEMBELIAN)
+    riwayat[KOLOM_ID] = [f"{a}-{i:012X}" for i, a in enumerate(awalan)]
+    jurnal = pd.DataFrame({
+        "No": np.repeat(np.arange(1, n + 1), 2),
+        "Total": np.repeat(riwayat["Total"].to_numpy(), 2),
+        KOLOM_ID: np.repeat(riwayat[KOLOM_ID].to_numpy(), 2),
+    })
+    return riwayat, jurnal
+
+
+def cari_lama(riwayat, jurnal, no):
+    """Cara lama: ambil nominal dari jurnal lalu cocokkan seluruh riwayat"""
+    total = jurnal["Total"].to_numpy()[jurnal["No"].to_numpy() == no][0]
+    return np.flatnonzero(riwayat["Total"].to_numpy() == total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--hapus", type=int, default=200, help="jumlah transaksi yang dihapus berurutan per ukuran")
+    args = parser.parse_args()
+
+    print(f"{'Dokumen':>10} | {'Bangun indeks (s)':>17} | {'Lama/hapus (ms)':>15} | "
+          f"{'Indeks/hapus (ms)':>17} | {'Salah cocok':>11}")
+    print("-" * 84)
+    for n in args.ukuran:
+        riwayat, jurnal = siapkan_data(n)
+        rng = np.random.default_rng(3)
+
+        mulai = time.perf_counter()
+        indeks = IndeksDokumen("jurnal")
+        indeks.sinkron("jurnal", jurnal, 0)
+        indeks.sinkron("riwayat", riwayat, 0)
+        waktu_bangun = time.perf_counter() - mulai
+
+        waktu_lama = waktu_baru = 0.0
+        salah = 0
+        for langkah in range(1, args.hapus + 1):
+            no = int(rng.integers(1, jurnal["No"].iat[-1] + 1))
+
+            mulai = time.perf_counter()
+            lama = cari_lama(riwayat, jurnal, no)
+            waktu_lama += time.perf_counter() - mulai
+
+            mulai = time.perf_counter()
+            id_dokumen = indeks.id_transaksi(no)
+            posisi = indeks.baris("riwayat", id_dokumen)
+            waktu_baru += time.perf_counter() - mulai
+
+            benar = np.flatnonzero(riwayat[KOLOM_ID].to_numpy() == id_dokumen)
+            assert posisi.tolist() == benar.tolist() and len(benar) == 1, f"Indeks salah untuk No {no}"
+            assert benar[0] in lama, f"Cara lama tidak menemukan No {no}"
+            salah += len(lama) > 1
+
+            # Hapus seperti di aplikasi (tidak diukur, sama untuk kedua cara)
+            jurnal = hapus_transaksi_jurnal(jurnal, no)
+            riwayat = riwayat.drop(index=riwayat.index[posisi]).reset_index(drop=True)
+
+            mulai = time.perf_counter()
+            indeks.hapus_transaksi([no], langkah)
+            indeks.hapus("riwayat", [id_dokumen], langkah)
+            waktu_baru += time.perf_counter() - mulai
+
+        print(f"{n:>10,} | {waktu_bangun:>17.4f} | {waktu_lama / args.hapus * 1e3:>15.3f} | "
+              f"{waktu_baru / args.hapus * 1e3:>17.3f} | {salah:>5}/{args.hapus:<5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark hitung ulang persediaan (Average): loop iterrows per barang lama
+vs simaya.inventory.hitung_persediaan_average (satu sort + operasi
+kumulatif per barang) vs mesin persediaan (loop O(1) per pergerakan).
+
+Semua ukuran dicek sama dengan implementasi lama, termasuk dataset golden
+kecil berisi kasus tepi: input tidak urut, stok habis tepat nol lalu diisi
+lagi, penjualan saat stok kosong / melebihi stok, dan jenis lain.
+
+Jalankan:
+    python benchmarks/bench_hitung_ulang_persediaan.py
+    python benchmarks/bench_hitung_ulang_persediaan.py --ukuran 100000 1000000 --tanpa-lama
+"""
+
+import argparse
+from datetime import date
+
+import pandas as pd
+
+from bench_buku_besar import ukur
+from bench_persediaan import cocokkan, hitung_ulang_lama
+from data_sintetis import buat_riwayat_persediaan
+from simaya.inventory import bangun_dari_riwayat, hitung_persediaan_average
+
+
+def riwayat_golden():
+    """Riwayat kecil dengan kasus tepi semantik Average"""
+    baris = [
+        # Tanggal, Jenis, Barang, Jumlah, Harga, Total
+        (date(2025, 1, 5), "Penjualan", "Ayam Jago", -4, 0, 0),          # input tidak urut
+        (date(2025, 1, 1), "Pembelian", "Ayam Jago", 10, 1000, 10000),
+        (date(2025, 1, 2), "Pembelian", "Ayam Jago", 5, 1600, 8000),
+        (date(2025, 1, 3), "Penjualan", "Ayam Broiler", -3, 0, 0),       # stok kosong
+        (date(2025, 1, 4), "Pembelian", "Ayam Broiler", 7, 3000, 21000),
+        (date(2025, 1, 6), "Penjualan", "Ayam Jago", -11, 0, 0),         # habis tepat nol
+        (date(2025, 1, 7), "Pembelian", "Ayam Jago", 3, 1250, 3750),     # diisi lagi
+        (date(2025, 1, 8), "Penjualan", "Ayam Broiler", -9, 0, 0),       # melebihi stok
+        (date(2025, 1, 9), "Pembelian", "Ayam Broiler", 6, 3100, 18600),
+        (date(2025, 1, 9), "Koreksi", "Ayam Broiler", 2, 0, 0),          # jenis lain diabaikan
+        (date(2025, 1, 10), "Penjualan", "Telur Ayam", -1, 0, 0),
+        (date(2025, 1, 11), "Pembelian", "Telur Ayam", 30, 1700, 51000),
+        (date(2025, 1, 12), "Penjualan", "Telur Ayam", -7, 0, 0),
+        (date(2025, 1, 13), "Penjualan", "Ayam Jago", -1, 0, 0),
+        (date(2025, 1, 14), "Pembelian", "Telur Ayam", 12, 1900, 22800),
+        (date(2025, 1, 15), "Penjualan", "Telur Ayam", -13, 0, 0),
+    ]
+    df = pd.DataFrame(baris, columns=["Tanggal", "Jenis", "Barang", "Jumlah", "Harga", "Total"])
+    df["Stok"] = 0.0
+    df["Keterangan"] = df["Jenis"]
+    return df
+
+
+def cek(riwayat):
+    """Ketiga implementasi harus menghasilkan df_persediaan yang sama"""
+    lama = hitung_ulang_lama(riwayat)
+    cocokkan(lama, hitung_persediaan_average(riwayat))
+    cocokkan(lama, bangun_dari_riwayat(riwayat, "Average").ke_dataframe())
+    return lama
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--barang", type=int, default=20, help="Jumlah barang")
+    parser.add_argument("--tanpa-lama", action="store_true", help="Lewati implementasi lama (lambat)")
+    args = parser.parse_args()
+
+    golden = cek(riwayat_golden())
+    print("Dataset golden cocok:")
+    print(golden.to_string(index=False))
+    print()
+
+    print(f"{'Pergerakan':>10} | {'Lama (s)':>10} | {'Mesin (s)':>10} | {'Vektor (s)':>10} | {'Speedup':>8}")
+    print("-" * 62)
+    for n in args.ukuran:
+        riwayat = buat_riwayat_persediaan(n, jumlah_barang=args.barang)
+        vektor, waktu_vektor = ukur(hitung_persediaan_average, riwayat)
+        mesin, waktu_mesin = ukur(bangun_dari_riwayat, riwayat, "Average")
+        cocokkan(mesin.ke_dataframe(), vektor)
+        if args.tanpa_lama:
+            print(f"{n:>10,} | {'-':>10} | {waktu_mesin:>10.3f} | {waktu_vektor:>10.3f} | {'-':>8}")
+            continue
+        lama, waktu_lama = ukur(hitung_ulang_lama, riwayat)
+        cocokkan(lama, vektor)
+        print(f"{n:>10,} | {waktu_lama:>10.3f} | {waktu_mesin:>10.3f} | {waktu_vektor:>10.3f} | "
+              f"{waktu_lama / waktu_vektor:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
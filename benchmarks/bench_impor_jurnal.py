@@ -0,0 +1,84 @@
+"""
+Benchmark impor jurnal dari CSV: cara lama (baca seluruh file lalu catat per
+transaksi: append ke jurnal + posting inkremental buku besar, seperti input
+manual lewat catat_jurnal_umum) vs simaya.impor_jurnal (baca & validasi per
+potongan, satu append lalu satu kali bangun buku besar).
+
+Cara lama hanya diukur sampai --lama-maks baris karena biayanya kuadratik.
+Jurnal hasil kedua cara dan saldo akhir setiap akun dicek sama.
+
+Jalankan:
+    python benchmarks/bench_impor_jurnal.py
+    python benchmarks/bench_impor_jurnal.py --ukuran 10000 200000 --potongan 20000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+
+import pandas as pd
+
+from data_sintetis import DAFTAR_AKUN, buat_jurnal_umum, buat_saldo_awal
+from simaya.impor_jurnal import KOLOM_IMPOR, impor_jurnal
+from simaya.ledger import bangun_buku_besar, posting_inkremental
+
+
+def impor_lama(path, saldo_awal, tanggal_awal, periode):
+    df = pd.read_csv(path)
+    df["Tanggal"] = pd.to_datetime(df["Tanggal"]).dt.date
+    df[["Akun Debit", "Akun Kredit"]] = df[["Akun Debit", "Akun Kredit"]].fillna("")
+    jurnal = pd.DataFrame(columns=KOLOM_IMPOR)
+    buku_besar_per_akun, df_buku_besar = bangun_buku_besar(saldo_awal, {"df_jurnal_umum": jurnal}, tanggal_awal, periode)
+    for _, grup in df.groupby("No", sort=False):
+        jurnal = pd.concat([jurnal, grup], ignore_index=True)
+        buku_besar_per_akun, df_buku_besar, _ = posting_inkremental(buku_besar_per_akun, df_buku_besar, grup)
+    return jurnal, buku_besar_per_akun
+
+
+def impor_baru(path, saldo_awal, tanggal_awal, periode, ukuran):
+    jurnal, kesalahan, _ = impor_jurnal(path, DAFTAR_AKUN, ukuran=ukuran)
+    assert kesalahan.empty, f"{len(kesalahan)} baris ditolak"
+    buku_besar_per_akun, _ = bangun_buku_besar(saldo_awal, {"df_jurnal_umum": jurnal}, tanggal_awal, periode)
+    return jurnal, buku_besar_per_akun
+
+
+def saldo_akhir(buku_besar_per_akun):
+    return {akun: round(float(df["Saldo (Rp)"].iloc[-1]), 2) for akun, df in buku_besar_per_akun.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--potongan", type=int, default=50_000, help="baris per potongan impor")
+    parser.add_argument("--lama-maks", type=int, default=2_000, help="ukuran terbesar yang diukur dengan cara lama")
+    args = parser.parse_args()
+
+    saldo_awal, tanggal_awal, periode = buat_saldo_awal(), date(2025, 1, 1), "Januari 2025"
+    print(f"{'Baris':>10} | {'Lama (s)':>9} | {'Impor (s)':>9} | {'Speedup':>8}")
+    print("-" * 46)
+    with tempfile.TemporaryDirectory() as folder:
+        for n in args.ukuran:
+            path = os.path.join(folder, f"jurnal_{n}.csv")
+            buat_jurnal_umum(n, seed=7).to_csv(path, index=False)
+
+            mulai = time.perf_counter()
+            jurnal_baru, buku_besar_baru = impor_baru(path, saldo_awal, tanggal_awal, periode, args.potongan)
+            waktu_baru = time.perf_counter() - mulai
+
+            if n > args.lama_maks:
+                print(f"{n:>10,} | {'-':>9} | {waktu_baru:>9.3f} | {'-':>8}")
+                continue
+
+            mulai = time.perf_counter()
+            jurnal_lama, buku_besar_lama = impor_lama(path, saldo_awal, tanggal_awal, periode)
+            waktu_lama = time.perf_counter() - mulai
+
+            pd.testing.assert_frame_equal(jurnal_lama, jurnal_baru, check_dtype=False)
+            assert saldo_akhir(buku_besar_lama) == saldo_akhir(buku_besar_baru), "Saldo akhir berbeda"
+            print(f"{n:>10,} | {waktu_lama:>9.3f} | {waktu_baru:>9.3f} | {waktu_lama / waktu_baru:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark inti headless: tutup periode (buku besar, neraca saldo, laporan,
+neraca setelah penutup) untuk banyak Buku sekaligus, berurutan vs
+ProcessPoolExecutor. Sebelum simaya.buku/simaya.periode hal ini tidak bisa
+dilakukan karena semua perhitungan membaca st.session_state.
+
+Setiap buku disimpan ke database SQLite sendiri; job hanya menerima path
+database lalu memuat Buku.dari_storage() di prosesnya (tabel tidak di-pickle
+ke pekerja). Cara berurutan menjalankan job yang sama. Di akhir dicetak
+titik impas: ukuran buku terkecil yang pool-nya lebih cepat dari berurutan
+(dengan --pekerja dan jumlah CPU mesin ini). Di bawah ukuran itu biaya
+menyalakan proses dan mengirim hasil lebih besar dari kerjanya.
+
+Jalankan:
+    python benchmarks/bench_inti.py
+    python benchmarks/bench_inti.py --buku 16 --baris 20000 --pekerja 4
+"""
+
+import argparse
+import io
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import date, datetime
+
+import pandas as pd
+
+from bench_buku_besar import siapkan_data, ukur
+from data_sintetis import buat_riwayat_persediaan
+from simaya.buku import Buku
+from simaya.periode import tutup_periode
+from simaya.storage import SQLiteBackend
+
+SEKARANG = datetime(2025, 1, 31)
+
+
+def buat_buku(jumlah_baris):
+    saldo_awal, jurnal = siapkan_data(jumlah_baris)
+    tabel = {
+        "jurnal_umum": jurnal["df_jurnal_umum"],
+        "jurnal_penyesuaian": jurnal["df_jurnal_penyesuaian"],
+        "jurnal_penutup": jurnal["df_jurnal_penutup"],
+        "neraca_saldo_sebelumnya": saldo_awal,
+        "riwayat_persediaan": buat_riwayat_persediaan(max(jumlah_baris // 10, 10)),
+    }
+    return Buku(tabel, "Januari 2025", date(2025, 1, 1))
+
+
+def simpan_buku(folder, ke, buku):
+    """Simpan buku ke database SQLite baru di folder; mengembalikan path-nya"""
+    backend = SQLiteBackend(os.path.join(folder, f"buku_{ke}.db"))
+    with redirect_stdout(io.StringIO()):
+        backend.siapkan()
+    backend.simpan(buku.tabel)
+    return backend.path
+
+
+def tutup(path):
+    """Satu job: muat buku dari path, tutup periode + hitung ulang persediaan, hasil yang bisa di-pickle"""
+    buku = Buku.dari_storage(SQLiteBackend(path), putar_log=False,
+                             periode="Januari 2025", tanggal_awal_periode=date(2025, 1, 1))
+    hasil = tutup_periode(buku, SEKARANG)
+    laporan = hasil["laporan"]
+    return {
+        "neraca": hasil["neraca_setelah_penutup"],
+        "laba_bersih": laporan["laba_bersih"],
+        "posisi_keuangan": laporan["posisi_keuangan"],
+        "persediaan": buku.persediaan(),
+    }
+
+
+def berurutan(daftar_path):
+    return [tutup(path) for path in daftar_path]
+
+
+def paralel(daftar_path, pekerja):
+    with ProcessPoolExecutor(max_workers=pekerja) as pool:
+        return list(pool.map(tutup, daftar_path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buku", type=int, default=8, help="Jumlah buku (periode/unit) yang ditutup")
+    parser.add_argument("--baris", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--pekerja", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(f"{'Baris/buku':>10} | {'Buku':>5} | {'Berurutan (s)':>13} | {'Pool (s)':>9} | {'Speedup':>8}")
+    print("-" * 58)
+    speedup = {}
+    for n in sorted(args.baris):
+        with tempfile.TemporaryDirectory() as folder:
+            daftar_path = [simpan_buku(folder, ke, buat_buku(n)) for ke in range(args.buku)]
+
+            hasil_urut, waktu_urut = ukur(berurutan, daftar_path)
+            hasil_pool, waktu_pool = ukur(paralel, daftar_path, args.pekerja)
+
+        for a, b in zip(hasil_urut, hasil_pool):
+            assert a["laba_bersih"] == b["laba_bersih"]
+            for kunci in ("neraca", "posisi_keuangan", "persediaan"):
+                pd.testing.assert_frame_equal(a[kunci], b[kunci])
+        speedup[n] = waktu_urut / waktu_pool
+        print(f"{n:>10,} | {args.buku:>5} | {waktu_urut:>13.4f} | {waktu_pool:>9.4f} | "
+              f"{speedup[n]:>7.2f}x")
+
+    # Titik impas: ukuran terkecil yang pool-nya lebih cepat di ukuran itu dan semua ukuran di atasnya
+    impas = None
+    for n in sorted(speedup, reverse=True):
+        if speedup[n] <= 1:
+            break
+        impas = n
+    mesin = f"{args.pekerja} pekerja, {os.cpu_count()} CPU"
+    if impas is None:
+        print(f"Titik impas: pool tidak lebih cepat di ukuran yang diukur ({mesin}); jalankan berurutan")
+    else:
+        print(f"Titik impas: pool lebih cepat mulai {impas:,} baris/buku ({mesin})")
+
+
+if __name__ == "__main__":
+    main()
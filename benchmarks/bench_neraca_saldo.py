@@ -0,0 +1,73 @@
+"""
+Benchmark neraca saldo: loop per akun + safe_float_convert lama vs
+simaya.ledger.bangun_neraca_saldo dari buku besar per akun (penjumlahan
+vektor per akun) dan dari buku besar flat (satu groupby).
+
+Jalankan:
+    python benchmarks/bench_neraca_saldo.py
+    python benchmarks/bench_neraca_saldo.py --ukuran 1000 10000
+"""
+
+import argparse
+from datetime import date
+
+import pandas as pd
+
+from bench_buku_besar import safe_float_convert, siapkan_data, ukur
+from simaya.ledger import bangun_buku_besar, bangun_neraca_saldo
+
+
+def neraca_saldo_lama(buku_besar_per_akun):
+    """Algoritma update_neraca_saldo_dari_buku_besar_per_akun sebelum divektorkan"""
+    neraca_data = []
+    for akun, df_akun in buku_besar_per_akun.items():
+        if not df_akun.empty:
+            neraca_data.append({
+                "Nama Akun": akun,
+                "Debit (Rp)": sum(df_akun["Debit (Rp)"].apply(safe_float_convert)),
+                "Kredit (Rp)": sum(df_akun["Kredit (Rp)"].apply(safe_float_convert)),
+                "Saldo (Rp)": safe_float_convert(df_akun["Saldo (Rp)"].iloc[-1]),
+            })
+    neraca_saldo = pd.DataFrame(neraca_data).sort_values("Nama Akun").reset_index(drop=True)
+    neraca_saldo.insert(0, "No", range(1, len(neraca_saldo) + 1))
+    total_row = {
+        "No": "",
+        "Nama Akun": "TOTAL",
+        "Debit (Rp)": sum(neraca_saldo["Debit (Rp)"].apply(safe_float_convert)),
+        "Kredit (Rp)": sum(neraca_saldo["Kredit (Rp)"].apply(safe_float_convert)),
+        "Saldo (Rp)": "",
+    }
+    return pd.concat([neraca_saldo, pd.DataFrame([total_row])], ignore_index=True)
+
+
+def terbaik(fungsi, *args, ulang=5):
+    """Waktu terbaik dari beberapa ulangan (ukuran kecil terlalu berisik untuk satu kali ukur)"""
+    hasil = [ukur(fungsi, *args) for _ in range(ulang)]
+    return hasil[0][0], min(detik for _, detik in hasil)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    tanggal_awal, periode = date(2025, 1, 1), "Januari 2025"
+    print(f"{'Baris':>10} | {'Lama (s)':>10} | {'Per akun (s)':>12} | {'Speedup':>8} | {'Flat (s)':>10} | {'Speedup':>8}")
+    print("-" * 75)
+    for n in args.ukuran:
+        saldo_awal, jurnal = siapkan_data(n)
+        per_akun, flat = bangun_buku_besar(saldo_awal, jurnal, tanggal_awal, periode)
+
+        lama, waktu_lama = terbaik(neraca_saldo_lama, per_akun)
+        (dari_akun, _), waktu_akun = terbaik(bangun_neraca_saldo, per_akun)
+        (dari_flat, ringkasan), waktu_flat = terbaik(bangun_neraca_saldo, None, flat)
+
+        pd.testing.assert_frame_equal(lama, dari_akun, check_dtype=False)
+        pd.testing.assert_frame_equal(lama, dari_flat, check_dtype=False)
+        assert ringkasan["seimbang"], "Neraca saldo data sintetis harus seimbang"
+        print(f"{n:>10,} | {waktu_lama:>10.4f} | {waktu_akun:>12.4f} | {waktu_lama / waktu_akun:>7.1f}x | "
+              f"{waktu_flat:>10.4f} | {waktu_lama / waktu_flat:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
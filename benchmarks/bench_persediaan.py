@@ -0,0 +1,101 @@
+"""
+Benchmark persediaan: hitung_ulang_persediaan lama (filter + iterrows per
+barang, hanya Average) vs simaya.inventory.bangun_dari_riwayat
+(Average / FIFO / LIFO).
+
+Jalankan:
+    python benchmarks/bench_persediaan.py
+    python benchmarks/bench_persediaan.py --ukuran 10000 100000 --barang 50
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from bench_buku_besar import ukur
+from data_sintetis import buat_riwayat_persediaan
+from simaya.inventory import METODE_PERSEDIAAN, bangun_dari_riwayat
+
+KOLOM_BANDING = ["Barang", "Pembelian", "Penjualan", "Stok Akhir", "Harga Rata-rata", "Total Nilai"]
+
+
+def hitung_ulang_lama(df_riwayat):
+    """Algoritma hitung_ulang_persediaan (metode Average) sebelum memakai mesin persediaan"""
+    df_persediaan = pd.DataFrame(
+        columns=["Barang", "Stok Awal", "Pembelian", "Penjualan", "Stok Akhir", "Harga Rata-rata", "Total Nilai"]
+    )
+    for barang in df_riwayat["Barang"].unique():
+        riwayat_barang = df_riwayat[df_riwayat["Barang"] == barang].sort_values("Tanggal")
+        stok_awal = 0
+        total_pembelian = 0
+        total_penjualan = 0
+        total_nilai = 0
+        for _, transaksi in riwayat_barang.iterrows():
+            if transaksi["Jenis"] == "Pembelian":
+                total_pembelian += transaksi["Jumlah"]
+                total_nilai += transaksi["Total"]
+            elif transaksi["Jenis"] == "Penjualan":
+                total_penjualan += abs(transaksi["Jumlah"])
+                stok_sebelum = stok_awal + total_pembelian - total_penjualan + abs(transaksi["Jumlah"])
+                harga_rata2 = total_nilai / stok_sebelum if stok_sebelum > 0 else 0
+                total_nilai -= abs(transaksi["Jumlah"]) * harga_rata2
+        stok_akhir = stok_awal + total_pembelian - total_penjualan
+        harga_rata2 = total_nilai / stok_akhir if stok_akhir > 0 else 0
+        df_persediaan = pd.concat([df_persediaan, pd.DataFrame([{
+            "Barang": barang, "Stok Awal": stok_awal, "Pembelian": total_pembelian,
+            "Penjualan": total_penjualan, "Stok Akhir": stok_akhir,
+            "Harga Rata-rata": harga_rata2, "Total Nilai": total_nilai,
+        }])], ignore_index=True)
+    return df_persediaan
+
+
+def cocokkan(lama, baru):
+    """Ringkasan persediaan Average harus sama (toleransi galat float kumulatif)"""
+    lama = lama[KOLOM_BANDING].sort_values("Barang").reset_index(drop=True)
+    baru = baru[KOLOM_BANDING].sort_values("Barang").reset_index(drop=True)
+    pd.testing.assert_frame_equal(lama, baru, check_dtype=False, rtol=1e-9)
+
+
+def cek_lapisan(mesin, df_riwayat):
+    """FIFO/LIFO: nilai akhir = total pembelian - total HPP, stok sama dengan Average"""
+    pembelian = df_riwayat.loc[df_riwayat["Jenis"] == "Pembelian"].groupby("Barang")["Total"].sum()
+    for barang, stok in mesin.barang.items():
+        hpp = sum(baris[7] for baris in stok.kartu)
+        assert np.isclose(pembelian.get(barang, 0.0) - hpp, stok.nilai), f"Nilai {barang} tidak konsisten"
+        assert stok.qty >= 0 and np.isclose(sum(q for q, _ in stok.lapisan), stok.qty), f"Lapisan {barang} tidak cocok"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--barang", type=int, default=None, help="Jumlah barang (default 3 barang SIMAYA)")
+    parser.add_argument("--tanpa-lama", action="store_true", help="Lewati implementasi lama (lambat)")
+    args = parser.parse_args()
+
+    print(f"{'Pergerakan':>10} | {'Lama (s)':>10} | " + " | ".join(f"{m + ' (s)':>10}" for m in METODE_PERSEDIAAN)
+          + f" | {'Speedup':>8}")
+    print("-" * (27 + 13 * len(METODE_PERSEDIAAN) + 11))
+    for n in args.ukuran:
+        riwayat = buat_riwayat_persediaan(n, jumlah_barang=args.barang)
+        waktu = {}
+        for metode in METODE_PERSEDIAAN:
+            mesin, waktu[metode] = ukur(bangun_dari_riwayat, riwayat, metode)
+            if metode == "Average":
+                hasil_average = mesin.ke_dataframe()
+            else:
+                cek_lapisan(mesin, riwayat)
+
+        if args.tanpa_lama:
+            waktu_lama, speedup = "-", "-"
+            print(f"{n:>10,} | {waktu_lama:>10} | " + " | ".join(f"{waktu[m]:>10.3f}" for m in METODE_PERSEDIAAN)
+                  + f" | {speedup:>8}")
+            continue
+        lama, waktu_lama = ukur(hitung_ulang_lama, riwayat)
+        cocokkan(lama, hasil_average)
+        print(f"{n:>10,} | {waktu_lama:>10.3f} | " + " | ".join(f"{waktu[m]:>10.3f}" for m in METODE_PERSEDIAAN)
+              + f" | {waktu_lama / waktu['Average']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark pemilih transaksi di expander Hapus Transaksi: cara lama (loop
+No unik, saring seluruh jurnal dengan mask per No lalu susun teks opsi untuk
+semua transaksi, setiap rerun) vs ringkasan_transaksi (satu groupby, dibuat
+sekali per versi jurnal) + saring_transaksi + label satu halaman.
+
+Kolom "Rerun (ms)" adalah biaya rerun berikutnya saat ringkasan sudah ada
+di cache (saring + label satu halaman). Jumlah entri dan total per No
+dicek sama dengan cara lama. Cara lama hanya diukur sampai --lama-maks
+transaksi karena biayanya kuadratik.
+
+Jalankan:
+    python benchmarks/bench_pilih_transaksi.py
+    python benchmarks/bench_pilih_transaksi.py --transaksi 10000 100000 --lama-maks 10000
+"""
+
+import argparse
+import time
+
+from data_sintetis import buat_jurnal_umum
+from simaya.ledger import ringkasan_transaksi, saring_transaksi
+
+PER_HALAMAN = 50
+
+
+def opsi_lama(df_jurnal):
+    """Opsi selectbox hapus transaksi sebelum ada ringkasan (plus (No, entri, total) untuk dicek)"""
+    transaksi_options, angka = [], []
+    for no in df_jurnal["No"].unique():
+        transaksi_data = df_jurnal[df_jurnal["No"] == no]
+        if len(transaksi_data) == 1:
+            row = transaksi_data.iloc[0]
+            desc = f"No {no} - {row['Akun Debit']} vs {row['Akun Kredit']} - Rp {row['Debit (Rp)']:,.0f}"
+        else:
+            desc = f"No {no} - Double Entry ({len(transaksi_data)} entri) - Rp {transaksi_data['Debit (Rp)'].sum():,.0f}"
+        transaksi_options.append(desc)
+        angka.append((int(no), len(transaksi_data), round(float(transaksi_data["Debit (Rp)"].sum()), 2)))
+    return transaksi_options, angka
+
+
+def halaman_baru(ringkasan, cari):
+    """Yang dikerjakan setiap rerun setelah ringkasan ada: saring lalu label satu halaman"""
+    hasil = saring_transaksi(ringkasan, cari)
+    return [
+        f"No {no} - {akun} - Rp {total:,.0f}"
+        for no, akun, total in hasil.iloc[:PER_HALAMAN][["No", "Akun", "Total (Rp)"]].itertuples(index=False)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transaksi", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--lama-maks", type=int, default=10_000, help="jumlah transaksi terbesar yang diukur dengan cara lama")
+    parser.add_argument("--cari", default="kas", help="teks pencarian akun untuk rerun")
+    args = parser.parse_args()
+
+    print(f"{'Transaksi':>10} | {'Lama (s)':>9} | {'Ringkasan (s)':>13} | {'Rerun (ms)':>10} | {'Speedup':>8}")
+    print("-" * 63)
+    for n in args.transaksi:
+        jurnal = buat_jurnal_umum(n * 2)
+
+        mulai = time.perf_counter()
+        ringkasan = ringkasan_transaksi(jurnal)
+        halaman_baru(ringkasan, args.cari)
+        waktu_ringkasan = time.perf_counter() - mulai
+
+        mulai = time.perf_counter()
+        halaman_baru(ringkasan, args.cari)
+        waktu_rerun = time.perf_counter() - mulai
+
+        if n > args.lama_maks:
+            print(f"{n:>10,} | {'-':>9} | {waktu_ringkasan:>13.3f} | {waktu_rerun * 1e3:>10.2f} | {'-':>8}")
+            continue
+
+        mulai = time.perf_counter()
+        _, angka = opsi_lama(jurnal)
+        waktu_lama = time.perf_counter() - mulai
+
+        baru = [
+            (int(no), int(entri), round(float(total), 2))
+            for no, entri, total in ringkasan[["No", "Entri", "Total (Rp)"]].itertuples(index=False)
+        ]
+        assert angka == baru, "Ringkasan transaksi berbeda"
+        print(f"{n:>10,} | {waktu_lama:>9.3f} | {waktu_ringkasan:>13.3f} | {waktu_rerun * 1e3:>10.2f} | "
+              f"{waktu_lama / waktu_rerun:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
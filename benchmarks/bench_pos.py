@@ -0,0 +1,119 @@
+"""
+Benchmark posting transaksi POS: satu transaksi per posting (seperti form
+"Penjualan & Pembelian", satu posting buku besar + satu append log per
+transaksi) vs micro-batch simaya.pos.PencatatPOS (satu posting buku besar +
+satu append + fsync log per batch).
+
+Setiap cara memakai database SQLite sendiri dengan data awal yang sama.
+Karena ID Dokumen diturunkan dari kunci transaksi, tabel hasil kedua cara
+(di memori maupun setelah dimuat ulang dari penyimpanan) dicek identik.
+
+Jalankan:
+    python benchmarks/bench_pos.py
+    python benchmarks/bench_pos.py --transaksi 5000 --batch 10 100 500
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from data_sintetis import DAFTAR_BARANG, buat_jurnal_umum, buat_riwayat_persediaan, buat_saldo_awal
+from simaya.buku import Buku
+from simaya.inventory import hitung_ulang_ringkasan
+from simaya.pos import DIPOSTING, PencatatPOS, baca_transaksi
+from simaya.storage import SQLiteBackend
+
+TABEL_DICEK = ("jurnal_umum", "penjualan", "pembelian", "persediaan", "riwayat_persediaan")
+
+
+def siapkan_database(path, jumlah_jurnal):
+    riwayat = buat_riwayat_persediaan(max(jumlah_jurnal // 10, 10))
+    backend = SQLiteBackend(path)
+    backend.siapkan()
+    backend.simpan({
+        "neraca_saldo_sebelumnya": buat_saldo_awal(),
+        "jurnal_umum": buat_jurnal_umum(jumlah_jurnal, seed=3),
+        "riwayat_persediaan": riwayat,
+        "persediaan": hitung_ulang_ringkasan(riwayat, "Average", DAFTAR_BARANG),
+    })
+    return backend
+
+
+def buat_transaksi(jumlah, seed=5):
+    """Transaksi kasir acak: sebagian besar penjualan kecil, sesekali pembelian stok"""
+    rng = np.random.default_rng(seed)
+    daftar = []
+    for i in range(jumlah):
+        pembelian = rng.random() < 0.1
+        daftar.append({
+            "kunci": f"kasir-{i:06d}",
+            "jenis": "pembelian" if pembelian else "penjualan",
+            "barang": DAFTAR_BARANG[rng.integers(0, len(DAFTAR_BARANG))],
+            "jumlah": int(rng.integers(20, 80)) if pembelian else int(rng.integers(1, 5)),
+            "harga": int(rng.integers(5, 60)) * 1000,
+            "tanggal": (date(2025, 2, 1) + timedelta(days=i // 200)).isoformat(),
+        })
+    return daftar
+
+
+def posting(path, daftar, ukuran_batch):
+    """Posting semua transaksi per ukuran_batch; mengembalikan (pencatat, detik)"""
+    pencatat = PencatatPOS(SQLiteBackend(path), periode="Januari 2025", tanggal_awal_periode=date(2025, 1, 1))
+    transaksi = [baca_transaksi(data, pencatat.barang()) for data in daftar]
+    mulai = time.perf_counter()
+    diposting = 0
+    for i in range(0, len(transaksi), ukuran_batch):
+        diposting += sum(h["status"] == DIPOSTING for h in pencatat.posting(transaksi[i:i + ukuran_batch]))
+    return pencatat, diposting, time.perf_counter() - mulai
+
+
+def seragam(df):
+    """Sel kosong None (dari SQLite) dan NaN (di memori) dianggap sama"""
+    return df.astype(object).where(df.notna(), None)
+
+
+def cocokkan(a, b):
+    for nama in TABEL_DICEK:
+        pd.testing.assert_frame_equal(a.tabel[nama], b.tabel[nama])
+    assert set(a.buku_besar_per_akun) == set(b.buku_besar_per_akun)
+    for akun, df in a.buku_besar_per_akun.items():
+        assert abs(df["Saldo (Rp)"].iloc[-1] - b.buku_besar_per_akun[akun]["Saldo (Rp)"].iloc[-1]) < 1e-6, akun
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transaksi", type=int, default=500, help="Jumlah transaksi kasir")
+    parser.add_argument("--batch", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--jurnal", type=int, default=10_000, help="Baris jurnal umum yang sudah ada")
+    args = parser.parse_args()
+
+    daftar = buat_transaksi(args.transaksi)
+    with tempfile.TemporaryDirectory() as folder:
+        def jalankan(ukuran_batch):
+            path = os.path.join(folder, f"pos_{ukuran_batch}.db")
+            siapkan_database(path, args.jurnal)
+            pencatat, diposting, detik = posting(path, daftar, ukuran_batch)
+            # Data yang dimuat ulang (snapshot + putar ulang log) sama dengan keadaan di memori
+            dimuat = Buku.dari_storage(SQLiteBackend(path))
+            for nama in TABEL_DICEK:
+                pd.testing.assert_frame_equal(seragam(dimuat.tabel[nama]), seragam(pencatat.tabel[nama]))
+            return pencatat, diposting, detik
+
+        satu, diposting, waktu_satu = jalankan(1)
+        print(f"{args.transaksi:,} transaksi ({diposting:,} diposting), jurnal awal {args.jurnal:,} baris\n")
+        print(f"{'Batch':>6} | {'Waktu (s)':>9} | {'Transaksi/s':>11} | {'Speedup':>8}")
+        print("-" * 44)
+        print(f"{1:>6} | {waktu_satu:>9.3f} | {args.transaksi / waktu_satu:>11,.0f} | {1:>7.1f}x")
+        for ukuran in args.batch:
+            hasil, _, detik = jalankan(ukuran)
+            cocokkan(satu, hasil)
+            print(f"{ukuran:>6} | {detik:>9.3f} | {args.transaksi / detik:>11,.0f} | {waktu_satu / detik:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark startup dan rerun script Streamlit: main.py sebelum dipecah
+(semua fungsi didefinisikan ulang dan blok inisialisasi dijalankan ulang di
+setiap run) vs main.py yang hanya berisi routing + tampilan dan mengimpor
+simaya.app sekali per proses.
+
+Setiap versi dijalankan di proses terpisah dengan AppTest pada salinan
+repo di folder sementara (database baru). Diukur:
+- Start awal: run pertama sesi pertama (termasuk impor modul)
+- Start sesi: run pertama sesi kedua di proses yang sama
+- Rerun: median/p90 --ulang kali rerun halaman --halaman
+Kolom "def/run" adalah jumlah def/class yang dieksekusi ulang setiap run.
+
+Jalankan:
+    python benchmarks/bench_rerun.py
+    python benchmarks/bench_rerun.py --rev-lama 8f95cef --halaman "Jurnal Umum" --ulang 50
+"""
+
+import argparse
+import ast
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Commit terakhir sebelum main.py dipecah menjadi simaya.app
+REV_LAMA = "8f95cef"
+
+
+def jumlah_definisi(path):
+    """(baris, def/class tingkat atas) script yang dieksekusi setiap run"""
+    with open(path, encoding="utf-8") as f:
+        sumber = f.read()
+    pohon = ast.parse(sumber)
+    definisi = sum(isinstance(n, (ast.FunctionDef, ast.ClassDef)) for n in pohon.body)
+    return sumber.count("\n") + 1, definisi
+
+
+def siapkan_lama(rev, tujuan):
+    arsip = subprocess.run(["git", "-C", ROOT, "archive", rev], check=True, capture_output=True).stdout
+    subprocess.run(["tar", "-x", "-C", tujuan], input=arsip, check=True)
+
+
+def siapkan_baru(tujuan):
+    shutil.copy(os.path.join(ROOT, "main.py"), tujuan)
+    shutil.copytree(os.path.join(ROOT, "simaya"), os.path.join(tujuan, "simaya"),
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    excel = os.path.join(ROOT, "database_keuangan.xlsx")
+    if os.path.exists(excel):
+        shutil.copy(excel, tujuan)
+
+
+def ukur_di_folder(folder, halaman, ulang):
+    """Dijalankan di proses anak: waktu run AppTest untuk main.py di folder"""
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(folder)
+    sys.path.insert(0, folder)
+
+    def sesi_baru():
+        at = AppTest.from_file(os.path.join(folder, "main.py"), default_timeout=300)
+        at.session_state["logged_in"] = True
+        at.session_state["username"] = "admin"
+        mulai = time.perf_counter()
+        at.run()
+        return at, time.perf_counter() - mulai
+
+    at, start_awal = sesi_baru()
+    _, start_sesi = sesi_baru()
+    at.sidebar.radio[0].set_value(halaman).run()
+    assert not at.exception, at.exception[0].value
+
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        at.run()
+        waktu.append(time.perf_counter() - mulai)
+    waktu.sort()
+    return {
+        "start_awal": start_awal, "start_sesi": start_sesi,
+        "median": statistics.median(waktu), "p90": waktu[int(0.9 * (len(waktu) - 1))],
+    }
+
+
+def jalankan_anak(folder, args):
+    hasil = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--anak", folder, "--halaman", args.halaman, "--ulang", str(args.ulang)],
+        check=True, capture_output=True, text=True
+    )
+    return json.loads(hasil.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rev-lama", default=REV_LAMA, help="commit git untuk versi sebelum dipecah")
+    parser.add_argument("--halaman", default="Profile", help="halaman yang di-rerun")
+    parser.add_argument("--ulang", type=int, default=30, help="jumlah rerun yang diukur")
+    parser.add_argument("--anak", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.anak:
+        import io
+        from contextlib import redirect_stdout
+        # Output print aplikasi dibuang; baris terakhir stdout adalah hasil JSON
+        with redirect_stdout(io.StringIO()):
+            hasil = ukur_di_folder(args.anak, args.halaman, args.ulang)
+        print(json.dumps(hasil))
+        return
+
+    print(f"Halaman: {args.halaman}, {args.ulang} rerun")
+    print(f"{'Versi':>12} | {'Baris':>6} | {'def/run':>7} | {'Start awal (ms)':>15} | {'Start sesi (ms)':>15} | "
+          f"{'Rerun med (ms)':>14} | {'Rerun p90 (ms)':>14}")
+    print("-" * 104)
+    hasil = {}
+    for versi, siapkan in [("lama", lambda d: siapkan_lama(args.rev_lama, d)), ("baru", siapkan_baru)]:
+        with tempfile.TemporaryDirectory() as folder:
+            siapkan(folder)
+            baris, definisi = jumlah_definisi(os.path.join(folder, "main.py"))
+            hasil[versi] = ukur = jalankan_anak(folder, args)
+        print(f"{versi:>12} | {baris:>6} | {definisi:>7} | {ukur['start_awal'] * 1e3:>15.1f} | "
+              f"{ukur['start_sesi'] * 1e3:>15.1f} | {ukur['median'] * 1e3:>14.1f} | {ukur['p90'] * 1e3:>14.1f}")
+    print(f"\nRerun median {hasil['lama']['median'] / hasil['baru']['median']:.2f}x lebih cepat, "
+          f"start sesi {hasil['lama']['start_sesi'] / hasil['baru']['start_sesi']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
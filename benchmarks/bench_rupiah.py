@@ -0,0 +1,74 @@
+"""
+Benchmark format/parse Rupiah: format_angka + safe_float_convert per sel
+(main.py) vs format_rupiah_series / parse_rupiah_series (simaya.rupiah).
+
+Jalankan:
+    python benchmarks/bench_rupiah.py
+    python benchmarks/bench_rupiah.py --ukuran 10000 100000 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench_buku_besar import safe_float_convert
+from simaya.rupiah import format_rupiah_series, parse_rupiah_series
+
+
+def format_angka(x):
+    """Salinan format_angka dari main.py (referensi versi per sel)"""
+    try:
+        if pd.isna(x) or x == 0:
+            return "0"
+        if isinstance(x, str):
+            x_clean = safe_float_convert(x)
+        else:
+            x_clean = float(x)
+        return f"Rp {x_clean:,.0f}".replace(",", ".")
+    except Exception:
+        return "0"
+
+
+def buat_nilai(jumlah, seed=7):
+    """Nominal acak kelipatan 100 (termasuk nol dan negatif)"""
+    rng = np.random.default_rng(seed)
+    nilai = np.round(rng.uniform(-5e8, 5e9, jumlah), -2)
+    nilai[rng.random(jumlah) < 0.1] = 0.0
+    return pd.Series(nilai)
+
+
+def terbaik(fungsi, ulang=3):
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        waktu.append(time.perf_counter() - mulai)
+    return hasil, min(waktu)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'Nilai':>10} | {'Operasi':<7} | {'Per sel (s)':>11} | {'Vektor (s)':>10} | {'Speedup':>8}")
+    print("-" * 60)
+    for n in args.ukuran:
+        nilai = buat_nilai(n)
+
+        lama, waktu_lama = terbaik(lambda: nilai.apply(format_angka))
+        baru, waktu_baru = terbaik(lambda: format_rupiah_series(nilai))
+        assert (baru.astype(object) == lama).all(), "Hasil format berbeda"
+        print(f"{n:>10,} | {'format':<7} | {waktu_lama:>11.3f} | {waktu_baru:>10.3f} | {waktu_lama / waktu_baru:>7.1f}x")
+
+        teks = lama
+        lama, waktu_lama = terbaik(lambda: teks.apply(safe_float_convert))
+        baru, waktu_baru = terbaik(lambda: parse_rupiah_series(teks))
+        pd.testing.assert_series_equal(lama.astype("float64"), baru, check_names=False)
+        print(f"{n:>10,} | {'parse':<7} | {waktu_lama:>11.3f} | {waktu_baru:>10.3f} | {waktu_lama / waktu_baru:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Pembuat data sintetis untuk skrip benchmark SIMAYA.
+"""
+
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Supaya paket simaya bisa diimpor saat skrip dijalankan dari folder mana pun
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+DAFTAR_AKUN = [
+    "Kas", "Piutang Usaha", "Persediaan Barang Dagang", "Perlengkapan", "Peralatan",
+    "Utang Usaha", "Modal", "Prive", "Penjualan", "Harga Pokok Penjualan",
+    "Beban Gaji", "Beban Listrik dan Air", "Beban Sewa", "Beban Perlengkapan",
+    "Beban Penyusutan Peralatan", "Akumulasi Penyusutan Peralatan",
+]
+
+
+def buat_jurnal_umum(jumlah_baris, seed=42, jumlah_akun=None, tanggal_awal=date(2025, 1, 1)):
+    """Jurnal umum acak: dua baris (debit, kredit) per nomor transaksi"""
+    rng = np.random.default_rng(seed)
+    akun = np.array(DAFTAR_AKUN if jumlah_akun is None else [f"Akun {i:03d}" for i in range(jumlah_akun)], dtype=object)
+    jumlah_transaksi = max(1, jumlah_baris // 2)
+
+    nomor = np.repeat(np.arange(1, jumlah_transaksi + 1), 2)[:jumlah_baris]
+    nominal = np.repeat(rng.integers(1, 500, jumlah_transaksi) * 1000.0, 2)[:jumlah_baris]
+    hari = np.repeat(np.sort(rng.integers(0, 28, jumlah_transaksi)), 2)[:jumlah_baris]
+    sisi_debit = np.tile([True, False], jumlah_transaksi)[:jumlah_baris]
+    akun_acak = akun[rng.integers(0, len(akun), jumlah_baris)]
+
+    tanggal = pd.Timestamp(tanggal_awal) + pd.to_timedelta(hari, unit="D")
+    return pd.DataFrame({
+        "No": nomor,
+        "Tanggal": tanggal.date,
+        "Akun Debit": np.where(sisi_debit, akun_acak, ""),
+        "Debit (Rp)": np.where(sisi_debit, nominal, 0.0),
+        "Akun Kredit": np.where(sisi_debit, "", akun_acak),
+        "Kredit (Rp)": np.where(sisi_debit, 0.0, nominal),
+    })
+
+
+def buat_saldo_awal():
+    """Neraca saldo periode sebelumnya sederhana"""
+    return pd.DataFrame({
+        "Nama Akun": ["Kas", "Persediaan Barang Dagang", "Peralatan", "Utang Usaha", "Modal"],
+        "Debit (Rp)": [50_000_000.0, 20_000_000.0, 30_000_000.0, 0.0, 0.0],
+        "Kredit (Rp)": [0.0, 0.0, 0.0, 10_000_000.0, 90_000_000.0],
+    })
+
+
+def buat_jurnal_ket(jumlah_baris, seed, keterangan):
+    """Jurnal dengan kolom Keterangan (penyesuaian/penutup)"""
+    df = buat_jurnal_umum(jumlah_baris, seed=seed)
+    df.insert(2, "Keterangan", keterangan)
+    return df
+
+
+DAFTAR_BARANG = ["Ayam Jago", "Ayam Broiler", "Telur Ayam"]
+
+
+def buat_riwayat_persediaan(jumlah_baris, seed=11, jumlah_barang=None, tanggal_awal=date(2025, 1, 1)):
+    """
+    Riwayat persediaan acak (skema df_riwayat_persediaan). Penjualan tidak
+    pernah melebihi stok berjalan barangnya; tanggal (datetime.date, seperti
+    dari form) naik satu hari per baris sehingga urutannya tidak ambigu.
+    """
+    rng = np.random.default_rng(seed)
+    barang = DAFTAR_BARANG if jumlah_barang is None else [f"Barang {i:03d}" for i in range(jumlah_barang)]
+    indeks_barang = rng.integers(0, len(barang), jumlah_baris)
+    qty = rng.integers(1, 50, jumlah_baris).astype("float64")
+    harga = rng.integers(5, 60, jumlah_baris) * 1000.0
+    coba_jual = rng.random(jumlah_baris) < 0.45
+
+    stok = np.zeros(len(barang))
+    jenis = np.empty(jumlah_baris, dtype=object)
+    for i, (b, q, jual) in enumerate(zip(indeks_barang, qty, coba_jual)):
+        if jual and stok[b] >= q:
+            jenis[i] = "Penjualan"
+            stok[b] -= q
+        else:
+            jenis[i] = "Pembelian"
+            stok[b] += q
+
+    penjualan = jenis == "Penjualan"
+    tanggal = pd.Timestamp(tanggal_awal) + pd.to_timedelta(np.arange(jumlah_baris), unit="D")
+    return pd.DataFrame({
+        "Tanggal": tanggal.date,
+        "Jenis": jenis,
+        "Barang": np.array(barang, dtype=object)[indeks_barang],
+        "Jumlah": np.where(penjualan, -qty, qty),
+        "Harga": np.where(penjualan, 0.0, harga),
+        "Total": np.where(penjualan, 0.0, qty * harga),
+        "Stok": 0.0,
+        "Keterangan": np.where(penjualan, "Penjualan", "Pembelian"),
+    })
@@ -0,0 +1,13 @@
+"""
+SIMAYA - inti perhitungan akuntansi yang dapat diimpor tanpa Streamlit.
+
+Modul di dalam paket ini hanya bergantung pada pandas/numpy sehingga bisa
+dipakai oleh aplikasi Streamlit (main.py) maupun skrip benchmark.
+Pengecualiannya subpaket simaya.app: lapisan aplikasi Streamlit yang
+diimpor main.py.
+
+Pekerjaan akhir bulan (tutup periode, hitung ulang persediaan, ekspor Excel)
+juga bisa dijalankan tanpa browser: python -m simaya --help (simaya.cli).
+Transaksi kasir (POS) diterima lewat HTTP lokal oleh python -m simaya
+layani-pos (simaya.layanan_pos) dan diposting per batch oleh simaya.pos.
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from simaya.cli import main
+
+sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Antrean tugas ekspor Excel di latar belakang.
+
+Penulisan workbook (simaya.ekspor) dijalankan di thread pool tingkat proses
+sehingga script Streamlit tidak terblokir selama workbook ditulis; halaman
+cukup membaca progres tugas (sheet dan baris yang sudah ditulis) lalu
+menampilkan tombol unduh setelah selesai.
+
+Seperti CACHE, objek ANTREAN diimpor sekali per proses dan dipakai bersama
+semua sesi. Tugas diidentifikasi dengan ID acak dan dikelompokkan menurut
+kunci data (mis. versi data + daftar tabel): pengajuan ulang dengan kunci
+yang sama mengembalikan tugas yang sudah ada selama belum gagal dan filenya
+masih tersedia.
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from simaya.ekspor import hapus_ekspor, path_ekspor_baru, tulis_workbook
+
+ANTRE = "antre"
+BERJALAN = "berjalan"
+SELESAI = "selesai"
+GAGAL = "gagal"
+
+MAKS_PEKERJA = 2
+
+# Tugas yang disimpan (beserta filenya); yang terlama dibuang lebih dulu
+MAKS_TUGAS = 8
+
+
+class Tugas:
+    """Satu tugas ekspor beserta progresnya (dibaca langsung oleh halaman)"""
+
+    __slots__ = (
+        "id", "kunci", "status", "sheet_total", "sheet_selesai", "baris_total", "baris_ditulis",
+        "sheet_sekarang", "path", "pesan", "dibuat", "selesai", "_event",
+    )
+
+    def __init__(self, kunci, daftar_sheet):
+        self.id = uuid.uuid4().hex[:12]
+        self.kunci = kunci
+        self.status = ANTRE
+        # Sumber berupa fungsi (dihitung saat ekspor) dihitung sebagai satu sheet tanpa baris
+        isi = [df for _, df in daftar_sheet if callable(df) or (df is not None and not df.empty)]
+        self.sheet_total = len(isi)
+        self.sheet_selesai = 0
+        self.baris_total = sum(len(df) for df in isi if not callable(df))
+        self.baris_ditulis = 0
+        self.sheet_sekarang = None
+        self.path = None
+        self.pesan = ""
+        self.dibuat = time.time()
+        self.selesai = None
+        self._event = threading.Event()
+
+    # Dipanggil tulis_workbook() dari thread pekerja
+    def baris(self, n):
+        self.baris_ditulis += n
+
+    def sheet(self, nama):
+        self.sheet_selesai += 1
+        self.sheet_sekarang = nama
+
+    def aktif(self):
+        return self.status in (ANTRE, BERJALAN)
+
+    def progres(self):
+        """Perkiraan progres 0..1 menurut baris yang sudah ditulis"""
+        if self.status == SELESAI:
+            return 1.0
+        return min(1.0, self.baris_ditulis / self.baris_total) if self.baris_total else 0.0
+
+    def tersedia(self):
+        return self.status == SELESAI and self.path is not None and os.path.exists(self.path)
+
+
+class AntreanEkspor:
+    """Thread pool + daftar tugas ekspor (LRU, aman dipakai banyak sesi)"""
+
+    def __init__(self, maks_pekerja=MAKS_PEKERJA, maks_tugas=MAKS_TUGAS):
+        self.maks_tugas = maks_tugas
+        self._pool = ThreadPoolExecutor(max_workers=maks_pekerja, thread_name_prefix="simaya-ekspor")
+        self._tugas = OrderedDict()
+        self._per_kunci = {}
+        self._lock = threading.Lock()
+        self.dedup = 0
+
+    def ajukan(self, kunci, daftar_sheet, awalan="ekspor"):
+        """
+        Ajukan ekspor daftar_sheet (list (nama, DataFrame) yang sudah diambil
+        dari sesi; tabel tidak disalin). Tugas dengan kunci sama yang masih
+        berjalan atau selesai dengan file tersedia dipakai ulang.
+        """
+        with self._lock:
+            lama = self._tugas.get(self._per_kunci.get(kunci))
+            if lama is not None and (lama.aktif() or lama.tersedia()):
+                self._tugas.move_to_end(lama.id)
+                self.dedup += 1
+                return lama
+            tugas = Tugas(kunci, daftar_sheet)
+            self._tugas[tugas.id] = tugas
+            self._per_kunci[kunci] = tugas.id
+            self._buang_lama()
+        self._pool.submit(self._jalankan, tugas, daftar_sheet, awalan)
+        return tugas
+
+    def ambil(self, id_tugas):
+        with self._lock:
+            return self._tugas.get(id_tugas)
+
+    def tunggu(self, id_tugas, timeout=None):
+        """Tunggu tugas selesai/gagal (untuk pemakaian sinkron); mengembalikan Tugas"""
+        tugas = self.ambil(id_tugas)
+        if tugas is not None:
+            tugas._event.wait(timeout)
+        return tugas
+
+    def _jalankan(self, tugas, daftar_sheet, awalan):
+        tugas.status = BERJALAN
+        mulai = time.perf_counter()
+        try:
+            path = path_ekspor_baru(awalan)
+            jumlah = tulis_workbook(path, daftar_sheet, kemajuan=tugas)
+            tugas.path = path
+            tugas.status = SELESAI
+            tugas.pesan = f"{len(jumlah)} sheet, {sum(jumlah.values())} baris ({time.perf_counter() - mulai:.2f}s)"
+            print(f"✅ Ekspor {tugas.id}: {tugas.pesan}")
+        except Exception as e:
+            tugas.status = GAGAL
+            tugas.pesan = str(e)
+            print(f"❌ Error ekspor {tugas.id}: {str(e)}")
+        finally:
+            tugas.selesai = time.time()
+            tugas._event.set()
+
+    def _buang_lama(self):
+        """Buang tugas terlama yang sudah tidak berjalan (dipanggil dengan lock)"""
+        for id_tugas in list(self._tugas):
+            if len(self._tugas) <= self.maks_tugas:
+                break
+            tugas = self._tugas[id_tugas]
+            if tugas.aktif():
+                continue
+            del self._tugas[id_tugas]
+            if self._per_kunci.get(tugas.kunci) == id_tugas:
+                del self._per_kunci[tugas.kunci]
+            hapus_ekspor(tugas.path)
+
+    def statistik(self):
+        with self._lock:
+            status = [t.status for t in self._tugas.values()]
+        return {
+            "tugas": len(status), "berjalan": status.count(BERJALAN) + status.count(ANTRE),
+            "selesai": status.count(SELESAI), "gagal": status.count(GAGAL), "dedup": self.dedup,
+        }
+
+
+# Satu instance per proses
+ANTREAN = AntreanEkspor()
@@ -0,0 +1,12 @@
+"""
+Lapisan aplikasi Streamlit SIMAYA.
+
+Berbeda dengan modul inti di paket simaya, modul di sini membaca dan
+menulis st.session_state. Modul diimpor sekali per proses; script main.py
+yang dijalankan ulang Streamlit setiap interaksi cukup berisi routing dan
+tampilan halaman.
+
+Urutan lapisan (modul hanya mengimpor lapisan di atasnya): utilitas,
+penyimpanan -> persediaan, buku_besar -> jurnal, laporan -> periode,
+ekspor -> tampilan, sesi.
+"""
@@ -0,0 +1,208 @@
+"""
+Buku besar dan neraca saldo di session state, dibangun dengan mesin vektor
+simaya.ledger.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from simaya.cache import CACHE
+from simaya.ledger import SUMBER_JURNAL, bangun_buku_besar, bangun_neraca_saldo, ke_format_lama
+from simaya.app.penyimpanan import auto_save, kunci_cache, tanda_sumber_buku_besar
+
+
+def reset_dan_renumber_jurnal_umum():
+    """Reset dan beri nomor ulang semua transaksi jurnal umum"""
+    try:
+        if "df_jurnal_umum" in st.session_state and not st.session_state.df_jurnal_umum.empty:
+            df = st.session_state.df_jurnal_umum.copy()
+            
+            # Dapatkan nomor transaksi unik
+            unique_nos = df["No"].unique()
+            unique_nos.sort()
+            
+            # Buat mapping dari nomor lama ke nomor baru
+            mapping = {old_no: new_no for new_no, old_no in enumerate(unique_nos, 1)}
+            
+            # Terapkan mapping
+            df["No"] = df["No"].map(mapping)
+            
+            st.session_state.df_jurnal_umum = df
+            
+            # Update transaction counter
+            st.session_state.transaction_counter = len(unique_nos) + 1
+            
+            # Update sistem
+            update_sistem_dengan_struktur_baru()
+            auto_save()
+            
+            return True
+        return False
+    except Exception as e:
+        st.error(f"Error reset numbering: {str(e)}")
+        return False
+
+
+def jurnal_sesi():
+    """Jurnal sesi ini dengan kunci simaya.ledger ({"df_jurnal_umum": df, ...})"""
+    return {kunci: st.session_state.get(kunci) for kunci, _ in SUMBER_JURNAL}
+
+
+def bangun_buku_besar_dari_session():
+    """
+    Bangun ulang buku besar per akun + buku besar flat dari session state
+    memakai mesin vektor (simaya.ledger), lalu perbarui neraca saldo.
+    Mengembalikan jumlah akun yang terbentuk.
+    """
+    jurnal = jurnal_sesi()
+    
+    def hitung():
+        return bangun_buku_besar(
+            st.session_state.get("df_neraca_saldo_periode_sebelumnya"),
+            jurnal,
+            tanggal_awal_periode=st.session_state.get("tanggal_awal_periode"),
+            periode=st.session_state.get("periode_sekarang", ""),
+        )
+    
+    # Sesi tanpa perubahan tersimpan memakai buku besar bersama dari CACHE
+    kunci = kunci_cache("buku_besar")
+    if kunci is None:
+        buku_besar_per_akun, df_buku_besar = hitung()
+    else:
+        (buku_besar_per_akun, df_buku_besar), _ = CACHE.ambil_atau_hitung(kunci, hitung)
+
+    st.session_state.buku_besar_per_akun = buku_besar_per_akun
+    st.session_state.df_buku_besar = df_buku_besar
+    st.session_state.tanda_buku_besar = tanda_sumber_buku_besar()
+
+    if buku_besar_per_akun:
+        update_neraca_saldo_dari_buku_besar_per_akun(buku_besar_per_akun, df_buku_besar)
+        print(f"✅ Buku besar per akun diperbarui: {len(buku_besar_per_akun)} akun, {len(df_buku_besar)} baris")
+    return len(buku_besar_per_akun)
+
+
+def update_buku_besar_per_akun():
+    """
+    Update buku besar yang dikelompokkan per akun - VERSI DIPERBAIKI
+    """
+    try:
+        if not st.session_state.get("tanggal_awal_periode"):
+            st.warning("Silakan atur periode akuntansi terlebih dahulu di menu 'Neraca Saldo Periode Sebelumnya'.")
+            return
+
+        bangun_buku_besar_dari_session()
+        
+    except Exception as e:
+        st.error(f"Error dalam update_buku_besar_per_akun: {str(e)}")
+        import traceback
+        st.error(f"Detail error: {traceback.format_exc()}")
+        # Fallback: buat buku besar kosong
+        st.session_state.df_buku_besar = pd.DataFrame(columns=[
+            "No", "Tanggal", "Sumber", "Keterangan", "Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"
+        ])
+        st.session_state.buku_besar_per_akun = {}
+
+
+def update_buku_besar_per_akun_fixed():
+    """
+    Update buku besar yang dikelompokkan per akun - VERSI DIPERBAIKI DENGAN ERROR HANDLING
+    """
+    try:
+        # PERBAIKAN: Pastikan tanggal_awal_periode sudah diinisialisasi
+        if "tanggal_awal_periode" not in st.session_state:
+            from datetime import date
+            st.session_state.tanggal_awal_periode = date.today().replace(day=1)
+            st.warning("⚠️ Tanggal awal periode diatur otomatis ke awal bulan ini. Silakan atur di menu 'Neraca Saldo Periode Sebelumnya' jika perlu disesuaikan.")
+            print("⚠️ tanggal_awal_periode diatur otomatis")
+        
+        # PERBAIKAN: Pastikan periode_sekarang sudah diinisialisasi
+        if "periode_sekarang" not in st.session_state:
+            from datetime import datetime
+            st.session_state.periode_sekarang = datetime.now().strftime("%B %Y")
+            print("⚠️ periode_sekarang diatur otomatis")
+        
+        if not bangun_buku_besar_dari_session():
+            st.info("📊 Buku Besar masih kosong. Silakan tambah transaksi di Jurnal Umum terlebih dahulu.")
+            return
+        
+        return True
+        
+    except Exception as e:
+        st.error(f"❌ Error dalam update_buku_besar_per_akun_fixed: {str(e)}")
+        import traceback
+        st.error(f"Detail error: {traceback.format_exc()}")
+        # Fallback: buat buku besar kosong
+        st.session_state.df_buku_besar = pd.DataFrame(columns=[
+            "No", "Tanggal", "Sumber", "Keterangan", "Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"
+        ])
+        st.session_state.buku_besar_per_akun = {}
+        return False
+
+
+def update_neraca_saldo_dari_buku_besar_per_akun(buku_besar_per_akun, df_buku_besar=None):
+    """
+    Update neraca saldo dari buku besar tanpa loop per baris (simaya.ledger.bangun_neraca_saldo).
+    Ringkasan total dan cek keseimbangan disimpan di st.session_state.ringkasan_neraca_saldo.
+    """
+    try:
+        neraca_final, ringkasan = bangun_neraca_saldo(buku_besar_per_akun, df_buku_besar)
+        if not neraca_final.empty:
+            st.session_state.df_neraca_saldo = neraca_final
+            st.session_state.ringkasan_neraca_saldo = ringkasan
+            print(f"✅ Neraca saldo diperbarui: {len(neraca_final) - 1} akun")
+        else:
+            st.session_state.pop("ringkasan_neraca_saldo", None)
+            
+    except Exception as e:
+        st.error(f"❌ Error update neraca saldo: {str(e)}")
+        # Fallback: buat neraca saldo kosong
+        st.session_state.df_neraca_saldo = pd.DataFrame(columns=["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"])
+        st.session_state.pop("ringkasan_neraca_saldo", None)
+
+
+def update_buku_besar_per_akun_dengan_saldo_awal():
+    """Update buku besar dengan saldo awal dari neraca saldo periode sebelumnya - VERSI KOMPREHENSIF"""
+    try:
+        bangun_buku_besar_dari_session()
+        
+    except Exception as e:
+        st.error(f"Error dalam update_buku_besar_per_akun_dengan_saldo_awal: {str(e)}")
+        import traceback
+        st.error(f"Detail error: {traceback.format_exc()}")
+        # Fallback: buat buku besar kosong
+        st.session_state.df_buku_besar = pd.DataFrame(columns=[
+            "No", "Tanggal", "Sumber", "Keterangan", "Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"
+        ])
+        st.session_state.buku_besar_per_akun = {}
+
+
+def update_sistem_dengan_struktur_baru():
+    """
+    Fungsi untuk update sistem dengan struktur data baru - VERSI DIPERBAIKI
+    Memastikan double entry mempunyai satu nomor yang sama.
+    Ini adalah rekonsiliasi penuh (rebuild buku besar dari seluruh jurnal);
+    transaksi baru cukup diposting lewat catat_jurnal_umum().
+    """
+    try:
+        # Pastikan nomor urut konsisten sebelum konversi
+        if "df_jurnal_umum" in st.session_state and not st.session_state.df_jurnal_umum.empty:
+            # Konversi ke format lama untuk kompatibilitas
+            st.session_state.df_jurnal_umum_old_format = ke_format_lama(st.session_state.df_jurnal_umum)
+            
+            # UPDATE BUKU BESAR
+            update_buku_besar_per_akun()
+            auto_save()
+            
+            print("✅ Sistem berhasil diupdate dengan struktur baru")
+         
+        else:
+            st.session_state.df_jurnal_umum_old_format = pd.DataFrame(columns=["Tanggal", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"])
+            
+    except Exception as e:
+        st.error(f"Error dalam update_sistem_dengan_struktur_baru: {str(e)}")
+
+
+def rekonsiliasi_buku_besar():
+    """Rebuild penuh buku besar + neraca saldo dari seluruh jurnal (langkah rekonsiliasi eksplisit)"""
+    update_sistem_dengan_struktur_baru()
+    return st.session_state.get("tanda_buku_besar") == tanda_sumber_buku_besar()
@@ -0,0 +1,102 @@
+"""
+Ekspor Excel data sesi: daftar sheet, kunci cache dan pengajuan ke
+antrean ekspor latar belakang (simaya.antrean).
+"""
+
+import uuid
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+
+from simaya.antrean import ANTREAN
+from simaya.ekspor import SHEET_EKSPOR, daftar_sheet
+from simaya.app.penyimpanan import kunci_cache, tanda_tabel
+
+
+def simple_export_to_excel():
+    """Fungsi export sederhana sebagai fallback"""
+    try:
+        buffer = BytesIO()
+        
+        with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+            # Export data dasar saja
+            basic_sheets = {
+                "df_jurnal_umum": "Jurnal Umum",
+                "df_buku_besar": "Buku Besar", 
+                "df_neraca_saldo": "Neraca Saldo"
+            }
+            
+            for key, sheet_name in basic_sheets.items():
+                if key in st.session_state and not st.session_state[key].empty:
+                    st.session_state[key].to_excel(writer, sheet_name=sheet_name, index=False)
+                else:
+                    # Buat sheet kosong
+                    pd.DataFrame(columns=["Data", "Tersedia"]).to_excel(
+                        writer, sheet_name=sheet_name, index=False
+                    )
+        
+        buffer.seek(0)
+        return buffer
+        
+    except Exception:
+        # Fallback paling sederhana
+        buffer = BytesIO()
+        buffer.write(b"Simple Excel Export - Error in main export")
+        buffer.seek(0)
+        return buffer
+
+
+def kunci_ekspor():
+    """
+    Kunci data yang diekspor untuk dedup tugas di ANTREAN. Selama data sesi
+    sama dengan versi tersimpan, kunci dibagi lintas sesi (kunci_cache);
+    selain itu kunci milik sesi ini dan ikut berubah bersama tanda tabelnya.
+    """
+    ada = tuple(
+        key for key in SHEET_EKSPOR
+        if isinstance(st.session_state.get(key), pd.DataFrame) and not st.session_state[key].empty
+    )
+    kunci = kunci_cache("ekspor_excel", ada)
+    if kunci is not None:
+        return kunci
+    if "id_sesi" not in st.session_state:
+        st.session_state.id_sesi = uuid.uuid4().hex
+    return ("sesi", st.session_state.id_sesi, st.session_state.get("periode_sekarang"),
+            id(st.session_state.get("buku_besar_per_akun"))) + tuple(
+        tanda_tabel(st.session_state.get(key)) for key in SHEET_EKSPOR
+    )
+
+
+def sheet_ekspor():
+    """(nama sheet, DataFrame atau fungsi penghasil DataFrame) untuk workbook ekspor; tabel tidak disalin"""
+    return daftar_sheet(st.session_state, st.session_state.get("buku_besar_per_akun"))
+
+
+def ajukan_ekspor(tempat):
+    """
+    Kirim ekspor semua data ke antrean latar belakang (simaya.antrean) dan
+    ingat ID tugasnya untuk tempat (tombol) tersebut. Permintaan berulang
+    untuk data yang sama mendapat tugas yang sama.
+    """
+    tugas = ANTREAN.ajukan(kunci_ekspor(), list(sheet_ekspor()))
+    st.session_state[f"tugas_ekspor_{tempat}"] = tugas.id
+    return tugas
+
+
+def export_to_excel():
+    """
+    Export semua data ke file .xlsx dan kembalikan path-nya (None jika gagal).
+    Lewat antrean yang sama dengan tombol unduh, lalu menunggu sampai selesai;
+    file yang sudah ada untuk data yang sama dipakai ulang.
+    """
+    tugas = ANTREAN.tunggu(ajukan_ekspor("sinkron").id)
+    if tugas is None or not tugas.tersedia():
+        print(f"❌ Error dalam export_to_excel: {tugas.pesan if tugas else 'tugas hilang'}")
+        return None
+    return tugas.path
+
+
+def baca_file(path):
+    with open(path, "rb") as f:
+        return f.read()
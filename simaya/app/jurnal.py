@@ -0,0 +1,560 @@
+"""
+Pencatatan dan penghapusan transaksi jurnal umum, termasuk transaksi
+penjualan/pembelian beserta catatan persediaan yang terkait.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from simaya.dokumen import (
+    AWALAN_PEMBELIAN, AWALAN_PENJUALAN, KOLOM_ID, buat_id_dokumen, lengkapi_id_dokumen, tanpa_id
+)
+from simaya.impor_jurnal import impor_jurnal
+from simaya.ledger import (
+    hapus_transaksi_jurnal, ke_format_lama, perbarui_neraca_saldo_inkremental, posting_inkremental,
+    ringkasan_transaksi
+)
+from simaya.app.buku_besar import rekonsiliasi_buku_besar, update_sistem_dengan_struktur_baru
+from simaya.app.penyimpanan import (
+    LOG, TABEL_DOKUMEN, auto_save, cache_laporan, catat_log_selesai, indeks_dokumen, kompaksi_log,
+    nomor_transaksi_berikutnya, seq_log_sesi, sinkron_log, tambah_baris, tanda_sumber_buku_besar, tanda_tabel,
+    tandai_turunan_tercatat, tercatat, turunan_tercatat
+)
+from simaya.app.persediaan import sinkron_persediaan, update_persediaan_setelah_pembelian_diperbaiki
+from simaya.app.utilitas import safe_float_convert
+
+
+def hapus_catatan_dokumen(daftar_id, sinkron=True):
+    """
+    Hapus baris penjualan, pembelian dan riwayat persediaan milik daftar ID
+    dokumen, satu kali drop per tabel. Baris dicari lewat indeks (bukan
+    dicocokkan dari nominal), sehingga transaksi lain dengan total yang sama
+    tidak ikut terhapus. sinkron=False: persediaan disinkronkan pemanggil.
+    """
+    try:
+        indeks = indeks_dokumen()
+        riwayat_berubah = False
+        for key in TABEL_DOKUMEN[1:]:
+            posisi = [p for id_dokumen in daftar_id for p in indeks.baris(key, id_dokumen).tolist()]
+            if not posisi:
+                continue
+            df = st.session_state[key]
+            df = df.drop(index=df.index[posisi]).reset_index(drop=True)
+            if "No" in df.columns:
+                # Reset nomor urut penjualan/pembelian
+                df["No"] = range(1, len(df) + 1)
+            st.session_state[key] = df
+            indeks.hapus(key, daftar_id, tanda_tabel(df))
+            riwayat_berubah = riwayat_berubah or key == "df_riwayat_persediaan"
+        
+        if riwayat_berubah and sinkron:
+            # Stok dan nilai persediaan dihitung ulang dari riwayat yang tersisa
+            sinkron_persediaan()
+        
+        print(f"✅ Berhasil hapus catatan {len(daftar_id)} dokumen")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error dalam hapus_catatan_dokumen: {str(e)}")
+        return False
+
+
+# Jenis transaksi jurnal -> (tabel catatan, kolom total, sisi jurnal, akun) untuk data lama tanpa ID
+CATATAN_LAMA = (
+    ("df_penjualan", "Penjualan", "Total Penjualan", "Kredit", "Penjualan"),
+    ("df_pembelian", "Pembelian", "Total Pembelian", "Debit", "Persediaan"),
+)
+
+
+def catatan_lama_terkait(transaksi_dihapus, id_tertaut):
+    """
+    Catatan penjualan/pembelian lama tanpa ID Dokumen yang nominalnya sama
+    dengan transaksi yang dihapus. Catatan ini tidak ikut dihapus (nominal
+    sama belum tentu dokumen yang sama); hanya dilaporkan agar diperiksa
+    pengguna. id_tertaut: ID dokumen yang punya catatan tertaut lewat ID.
+    Mengembalikan list teks per transaksi.
+    """
+    laporan = []
+    for no, transaksi in transaksi_dihapus.groupby("No", sort=True):
+        id_dokumen = transaksi[KOLOM_ID].iat[0] if KOLOM_ID in transaksi.columns else None
+        if id_dokumen in id_tertaut:
+            continue
+        for key, nama, kolom_total, sisi, akun in CATATAN_LAMA:
+            df = st.session_state.get(key)
+            if df is None or df.empty:
+                continue
+            nominal = transaksi.loc[transaksi[f"Akun {sisi}"] == akun, f"{sisi} (Rp)"]
+            nominal = nominal[nominal > 0]
+            if nominal.empty:
+                continue
+            cocok = df[tanpa_id(df) & df[kolom_total].isin(nominal.tolist())]
+            if not cocok.empty:
+                nomor = ", ".join(str(n) for n in cocok["No"].tolist())
+                laporan.append(f"Transaksi #{no}: {nama} No {nomor}")
+    return laporan
+
+
+def hapus_transaksi_banyak(daftar_no, password):
+    """
+    Hapus beberapa transaksi jurnal umum beserta catatan penjualan, pembelian
+    dan riwayat persediaan terkait dalam satu langkah: jurnal dinomori ulang
+    sekali, satu event log, persediaan dan buku besar dibangun ulang sekali,
+    dan satu permintaan simpan.
+    
+    Catatan terkait hanya dihapus lewat ID Dokumen. Catatan lama tanpa ID yang
+    nominalnya sama tidak dihapus, tetapi dilaporkan di pesan dan di
+    st.session_state.peringatan_hapus untuk diperiksa pengguna.
+    """
+    try:
+        # Verifikasi password admin
+        if password != "admin123":
+            return False, "Password salah!"
+        
+        # Nomor transaksi dipilih dari jurnal yang sudah memuat transaksi sesi lain
+        sinkron_log()
+        df_awal = st.session_state.get("df_jurnal_umum")
+        if df_awal is None or df_awal.empty:
+            return False, "Tidak ada data transaksi!"
+        
+        ada = set(df_awal["No"].tolist())
+        daftar_no = sorted({int(no) for no in daftar_no} & ada)
+        if not daftar_no:
+            return False, "Tidak ada transaksi yang dipilih!"
+        
+        # ID dokumen dan catatan tertautnya dicari sebelum jurnal dinomori ulang
+        indeks = indeks_dokumen()
+        id_per_no = {no: indeks.id_transaksi(no) for no in daftar_no}
+        daftar_id = [id_dokumen for id_dokumen in id_per_no.values() if id_dokumen is not None]
+        id_tertaut = {
+            id_dokumen for id_dokumen in daftar_id
+            if any(len(indeks.baris(key, id_dokumen)) for key in TABEL_DOKUMEN[1:])
+        }
+        transaksi_dihapus = df_awal[df_awal["No"].isin(daftar_no)]
+        
+        # Hapus semua entri nomor-nomor tersebut lalu nomori ulang sekali
+        turunan_sudah_tercatat = turunan_tercatat()
+        st.session_state.df_jurnal_umum = hapus_transaksi_jurnal(df_awal, daftar_no)
+        indeks.hapus_transaksi(daftar_no, tanda_tabel(st.session_state.df_jurnal_umum))
+        
+        # Catat sebagai satu event log (bukan tulis ulang seluruh jurnal)
+        if tercatat("df_jurnal_umum", df_awal):
+            try:
+                seq = LOG.hapus_transaksi("jurnal_umum", daftar_no, sesudah=seq_log_sesi())
+                catat_log_selesai(["df_jurnal_umum"], seq)
+            except Exception as e:
+                # Termasuk LogBerubah: jurnal tetap kotor dan ditulis saat flush setelah event sesi lain digabung
+                print(f"❌ Gagal menulis log jurnal: {str(e)}")
+        
+        # ========== HAPUS CATATAN PERSEDIAAN/PENJUALAN YANG TERKAIT ==========
+        if id_tertaut:
+            # Hapus tepat berdasarkan ID dokumen; persediaan disinkronkan di sini
+            hapus_catatan_dokumen(sorted(id_tertaut))
+        # Catatan lama tanpa ID tidak dicocokkan dari nominal: dilaporkan saja
+        peringatan = catatan_lama_terkait(transaksi_dihapus, id_tertaut)
+        st.session_state.peringatan_hapus = peringatan
+        # ====================================================================
+        
+        # Update sistem
+        update_sistem_dengan_struktur_baru()
+        tandai_turunan_tercatat(turunan_sudah_tercatat)
+        
+        # AUTO-SAVE SETELAH DELETE
+        auto_save()
+        
+        pesan = f"{len(daftar_no)} transaksi dan catatan persediaan terkait berhasil dihapus!"
+        if peringatan:
+            pesan += (" Catatan lama tanpa ID Dokumen tidak ikut dihapus, periksa manual: "
+                      + "; ".join(peringatan))
+        return True, pesan
+            
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+
+def delete_transaction(transaction_no, password):
+    """Hapus satu transaksi dari jurnal umum dengan verifikasi password"""
+    success, message = hapus_transaksi_banyak([transaction_no], password)
+    if success:
+        message = "Transaksi dan catatan persediaan terkait berhasil dihapus!"
+    return success, message
+
+
+@cache_laporan("ringkasan_transaksi")
+def ringkasan_transaksi_jurnal():
+    """Ringkasan per No jurnal umum untuk pemilih transaksi; dihitung sekali per versi jurnal"""
+    return ringkasan_transaksi(st.session_state.get("df_jurnal_umum"))
+
+
+def tambah_transaksi_double_entry(tanggal, keterangan, entries):
+    """
+    Tambah transaksi dengan multiple debit dan kredit
+    Format entries: [{"akun": "Kas", "debit": 100000, "kredit": 0}, ...]
+    SEMUA ENTRI DALAM SATU TRANSAKSI MEMPUNYAI NOMOR YANG SAMA
+    """
+    try:
+        if "df_jurnal_umum" not in st.session_state:
+            st.session_state.df_jurnal_umum = pd.DataFrame(
+                columns=["No", "Tanggal", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)", "ID Dokumen"]
+            )
+        
+        # Validasi keseimbangan
+        total_debit = sum(entry["debit"] for entry in entries)
+        total_kredit = sum(entry["kredit"] for entry in entries)
+        
+        if abs(total_debit - total_kredit) > 1:
+            return False, f"Transaksi tidak seimbang! Debit: {total_debit:,} vs Kredit: {total_kredit:,}"
+        
+        # GUNAKAN SATU NOMOR UNTUK SEMUA ENTRI DALAM TRANSAKSI INI
+        nomor_transaksi = nomor_transaksi_berikutnya()
+        
+        # Tambahkan setiap entry dengan NOMOR YANG SAMA
+        rows = []
+        for entry in entries:
+            rows.append({
+                "No": nomor_transaksi,  # NOMOR SAMA untuk semua entri
+                "Tanggal": tanggal,
+                "Akun Debit": entry["akun"] if entry["debit"] > 0 else "",
+                "Debit (Rp)": entry["debit"],
+                "Akun Kredit": entry["akun"] if entry["kredit"] > 0 else "",
+                "Kredit (Rp)": entry["kredit"]
+            })
+        
+        # Hanya increment transaction counter SEKALI untuk satu transaksi
+        st.session_state.transaction_counter += 1
+        
+        # Posting inkremental ke buku besar
+        catat_jurnal_umum(pd.DataFrame(rows))
+        auto_save()
+        
+        return True, f"Transaksi double entry berhasil ditambahkan! (No: {nomor_transaksi})"
+        
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+
+def catat_jurnal_umum(df_baris_baru):
+    """
+    Tambahkan baris baru ke jurnal umum (transaksi tanpa "ID Dokumen" diberi
+    ID baru) lalu posting secara inkremental:
+    hanya akun yang tersentuh di buku_besar_per_akun yang diperbarui dan total
+    neraca saldo disesuaikan di tempat. Jika buku besar belum sinkron dengan
+    jurnal (misalnya baru dimuat atau jurnal diubah di tempat lain), dilakukan
+    rekonsiliasi penuh sekali.
+    """
+    sinkron = (
+        st.session_state.get("buku_besar_per_akun") is not None
+        and st.session_state.get("tanda_buku_besar") == tanda_sumber_buku_besar()
+    )
+    turunan_sudah_tercatat = turunan_tercatat()
+
+    # Setiap transaksi baru membawa ID dokumen (jurnal manual mendapat ID sendiri)
+    df_lama = st.session_state.get("df_jurnal_umum")
+    df_baris_baru = lengkapi_id_dokumen(df_baris_baru)
+    jumlah_baru = len(df_baris_baru)
+    df_jurnal = tambah_baris("df_jurnal_umum", df_baris_baru)
+    # Baris yang benar-benar ditambahkan: No bisa dinomori ulang, dan event sesi
+    # lain yang digabung saat menulis log membuat posting inkremental tidak berlaku
+    df_baris_baru = df_jurnal.iloc[len(df_jurnal) - jumlah_baru:].reset_index(drop=True)
+    if df_lama is None or len(df_jurnal) != len(df_lama) + jumlah_baru:
+        sinkron = False
+
+    if not sinkron:
+        hasil = rekonsiliasi_buku_besar()
+        tandai_turunan_tercatat(turunan_sudah_tercatat)
+        return hasil
+
+    try:
+        buku_besar_per_akun, df_buku_besar, mutasi = posting_inkremental(
+            st.session_state.buku_besar_per_akun,
+            st.session_state.get("df_buku_besar"),
+            df_baris_baru
+        )
+        st.session_state.buku_besar_per_akun = buku_besar_per_akun
+        st.session_state.df_buku_besar = df_buku_besar
+        st.session_state.df_neraca_saldo = perbarui_neraca_saldo_inkremental(
+            st.session_state.get("df_neraca_saldo"), buku_besar_per_akun, mutasi
+        )
+
+        old_format = st.session_state.get("df_jurnal_umum_old_format")
+        baris_lama = ke_format_lama(df_baris_baru)
+        st.session_state.df_jurnal_umum_old_format = (
+            baris_lama if old_format is None or old_format.empty
+            else pd.concat([old_format, baris_lama], ignore_index=True)
+        )
+
+        st.session_state.tanda_buku_besar = tanda_sumber_buku_besar()
+        tandai_turunan_tercatat(turunan_sudah_tercatat)
+        print(f"✅ Posting inkremental: {len(mutasi)} akun diperbarui")
+        return True
+
+    except Exception as e:
+        print(f"⚠️ Posting inkremental gagal, rekonsiliasi penuh: {e}")
+        return rekonsiliasi_buku_besar()
+
+
+def impor_jurnal_umum(file, daftar_akun):
+    """
+    Impor massal baris jurnal dari CSV/XLSX (simaya.impor_jurnal): file dibaca
+    dan divalidasi per potongan, transaksi yang valid ditambahkan ke jurnal
+    umum dalam satu langkah, lalu buku besar dibangun ulang dan semuanya
+    disimpan sekali sebagai snapshot lengkap (sekaligus kompaksi log). Transaksi yang ditolak dilaporkan per baris tanpa
+    menggagalkan impor.
+    Mengembalikan (berhasil, pesan, df_kesalahan, ringkasan).
+    """
+    try:
+        nomor_awal = nomor_transaksi_berikutnya() - 1
+        df_impor, df_kesalahan, ringkasan = impor_jurnal(
+            file, daftar_akun, nomor_awal=nomor_awal, nama_file=getattr(file, "name", None)
+        )
+    except ValueError as e:
+        return False, str(e), pd.DataFrame(), {}
+    except Exception as e:
+        print(f"❌ Error impor jurnal: {str(e)}")
+        return False, f"Error: {str(e)}", pd.DataFrame(), {}
+    
+    if df_impor.empty:
+        return False, "Tidak ada transaksi valid yang dapat diimpor", df_kesalahan, ringkasan
+    
+    # Impor tidak dicatat sebagai satu event log (bisa berukuran megabyte dan
+    # dibaca ulang di setiap pemuatan sampai kompaksi berikutnya)
+    tambah_baris("df_jurnal_umum", lengkapi_id_dokumen(df_impor), catat_log=False)
+    nomor_transaksi_berikutnya(sinkron=False)
+    
+    # Satu rekonsiliasi penuh untuk seluruh impor, bukan posting per transaksi
+    update_sistem_dengan_struktur_baru()
+    if not kompaksi_log():
+        # Gagal disimpan: tabel tetap kotor dan dicoba lagi saat flush
+        auto_save()
+    
+    pesan = f"{ringkasan['transaksi_diterima']} transaksi ({ringkasan['baris_diterima']} baris) berhasil diimpor"
+    if ringkasan["transaksi_ditolak"]:
+        pesan += f", {ringkasan['transaksi_ditolak']} transaksi ditolak"
+    print(f"✅ {pesan}")
+    return True, pesan, df_kesalahan, ringkasan
+
+
+def tambah_penjualan_ke_jurnal_umum(tanggal, keterangan, akun_debit, total_penjualan, total_hpp, id_dokumen=None):
+    """Menambahkan penjualan ke jurnal umum dengan 4 entri (satu ID dokumen penjualan)"""
+    try:
+        if "df_jurnal_umum" not in st.session_state:
+            st.session_state.df_jurnal_umum = pd.DataFrame(
+                columns=["No", "Tanggal", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)", "ID Dokumen"]
+            )
+        
+        # Gunakan nomor transaksi yang sama untuk keempat entri
+        nomor_transaksi = nomor_transaksi_berikutnya()
+        
+        # Entri 1: Debit Kas/Piutang
+        entri1 = {
+            "No": nomor_transaksi,
+            "Tanggal": tanggal,
+            "Akun Debit": akun_debit,
+            "Debit (Rp)": total_penjualan,
+            "Akun Kredit": "",
+            "Kredit (Rp)": 0
+        }
+        
+        # Entri 2: Kredit Penjualan
+        entri2 = {
+            "No": nomor_transaksi,
+            "Tanggal": tanggal,
+            "Akun Debit": "",
+            "Debit (Rp)": 0,
+            "Akun Kredit": "Penjualan",
+            "Kredit (Rp)": total_penjualan
+        }
+        
+        # Entri 3: Debit Harga Pokok Penjualan
+        entri3 = {
+            "No": nomor_transaksi,
+            "Tanggal": tanggal,
+            "Akun Debit": "Harga Pokok Penjualan",
+            "Debit (Rp)": total_hpp,
+            "Akun Kredit": "",
+            "Kredit (Rp)": 0
+        }
+        
+        # Entri 4: Kredit Persediaan
+        entri4 = {
+            "No": nomor_transaksi,
+            "Tanggal": tanggal,
+            "Akun Debit": "",
+            "Debit (Rp)": 0,
+            "Akun Kredit": "Persediaan Barang Dagang",
+            "Kredit (Rp)": total_hpp
+        }
+        
+        # Increment transaction counter
+        st.session_state.transaction_counter += 1
+        
+        # Tambahkan semua entri + posting inkremental ke buku besar
+        df_entri = pd.DataFrame([entri1, entri2, entri3, entri4])
+        df_entri[KOLOM_ID] = id_dokumen or buat_id_dokumen(AWALAN_PENJUALAN)
+        catat_jurnal_umum(df_entri)
+        auto_save()
+        
+        return True
+        
+    except Exception as e:
+        st.error(f"Error tambah penjualan ke jurnal: {str(e)}")
+        return False
+
+
+def tambah_pembelian_ke_jurnal_umum_diperbaiki(tanggal, barang, total_pembelian, akun_kredit="Kas", id_dokumen=None):
+    """Menambahkan pembelian ke jurnal umum - VERSI DIPERBAIKI"""
+    try:
+        if "df_jurnal_umum" not in st.session_state:
+            st.session_state.df_jurnal_umum = pd.DataFrame(
+                columns=["No", "Tanggal", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)", "ID Dokumen"]
+            )
+        
+        # Gunakan nomor transaksi yang sama untuk kedua entri
+        nomor_transaksi = nomor_transaksi_berikutnya()
+        
+        # Validasi input - PERBAIKAN: Pastikan total_pembelian tidak 0
+        total_pembelian_float = safe_float_convert(total_pembelian)
+        if total_pembelian_float <= 0:
+            st.error(f"Total pembelian harus lebih dari 0. Nilai: {total_pembelian}")
+            return False
+        
+        # PERBAIKAN: Gunakan akun "Persediaan" bukan "Persediaan Barang Dagang"
+        # Entri 1: Debit Persediaan
+        entri1 = {
+            "No": nomor_transaksi,
+            "Tanggal": tanggal,
+            "Akun Debit": "Persediaan",  # PERBAIKAN: Ganti nama akun
+            "Debit (Rp)": total_pembelian_float,
+            "Akun Kredit": "",
+            "Kredit (Rp)": 0.0
+        }
+        
+        # Entri 2: Kredit Kas/Utang
+        entri2 = {
+            "No": nomor_transaksi,
+            "Tanggal": tanggal,
+            "Akun Debit": "",
+            "Debit (Rp)": 0.0,
+            "Akun Kredit": akun_kredit,
+            "Kredit (Rp)": total_pembelian_float
+        }
+        
+        # Increment transaction counter HANYA SEKALI
+        st.session_state.transaction_counter += 1
+        
+        # Tambahkan kedua entri dengan NOMOR dan ID DOKUMEN YANG SAMA + posting inkremental
+        df_entri = pd.DataFrame([entri1, entri2])
+        df_entri[KOLOM_ID] = id_dokumen or buat_id_dokumen(AWALAN_PEMBELIAN)
+        catat_jurnal_umum(df_entri)
+        auto_save()
+        
+        st.success(f"✅ Pembelian berhasil dicatat! (No Transaksi: {nomor_transaksi})")
+        return True
+        
+    except Exception as e:
+        st.error(f"Error tambah pembelian ke jurnal: {str(e)}")
+        return False
+
+
+def proses_pembelian_diperbaiki(tanggal_pembelian, barang_pembelian, jumlah_pembelian, harga_beli, akun_kredit_pembelian, keterangan_pembelian):
+    """Memproses pembelian dengan integrasi yang lebih baik - VERSI DIPERBAIKI"""
+    try:
+        total_pembelian = jumlah_pembelian * harga_beli
+        
+        # Validasi total pembelian
+        if total_pembelian <= 0:
+            st.error("Total pembelian harus lebih dari 0")
+            return False
+        
+        # Jurnal, riwayat persediaan dan baris pembelian berbagi satu ID dokumen
+        id_dokumen = buat_id_dokumen(AWALAN_PEMBELIAN)
+        
+        # 1. Tambahkan ke jurnal umum - gunakan fungsi yang diperbaiki
+        success_jurnal = tambah_pembelian_ke_jurnal_umum_diperbaiki(
+            tanggal_pembelian, 
+            barang_pembelian, 
+            total_pembelian,
+            akun_kredit_pembelian,
+            id_dokumen
+        )
+        
+        if success_jurnal:
+            # 2. Update persediaan
+            success_persediaan = update_persediaan_setelah_pembelian_diperbaiki(
+                barang_pembelian, 
+                jumlah_pembelian, 
+                harga_beli, 
+                tanggal_pembelian, 
+                keterangan_pembelian,
+                id_dokumen
+            )
+            
+            if success_persediaan:
+                # 3. Tambahkan ke dataframe pembelian
+                new_entry = {
+                    "No": len(st.session_state.df_pembelian) + 1,
+                    "Tanggal": tanggal_pembelian,
+                    "Keterangan": keterangan_pembelian,
+                    "Barang": barang_pembelian,
+                    "Jumlah": jumlah_pembelian,
+                    "Harga Beli": harga_beli,
+                    "Total Pembelian": total_pembelian,
+                    "ID Dokumen": id_dokumen
+                }
+                
+                tambah_baris("df_pembelian", pd.DataFrame([new_entry]))
+                
+                st.success("✅ Pembelian berhasil dicatat dan persediaan diperbarui!")
+                return True
+            else:
+                st.error("Gagal update persediaan")
+                return False
+        else:
+            st.error("Gagal mencatat jurnal pembelian")
+            return False
+            
+    except Exception as e:
+        st.error(f"Error dalam proses pembelian: {str(e)}")
+        return False
+
+
+def tambah_pembelian_ke_jurnal_umum(tanggal, keterangan, barang, total_pembelian):
+    """Menambahkan pembelian ke jurnal umum"""
+    try:
+        if "df_jurnal_umum" not in st.session_state:
+            st.session_state.df_jurnal_umum = pd.DataFrame(
+                columns=["No", "Tanggal", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)", "ID Dokumen"]
+            )
+        
+        nomor_terakhir = len(st.session_state.df_jurnal_umum)
+        
+        # Entri pembelian: Debit Persediaan, Kredit Kas/Utang
+        entri1 = {
+            "No": nomor_terakhir + 1,
+            "Tanggal": tanggal,
+            "Akun Debit": "Persediaan Barang Dagang",
+            "Debit (Rp)": total_pembelian,
+            "Akun Kredit": "",
+            "Kredit (Rp)": 0
+        }
+        
+        entri2 = {
+            "No": nomor_terakhir + 2,
+            "Tanggal": tanggal,
+            "Akun Debit": "",
+            "Debit (Rp)": 0,
+            "Akun Kredit": "Kas",
+            "Kredit (Rp)": total_pembelian
+        }
+        
+        new_entries = pd.DataFrame([entri1, entri2])
+        st.session_state.df_jurnal_umum = pd.concat([
+            st.session_state.df_jurnal_umum,
+            new_entries
+        ], ignore_index=True)
+        
+        update_sistem_dengan_struktur_baru()
+        return True
+        
+    except Exception as e:
+        st.error(f"Error tambah pembelian ke jurnal: {str(e)}")
+        return False
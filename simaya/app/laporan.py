@@ -0,0 +1,159 @@
+"""
+Laporan keuangan (laba rugi, perubahan modal, posisi keuangan) dari buku
+besar sesi. Perhitungannya ada di simaya.laporan; modul ini hanya mengambil
+tabel dari session state, menyimpan hasil dan menampilkan pesannya. Hasil
+di-cache per versi jurnal dengan cache_laporan.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from simaya.laporan import (
+    buat_posisi_keuangan_kosong, hitung_laba_rugi, hitung_perubahan_modal, hitung_posisi_keuangan,
+    hitung_posisi_keuangan_seimbang, laba_rugi_kosong
+)
+from simaya.app.buku_besar import jurnal_sesi, update_buku_besar_per_akun_dengan_saldo_awal
+from simaya.app.penyimpanan import cache_laporan, tanda_sumber_buku_besar, versi_jurnal
+from simaya.app.utilitas import tampilkan_pesan
+
+
+@cache_laporan("perubahan_modal", ["modal_awal", "modal_akhir", "df_laporan_perubahan_modal"])
+def hitung_perubahan_modal_diperbaiki(laba_bersih):
+    """Menghitung perubahan modal dengan benar - VERSI DIPERBAIKI"""
+    try:
+        modal_awal, modal_akhir, df_perubahan_modal = hitung_perubahan_modal(
+            laba_bersih,
+            st.session_state.get("df_neraca_saldo_periode_sebelumnya"),
+            st.session_state.get("df_buku_besar"),
+            st.session_state.get("df_neraca_saldo"),
+        )
+        
+        # Simpan ke session state
+        st.session_state.modal_awal = modal_awal
+        st.session_state.modal_akhir = modal_akhir
+        st.session_state.df_laporan_perubahan_modal = df_perubahan_modal
+        
+        return df_perubahan_modal
+        
+    except Exception as e:
+        st.error(f"Error dalam hitung_perubahan_modal_diperbaiki: {str(e)}")
+        
+        # Return default values in case of error
+        perubahan_modal_data = [
+            {"Keterangan": "Modal Awal", "Nilai (Rp)": 0},
+            {"Keterangan": "Laba (Rugi) Bersih", "Nilai (Rp)": laba_bersih},
+            {"Keterangan": "**Modal Akhir**", "Nilai (Rp)": laba_bersih}
+        ]
+        return pd.DataFrame(perubahan_modal_data)
+
+
+@cache_laporan("posisi_keuangan_seimbang", ["df_laporan_posisi_keuangan"])
+def hitung_posisi_keuangan_selalu_seimbang():
+    """Menghitung laporan posisi keuangan yang selalu seimbang - VERSI OPTIMIZED"""
+    try:
+        buku_besar_per_akun = st.session_state.get("buku_besar_per_akun")
+        df_posisi_keuangan, pesan = hitung_posisi_keuangan_seimbang(
+            buku_besar_per_akun, st.session_state.get("modal_akhir", 0), st.session_state.get("laba_bersih", 0)
+        )
+        tampilkan_pesan(pesan)
+        if buku_besar_per_akun:
+            st.session_state.df_laporan_posisi_keuangan = df_posisi_keuangan
+        return df_posisi_keuangan
+        
+    except Exception as e:
+        st.error(f"Error dalam hitung_posisi_keuangan_selalu_seimbang: {str(e)}")
+        import traceback
+        st.error(f"Detail error: {traceback.format_exc()}")
+        return buat_posisi_keuangan_kosong()
+
+
+@cache_laporan("posisi_keuangan", ["df_laporan_posisi_keuangan"])
+def hitung_posisi_keuangan_diperbaiki():
+    """Menghitung laporan posisi keuangan (neraca) dengan validasi keseimbangan - VERSI DIPERBAIKI"""
+    try:
+        df_buku_besar = st.session_state.get("df_buku_besar")
+        df_posisi_keuangan, pesan = hitung_posisi_keuangan(
+            st.session_state.get("buku_besar_per_akun"), df_buku_besar,
+            st.session_state.get("modal_akhir", 0), st.session_state.get("laba_bersih", 0)
+        )
+        tampilkan_pesan(pesan)
+        if df_buku_besar is not None and not df_buku_besar.empty:
+            st.session_state.df_laporan_posisi_keuangan = df_posisi_keuangan
+        return df_posisi_keuangan
+        
+    except Exception as e:
+        st.error(f"Error dalam hitung_posisi_keuangan_diperbaiki: {str(e)}")
+        import traceback
+        st.error(f"Detail error: {traceback.format_exc()}")
+        return buat_posisi_keuangan_kosong()
+
+
+@cache_laporan("laba_rugi", ["total_pendapatan", "total_beban", "laba_bersih", "df_laporan_laba_rugi"])
+def hitung_laba_rugi_diperbaiki():
+    """Menghitung laba rugi dengan benar dan menyimpan hasilnya - VERSI DIPERBAIKI"""
+    try:
+        # Jurnal umum diambil dari format lama yang sudah ada di sesi
+        total_pendapatan, total_beban, laba_bersih, df_laba_rugi = hitung_laba_rugi(
+            jurnal_sesi(), st.session_state.get("df_jurnal_umum_old_format")
+        )
+        
+        # Simpan ke session state
+        st.session_state.total_pendapatan = total_pendapatan
+        st.session_state.total_beban = total_beban
+        st.session_state.laba_bersih = laba_bersih
+        st.session_state.df_laporan_laba_rugi = df_laba_rugi
+        
+        return total_pendapatan, total_beban, laba_bersih, df_laba_rugi
+        
+    except Exception as e:
+        st.error(f"Error dalam hitung_laba_rugi_diperbaiki: {str(e)}")
+        import traceback
+        st.error(f"Detail error: {traceback.format_exc()}")
+        return 0, 0, 0, laba_rugi_kosong()
+
+
+# Ganti fungsi yang lama dengan yang baru di aplikasi utama
+def update_semua_laporan_keuangan(paksa=False):
+    """
+    Memperbarui semua laporan keuangan secara berurutan - VERSI DIPERBAIKI
+    Jika jurnal dan saldo awal tidak berubah (versi_jurnal sama), buku besar
+    tidak dibangun ulang dan laporan diambil dari memo. paksa=True menghitung
+    ulang semuanya (tombol Perbarui Laporan).
+    """
+    try:
+        if paksa:
+            st.session_state.memo_laporan = {}
+        
+        with st.spinner("Memperbarui laporan keuangan..."):
+            # 1. Update buku besar dengan saldo awal (hanya jika sumbernya berubah)
+            kunci_buku_besar = (
+                versi_jurnal(), st.session_state.get("periode_sekarang"),
+                str(st.session_state.get("tanggal_awal_periode"))
+            )
+            if (
+                paksa
+                or st.session_state.get("kunci_buku_besar_laporan") != kunci_buku_besar
+                or st.session_state.get("tanda_buku_besar") != tanda_sumber_buku_besar()
+            ):
+                update_buku_besar_per_akun_dengan_saldo_awal()
+                st.session_state.kunci_buku_besar_laporan = kunci_buku_besar
+            
+            # 2. Hitung Laba Rugi
+            pendapatan, beban, laba_bersih, df_laba_rugi = hitung_laba_rugi_diperbaiki()
+            
+            # 3. Hitung Perubahan Modal
+            hitung_perubahan_modal_diperbaiki(laba_bersih)
+            
+            # 4. Hitung Posisi Keuangan (yang selalu seimbang)
+            hitung_posisi_keuangan_selalu_seimbang()
+            
+            # Simpan timestamp update
+            st.session_state.last_report_update = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            
+            return True
+            
+    except Exception as e:
+        st.error(f"Error dalam update_semua_laporan_keuangan: {str(e)}")
+        return False
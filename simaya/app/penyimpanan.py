@@ -0,0 +1,705 @@
+"""
+Penyimpanan dan status data sesi Streamlit.
+
+Backend penyimpanan (STORAGE) dan log jurnal (LOG) dibuka sekali per
+proses saat modul diimpor. Fungsi di sini membaca/menulis tabel di
+st.session_state: muat/simpan database, pencatatan event log, tanda
+perubahan tabel, dan kunci cache laporan per versi data.
+"""
+
+import functools
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from simaya.cache import CACHE, salin
+from simaya.dokumen import IndeksDokumen, lengkapi_id_dokumen
+from simaya.jurnal_log import (
+    TABEL_LOG, TABEL_TURUNAN, LogBerubah, buka_log, kunci_seq, path_log, putar_ulang, seq_kompaksi, seq_terakhir
+)
+from simaya.ledger import nomori_transaksi_baru
+from simaya.schema import terapkan_skema, terapkan_skema_tabel
+from simaya.storage import (
+    KOLOM_TABEL, PATH_EXCEL_DEFAULT, TABEL_DATABASE, buat_backend, hash_baris, migrasi_excel_ke_sqlite
+)
+
+
+# Backend penyimpanan (SQLite default, SIMAYA_STORAGE=excel untuk mode lama)
+STORAGE = buat_backend()
+
+# Log jurnal append-only di samping database; penyimpanan berperan sebagai snapshot
+LOG = buka_log(path_log(STORAGE.path))
+
+# key session_state -> nama tabel
+NAMA_TABEL = {session_key: nama for nama, session_key in TABEL_DATABASE.items()}
+
+
+def init_database():
+    """Inisialisasi penyimpanan data - SQLite default, workbook lama dimigrasi sekali"""
+    try:
+        if STORAGE.jenis == "sqlite" and not STORAGE.ada():
+            migrasi_excel_ke_sqlite(PATH_EXCEL_DEFAULT, STORAGE.path)
+        STORAGE.siapkan()
+    except Exception as e:
+        print(f"❌ Error dalam init_database: {str(e)}")
+
+
+# Tambahkan di bagian inisialisasi sistem (setelah init_database())
+def init_session_state_fixed():
+    """Inisialisasi session state dengan nilai default yang aman - VERSI DIPERBAIKI"""
+    try:
+        default_dataframes = {
+            "df_jurnal_umum": ["No", "Tanggal", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)", "ID Dokumen"],
+            "df_jurnal_penyesuaian": ["No", "Tanggal", "Keterangan", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)"],
+            "df_neraca_saldo_periode_sebelumnya": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+            "df_buku_besar": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"],
+            "df_neraca_saldo": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+            "df_jurnal_penutup": ["No", "Tanggal", "Keterangan", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)"],
+            "df_neraca_saldo_setelah_penutup": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+            "df_penjualan": ["No", "Tanggal", "Keterangan", "Barang", "Jumlah", "Harga Jual", "Total Penjualan", "HPP", "Total HPP", "ID Dokumen"],
+            "df_pembelian": ["No", "Tanggal", "Keterangan", "Barang", "Jumlah", "Harga Beli", "Total Pembelian", "ID Dokumen"],
+            "df_persediaan": ["Barang", "Stok Awal", "Nilai Awal", "Pembelian", "Penjualan", "Stok Akhir", "Harga Rata-rata", "Total Nilai"],
+            "df_riwayat_persediaan": ["Tanggal", "Jenis", "Barang", "Jumlah", "Harga", "Total", "Stok", "Keterangan", "ID Dokumen"],
+            "df_laporan_laba_rugi": ["Keterangan", "Nilai (Rp)"],
+            "df_laporan_perubahan_modal": ["Keterangan", "Nilai (Rp)"],
+            "df_laporan_posisi_keuangan": ["Keterangan", "Nilai (Rp)"]
+        }
+        
+        for df_key, columns in default_dataframes.items():
+            if df_key not in st.session_state:
+                st.session_state[df_key] = pd.DataFrame(columns=columns)
+        
+        # Inisialisasi counter transaksi
+        if "transaction_counter" not in st.session_state:
+            st.session_state.transaction_counter = 1
+        
+        # Inisialisasi buku besar per akun
+        if "buku_besar_per_akun" not in st.session_state:
+            st.session_state.buku_besar_per_akun = {}
+        
+        # INISIALISASI PENTING: Pastikan tanggal_awal_periode ada
+        if "tanggal_awal_periode" not in st.session_state:
+            from datetime import date
+            # Default: awal bulan ini
+            st.session_state.tanggal_awal_periode = date.today().replace(day=1)
+            print("✅ tanggal_awal_periode diinisialisasi:", st.session_state.tanggal_awal_periode)
+        
+        # INISIALISASI PENTING: Pastikan periode_sekarang ada
+        if "periode_sekarang" not in st.session_state:
+            from datetime import datetime
+            st.session_state.periode_sekarang = datetime.now().strftime("%B %Y")
+            print("✅ periode_sekarang diinisialisasi:", st.session_state.periode_sekarang)
+        
+        # Inisialisasi variabel laporan keuangan
+        if "total_pendapatan" not in st.session_state:
+            st.session_state.total_pendapatan = 0
+        if "total_beban" not in st.session_state:
+            st.session_state.total_beban = 0
+        if "laba_bersih" not in st.session_state:
+            st.session_state.laba_bersih = 0
+        if "modal_awal" not in st.session_state:
+            st.session_state.modal_awal = 0
+        if "modal_akhir" not in st.session_state:
+            st.session_state.modal_akhir = 0
+            
+        # INISIALISASI PENTING: Pastikan neraca saldo periode sebelumnya ada data contoh untuk testing
+        if "df_neraca_saldo_periode_sebelumnya" in st.session_state and st.session_state.df_neraca_saldo_periode_sebelumnya.empty:
+            # Data contoh untuk memulai sistem
+            contoh_data = [
+                {"No": 1, "Nama Akun": "Kas", "Debit (Rp)": 100000000, "Kredit (Rp)": 0},
+                {"No": 2, "Nama Akun": "Persediaan", "Debit (Rp)": 50000000, "Kredit (Rp)": 0},
+                {"No": 3, "Nama Akun": "Peralatan", "Debit (Rp)": 75000000, "Kredit (Rp)": 0},
+                {"No": 4, "Nama Akun": "Utang Usaha", "Debit (Rp)": 0, "Kredit (Rp)": 45000000},
+                {"No": 5, "Nama Akun": "Modal", "Debit (Rp)": 0, "Kredit (Rp)": 180000000},
+            ]
+            st.session_state.df_neraca_saldo_periode_sebelumnya = terapkan_skema(pd.DataFrame(contoh_data))
+            print("✅ Data contoh neraca saldo periode sebelumnya diinisialisasi")
+        
+        print("✅ Session state berhasil diinisialisasi dengan lengkap")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error dalam init_session_state_fixed: {str(e)}")
+        return False
+
+
+# Tabel kecil dibandingkan isinya (menangkap perubahan di tempat seperti .at[]),
+# tabel besar cukup dibandingkan objek dan ukurannya
+# ==================== PELACAK PERUBAHAN (DIRTY TRACKING) ====================
+
+BATAS_HASH_ISI = 2000
+
+
+def tanda_tabel(df):
+    """Tanda murah sebuah DataFrame untuk mendeteksi perubahan sejak terakhir disimpan"""
+    if df is None:
+        return None
+    if len(df) <= BATAS_HASH_ISI:
+        return (df.shape, tuple(df.columns), int(hash_baris(df).sum()))
+    return (id(df), df.shape, tuple(df.columns))
+
+
+def tandai_tersimpan(session_keys):
+    """Catat kondisi tabel yang baru saja disimpan/dimuat sebagai bersih"""
+    if "tanda_tersimpan" not in st.session_state:
+        st.session_state.tanda_tersimpan = {}
+    for key in session_keys:
+        st.session_state.tanda_tersimpan[key] = tanda_tabel(st.session_state.get(key))
+
+
+def tabel_kotor():
+    """Daftar nama tabel yang berubah sejak terakhir disimpan"""
+    tersimpan = st.session_state.get("tanda_tersimpan", {})
+    return [
+        nama for nama, session_key in TABEL_DATABASE.items()
+        if session_key not in tersimpan or tersimpan[session_key] != tanda_tabel(st.session_state.get(session_key))
+    ]
+
+
+# Tabel log yang berubah di luar event 'tambah' ditulis sebagai event 'ganti'
+# jika kecil; tabel yang lebih besar ditulis ke penyimpanan sebagai snapshot
+# ==================== LOG JURNAL (APPEND-ONLY) ====================
+
+BATAS_GANTI_LOG = 200
+
+# Penulisan event diulang paling banyak sekian kali jika sesi lain terus mendahului
+BATAS_PERCOBAAN_LOG = 3
+
+
+def tercatat(session_key, df):
+    """True jika df sama dengan kondisi tabel yang sudah tersimpan atau tercatat di log"""
+    return st.session_state.get("tanda_tersimpan", {}).get(session_key) == tanda_tabel(df)
+
+
+def seq_log_sesi():
+    """Nomor event log terakhir yang sudah termasuk dalam tabel sesi ini"""
+    return st.session_state.get("seq_log_sesi", 0)
+
+
+def catat_log_selesai(session_keys, seq):
+    """Tabel yang perubahannya sudah masuk log (sampai event seq) dianggap tersimpan; versi data ikut naik"""
+    tandai_tersimpan(session_keys)
+    st.session_state.seq_log_sesi = seq
+    versi_storage = (st.session_state.get("versi_data") or (None, 0))[0]
+    st.session_state.versi_data = (versi_storage, seq)
+
+
+def sinkron_log():
+    """
+    Gabungkan event log yang ditulis sesi lain atau layanan POS sejak tabel
+    sesi ini dimuat, agar penulisan berikutnya tidak menimpa transaksi mereka
+    dan nomor transaksi tidak bentrok. Jika event itu sudah dikompaksi ke
+    penyimpanan, data dimuat ulang (hanya bila tidak ada perubahan yang belum
+    tersimpan). Mengembalikan False jika sesi harus dimuat ulang pengguna.
+    """
+    seq_sesi = seq_log_sesi()
+    if seq_terakhir(LOG.path) <= seq_sesi:
+        return True
+    with LOG.kunci():
+        if seq_kompaksi(LOG.path) > seq_sesi:
+            kotor = tabel_kotor()
+            if kotor:
+                print(f"❌ Log jurnal sudah dikompaksi sesi lain, perubahan belum tersimpan: {', '.join(kotor)}")
+                return False
+            return load_from_database()
+        
+        tabel = {nama: st.session_state.get(TABEL_DATABASE[nama]) for nama in TABEL_LOG}
+        sudah_tercatat = [TABEL_DATABASE[nama] for nama in TABEL_LOG if tercatat(TABEL_DATABASE[nama], tabel[nama])]
+        meta = {kunci_seq(nama): seq_sesi for nama in TABEL_LOG + TABEL_TURUNAN}
+        diterapkan, _, seq = putar_ulang(tabel, LOG, meta)
+    
+    for nama in diterapkan:
+        st.session_state[TABEL_DATABASE[nama]] = terapkan_skema(tabel[nama])
+    # Tabel yang sebelumnya bersih tetap bersih; perubahan sesi ini yang belum tercatat tetap kotor
+    tandai_tersimpan([key for key in sudah_tercatat if NAMA_TABEL[key] in diterapkan])
+    st.session_state.seq_log_sesi = seq
+    versi_storage = (st.session_state.get("versi_data") or (None, 0))[0]
+    st.session_state.versi_data = (versi_storage, seq)
+    
+    if "jurnal_umum" in diterapkan:
+        st.session_state.buku_besar_perlu_dibangun = True
+        nomor_transaksi_berikutnya(sinkron=False)
+    if {"riwayat_persediaan", "persediaan"} & set(diterapkan):
+        st.session_state.pop("mesin_persediaan", None)
+    if diterapkan:
+        print(f"🔄 Event log dari sesi lain digabung: {diterapkan}")
+    return True
+
+
+def nomor_transaksi_berikutnya(sinkron=True):
+    """
+    Nomor transaksi jurnal umum berikutnya (transaction_counter). Event log
+    dari sesi lain / layanan POS digabung dulu sehingga nomor tidak bentrok.
+    """
+    if sinkron:
+        sinkron_log()
+    df = st.session_state.get("df_jurnal_umum")
+    no = None if df is None or df.empty else pd.to_numeric(df["No"], errors="coerce").max()
+    berikutnya = 1 if no is None or pd.isna(no) else int(no) + 1
+    st.session_state.transaction_counter = max(st.session_state.get("transaction_counter", 1), berikutnya)
+    return st.session_state.transaction_counter
+
+
+def tambah_baris(session_key, df_baris, catat_log=True):
+    """
+    Tambahkan baris di akhir tabel session state. Untuk tabel yang dicatat log
+    (TABEL_LOG), penambahan ditulis sebagai satu event 'tambah' (append + fsync)
+    sehingga tabel tidak perlu ditulis ulang ke penyimpanan. Event sesi lain
+    digabung dulu; baris jurnal yang No-nya sudah terpakai dinomori ulang.
+    catat_log=False: tabel dibiarkan kotor (mis. impor massal yang langsung
+    disimpan sebagai snapshot lengkap alih-alih satu event log raksasa).
+    """
+    nama = NAMA_TABEL.get(session_key)
+    df_baris = terapkan_skema(df_baris)
+    for _ in range(BATAS_PERCOBAAN_LOG):
+        if nama in TABEL_LOG:
+            sinkron_log()
+        df_lama = st.session_state.get(session_key)
+        if nama == "jurnal_umum":
+            df_baris = nomori_transaksi_baru(df_lama, df_baris)
+        # Skema diterapkan ulang pada hasil gabungan: murah jika tipe sudah benar,
+        # dan memperbaiki kolom dari tabel kosong yang belum bertipe
+        df_baru = df_baris if df_lama is None else terapkan_skema(pd.concat([df_lama, df_baris], ignore_index=True))
+        if nama not in TABEL_LOG or not catat_log or df_lama is None or not tercatat(session_key, df_lama):
+            seq = None
+            break
+        try:
+            seq = LOG.tambah(nama, df_baru.iloc[len(df_lama):], sesudah=seq_log_sesi())
+            break
+        except LogBerubah:
+            # Sesi lain menulis tepat sebelum ini: gabungkan lalu ulangi
+            seq = None
+            continue
+        except Exception as e:
+            # Tabel tetap kotor sehingga flush_auto_save() menulisnya ke penyimpanan
+            print(f"❌ Gagal menulis log jurnal: {str(e)}")
+            seq = None
+            break
+    
+    st.session_state[session_key] = df_baru
+    indeks = st.session_state.get("indeks_dokumen")
+    if indeks is not None and session_key in TABEL_DOKUMEN:
+        indeks.tambah(session_key, df_baris, tanda_tabel(df_lama), tanda_tabel(df_baru))
+    if seq is not None:
+        catat_log_selesai([session_key], seq)
+    return df_baru
+
+
+def turunan_tercatat():
+    """True jika buku besar & neraca saldo sama dengan yang tersimpan/tercatat"""
+    return all(
+        tercatat(TABEL_DATABASE[nama], st.session_state.get(TABEL_DATABASE[nama])) for nama in TABEL_TURUNAN
+    )
+
+
+def tandai_turunan_tercatat(sebelumnya_tercatat):
+    """
+    Setelah event jurnal umum masuk log, buku besar & neraca saldo tidak perlu
+    ditulis: saat startup keduanya dibangun ulang dari snapshot + log.
+    """
+    if (
+        sebelumnya_tercatat
+        and tercatat("df_jurnal_umum", st.session_state.get("df_jurnal_umum"))
+        and st.session_state.get("tanda_buku_besar") == tanda_sumber_buku_besar()
+    ):
+        tandai_tersimpan([TABEL_DATABASE[nama] for nama in TABEL_TURUNAN])
+
+
+def kompaksi_log():
+    """Tulis snapshot semua tabel ke penyimpanan lalu buang event yang sudah termasuk"""
+    return save_to_database()
+
+
+# Tabel masukan perhitungan. Selama semuanya sama dengan versi tersimpan,
+# buku besar dan laporan sesi ini identik dengan sesi lain pada versi yang sama
+# ==================== CACHE LINTAS SESI ====================
+
+TABEL_SUMBER_CACHE = [
+    "df_jurnal_umum", "df_jurnal_penyesuaian", "df_jurnal_penutup",
+    "df_neraca_saldo_periode_sebelumnya", "df_penjualan", "df_pembelian", "df_persediaan"
+]
+
+
+def versi_sesi():
+    """Versi data yang dipegang sesi ini, atau None jika ada perubahan yang belum tersimpan"""
+    versi = st.session_state.get("versi_data")
+    if versi is None or st.session_state.get("simpan_tertunda"):
+        return None
+    tersimpan = st.session_state.get("tanda_tersimpan", {})
+    for key in TABEL_SUMBER_CACHE:
+        if tersimpan.get(key) != tanda_tabel(st.session_state.get(key)):
+            return None
+    return versi
+
+
+def kunci_cache(nama, *args):
+    """Kunci CACHE untuk hasil perhitungan sesi ini (None = jangan pakai cache)"""
+    versi = versi_sesi()
+    if versi is None:
+        return None
+    # df_jurnal_umum_old_format tidak disimpan ke database tetapi dipakai laba rugi
+    old_format = st.session_state.get("df_jurnal_umum_old_format")
+    kunci = (
+        STORAGE.path, versi, nama,
+        st.session_state.get("periode_sekarang"), str(st.session_state.get("tanggal_awal_periode")),
+        0 if old_format is None else len(old_format)
+    ) + args
+    try:
+        hash(kunci)
+    except TypeError:
+        return None
+    return kunci
+
+
+# Sumber semua laporan: empat jurnal (termasuk format lama) dan saldo awal
+TABEL_SUMBER_LAPORAN = [
+    "df_jurnal_umum", "df_jurnal_umum_old_format", "df_jurnal_penyesuaian", "df_jurnal_penutup",
+    "df_neraca_saldo_periode_sebelumnya"
+]
+
+
+def versi_jurnal():
+    """
+    Nomor versi jurnal sesi ini; naik satu setiap kali salah satu tabel
+    sumber laporan berubah (tidak pernah turun).
+    """
+    tanda = tuple(tanda_tabel(st.session_state.get(key)) for key in TABEL_SUMBER_LAPORAN)
+    if st.session_state.get("tanda_versi_jurnal") != tanda:
+        st.session_state.tanda_versi_jurnal = tanda
+        st.session_state.versi_jurnal = st.session_state.get("versi_jurnal", 0) + 1
+    return st.session_state.versi_jurnal
+
+
+def catat_status_laporan(nama, waktu, sumber):
+    """sumber: None (dihitung ulang), 'sesi' (memo sesi ini) atau 'bersama' (CACHE lintas sesi)"""
+    if "status_laporan" not in st.session_state:
+        st.session_state.status_laporan = {}
+    st.session_state.status_laporan[nama] = {"waktu": waktu, "sumber": sumber, "versi": versi_jurnal()}
+
+
+def cache_laporan(nama, kunci_state=()):
+    """
+    Dekorator dua lapis untuk fungsi laporan:
+    1. memo per sesi, dikunci versi_jurnal() - berpindah halaman laporan tanpa
+       perubahan jurnal tidak menghitung ulang apa pun;
+    2. CACHE lintas sesi untuk periode dan versi data tersimpan yang sama.
+    Nilai session_state yang diisi fungsi (kunci_state) ikut disimpan dan
+    dipulihkan saat cache hit.
+    """
+    def dekorator(fungsi):
+        @functools.wraps(fungsi)
+        def pembungkus(*args):
+            kunci_memo = (
+                versi_jurnal(), st.session_state.get("periode_sekarang"),
+                str(st.session_state.get("tanggal_awal_periode"))
+            ) + args
+            try:
+                hash(kunci_memo)
+            except TypeError:
+                return fungsi(*args)
+            
+            if "memo_laporan" not in st.session_state:
+                st.session_state.memo_laporan = {}
+            entri = st.session_state.memo_laporan.get(nama)
+            if entri is not None and entri["kunci"] == kunci_memo:
+                for k, v in entri["state"].items():
+                    st.session_state[k] = salin(v)
+                catat_status_laporan(nama, entri["waktu"], "sesi")
+                return salin(entri["hasil"])
+            
+            def hitung():
+                hasil = fungsi(*args)
+                return hasil, {k: st.session_state.get(k) for k in kunci_state}
+            
+            kunci = kunci_cache(nama, *args)
+            if kunci is None:
+                (hasil, state), dari_cache = hitung(), False
+            else:
+                (hasil, state), dari_cache = CACHE.ambil_atau_hitung(kunci, hitung)
+                for k, v in state.items():
+                    st.session_state[k] = v
+            
+            waktu = datetime.now()
+            st.session_state.memo_laporan[nama] = {
+                "kunci": kunci_memo, "hasil": salin(hasil), "state": salin(state), "waktu": waktu
+            }
+            catat_status_laporan(nama, waktu, "bersama" if dari_cache else None)
+            return hasil
+        return pembungkus
+    return dekorator
+
+
+def load_from_database():
+    """Load semua data dari penyimpanan (SQLite default) - VERSI DIPERBAIKI"""
+    try:
+        if not STORAGE.ada():
+            print("❌ Database file not found")
+            return False
+        
+        # Satu kali buka database, semua tabel dibaca sekaligus. Hasil parse
+        # dibagi lintas sesi selama versi data belum berubah
+        mulai = time.perf_counter()
+        # Snapshot dan log dibaca tanpa diselingi kompaksi penulis lain
+        with LOG.kunci():
+            versi = STORAGE.versi()
+            (semua_tabel, waktu_tabel), dari_cache = CACHE.ambil_atau_hitung(
+                (STORAGE.path, versi, "tabel"),
+                lambda: (terapkan_skema_tabel(STORAGE.muat_semua(list(TABEL_DATABASE))), dict(STORAGE.waktu_muat))
+            )
+            
+            # Putar ulang event log yang belum termasuk snapshot
+            diterapkan, perlu_bangun_ulang, seq = putar_ulang(semua_tabel, LOG, STORAGE.muat_meta())
+        if diterapkan:
+            print(f"✅ Replay log jurnal: {diterapkan}")
+            for nama_tabel in diterapkan:
+                semua_tabel[nama_tabel] = terapkan_skema(semua_tabel[nama_tabel])
+        st.session_state.buku_besar_perlu_dibangun = perlu_bangun_ulang
+        
+        loaded_count = 0
+        for nama_tabel, session_key in TABEL_DATABASE.items():
+            df = semua_tabel.get(nama_tabel)
+            if df is not None and not df.empty:
+                st.session_state[session_key] = df
+                loaded_count += 1
+                print(f"✅ Loaded {len(df)} rows from {nama_tabel} ({waktu_tabel.get(nama_tabel, 0) * 1000:.1f} ms)")
+            else:
+                # Tabel kosong: tetap pertahankan struktur kolomnya
+                kolom = list(df.columns) if df is not None and len(df.columns) else KOLOM_TABEL[nama_tabel]
+                st.session_state[session_key] = terapkan_skema(pd.DataFrame(columns=kolom))
+        
+        tandai_tersimpan(TABEL_DATABASE.values())
+        st.session_state.seq_log_sesi = seq
+        st.session_state.versi_data = (versi, seq)
+        
+        # Transaksi jurnal lama tanpa ID dokumen diberi ID sekali di sini (diturunkan
+        # dari isinya, sama di setiap sesi) agar hapus tidak perlu mencocokkan nominal.
+        # Jurnal menjadi kotor sehingga ID-nya ikut tersimpan
+        jurnal = st.session_state.df_jurnal_umum
+        jurnal_lengkap = lengkapi_id_dokumen(jurnal, dari_isi=True)
+        if jurnal_lengkap is not jurnal:
+            st.session_state.df_jurnal_umum = terapkan_skema(jurnal_lengkap)
+            auto_save()
+            print("✅ ID Dokumen dilengkapi untuk transaksi jurnal lama")
+        st.session_state.waktu_muat = {
+            "tabel": dict(waktu_tabel),
+            "total": time.perf_counter() - mulai,
+            "waktu": datetime.now(),
+            "dari_cache": dari_cache,
+        }
+        print(f"✅ Successfully loaded {loaded_count} tables from {STORAGE.jenis} database "
+              f"in {st.session_state.waktu_muat['total']:.3f}s{' (cache)' if dari_cache else ''}")
+        return True
+    except Exception as e:
+        print(f"❌ Error in load_from_database: {str(e)}")
+        return False
+
+
+def muat_database_sekali():
+    """Muat database tepat satu kali per sesi; load berikutnya hanya lewat tombol Load Ulang"""
+    if st.session_state.get("database_dimuat"):
+        return False
+    st.session_state.database_dimuat = True
+    return load_from_database()
+
+
+# Inisialisasi session state untuk data yang belum ada
+default_dataframes = {
+    "df_jurnal_umum": ["No", "Tanggal", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)", "ID Dokumen"],
+    "df_jurnal_penyesuaian": ["No", "Tanggal", "Keterangan", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)"],
+    "df_neraca_saldo_periode_sebelumnya": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+    "df_buku_besar": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"],
+    "df_neraca_saldo": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+    "df_jurnal_penutup": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+    "df_neraca_saldo_setelah_penutup": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+    "df_jurnal_umum_old_format": ["Tanggal", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+    "df_semua_transaksi": ["Tanggal", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"]
+}
+
+
+def save_to_database(nama_tabel=None):
+    """
+    Simpan data ke penyimpanan - SQLite hanya menulis baris yang berubah.
+    nama_tabel: daftar tabel yang disimpan (default semua tabel).
+    Event log sesi lain digabung dulu; jika tidak bisa (sudah dikompaksi dan
+    sesi ini punya perubahan belum tersimpan) penyimpanan ditolak.
+    """
+    try:
+        with LOG.kunci():
+            if not sinkron_log():
+                pesan = "Data sudah diubah sesi lain sejak dimuat. Muat ulang data sebelum menyimpan."
+                print(f"❌ {pesan}")
+                st.error(pesan)
+                return False
+            
+            tabel = {}
+            for nama, session_key in TABEL_DATABASE.items():
+                if nama_tabel is not None and nama not in nama_tabel:
+                    continue
+                df = st.session_state.get(session_key)
+                if df is None or len(df.columns) == 0:
+                    df = pd.DataFrame(columns=KOLOM_TABEL[nama])
+                tabel[nama] = df
+            
+            # Setiap tabel yang ditulis mencatat event log terakhir yang sudah termasuk di sesi ini
+            seq_log = seq_log_sesi()
+            ditulis = STORAGE.simpan(tabel, meta={kunci_seq(nama): seq_log for nama in tabel})
+            tandai_tersimpan([TABEL_DATABASE[nama] for nama in tabel])
+            if nama_tabel is None:
+                # Snapshot lengkap = kompaksi: event sampai seq_log tidak diperlukan lagi
+                LOG.kosongkan(sampai=seq_log)
+            versi = STORAGE.versi()
+        
+        # Versi baru: cache lintas sesi untuk versi lama tidak dipakai lagi
+        st.session_state.versi_data = (versi, seq_log)
+        CACHE.invalidasi(STORAGE.path, st.session_state.versi_data)
+        if nama_tabel is None:
+            st.session_state.simpan_tertunda = False
+        
+        detail = ", ".join(f"{nama}: {jumlah}" for nama, jumlah in ditulis.items() if jumlah)
+        print(f"✅ Data tersimpan ({STORAGE.jenis}), {len(tabel)} tabel, baris ditulis: {sum(ditulis.values())} {detail}")
+        return True
+    except Exception as e:
+        print(f"❌ Error saving to database: {str(e)}")
+        st.error(f"Gagal menyimpan ke database: {str(e)}")
+        return False
+
+
+# Tabel yang barisnya ditautkan ke transaksi jurnal lewat kolom "ID Dokumen"
+# ==================== ID DOKUMEN SUMBER ====================
+
+TABEL_DOKUMEN = ("df_jurnal_umum", "df_penjualan", "df_pembelian", "df_riwayat_persediaan")
+
+
+def indeks_dokumen():
+    """
+    Indeks No -> ID dokumen -> posisi baris sesi ini. tambah_baris(),
+    hapus_transaksi_banyak() dan hapus_catatan_dokumen() memperbarui indeks di
+    tempat; tabel yang berubah dengan cara lain (load data, hapus data lama
+    tanpa ID) diindeks ulang sekali di sini.
+    """
+    indeks = st.session_state.get("indeks_dokumen")
+    if indeks is None:
+        indeks = IndeksDokumen("df_jurnal_umum")
+        st.session_state.indeks_dokumen = indeks
+    for key in TABEL_DOKUMEN:
+        df = st.session_state.get(key)
+        indeks.sinkron(key, df, tanda_tabel(df))
+    return indeks
+
+
+def tanda_sumber_buku_besar():
+    """Tanda (objek, jumlah baris) dari tabel sumber buku besar untuk deteksi perubahan di luar posting"""
+    tanda = []
+    for kunci in ("df_neraca_saldo_periode_sebelumnya", "df_jurnal_umum", "df_jurnal_penyesuaian", "df_jurnal_penutup"):
+        df = st.session_state.get(kunci)
+        tanda.append((id(df), 0 if df is None else len(df)))
+    return tuple(tanda)
+
+
+# ==================== FUNGSI INITIALIZATION DAN CLEANUP ====================
+
+def initialize_fixed_session_state():
+    """Inisialisasi session state dengan nilai default yang aman - VERSI DIPERBAIKI"""
+    default_dataframes = {
+        "df_jurnal_umum": ["No", "Tanggal", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)", "ID Dokumen"],
+        "df_jurnal_penyesuaian": ["No", "Tanggal", "Keterangan", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)"],
+        "df_neraca_saldo_periode_sebelumnya": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+        "df_buku_besar": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"],
+        "df_neraca_saldo": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+        "df_jurnal_penutup": ["No", "Tanggal", "Keterangan", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)"],
+        "df_neraca_saldo_setelah_penutup": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+        "df_penjualan": ["No", "Tanggal", "Keterangan", "Barang", "Jumlah", "Harga Jual", "Total Penjualan", "HPP", "Total HPP", "ID Dokumen"],
+        "df_pembelian": ["No", "Tanggal", "Keterangan", "Barang", "Jumlah", "Harga Beli", "Total Pembelian", "ID Dokumen"],
+        "df_persediaan": ["Barang", "Stok Awal", "Nilai Awal", "Pembelian", "Penjualan", "Stok Akhir", "Harga Rata-rata", "Total Nilai"],
+        "df_riwayat_persediaan": ["Tanggal", "Jenis", "Barang", "Jumlah", "Harga", "Total", "Stok", "Keterangan", "ID Dokumen"]
+    }
+    
+    for df_key, columns in default_dataframes.items():
+        if df_key not in st.session_state:
+            st.session_state[df_key] = pd.DataFrame(columns=columns)
+    
+    # Inisialisasi counter transaksi
+    if "transaction_counter" not in st.session_state:
+        st.session_state.transaction_counter = 1
+    
+    # Inisialisasi buku besar per akun
+    if "buku_besar_per_akun" not in st.session_state:
+        st.session_state.buku_besar_per_akun = {}
+
+
+def cleanup_numeric_data():
+    """Membersihkan data numerik di semua session state - VERSI DIPERBAIKI"""
+    try:
+        numeric_dataframes = [
+            "df_jurnal_umum", "df_jurnal_penyesuaian", "df_buku_besar", 
+            "df_neraca_saldo", "df_neraca_saldo_setelah_penutup"
+        ]
+        
+        for df_key in numeric_dataframes:
+            if df_key in st.session_state and not st.session_state[df_key].empty:
+                st.session_state[df_key] = terapkan_skema(st.session_state[df_key])
+                
+        return True
+    except Exception as e:
+        print(f"Error dalam cleanup_numeric_data: {e}")
+        return False
+
+
+def auto_save():
+    """
+    Minta penyimpanan setelah perubahan penting. Penulisan ditunda dan semua
+    permintaan dalam satu run Streamlit digabung menjadi satu flush_auto_save().
+    """
+    st.session_state.simpan_tertunda = True
+    return True
+
+
+def flush_auto_save():
+    """Tulis hanya tabel yang berubah jika ada permintaan auto_save() yang tertunda"""
+    if not st.session_state.get("simpan_tertunda"):
+        return True
+    try:
+        # Event sesi lain / layanan POS digabung sebelum tabel kotor ditulis
+        sinkron_log()
+        kotor = tabel_kotor()
+        
+        if kotor:
+            # Tegakkan skema tipe hanya untuk tabel kotor (tabel yang tipenya
+            # sudah benar dikembalikan apa adanya tanpa salinan). Koersi membuat
+            # objek DataFrame baru tetapi isinya sama, jadi status sinkron buku
+            # besar (posting inkremental) dipertahankan
+            buku_besar_sinkron = st.session_state.get("tanda_buku_besar") == tanda_sumber_buku_besar()
+            
+            for nama in kotor:
+                df_key = TABEL_DATABASE[nama]
+                if df_key in st.session_state:
+                    st.session_state[df_key] = terapkan_skema(st.session_state[df_key])
+            
+            if buku_besar_sinkron:
+                st.session_state.tanda_buku_besar = tanda_sumber_buku_besar()
+            
+            # Tabel log kecil yang berubah di luar tambah_baris(): satu event 'ganti'
+            for nama in [n for n in kotor if n in TABEL_LOG]:
+                df = st.session_state.get(TABEL_DATABASE[nama])
+                if df is not None and len(df) <= BATAS_GANTI_LOG:
+                    try:
+                        seq = LOG.ganti(nama, df, sesudah=seq_log_sesi())
+                    except LogBerubah:
+                        # Sesi lain menulis tepat sebelum ini: ditulis lewat save_to_database() yang menggabung dulu
+                        continue
+                    catat_log_selesai([TABEL_DATABASE[nama]], seq)
+                    kotor.remove(nama)
+            
+            if kotor:
+                save_to_database(kotor)
+        
+        if LOG.perlu_kompaksi():
+            kompaksi_log()
+        
+        st.session_state.simpan_tertunda = False
+        return True
+    except Exception as e:
+        print(f"❌ Auto-save failed: {str(e)}")
+        return False
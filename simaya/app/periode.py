@@ -0,0 +1,220 @@
+"""
+Periode akuntansi di session state: riwayat neraca saldo per periode, ganti
+periode dan penutupan periode. Perhitungannya ada di simaya.periode.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from simaya.buku import Buku
+from simaya.periode import baca_riwayat_periode, catat_riwayat_periode, neraca_akun_riil, tutup_periode
+from simaya.schema import terapkan_skema
+from simaya.app.buku_besar import update_buku_besar_per_akun
+from simaya.app.penyimpanan import STORAGE, auto_save
+
+
+def simpan_ke_riwayat_periode(periode, data_neraca_setelah_penutup):
+    """Menyimpan neraca saldo setelah penutup ke riwayat periode - VERSI DIPERBAIKI"""
+    try:
+        df_riwayat = catat_riwayat_periode(STORAGE.muat_tabel("riwayat_periode"), periode, data_neraca_setelah_penutup)
+        STORAGE.simpan_tabel("riwayat_periode", df_riwayat)
+        
+        print(f"✅ Data periode {periode} berhasil disimpan ke riwayat")
+        return True
+    except Exception as e:
+        print(f"❌ Error menyimpan riwayat periode: {str(e)}")
+        return False
+
+
+def muat_dari_riwayat_periode(periode):
+    """Memuat neraca saldo setelah penutup dari riwayat periode"""
+    try:
+        data_neraca = baca_riwayat_periode(STORAGE.muat_tabel("riwayat_periode"), periode)
+        if not data_neraca.empty:
+            print(f"✅ Data periode {periode} berhasil dimuat dari riwayat")
+        return data_neraca
+    except Exception as e:
+        print(f"❌ Error memuat riwayat periode: {str(e)}")
+    
+    return pd.DataFrame()
+
+
+def load_data_periode(periode):
+    """Memuat data untuk periode tertentu"""
+    try:
+        # Load neraca saldo sebelumnya dari riwayat
+        neraca_sebelumnya = muat_dari_riwayat_periode(periode)
+        
+        if not neraca_sebelumnya.empty:
+            st.session_state.df_neraca_saldo_periode_sebelumnya = neraca_sebelumnya
+        else:
+            # Jika tidak ada data, buat neraca kosong
+            st.session_state.df_neraca_saldo_periode_sebelumnya = pd.DataFrame(
+                columns=["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"]
+            )
+        
+        # Reset data transaksi untuk periode baru
+        st.session_state.df_jurnal_umum = pd.DataFrame(
+            columns=["No", "Tanggal", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)", "ID Dokumen"]
+        )
+        st.session_state.df_jurnal_penyesuaian = pd.DataFrame(
+            columns=["No", "Tanggal", "Keterangan", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)"]
+        )
+        st.session_state.df_jurnal_penutup = pd.DataFrame(
+            columns=["No", "Tanggal", "Keterangan", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)"]
+        )
+        
+        # Reset buku besar dan neraca saldo
+        st.session_state.df_buku_besar = pd.DataFrame(columns=["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"])
+        st.session_state.df_neraca_saldo = pd.DataFrame(columns=["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"])
+        st.session_state.df_neraca_saldo_setelah_penutup = pd.DataFrame(columns=["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"])
+        
+        print(f"✅ Data periode {periode} berhasil dimuat")
+        return True
+    except Exception as e:
+        print(f"❌ Error load data periode: {str(e)}")
+        return False
+
+
+def reset_data_periode_baru():
+    """Reset semua data transaksi untuk periode baru, tetapi pertahankan neraca saldo periode sebelumnya"""
+    try:
+        # Reset data transaksi periode berjalan
+        st.session_state.df_jurnal_umum = pd.DataFrame(
+            columns=["No", "Tanggal", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)", "ID Dokumen"]
+        )
+        st.session_state.df_jurnal_penyesuaian = pd.DataFrame(
+            columns=["No", "Tanggal", "Keterangan", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)"]
+        )
+        st.session_state.df_jurnal_penutup = pd.DataFrame(
+            columns=["No", "Tanggal", "Keterangan", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)"]
+        )
+        
+        # Reset buku besar dan neraca saldo periode berjalan
+        st.session_state.df_buku_besar = pd.DataFrame(columns=["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"])
+        st.session_state.df_neraca_saldo = pd.DataFrame(columns=["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"])
+        
+        # Reset transaction counter untuk periode baru
+        st.session_state.transaction_counter = 1
+        
+        # Reset buku besar per akun
+        st.session_state.buku_besar_per_akun = {}
+        
+        # Reset laporan keuangan periode berjalan
+        st.session_state.df_laporan_laba_rugi = pd.DataFrame()
+        st.session_state.df_laporan_perubahan_modal = pd.DataFrame()
+        st.session_state.df_laporan_posisi_keuangan = pd.DataFrame()
+        
+        print("✅ Data transaksi berhasil direset untuk periode baru")
+        return True
+    except Exception as e:
+        print(f"❌ Error reset data periode: {str(e)}")
+        return False
+
+
+def init_sistem_periode():
+    """Inisialisasi sistem periode dengan data contoh"""
+    # Pastikan neraca saldo periode sebelumnya ada data
+    if st.session_state.df_neraca_saldo_periode_sebelumnya.empty:
+        # Data contoh untuk periode pertama
+        contoh_data = [
+            {"No": 1, "Nama Akun": "Kas", "Debit (Rp)": 100000000, "Kredit (Rp)": 0},
+            {"No": 2, "Nama Akun": "Persediaan", "Debit (Rp)": 50000000, "Kredit (Rp)": 0},
+            {"No": 3, "Nama Akun": "Peralatan", "Debit (Rp)": 75000000, "Kredit (Rp)": 0},
+            {"No": 4, "Nama Akun": "Utang Usaha", "Debit (Rp)": 0, "Kredit (Rp)": 45000000},
+            {"No": 5, "Nama Akun": "Modal", "Debit (Rp)": 0, "Kredit (Rp)": 180000000},
+        ]
+        st.session_state.df_neraca_saldo_periode_sebelumnya = terapkan_skema(pd.DataFrame(contoh_data))
+        print("✅ Data contoh neraca saldo periode sebelumnya berhasil diinisialisasi")
+
+
+def update_setelah_penutupan():
+    """Memproses data setelah penutupan periode"""
+    try:
+        # Update buku besar dengan semua transaksi termasuk penutupan
+        update_buku_besar_per_akun()
+        
+        # Buat neraca saldo setelah penutup (hanya akun riil)
+        if "buku_besar_per_akun" in st.session_state and st.session_state.buku_besar_per_akun:
+            neraca_saldo = neraca_akun_riil(st.session_state.buku_besar_per_akun)
+            if neraca_saldo is not None:
+                st.session_state.df_neraca_saldo_setelah_penutup = neraca_saldo
+            
+            auto_save()
+            return True
+        
+        return False
+        
+    except Exception as e:
+        st.error(f"Error dalam update_setelah_penutupan: {str(e)}")
+        return False
+
+
+def akhiri_periode():
+    """Mengakhiri periode saat ini dan mempersiapkan periode baru (simaya.periode.tutup_periode)"""
+    try:
+        hasil = tutup_periode(Buku.dari_session(st.session_state))
+        
+        # Simpan neraca saldo setelah penutup sebagai periode sebelumnya
+        neraca = hasil["neraca_setelah_penutup"]
+        if not neraca.empty:
+            st.session_state.df_neraca_saldo_setelah_penutup = neraca
+            simpan_ke_riwayat_periode(hasil["periode"], neraca)
+            st.session_state.df_neraca_saldo_periode_sebelumnya = neraca.copy()
+            st.success(f"✅ Neraca saldo periode {hasil['periode']} berhasil disimpan")
+        
+        # Update periode dan reset data
+        periode_baru = hasil["periode_baru"]
+        st.session_state.periode_sekarang = periode_baru
+        reset_data_periode_baru()
+        st.session_state.tanggal_awal_periode = hasil["tanggal_awal_periode"]
+        
+        # Tambah ke daftar periode jika belum ada
+        if periode_baru not in st.session_state.daftar_periode:
+            st.session_state.daftar_periode.append(periode_baru)
+        
+        auto_save()
+        st.success(f"✅ Periode berhasil diakhiri. Periode baru: {periode_baru}")
+        return True
+    
+    except ValueError as e:
+        st.error(str(e))
+        return False
+    except Exception as e:
+        st.error(f"Error mengakhiri periode: {str(e)}")
+        return False
+
+
+def update_periode_semua_halaman():
+    """Update periode di semua halaman berdasarkan periode aktif"""
+    st.session_state.periode_display = st.session_state.periode_sekarang
+
+
+def ganti_periode(periode_baru):
+    """Mengganti periode saat ini dengan reset data transaksi - VERSI DIPERBAIKI"""
+    try:
+        # Simpan data periode sebelumnya (neraca saldo setelah penutup)
+        if "df_neraca_saldo_setelah_penutup" in st.session_state and not st.session_state.df_neraca_saldo_setelah_penutup.empty:
+            simpan_ke_riwayat_periode(st.session_state.periode_sekarang, st.session_state.df_neraca_saldo_setelah_penutup)
+            
+            # Set sebagai neraca saldo periode sebelumnya untuk periode baru
+            st.session_state.df_neraca_saldo_periode_sebelumnya = st.session_state.df_neraca_saldo_setelah_penutup.copy()
+        
+        # Update periode
+        st.session_state.periode_sekarang = periode_baru
+        
+        # Reset semua data transaksi untuk periode baru
+        reset_data_periode_baru()
+        
+        # Load data untuk periode baru (jika ada)
+        load_data_periode(periode_baru)
+        
+        # Tambah ke daftar periode jika belum ada
+        if periode_baru not in st.session_state.daftar_periode:
+            st.session_state.daftar_periode.append(periode_baru)
+        
+        print(f"✅ Berhasil ganti ke periode: {periode_baru}")
+        return True
+    except Exception as e:
+        print(f"❌ Error ganti periode: {str(e)}")
+        return False
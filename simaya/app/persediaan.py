@@ -0,0 +1,199 @@
+"""
+Persediaan barang dagang di session state (kartu stok, sinkronisasi
+ringkasan dengan riwayat pergerakan) di atas simaya.inventory.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from simaya.inventory import bangun_dari_riwayat, barang_persediaan, hitung_ulang_ringkasan, saldo_awal_persediaan
+from simaya.schema import terapkan_skema
+from simaya.app.penyimpanan import auto_save, tambah_baris, tanda_tabel
+
+
+# ==================== MESIN PERSEDIAAN ====================
+
+def tanda_persediaan():
+    """Tanda sumber mesin persediaan: metode + isi riwayat persediaan + stok awal"""
+    return (
+        st.session_state.get("metode_persediaan", "Average"),
+        tanda_tabel(st.session_state.get("df_riwayat_persediaan")),
+        tuple(saldo_awal_persediaan(st.session_state.get("df_persediaan")).items())
+    )
+
+
+def daftar_barang():
+    """Barang di df_persediaan (urutan tabel), atau daftar default jika tabel masih kosong"""
+    return barang_persediaan(st.session_state.get("df_persediaan"))
+
+
+def mesin_persediaan():
+    """
+    Mesin persediaan sesi ini (stok, HPP dan kartu stok semua barang).
+    Dibangun ulang dari stok awal df_persediaan + df_riwayat_persediaan hanya
+    jika riwayat, stok awal atau metode berubah di luar
+    catat_pergerakan_persediaan() (hapus transaksi, load data).
+    """
+    tanda = tanda_persediaan()
+    mesin = st.session_state.get("mesin_persediaan")
+    if mesin is None or st.session_state.get("tanda_persediaan") != tanda:
+        mesin = bangun_dari_riwayat(
+            st.session_state.get("df_riwayat_persediaan"), tanda[0], daftar_barang(), dict(tanda[2])
+        )
+        st.session_state.mesin_persediaan = mesin
+        st.session_state.tanda_persediaan = tanda
+    return mesin
+
+
+def sinkron_persediaan():
+    """Tulis ringkasan mesin persediaan ke df_persediaan jika isinya berbeda"""
+    df_baru = mesin_persediaan().ke_dataframe()
+    df_lama = st.session_state.get("df_persediaan")
+    if df_lama is None or not df_baru.equals(terapkan_skema(df_lama)):
+        st.session_state.df_persediaan = df_baru
+        auto_save()
+    return st.session_state.df_persediaan
+
+
+def catat_pergerakan_persediaan(tanggal, jenis, barang, jumlah, harga, total, keterangan, id_dokumen=None):
+    """
+    Tambahkan satu pergerakan (sudah diterapkan ke mesin) ke riwayat
+    persediaan, lalu sinkronkan df_persediaan tanpa membangun ulang mesin.
+    """
+    stok = mesin_persediaan().stok(barang)
+    if tambah_riwayat_persediaan(tanggal, jenis, barang, jumlah, harga, total, stok, keterangan, id_dokumen):
+        st.session_state.tanda_persediaan = tanda_persediaan()
+    else:
+        # Riwayat gagal ditambah: buang mesin agar dibangun ulang dari riwayat
+        st.session_state.pop("mesin_persediaan", None)
+    sinkron_persediaan()
+    auto_save()
+    return True
+
+
+def cek_stok_barang(barang):
+    """Mengecek stok barang yang tersedia"""
+    try:
+        return mesin_persediaan().stok(barang)
+    except Exception as e:
+        st.error(f"Error cek stok barang: {str(e)}")
+        return 0
+
+
+def update_persediaan_setelah_penjualan(barang, jumlah, hpp_per_unit, tanggal, keterangan, id_dokumen=None):
+    """
+    Update persediaan setelah penjualan sesuai metode persediaan.
+    hpp_per_unit adalah pratinjau dari form; HPP yang dicatat ke riwayat
+    dihitung oleh mesin persediaan (sama untuk Average, per lapisan untuk FIFO/LIFO).
+    """
+    try:
+        mesin = mesin_persediaan()
+        if barang not in mesin.barang:
+            return False
+        
+        total_hpp = mesin.keluarkan(barang, jumlah, tanggal, keterangan)
+        harga_hpp = total_hpp / jumlah if jumlah else hpp_per_unit
+        
+        # Tambahkan ke riwayat persediaan
+        return catat_pergerakan_persediaan(
+            tanggal, "Penjualan", barang, -jumlah, harga_hpp, -total_hpp, keterangan, id_dokumen
+        )
+        
+    except Exception as e:
+        st.error(f"Error update persediaan penjualan: {str(e)}")
+        return False
+
+
+def update_persediaan_setelah_pembelian(barang, jumlah, harga_beli, tanggal, keterangan, id_dokumen=None):
+    """Update persediaan setelah pembelian (alias versi diperbaiki)"""
+    return update_persediaan_setelah_pembelian_diperbaiki(barang, jumlah, harga_beli, tanggal, keterangan, id_dokumen)
+
+
+def tambah_riwayat_persediaan_diperbaiki(tanggal, jenis, barang, jumlah, harga, total, stok, keterangan, id_dokumen=None):
+    """Menambah riwayat pergerakan persediaan (alias tambah_riwayat_persediaan)"""
+    return tambah_riwayat_persediaan(tanggal, jenis, barang, jumlah, harga, total, stok, keterangan, id_dokumen)
+
+
+def update_persediaan_setelah_pembelian_diperbaiki(barang, jumlah, harga_beli, tanggal, keterangan, id_dokumen=None):
+    """Update persediaan setelah pembelian: satu lapisan biaya baru di mesin persediaan"""
+    try:
+        mesin = mesin_persediaan()
+        if barang not in mesin.barang:
+            return False
+        
+        mesin.terima(barang, jumlah, harga_beli, jumlah * harga_beli, tanggal, keterangan)
+        
+        # Tambahkan ke riwayat persediaan
+        return catat_pergerakan_persediaan(
+            tanggal, "Pembelian", barang, jumlah, harga_beli, jumlah * harga_beli, keterangan, id_dokumen
+        )
+        
+    except Exception as e:
+        st.error(f"Error update persediaan pembelian: {str(e)}")
+        return False
+
+
+def tambah_riwayat_persediaan(tanggal, jenis, barang, jumlah, harga, total, stok, keterangan, id_dokumen=None):
+    """Menambah riwayat pergerakan persediaan - VERSI DIPERBAIKI"""
+    try:
+        if "df_riwayat_persediaan" not in st.session_state:
+            st.session_state.df_riwayat_persediaan = pd.DataFrame(
+                columns=["Tanggal", "Jenis", "Barang", "Jumlah", "Harga", "Total", "Stok", "Keterangan", "ID Dokumen"]
+            )
+        
+        new_row = {
+            "Tanggal": tanggal,
+            "Jenis": jenis,
+            "Barang": barang,
+            "Jumlah": jumlah,
+            "Harga": harga,
+            "Total": total,
+            "Stok": stok,
+            "Keterangan": keterangan,
+            "ID Dokumen": id_dokumen
+        }
+        
+        tambah_baris("df_riwayat_persediaan", pd.DataFrame([new_row]))
+        
+        return True
+    except Exception as e:
+        st.error(f"Error tambah riwayat persediaan: {str(e)}")
+        return False
+
+
+def update_persediaan(barang, jumlah, harga, jenis):
+    """Fungsi sederhana untuk update persediaan (pergerakan bertanggal hari ini)"""
+    tanggal = datetime.now().date()
+    if jenis == "pembelian":
+        return update_persediaan_setelah_pembelian_diperbaiki(barang, jumlah, harga, tanggal, "")
+    if jenis == "penjualan":
+        return update_persediaan_setelah_penjualan(barang, jumlah, harga, tanggal, "")
+    return True
+
+
+def hitung_ulang_persediaan():
+    """Menghitung ulang semua persediaan berdasarkan riwayat dan metode persediaan"""
+    try:
+        if "df_riwayat_persediaan" not in st.session_state or st.session_state.df_riwayat_persediaan.empty:
+            return False
+        
+        # Paksa mesin dibangun ulang dari seluruh riwayat (lazy, saat kartu stok/HPP dibutuhkan)
+        st.session_state.pop("mesin_persediaan", None)
+        
+        if st.session_state.metode_persediaan == "Average":
+            # Jalur vektor: satu sort + operasi kumulatif per barang, tanpa loop per baris
+            st.session_state.df_persediaan = hitung_ulang_ringkasan(
+                st.session_state.df_riwayat_persediaan, "Average", daftar_barang(),
+                saldo_awal_persediaan(st.session_state.get("df_persediaan"))
+            )
+        else:
+            sinkron_persediaan()
+        
+        auto_save()
+        return True
+        
+    except Exception as e:
+        st.error(f"Error hitung ulang persediaan: {str(e)}")
+        return False
@@ -0,0 +1,121 @@
+"""
+Inisialisasi sesi yang dijalankan di awal setiap run script Streamlit.
+
+Semua pengecekan di sini murah (kunci session_state) kecuali pemuatan
+database yang hanya terjadi sekali per sesi dan penyiapan penyimpanan yang
+hanya terjadi sekali per proses.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from simaya.jurnal_log import TABEL_TURUNAN
+from simaya.storage import TABEL_DATABASE
+from simaya.app.buku_besar import rekonsiliasi_buku_besar
+from simaya.app.penyimpanan import (
+    STORAGE, default_dataframes, flush_auto_save, init_database, init_session_state_fixed, muat_database_sekali,
+    sinkron_log, tandai_tersimpan
+)
+from simaya.app.periode import init_sistem_periode
+
+# init_database() sudah dijalankan di proses ini
+_database_siap = False
+
+
+def siapkan_database():
+    """init_database() sekali per proses (diulang hanya jika file database hilang)"""
+    global _database_siap
+    if not _database_siap or not STORAGE.ada():
+        init_database()
+        _database_siap = True
+
+
+def mulai_sesi():
+    """Dipanggil sebelum halaman login: muat data sesi baru dan lengkapi tabel default"""
+    siapkan_database()
+
+    # Load data dari database saat aplikasi dimulai
+    if "system_initialized" not in st.session_state:
+        print("🔄 Initializing system and loading data from database...")
+        muat_database_sekali()
+        st.session_state.system_initialized = True
+        print("✅ System initialization completed")
+
+    # Inisialisasi session state untuk data yang belum ada
+    for df_key, columns in default_dataframes.items():
+        if df_key not in st.session_state:
+            st.session_state[df_key] = pd.DataFrame(columns=columns)
+
+    # user data - Tetap di session state karena bersifat sementara
+    if "users" not in st.session_state:
+        st.session_state.users = {
+            "admin": "admin123",
+        }
+
+    if "logged_in" not in st.session_state:
+        st.session_state.logged_in = False
+
+    if "periode_sekarang" not in st.session_state:
+        st.session_state.periode_sekarang = datetime.now().strftime("%B %Y")
+
+    # Daftar periode yang tersedia
+    if "daftar_periode" not in st.session_state:
+        st.session_state.daftar_periode = [st.session_state.periode_sekarang]
+
+    init_sistem_periode()
+
+    # Transaksi yang dicatat sesi lain / layanan POS sejak run sebelumnya
+    if st.session_state.get("database_dimuat"):
+        sinkron_log()
+
+    # Permintaan simpan dari run sebelumnya yang berakhir dengan st.rerun()/st.stop()
+    flush_auto_save()
+
+
+def mulai_sesi_login():
+    """Dipanggil setelah login berhasil: counter transaksi, tabel penjualan/persediaan, buku besar tertunda"""
+    if "transaction_counter" not in st.session_state:
+        if "df_jurnal_umum" in st.session_state and not st.session_state.df_jurnal_umum.empty:
+            # Cari nomor tertinggi yang ada
+            max_no = st.session_state.df_jurnal_umum["No"].max()
+            if pd.isna(max_no):
+                st.session_state.transaction_counter = 1
+            else:
+                st.session_state.transaction_counter = int(max_no) + 1
+        else:
+            st.session_state.transaction_counter = 1
+
+    # Inisialisasi sistem yang diperbaiki
+    if "system_initialized_fixed" not in st.session_state:
+        print("🔄 Initializing fixed system...")
+        init_session_state_fixed()
+        muat_database_sekali()  # Tidak memuat ulang jika sudah dimuat saat inisialisasi awal
+        st.session_state.system_initialized_fixed = True
+        print("✅ Fixed system initialization completed")
+
+    # Ada event jurnal di log yang belum termasuk snapshot buku besar: bangun ulang sekali
+    if st.session_state.pop("buku_besar_perlu_dibangun", False):
+        rekonsiliasi_buku_besar()
+        tandai_tersimpan([TABEL_DATABASE[nama] for nama in TABEL_TURUNAN])
+
+    # Inisialisasi untuk sistem penjualan dan persediaan
+    if "df_penjualan" not in st.session_state:
+        st.session_state.df_penjualan = pd.DataFrame(
+            columns=["No", "Tanggal", "Keterangan", "Akun Debit 1", "Debit 1 (Rp)", "Akun Debit 2", "Debit 2 (Rp)",
+                    "Akun Kredit 1", "Kredit 1 (Rp)", "Akun Kredit 2", "Kredit 2 (Rp)", "Barang", "Jumlah", "Harga Jual", "HPP"]
+        )
+
+    if "df_pembelian" not in st.session_state:
+        st.session_state.df_pembelian = pd.DataFrame(
+            columns=["No", "Tanggal", "Keterangan", "Barang", "Jumlah", "Harga Beli", "Total Pembelian", "ID Dokumen"]
+        )
+
+    if "df_persediaan" not in st.session_state:
+        st.session_state.df_persediaan = pd.DataFrame(
+            columns=["Barang", "Stok Awal", "Nilai Awal", "Pembelian", "Penjualan", "Stok Akhir", "Harga Rata-rata", "Total Nilai"]
+        )
+
+    if "metode_persediaan" not in st.session_state:
+        st.session_state.metode_persediaan = "Average"  # Default metode
@@ -0,0 +1,904 @@
+"""
+Komponen tampilan Streamlit yang dipakai beberapa halaman (tabel, kartu
+persediaan, laporan, pemilih transaksi, tombol unduh ekspor).
+"""
+
+import functools
+import os
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from simaya.antrean import ANTREAN
+from simaya.ledger import ringkas_neraca_saldo, saring_transaksi
+from simaya.rupiah import format_rupiah_series
+from simaya.app.buku_besar import update_buku_besar_per_akun
+from simaya.app.ekspor import baca_file
+from simaya.app.laporan import (
+    hitung_laba_rugi_diperbaiki, hitung_perubahan_modal_diperbaiki, hitung_posisi_keuangan_diperbaiki,
+    update_semua_laporan_keuangan
+)
+from simaya.app.persediaan import mesin_persediaan
+from simaya.app.utilitas import format_rupiah, parse_rupiah, safe_float_convert
+
+
+def tampilkan_status_laporan(nama):
+    """Indikator kecil 'dihitung pada / cache hit' di halaman laporan"""
+    status = st.session_state.get("status_laporan", {}).get(nama)
+    if not status:
+        return
+    keterangan = {
+        None: "🔄 dihitung ulang",
+        "sesi": "⚡ cache hit",
+        "bersama": "⚡ cache hit (dibagi lintas sesi)",
+    }[status["sumber"]]
+    st.caption(f"🕒 Dihitung pada {status['waktu'].strftime('%H:%M:%S')} · versi jurnal #{status['versi']} · {keterangan}")
+
+
+# Pilihan jumlah transaksi per halaman pada pemilih hapus transaksi
+UKURAN_HALAMAN_HAPUS = [25, 50, 100, 200]
+
+
+def label_transaksi(ringkasan):
+    """{No: teks pilihan} untuk baris-baris ringkasan_transaksi()"""
+    label = {}
+    for no, tanggal, entri, total, akun in ringkasan.itertuples(index=False):
+        teks_tanggal = "-" if pd.isna(tanggal) else tanggal.strftime("%d/%m/%Y")
+        teks_entri = f" ({entri} entri)" if entri > 1 else ""
+        label[no] = f"No {no} - {teks_tanggal} - {akun}{teks_entri} - Rp {total:,.0f}"
+    return label
+
+
+def pilih_transaksi_hapus(ringkasan):
+    """
+    Pemilih transaksi untuk expander Hapus Transaksi. Ringkasan disaring
+    (akun/No, tanggal, nominal) lalu ditampilkan per halaman; hanya nomor di
+    halaman aktif (ditambah yang sudah dipilih) yang menjadi opsi widget.
+    Mengembalikan daftar No yang akan dihapus.
+    """
+    mode_hapus = st.radio(
+        "Mode hapus", ["Satu transaksi", "Beberapa transaksi", "Rentang No"],
+        horizontal=True, key="hapus_mode"
+    )
+
+    if mode_hapus == "Rentang No":
+        no_terakhir = int(ringkasan["No"].max())
+        col1, col2 = st.columns(2)
+        with col1:
+            no_dari = st.number_input("Dari No", min_value=1, max_value=no_terakhir, value=1, step=1, key="hapus_dari")
+        with col2:
+            no_sampai = st.number_input("Sampai No", min_value=1, max_value=no_terakhir, value=no_terakhir, step=1, key="hapus_sampai")
+        nomor = ringkasan["No"]
+        return nomor[(nomor >= no_dari) & (nomor <= no_sampai)].tolist()
+
+    # Filter
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        cari = st.text_input("Cari akun / No", key="hapus_cari")
+    with col2:
+        tanggal_dari = st.date_input("Dari tanggal", value=None, key="hapus_tgl_dari")
+    with col3:
+        tanggal_sampai = st.date_input("Sampai tanggal", value=None, key="hapus_tgl_sampai")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        nominal_min = st.number_input("Nominal min (Rp)", min_value=0.0, value=None, step=1000.0, key="hapus_nominal_min")
+    with col2:
+        nominal_maks = st.number_input("Nominal maks (Rp)", min_value=0.0, value=None, step=1000.0, key="hapus_nominal_maks")
+    with col3:
+        per_halaman = st.selectbox("Per halaman", UKURAN_HALAMAN_HAPUS, index=1, key="hapus_per_halaman")
+
+    hasil = saring_transaksi(ringkasan, cari, tanggal_dari, tanggal_sampai, nominal_min, nominal_maks)
+
+    # Halaman kembali ke 1 setiap filter berubah
+    jumlah_halaman = max(1, -(-len(hasil) // per_halaman))
+    filter_sekarang = (cari, tanggal_dari, tanggal_sampai, nominal_min, nominal_maks, per_halaman)
+    if st.session_state.get("hapus_filter") != filter_sekarang:
+        st.session_state.hapus_filter = filter_sekarang
+        st.session_state.hapus_halaman = 1
+    elif st.session_state.get("hapus_halaman", 1) > jumlah_halaman:
+        st.session_state.hapus_halaman = jumlah_halaman
+    halaman = st.number_input(
+        f"Halaman (dari {jumlah_halaman})", min_value=1, max_value=jumlah_halaman, step=1, key="hapus_halaman"
+    )
+
+    awal = (halaman - 1) * per_halaman
+    df_halaman = hasil.iloc[awal:awal + per_halaman]
+    st.caption(f"{len(hasil):,} dari {len(ringkasan):,} transaksi cocok · halaman {halaman}/{jumlah_halaman}")
+    st.dataframe(
+        df_halaman.assign(Tanggal=df_halaman["Tanggal"].dt.date),
+        use_container_width=True, hide_index=True
+    )
+
+    if mode_hapus == "Satu transaksi":
+        if df_halaman.empty:
+            st.info("Tidak ada transaksi yang cocok dengan filter")
+            return []
+        label = label_transaksi(df_halaman)
+        no = st.selectbox("Pilih transaksi untuk dihapus:", list(label), format_func=label.get, key="hapus_select")
+        return [no]
+
+    # Pilihan dari halaman/filter lain tetap dipertahankan selama nomornya masih ada
+    pilihan = st.session_state.get("hapus_multi", [])
+    masih_ada = set(ringkasan.loc[ringkasan["No"].isin(pilihan), "No"].tolist())
+    terpilih = [no for no in pilihan if no in masih_ada]
+    if terpilih != pilihan:
+        st.session_state.hapus_multi = terpilih
+    opsi = sorted(set(df_halaman["No"].tolist()) | set(terpilih))
+    label = label_transaksi(ringkasan[ringkasan["No"].isin(opsi)])
+    return st.multiselect("Pilih transaksi untuk dihapus:", opsi, format_func=label.get, key="hapus_multi")
+
+
+def create_number_input_with_format(label, value, key):
+    """Membuat input number dengan format rupiah yang user-friendly"""
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        # Input text untuk format ribuan
+        formatted_value = format_rupiah(value) if value > 0 else ""
+        input_str = st.text_input(
+            label,
+            value=formatted_value,
+            placeholder="0",
+            key=f"text_{key}"
+        )
+    
+    with col2:
+        # Input number untuk backup (hidden)
+        number_val = st.number_input(
+            label,
+            min_value=0.0,
+            value=float(value),
+            step=1000.0,
+            key=f"num_{key}",
+            label_visibility="collapsed"
+        )
+    
+    # Prioritaskan input text jika ada isinya
+    if input_str and input_str != "0":
+        return parse_rupiah(input_str)
+    else:
+        return number_val
+
+
+def tombol_unduh_excel(path, label, awalan_file, key):
+    """download_button untuk file ekspor; isi file baru dibaca saat tombol diklik"""
+    st.download_button(
+        label=label,
+        data=functools.partial(baca_file, path),
+        file_name=f"{awalan_file}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        key=key
+    )
+
+
+def tampilkan_tugas_ekspor(tempat, label, awalan_file):
+    """
+    Status tugas ekspor milik tempat: progres (diperbarui tiap detik tanpa
+    memblokir halaman) selama berjalan, tombol unduh setelah selesai.
+    """
+    id_tugas = st.session_state.get(f"tugas_ekspor_{tempat}")
+    tugas = ANTREAN.ambil(id_tugas) if id_tugas else None
+    if tugas is None:
+        return
+    
+    if tugas.aktif():
+        @st.fragment(run_every=1.0)
+        def progres_ekspor():
+            if not tugas.aktif():
+                st.rerun()
+            st.progress(
+                tugas.progres(),
+                text=f"⏳ Menulis sheet {min(tugas.sheet_selesai + 1, tugas.sheet_total)}/{tugas.sheet_total} · "
+                     f"{tugas.baris_ditulis:,}/{tugas.baris_total:,} baris"
+            )
+        progres_ekspor()
+    elif tugas.tersedia():
+        st.success(f"✅ File siap ({tugas.pesan}, {os.path.getsize(tugas.path):,} bytes)")
+        tombol_unduh_excel(tugas.path, label, awalan_file, f"unduh_ekspor_{tempat}")
+    else:
+        st.error(f"❌ Ekspor gagal: {tugas.pesan or 'file tidak tersedia lagi'}")
+
+
+def display_buku_besar_fixed():
+    """Menampilkan buku besar dengan error handling yang lebih baik"""
+    st.subheader("Buku Besar 📚")
+    st.markdown(f"**Periode:** {st.session_state.periode_sekarang}")
+    
+    # Update buku besar per akun dengan error handling
+    try:
+        with st.spinner("Memperbarui buku besar..."):
+            update_buku_besar_per_akun()
+    except Exception as e:
+        st.error(f"Error saat memperbarui buku besar: {str(e)}")
+        st.info("Silakan coba refresh halaman atau tambah transaksi di Jurnal Umum terlebih dahulu.")
+    
+    # Tampilkan informasi sumber data
+    st.info("""**Buku Besar ini menggabungkan data dari:**
+    - ✅ **Jurnal Umum** - Transaksi harian
+    - ✅ **Jurnal Penyesuaian** - Penyesuaian periode  
+    - ✅ **Jurnal Penutup** - Penutupan periode
+    """)
+    
+    if "buku_besar_per_akun" not in st.session_state or not st.session_state.buku_besar_per_akun:
+        st.info("Buku Besar masih kosong. Silakan tambah transaksi di Jurnal Umum terlebih dahulu.")
+        
+        # Debug information
+        with st.expander("🔧 Debug Information"):
+            st.write("Session State Keys:", [k for k in st.session_state.keys() if 'jurnal' in k or 'buku' in k])
+            if "df_jurnal_umum" in st.session_state:
+                st.write("Jurnal Umum data:", len(st.session_state.df_jurnal_umum))
+            if "df_jurnal_penyesuaian" in st.session_state:
+                st.write("Jurnal Penyesuaian data:", len(st.session_state.df_jurnal_penyesuaian))
+        
+        return
+    
+    buku_besar_per_akun = st.session_state.buku_besar_per_akun
+    
+    # Tampilkan setiap akun dalam expander
+    for akun in sorted(buku_besar_per_akun.keys()):
+        df_akun = buku_besar_per_akun[akun]
+        
+        with st.expander(f"**{akun}** - {len(df_akun)} transaksi", expanded=False):
+            if not df_akun.empty:
+                # Header informasi akun (kolom buku besar sudah float64)
+                saldo_akhir = float(df_akun["Saldo (Rp)"].iloc[-1])
+                total_debit = float(df_akun["Debit (Rp)"].sum())
+                total_kredit = float(df_akun["Kredit (Rp)"].sum())
+                
+                col_info1, col_info2, col_info3, col_info4 = st.columns(4)
+                with col_info1:
+                    st.metric("Total Debit", f"Rp {total_debit:,.0f}")
+                with col_info2:
+                    st.metric("Total Kredit", f"Rp {total_kredit:,.0f}")
+                with col_info3:
+                    st.metric("Saldo Akhir", f"Rp {saldo_akhir:,.0f}")
+                with col_info4:
+                    status = "Debit" if saldo_akhir > 0 else "Kredit" if saldo_akhir < 0 else "Nol"
+                    st.metric("Posisi", status)
+                
+                # Tampilkan tabel transaksi dengan format aman
+                st.write("### 📋 Detail Transaksi")
+                
+                # Buat copy untuk tampilan dengan format yang aman
+                df_tampil = safe_dataframe_display(df_akun)
+                
+                # Tampilkan tabel
+                st.dataframe(
+                    df_tampil[["No", "Tanggal", "Sumber", "Keterangan", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"]],
+                    use_container_width=True,
+                    hide_index=True
+                )
+            else:
+                st.info("Tidak ada transaksi untuk akun ini.")
+
+
+def display_neraca_saldo_fixed():
+    """Menampilkan neraca saldo dengan error handling yang lebih baik"""
+    st.subheader("Neraca Saldo 📊")
+    st.markdown(f"**Periode:** {st.session_state.periode_sekarang}")
+    
+    # Update neraca saldo terlebih dahulu
+    try:
+        update_buku_besar_per_akun()
+    except Exception as e:
+        st.error(f"Error saat memperbarui neraca saldo: {str(e)}")
+    
+    # Tampilkan neraca saldo
+    if "df_neraca_saldo" in st.session_state and not st.session_state.df_neraca_saldo.empty:
+        st.write("### 📋 Daftar Neraca Saldo")
+        
+        # Gunakan safe_dataframe_display untuk format yang aman
+        df_tampil = safe_dataframe_display(st.session_state.df_neraca_saldo)
+        
+        # Tampilkan tabel
+        st.dataframe(df_tampil, use_container_width=True, hide_index=True)
+        
+        # Total dan cek keseimbangan dari pembentukan neraca saldo barusan;
+        # jika tidak ada (neraca dari jalur lain), hitung vektor dari tabelnya
+        ringkasan = st.session_state.pop("ringkasan_neraca_saldo", None) or ringkas_neraca_saldo(st.session_state.df_neraca_saldo)
+        total_debit = ringkasan["total_debit"]
+        total_kredit = ringkasan["total_kredit"]
+        
+        # Tampilkan total
+        st.write("### 💰 Total Neraca Saldo")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Total Debit", f"Rp {total_debit:,.0f}")
+        with col2:
+            st.metric("Total Kredit", f"Rp {total_kredit:,.0f}")
+        
+        # Validasi keseimbangan
+        if ringkasan["seimbang"]:
+            st.success("✅ Neraca Saldo SEIMBANG")
+        else:
+            st.error(f"❌ Neraca Saldo TIDAK SEIMBANG - Selisih: Rp {ringkasan['selisih']:,.0f}")
+            
+    else:
+        st.info("""
+        **Belum ada data neraca saldo.**
+        
+        **Untuk membuat neraca saldo:**
+        1. Tambahkan transaksi di menu **Jurnal Umum**
+        2. Jika diperlukan, buat penyesuaian di menu **Jurnal Penyesuaian**
+        3. Neraca saldo akan otomatis terbentuk dari data transaksi yang sudah dicatat
+        """)
+
+
+def tampilkan_laporan_laba_rugi():
+    """Menampilkan laporan laba rugi dengan format yang rapi"""
+    st.subheader('📊 Laporan Laba Rugi')
+    st.markdown(f"**Periode:** {st.session_state.periode_sekarang}")
+    
+    # Tombol untuk memperbarui laporan
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        if st.button("🔄 Perbarui Laporan", key="update_laba_rugi"):
+            update_semua_laporan_keuangan(paksa=True)
+            st.rerun()
+    
+    # Hitung dan tampilkan laporan laba rugi
+    pendapatan, beban, laba_bersih, df_laba_rugi = hitung_laba_rugi_diperbaiki()
+    tampilkan_status_laporan("laba_rugi")
+    
+    if not df_laba_rugi.empty:
+        # Tampilkan dalam format yang rapi
+        st.write("### Laporan Laba Rugi")
+        
+        # Buat container untuk tampilan yang lebih baik
+        with st.container():
+            for _, row in df_laba_rugi.iterrows():
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    keterangan = row["Keterangan"]
+                    if "**" in keterangan:
+                        st.markdown(f"**{keterangan.replace('**', '')}**")
+                    else:
+                        st.write(keterangan)
+                with col2:
+                    nilai = row["Nilai (Rp)"]
+                    if pd.notna(nilai) and nilai != "":
+                        if "**" in row["Keterangan"]:
+                            if isinstance(nilai, (int, float)):
+                                st.markdown(f"**Rp {nilai:,.0f}**")
+                            else:
+                                st.markdown(f"**{nilai}**")
+                        else:
+                            if isinstance(nilai, (int, float)):
+                                st.write(f"Rp {nilai:,.0f}")
+                            else:
+                                st.write(nilai)
+                    else:
+                        st.write("")
+        
+        # Tampilkan summary metrics
+        st.write("---")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Pendapatan", f"Rp {pendapatan:,.0f}")
+        with col2:
+            st.metric("Total Beban", f"Rp {beban:,.0f}")
+        with col3:
+            warna = "normal" if laba_bersih >= 0 else "inverse"
+            st.metric("Laba (Rugi) Bersih", f"Rp {laba_bersih:,.0f}", delta=None, delta_color=warna)
+        
+        # Tampilkan status
+        if laba_bersih > 0:
+            st.success(f"✅ Perusahaan mengalami **LABA** sebesar Rp {laba_bersih:,.0f}")
+        elif laba_bersih < 0:
+            st.error(f"❌ Perusahaan mengalami **RUGI** sebesar Rp {abs(laba_bersih):,.0f}")
+        else:
+            st.info("ℹ️ Perusahaan **BREAK EVEN** (Tidak laba tidak rugi)")
+    
+    else:
+        st.info("""
+        **Belum ada data untuk laporan laba rugi.**
+        
+        **Untuk membuat laporan laba rugi:**
+        1. Pastikan sudah ada transaksi di **Jurnal Umum**
+        2. Jika diperlukan, buat penyesuaian di **Jurnal Penyesuaian**
+        3. Pastikan ada transaksi yang mempengaruhi akun pendapatan dan beban
+        4. Klik tombol **'Perbarui Laporan'** di atas
+        """)
+        
+        with st.expander("🔍 Daftar Akun Pendapatan dan Beban yang Diakui"):
+            st.write("""
+            **Akun Pendapatan:**
+            - Penjualan
+            - Pendapatan Jasa  
+            - Pendapatan Lain
+            - Pendapatan
+            
+            **Akun Beban:**
+            - Beban Gaji
+            - Beban Sewa
+            - Beban Listrik dan Air
+            - Beban Transportasi
+            - Beban Lain-lain
+            - Beban Asuransi
+            - Beban Penyusutan
+            - Harga Pokok Penjualan
+            - Beban listrik dan air
+            - Beban transportasi
+            - Beban gaji
+            - Beban Lain
+            """)
+
+
+def tampilkan_laporan_perubahan_modal():
+    """Menampilkan laporan perubahan modal dengan format yang rapi"""
+    st.subheader('📈 Laporan Perubahan Modal')
+    st.markdown(f"**Periode:** {st.session_state.periode_sekarang}")
+    
+    # Pastikan laba rugi sudah dihitung
+    if "laba_bersih" not in st.session_state:
+        hitung_laba_rugi_diperbaiki()
+    
+    # Tombol perbarui
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        if st.button("🔄 Perbarui Laporan", key="update_perubahan_modal"):
+            update_semua_laporan_keuangan(paksa=True)
+            st.rerun()
+    
+    # Hitung dan tampilkan laporan perubahan modal
+    df_perubahan_modal = hitung_perubahan_modal_diperbaiki(st.session_state.get("laba_bersih", 0))
+    tampilkan_status_laporan("perubahan_modal")
+    
+    if not df_perubahan_modal.empty:
+        st.write("### Laporan Perubahan Modal")
+        
+        # Tampilkan dalam format yang rapi
+        with st.container():
+            for _, row in df_perubahan_modal.iterrows():
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    keterangan = row["Keterangan"]
+                    if "**" in keterangan:
+                        st.markdown(f"**{keterangan.replace('**', '')}**")
+                    else:
+                        st.write(keterangan)
+                with col2:
+                    nilai = row["Nilai (Rp)"]
+                    if "**" in row["Keterangan"]:
+                        st.markdown(f"**Rp {nilai:,.0f}**")
+                    else:
+                        st.write(f"Rp {nilai:,.0f}")
+        
+        # Informasi tambahan
+        st.write("---")
+        st.info(f"""
+        **Ringkasan Perubahan Modal:**
+        - **Modal Awal:** Rp {st.session_state.get('modal_awal', 0):,.0f}
+        - **Laba/Rugi Bersih:** Rp {st.session_state.get('laba_bersih', 0):,.0f}
+        - **Modal Akhir:** Rp {st.session_state.get('modal_akhir', 0):,.0f}
+        
+        **Kenaikan/penurunan modal:** {((st.session_state.get('modal_akhir', 0) / max(1, st.session_state.get('modal_awal', 1)) - 1) * 100):.1f}%
+        """)
+    
+    else:
+        st.info("""
+        **Belum ada data untuk laporan perubahan modal.**
+        
+        **Pastikan:**
+        1. Sudah ada data **Laporan Laba Rugi**
+        2. Ada data **Modal Awal** dari neraca saldo periode sebelumnya
+        3. Jika ini periode pertama, isi neraca saldo periode sebelumnya terlebih dahulu
+        """)
+
+
+def tampilkan_laporan_posisi_keuangan():
+    """Menampilkan laporan posisi keuangan dengan format yang rapi"""
+    st.subheader('🏦 Laporan Posisi Keuangan (Neraca)')
+    st.markdown(f"**Periode:** {st.session_state.periode_sekarang}")
+    
+    # Tombol perbarui
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        if st.button("🔄 Perbarui Laporan", key="update_posisi_keuangan"):
+            update_semua_laporan_keuangan(paksa=True)
+            st.rerun()
+    
+    # Perbarui semua laporan terlebih dahulu
+    update_semua_laporan_keuangan()
+    
+    # Tampilkan laporan posisi keuangan
+    df_posisi_keuangan = hitung_posisi_keuangan_diperbaiki()
+    tampilkan_status_laporan("posisi_keuangan")
+    
+    if not df_posisi_keuangan.empty:
+        st.write("### Laporan Posisi Keuangan")
+        
+        # Tampilkan dalam format yang rapi
+        with st.container():
+            for _, row in df_posisi_keuangan.iterrows():
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    keterangan = row["Keterangan"]
+                    if "**" in keterangan:
+                        st.markdown(f"**{keterangan.replace('**', '')}**")
+                    else:
+                        st.write(keterangan)
+                with col2:
+                    if pd.notna(row["Nilai (Rp)"]) and row["Nilai (Rp)"] != "":
+                        nilai = row["Nilai (Rp)"]
+                        if "**" in row["Keterangan"]:
+                            if isinstance(nilai, (int, float)):
+                                st.markdown(f"**Rp {nilai:,.0f}**")
+                            else:
+                                st.markdown(f"**{nilai}**")
+                        else:
+                            if isinstance(nilai, (int, float)):
+                                st.write(f"Rp {nilai:,.0f}")
+                            else:
+                                st.write(nilai)
+                    else:
+                        st.write("")
+        
+        # Validasi keseimbangan
+        total_aset = 0
+        total_liabilitas_ekuitas = 0
+        
+        # Hitung total dari data
+        for _, row in df_posisi_keuangan.iterrows():
+            if row["Keterangan"] == "**TOTAL ASET**" and pd.notna(row["Nilai (Rp)"]):
+                total_aset = safe_float_convert(row["Nilai (Rp)"])
+            elif row["Keterangan"] == "**TOTAL LIABILITAS & EKUITAS**" and pd.notna(row["Nilai (Rp)"]):
+                total_liabilitas_ekuitas = safe_float_convert(row["Nilai (Rp)"])
+        
+        st.write("---")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Total Aset", f"Rp {total_aset:,.0f}")
+        with col2:
+            st.metric("Total Liabilitas & Ekuitas", f"Rp {total_liabilitas_ekuitas:,.0f}")
+        
+        # Cek keseimbangan
+        selisih = abs(total_aset - total_liabilitas_ekuitas)
+        if selisih < 1:
+            st.success("✅ Neraca SEIMBANG - Aset = Liabilitas + Ekuitas")
+        else:
+            st.error(f"❌ Neraca TIDAK SEIMBANG - Selisih: Rp {selisih:,.0f}")
+            
+            # Saran perbaikan
+            with st.expander("💡 Saran Perbaikan Keseimbangan Neraca"):
+                st.write(f"""
+                **Analisis Ketidakseimbangan:**
+                - Total Aset: Rp {total_aset:,.0f}
+                - Total Liabilitas & Ekuitas: Rp {total_liabilitas_ekuitas:,.0f}
+                - **Selisih: Rp {selisih:,.0f}**
+                
+                **Kemungkinan penyebab:**
+                1. Transaksi yang tidak seimbang di Jurnal Umum
+                2. Penyesuaian yang belum dilakukan
+                3. Kesalahan input data
+                4. Akun yang belum terklasifikasi dengan benar
+                
+                **Tindakan perbaikan:**
+                - Periksa kembali transaksi di **Jurnal Umum**
+                - Pastikan semua penyesuaian sudah dicatat di **Jurnal Penyesuaian**
+                - Validasi data di **Buku Besar**
+                """)
+    
+    else:
+        st.info("""
+        **Belum ada data untuk laporan posisi keuangan.**
+        
+        **Untuk membuat laporan posisi keuangan:**
+        1. Pastikan sudah ada transaksi yang mempengaruhi aset, liabilitas, dan ekuitas
+        2. Pastikan **Buku Besar** sudah terisi
+        3. Pastikan **Laporan Laba Rugi** sudah ada
+        4. Klik tombol **'Perbarui Laporan'** di atas
+        """)
+
+
+def display_kartu_persediaan_single_barang(barang):
+    """Menampilkan kartu persediaan untuk satu barang tertentu"""
+    
+    # Data persediaan barang
+    mesin = mesin_persediaan()
+    
+    if barang in mesin.barang:
+        stok_akhir = mesin.stok(barang)
+        harga_rata = mesin.harga_rata(barang)
+        total_nilai = mesin.nilai(barang)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Stok Akhir", f"{stok_akhir:,.0f} unit")
+        with col2:
+            st.metric("Harga Rata-rata", f"Rp {harga_rata:,.0f}")
+        with col3:
+            st.metric("Total Nilai", f"Rp {total_nilai:,.0f}")
+        with col4:
+            status = "Tersedia" if stok_akhir > 0 else "Habis"
+            st.metric("Status", status)
+    
+    # Riwayat pembelian untuk barang ini
+    st.write("#### 🛒 Riwayat Pembelian")
+    if "df_pembelian" in st.session_state and not st.session_state.df_pembelian.empty:
+        pembelian_barang = st.session_state.df_pembelian[st.session_state.df_pembelian["Barang"] == barang]
+        if not pembelian_barang.empty:
+            # Format untuk tampilan
+            df_tampil = pembelian_barang.copy()
+            format_kolom_rupiah(df_tampil, ["Harga Beli", "Total Pembelian"], pemisah=",", teks_nol=None)
+            
+            st.dataframe(df_tampil[["Tanggal", "Keterangan", "Jumlah", "Harga Beli", "Total Pembelian"]], 
+                        use_container_width=True, hide_index=True)
+            
+            # Total pembelian
+            total_pembelian = pembelian_barang["Total Pembelian"].sum()
+            st.metric("Total Pembelian", f"Rp {total_pembelian:,.0f}")
+        else:
+            st.info("Belum ada data pembelian untuk barang ini.")
+    else:
+        st.info("Belum ada data pembelian.")
+    
+    # Riwayat penjualan untuk barang ini
+    st.write("#### 📦 Riwayat Penjualan")
+    if "df_penjualan" in st.session_state and not st.session_state.df_penjualan.empty:
+        penjualan_barang = st.session_state.df_penjualan[st.session_state.df_penjualan["Barang"] == barang]
+        if not penjualan_barang.empty:
+            # Format untuk tampilan
+            df_tampil = penjualan_barang.copy()
+            format_kolom_rupiah(df_tampil, ["Harga Jual", "Total Penjualan", "HPP", "Total HPP"], pemisah=",", teks_nol=None)
+            
+            st.dataframe(df_tampil[["Tanggal", "Keterangan", "Jumlah", "Harga Jual", "Total Penjualan", "HPP", "Total HPP"]], 
+                        use_container_width=True, hide_index=True)
+            
+            # Total penjualan dan laba
+            total_penjualan = penjualan_barang["Total Penjualan"].sum()
+            total_hpp = penjualan_barang["Total HPP"].sum()
+            laba_kotor = total_penjualan - total_hpp
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Penjualan", f"Rp {total_penjualan:,.0f}")
+            with col2:
+                st.metric("Total HPP", f"Rp {total_hpp:,.0f}")
+            with col3:
+                st.metric("Laba Kotor", f"Rp {laba_kotor:,.0f}")
+        else:
+            st.info("Belum ada data penjualan untuk barang ini.")
+    else:
+        st.info("Belum ada data penjualan.")
+    
+    # Riwayat persediaan untuk barang ini
+    st.write("#### 📊 Riwayat Pergerakan Persediaan")
+    if "df_riwayat_persediaan" in st.session_state and not st.session_state.df_riwayat_persediaan.empty:
+        riwayat_barang = st.session_state.df_riwayat_persediaan[st.session_state.df_riwayat_persediaan["Barang"] == barang]
+        if not riwayat_barang.empty:
+            # Format untuk tampilan
+            df_tampil = riwayat_barang.copy()
+            format_kolom_rupiah(df_tampil, ["Harga", "Total"], pemisah=",", teks_nol=None)
+            
+            # Urutkan berdasarkan tanggal
+            df_tampil = df_tampil.sort_values("Tanggal", ascending=False)
+            
+            st.dataframe(df_tampil[["Tanggal", "Jenis", "Jumlah", "Harga", "Total", "Stok", "Keterangan"]], 
+                        use_container_width=True, hide_index=True)
+        else:
+            st.info("Belum ada riwayat pergerakan persediaan untuk barang ini.")
+    else:
+        st.info("Belum ada riwayat persediaan.")
+
+
+def display_kartu_persediaan_per_barang():
+    """Menampilkan kartu persediaan dengan tabel terpisah untuk setiap barang"""
+    st.subheader("📦 Kartu Persediaan - Per Barang")
+    
+    # Inisialisasi jika belum ada
+    if "df_persediaan" not in st.session_state:
+        st.session_state.df_persediaan = pd.DataFrame({
+            "Barang": ["Ayam Jago", "Ayam Broiler", "Telur Ayam"],
+            "Stok Awal": [0, 0, 0],
+            "Nilai Awal": [0, 0, 0],
+            "Pembelian": [0, 0, 0],
+            "Penjualan": [0, 0, 0],
+            "Stok Akhir": [0, 0, 0],
+            "Harga Rata-rata": [0, 0, 0],
+            "Total Nilai": [0, 0, 0]
+        })
+    
+    # Tampilkan ringkasan persediaan
+    st.write("### 📊 Ringkasan Persediaan")
+    if not st.session_state.df_persediaan.empty:
+        total_nilai = st.session_state.df_persediaan["Total Nilai"].sum()
+        total_stok = st.session_state.df_persediaan["Stok Akhir"].sum()
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Total Nilai Persediaan", f"Rp {total_nilai:,.0f}")
+        with col2:
+            st.metric("Total Stok Semua Barang", f"{total_stok:,.0f} unit")
+        
+        st.dataframe(st.session_state.df_persediaan, use_container_width=True)
+    
+    # Tampilkan detail per barang
+    st.write("### 📋 Detail Per Barang")
+    
+    # Daftar barang yang tersedia
+    barang_list = list(mesin_persediaan().barang)
+    
+    for barang in barang_list:
+        with st.expander(f"**{barang}** - Kartu Persediaan", expanded=False):
+            display_kartu_persediaan_single_barang(barang)
+
+
+# Header bertingkat kartu stok: kolom mesin persediaan -> (grup, sub-kolom)
+KOLOM_KARTU_BERTINGKAT = {
+    "Tanggal": ("", "Tanggal"),
+    "Keterangan": ("", "Keterangan"),
+    "Kuantitas_Masuk": ("Unit Masuk", "Kuantitas"),
+    "Harga_Unit_Masuk": ("Unit Masuk", "Harga"),
+    "Jumlah_Masuk": ("Unit Masuk", "Jumlah"),
+    "Kuantitas_Keluar": ("Unit Keluar", "Kuantitas"),
+    "Harga_Unit_Keluar": ("Unit Keluar", "Harga"),
+    "Jumlah_Keluar": ("Unit Keluar", "Jumlah"),
+    "Kuantitas_Balance": ("Balance", "Kuantitas"),
+    "Harga_Rata_Balance": ("Balance", "Harga"),
+    "Jumlah_Balance": ("Balance", "Jumlah"),
+}
+
+
+UKURAN_HALAMAN_KARTU = [25, 50, 100, 250]
+
+
+def tampilkan_kartu_stok(mesin, barang):
+    """
+    Kartu stok satu barang sebagai satu st.dataframe dengan header bertingkat
+    (Unit Masuk / Unit Keluar / Balance). Filter tanggal dan paginasi dilakukan
+    di server; hanya baris halaman aktif yang diformat dan dikirim ke browser.
+    """
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        rentang = st.date_input(
+            "Rentang Tanggal", value=mesin.rentang_tanggal_kartu(barang) or (), key=f"rentang_kartu_{barang}"
+        )
+    with col2:
+        per_halaman = st.selectbox("Baris per halaman", UKURAN_HALAMAN_KARTU, index=1, key=f"per_halaman_kartu_{barang}")
+    
+    # Saat memilih rentang, date_input sempat mengembalikan satu tanggal saja
+    mulai = rentang[0] if len(rentang) > 0 else None
+    sampai = rentang[1] if len(rentang) > 1 else None
+    _, jumlah_baris, jumlah_halaman = mesin.halaman_kartu_stok(barang, mulai, sampai, 1, per_halaman)
+    
+    # Filter yang mempersempit hasil bisa membuat halaman aktif melewati halaman terakhir
+    kunci_halaman = f"halaman_kartu_{barang}"
+    if st.session_state.get(kunci_halaman, 1) > jumlah_halaman:
+        st.session_state[kunci_halaman] = jumlah_halaman
+    with col3:
+        halaman = st.number_input("Halaman", min_value=1, max_value=jumlah_halaman, step=1, key=kunci_halaman)
+    df_halaman, _, _ = mesin.halaman_kartu_stok(barang, mulai, sampai, halaman, per_halaman)
+    
+    # Format hanya baris halaman ini; 0 pada masuk/keluar ditampilkan "-"
+    df_tampil = df_halaman.copy()
+    df_tampil["Tanggal"] = df_tampil["Tanggal"].astype(str)
+    format_kolom_rupiah(df_tampil, ["Kuantitas_Masuk", "Kuantitas_Keluar"], awalan="", pemisah=",", teks_nol="-")
+    format_kolom_rupiah(df_tampil, ["Harga_Unit_Masuk", "Jumlah_Masuk", "Harga_Unit_Keluar", "Jumlah_Keluar"],
+                        pemisah=",", teks_nol="-")
+    format_kolom_rupiah(df_tampil, ["Kuantitas_Balance"], awalan="", pemisah=",", teks_nol=None)
+    format_kolom_rupiah(df_tampil, ["Harga_Rata_Balance", "Jumlah_Balance"], pemisah=",", teks_nol=None)
+    df_tampil.columns = pd.MultiIndex.from_tuples([KOLOM_KARTU_BERTINGKAT[k] for k in df_tampil.columns])
+    
+    st.write("**Tabel Kartu Persediaan:**")
+    st.dataframe(df_tampil, use_container_width=True, hide_index=True)
+    st.caption(f"Halaman {halaman} dari {jumlah_halaman} · {jumlah_baris:,} pergerakan dalam rentang tanggal")
+
+
+def display_kartu_persediaan_single_barang_detail(barang):
+    """Menampilkan kartu persediaan detail untuk satu barang dengan struktur tabel yang diminta"""
+    
+    # Data persediaan barang
+    mesin = mesin_persediaan()
+    
+    if barang in mesin.barang:
+        stok_akhir = mesin.stok(barang)
+        harga_rata = mesin.harga_rata(barang)
+        total_nilai = mesin.nilai(barang)
+        
+        # Header informasi
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Stok Akhir", f"{stok_akhir:,.0f} unit")
+        with col2:
+            st.metric("Harga Rata-rata", f"Rp {harga_rata:,.0f}")
+        with col3:
+            st.metric("Total Nilai", f"Rp {total_nilai:,.0f}")
+        with col4:
+            status = "Tersedia" if stok_akhir > 0 else "Habis"
+            st.metric("Status", status)
+    
+    # Buat tabel kartu persediaan detail
+    st.write("### 📊 Kartu Persediaan Detail")
+    
+    # Kartu stok dari mesin persediaan (saldo berjalan sesuai metode persediaan,
+    # dihitung sekali per barang dan versi riwayat)
+    if not mesin.kartu_stok(barang).empty:
+        tampilkan_kartu_stok(mesin, barang)
+    else:
+        st.info("Belum ada transaksi untuk barang ini.")
+    
+    # Tampilkan ringkasan transaksi (opsional)
+    st.write("### 📋 Ringkasan Transaksi")
+    
+    # Pembelian
+    st.write("#### 🛒 Pembelian")
+    if "df_pembelian" in st.session_state and not st.session_state.df_pembelian.empty:
+        pembelian_barang = st.session_state.df_pembelian[st.session_state.df_pembelian["Barang"] == barang]
+        if not pembelian_barang.empty:
+            st.dataframe(pembelian_barang[["Tanggal", "Keterangan", "Jumlah", "Harga Beli", "Total Pembelian"]], 
+                        use_container_width=True, hide_index=True)
+        else:
+            st.info("Belum ada data pembelian.")
+    else:
+        st.info("Belum ada data pembelian.")
+    
+    # Penjualan
+    st.write("#### 📦 Penjualan")
+    if "df_penjualan" in st.session_state and not st.session_state.df_penjualan.empty:
+        penjualan_barang = st.session_state.df_penjualan[st.session_state.df_penjualan["Barang"] == barang]
+        if not penjualan_barang.empty:
+            st.dataframe(penjualan_barang[["Tanggal", "Keterangan", "Jumlah", "Harga Jual", "Total Penjualan"]], 
+                        use_container_width=True, hide_index=True)
+        else:
+            st.info("Belum ada data penjualan.")
+    else:
+        st.info("Belum ada data penjualan.")
+
+
+def display_kartu_persediaan_detail_per_barang():
+    """Menampilkan kartu persediaan detail dengan struktur tabel yang diminta"""
+    st.subheader("📦 Kartu Persediaan - Detail Per Barang")
+    
+    # Inisialisasi jika belum ada
+    if "df_persediaan" not in st.session_state:
+        st.session_state.df_persediaan = pd.DataFrame({
+            "Barang": ["Ayam Jago", "Ayam Broiler", "Telur Ayam"],
+            "Stok Awal": [0, 0, 0],
+            "Nilai Awal": [0, 0, 0],
+            "Pembelian": [0, 0, 0],
+            "Penjualan": [0, 0, 0],
+            "Stok Akhir": [0, 0, 0],
+            "Harga Rata-rata": [0, 0, 0],
+            "Total Nilai": [0, 0, 0]
+        })
+    
+    # Daftar barang yang tersedia
+    barang_list = list(mesin_persediaan().barang)
+    
+    for barang in barang_list:
+        with st.expander(f"**{barang}** - Kartu Persediaan Detail", expanded=False):
+            display_kartu_persediaan_single_barang_detail(barang)
+
+
+def safe_dataframe_display(df, numeric_columns=None):
+    """Menampilkan DataFrame dengan format yang aman - VERSI DIPERBAIKI"""
+    try:
+        if df.empty:
+            return df
+            
+        df_display = df.copy()
+        
+        if numeric_columns is None:
+            numeric_columns = [col for col in df.columns if '(Rp)' in col]
+        
+        # Format kolom numerik sekaligus per kolom (simaya.rupiah)
+        format_kolom_rupiah(df_display, numeric_columns)
+        
+        return df_display
+    except Exception as e:
+        print(f"Error dalam safe_dataframe_display: {e}")
+        return df
+
+
+def format_kolom_rupiah(df_tampil, kolom, **opsi):
+    """
+    Format kolom angka pada DataFrame tampilan (di tempat) dengan
+    format_rupiah_series. Kolom yang tidak ada dilewati. Opsi diteruskan ke
+    format_rupiah_series (pemisah, teks_nol, teks_kosong).
+    """
+    for col in kolom:
+        if col in df_tampil.columns:
+            df_tampil[col] = format_rupiah_series(df_tampil[col], **opsi)
+    return df_tampil
@@ -0,0 +1,113 @@
+"""
+Konversi dan pembersihan angka/Rupiah untuk nilai yang diketik pengguna,
+serta penampil pesan dari modul inti.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from simaya.rupiah import parse_rupiah_series
+from simaya.schema import terapkan_skema
+
+
+def safe_float_convert(value, default=0.0):
+    """Mengonversi value ke float dengan aman - VERSI DIPERBAIKI"""
+    try:
+        if pd.isna(value) or value == '' or value is None:
+            return default
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            # Bersihkan string dari format Rupiah dan karakter non-numerik
+            cleaned = str(value).replace('Rp', '').replace('.', '').replace(',', '.').replace(' ', '').strip()
+            # Hapus karakter non-digit kecuali titik dan minus
+            cleaned = ''.join(ch for ch in cleaned if ch.isdigit() or ch in ['.', '-'])
+            if cleaned == '' or cleaned == '-' or cleaned == '.':
+                return default
+            return float(cleaned)
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def parse_rupiah(rupiah_str):
+    """Parse string rupiah menjadi float"""
+    if not rupiah_str:
+        return 0.0
+    # Hapus titik dan spasi, ganti koma dengan titik untuk decimal
+    clean_str = str(rupiah_str).replace('.', '').replace(' ', '').replace(',', '.')
+    try:
+        return float(clean_str)
+    except:
+        return 0.0
+
+
+def format_rupiah(angka):
+    """Format angka menjadi string dengan pemisah ribuan"""
+    try:
+        if pd.isna(angka) or angka == 0:
+            return "0"
+        # Pastikan angka adalah float/int
+        angka_float = float(angka)
+        return f"{angka_float:,.0f}".replace(",", ".")
+    except Exception as e:
+        print(f"Error format_rupiah: {e}")
+        return "0"
+
+
+def format_angka(x):
+    """Format angka menjadi string dengan pemisah ribuan - VERSI DIPERBAIKI"""
+    try:
+        if pd.isna(x) or x == 0:
+            return "0"
+        # Pastikan x adalah numerik
+        if isinstance(x, str):
+            # Jika string, coba konversi ke float
+            x_clean = safe_float_convert(x)
+        else:
+            x_clean = float(x)
+        
+        return f"Rp {x_clean:,.0f}".replace(",", ".")
+    except Exception as e:
+        print(f"Error format_angka: {e}, value: {x}, type: {type(x)}")
+        return "0"
+
+
+def clean_numeric_data(df, numeric_columns):
+    """Membersihkan data numerik dalam DataFrame - VERSI DIPERBAIKI"""
+    try:
+        df_clean = df.copy()
+        for col in numeric_columns:
+            if col in df_clean.columns:
+                df_clean[col] = parse_rupiah_series(df_clean[col])
+        return df_clean
+    except Exception as e:
+        print(f"Error dalam clean_numeric_data: {e}")
+        return df
+
+
+def validate_transaction_data(df):
+    """Validasi data transaksi sebelum processing - VERSI DIPERBAIKI"""
+    try:
+        if df.empty:
+            return df
+            
+        # Validasi kolom numerik lewat skema (vektor, dilewati jika tipe sudah benar)
+        df_valid = terapkan_skema(df).copy()
+        
+        # Validasi kolom teks
+        text_columns = ['Akun Debit', 'Akun Kredit', 'Keterangan']
+        for col in text_columns:
+            if col in df_valid.columns:
+                df_valid[col] = df_valid[col].fillna('').astype(str)
+        
+        return df_valid
+    except Exception as e:
+        print(f"Error dalam validate_transaction_data: {e}")
+        return df
+
+
+def tampilkan_pesan(pesan):
+    """Tampilkan pesan [(jenis, teks)] dari modul inti dengan st.info/st.warning/st.success/st.error"""
+    for jenis, teks in pesan:
+        getattr(st, jenis)(teks)
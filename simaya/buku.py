@@ -0,0 +1,190 @@
+"""
+Data akuntansi satu periode tanpa Streamlit.
+
+Buku memegang tabel bertipe (skema simaya.schema) dengan nama tabel
+penyimpanan (jurnal_umum, neraca_saldo_sebelumnya, riwayat_persediaan, ...)
+beserta periode dan tanggal awalnya. Buku besar, neraca saldo, laporan dan
+ringkasan persediaan dihitung dari tabel itu dengan modul inti (ledger,
+laporan, inventory) dan dimemo sampai tabel diganti lewat ganti_tabel().
+
+Buku tidak bergantung pada session state sehingga bisa dipakai di batch
+job, proses pekerja maupun benchmark; lapisan simaya.app hanya menyalin
+tabel sesi ke dan dari sini. Untuk proses pekerja kirim path penyimpanan
+dan muat dengan Buku.dari_storage() di sana: mem-pickle seluruh tabel ke
+pekerja lebih mahal daripada perhitungannya (benchmarks/bench_inti.py).
+"""
+
+from datetime import date, datetime
+
+import pandas as pd
+
+from simaya.inventory import barang_persediaan, hitung_ulang_ringkasan, saldo_awal_persediaan
+from simaya.jurnal_log import buka_log, kunci_seq, path_log, putar_ulang, seq_kompaksi, seq_terakhir
+from simaya.laporan import susun_laporan
+from simaya.ledger import bangun_buku_besar, bangun_neraca_saldo
+from simaya.schema import terapkan_skema, terapkan_skema_tabel
+from simaya.storage import KOLOM_TABEL, TABEL_DATABASE
+
+# Tabel sumber (hasil input pengguna); buku_besar, neraca_saldo dan
+# neraca_setelah_penutup adalah turunan yang dihitung ulang
+TABEL_SUMBER = (
+    "jurnal_umum", "jurnal_penyesuaian", "jurnal_penutup", "neraca_saldo_sebelumnya",
+    "penjualan", "pembelian", "persediaan", "riwayat_persediaan",
+)
+
+# Nama tabel jurnal -> kunci jurnal simaya.ledger
+KUNCI_JURNAL = {
+    "jurnal_umum": "df_jurnal_umum",
+    "jurnal_penyesuaian": "df_jurnal_penyesuaian",
+    "jurnal_penutup": "df_jurnal_penutup",
+}
+
+
+def tabel_kosong(nama):
+    return terapkan_skema(pd.DataFrame(columns=KOLOM_TABEL[nama]))
+
+
+def periode_default():
+    return datetime.now().strftime("%B %Y")
+
+
+class Buku:
+    """Tabel sumber satu periode + hasil turunan yang dimemo"""
+
+    def __init__(self, tabel=None, periode=None, tanggal_awal_periode=None, metode_persediaan="Average",
+                 seq_log=None):
+        tabel = tabel or {}
+        self.tabel = {}
+        for nama in TABEL_SUMBER:
+            df = tabel.get(nama)
+            self.tabel[nama] = tabel_kosong(nama) if df is None or len(df.columns) == 0 else terapkan_skema(df)
+        self.periode = periode or periode_default()
+        self.tanggal_awal_periode = tanggal_awal_periode or date.today().replace(day=1)
+        self.metode_persediaan = metode_persediaan
+        # Nomor event log terakhir yang sudah termasuk dalam tabel (buku dari penyimpanan)
+        self.seq_log = seq_log
+        self._memo = {}
+
+    @classmethod
+    def dari_storage(cls, backend, putar_log=True, **opsi):
+        """
+        Buku dari penyimpanan (simaya.storage). Event log jurnal yang belum
+        masuk snapshot ikut diputar ulang seperti saat aplikasi memuat data.
+        """
+        if not putar_log:
+            return cls(terapkan_skema_tabel(backend.muat_semua(list(TABEL_DATABASE))), **opsi)
+        log = buka_log(path_log(backend.path))
+        # Snapshot dan log dibaca tanpa diselingi kompaksi penulis lain
+        with log.kunci():
+            tabel = terapkan_skema_tabel(backend.muat_semua(list(TABEL_DATABASE)))
+            diterapkan, _, seq = putar_ulang(tabel, log, backend.muat_meta())
+        for nama in diterapkan:
+            tabel[nama] = terapkan_skema(tabel[nama])
+        opsi.setdefault("seq_log", seq)
+        return cls(tabel, **opsi)
+
+    @classmethod
+    def dari_session(cls, state, **opsi):
+        """Buku dari mapping key session (df_jurnal_umum, ...) - dipakai lapisan simaya.app"""
+        tabel = {nama: state.get(TABEL_DATABASE[nama]) for nama in TABEL_SUMBER}
+        opsi.setdefault("periode", state.get("periode_sekarang"))
+        opsi.setdefault("tanggal_awal_periode", state.get("tanggal_awal_periode"))
+        opsi.setdefault("metode_persediaan", state.get("metode_persediaan", "Average"))
+        return cls(tabel, **opsi)
+
+    def ganti_tabel(self, nama, df):
+        """Ganti satu tabel sumber; semua hasil turunan dihitung ulang saat diminta"""
+        self.tabel[nama] = terapkan_skema(df)
+        self._memo.clear()
+
+    def _hitung(self, nama, fungsi):
+        if nama not in self._memo:
+            self._memo[nama] = fungsi()
+        return self._memo[nama]
+
+    # ---------------------------------------------------------- turunan
+
+    def jurnal(self):
+        """Jurnal dengan kunci simaya.ledger ({"df_jurnal_umum": df, ...})"""
+        return {kunci: self.tabel[nama] for nama, kunci in KUNCI_JURNAL.items()}
+
+    def buku_besar(self):
+        """(buku_besar_per_akun, df_buku_besar) dari saldo awal + semua jurnal"""
+        return self._hitung("buku_besar", lambda: bangun_buku_besar(
+            self.tabel["neraca_saldo_sebelumnya"], self.jurnal(),
+            tanggal_awal_periode=self.tanggal_awal_periode, periode=self.periode,
+        ))
+
+    def neraca_saldo(self):
+        """(df_neraca_saldo, ringkasan) dari buku besar"""
+        return self._hitung("neraca_saldo", lambda: bangun_neraca_saldo(*self.buku_besar()))
+
+    def laporan(self):
+        """Laba rugi, perubahan modal dan posisi keuangan (lihat simaya.laporan.susun_laporan)"""
+        def hitung():
+            buku_besar_per_akun, df_buku_besar = self.buku_besar()
+            return susun_laporan(
+                self.jurnal(), self.tabel["neraca_saldo_sebelumnya"], buku_besar_per_akun, df_buku_besar,
+                self.neraca_saldo()[0]
+            )
+        return self._hitung("laporan", hitung)
+
+    def persediaan(self):
+        """df_persediaan dihitung ulang dari stok awal + riwayat persediaan dengan metode buku ini"""
+        def hitung():
+            if self.tabel["riwayat_persediaan"].empty:
+                return self.tabel["persediaan"]
+            df_persediaan = self.tabel["persediaan"]
+            return hitung_ulang_ringkasan(
+                self.tabel["riwayat_persediaan"], self.metode_persediaan, barang_persediaan(df_persediaan),
+                saldo_awal_persediaan(df_persediaan)
+            )
+        return self._hitung("persediaan", hitung)
+
+    def tabel_turunan(self):
+        """Tabel turunan yang disimpan aplikasi bersama tabel sumber (nama tabel penyimpanan)"""
+        return {"buku_besar": self.buku_besar()[1], "neraca_saldo": self.neraca_saldo()[0]}
+
+    def tabel_sesi(self):
+        """Tabel sumber, turunan dan laporan dengan key session_state (kebalikan dari_session)"""
+        laporan = self.laporan()
+        tabel = {TABEL_DATABASE[nama]: df for nama, df in self.tabel.items()}
+        tabel.update({TABEL_DATABASE[nama]: df for nama, df in self.tabel_turunan().items()})
+        tabel.update({
+            "df_laporan_laba_rugi": laporan["laba_rugi"],
+            "df_laporan_perubahan_modal": laporan["perubahan_modal"],
+            "df_laporan_posisi_keuangan": laporan["posisi_keuangan"],
+        })
+        return tabel
+
+    # ---------------------------------------------------------- simpan
+
+    def simpan(self, backend, nama_tabel=None, tabel_lain=None):
+        """
+        Tulis tabel buku ke penyimpanan seperti save_to_database(): semua
+        tabel sumber + turunan (atau hanya nama_tabel) ditambah tabel_lain
+        ({nama_tabel: DataFrame}, mis. riwayat_periode). Setiap tabel membawa
+        nomor event log yang sudah termasuk (seq_log); snapshot lengkap membuang
+        event log sampai nomor itu. Buku tanpa seq_log (tidak dimuat dari log)
+        menggantikan seluruh isi log. Mengembalikan jumlah baris ditulis per tabel.
+
+        Raises:
+            ValueError jika log sudah dikompaksi penulis lain sejak buku dimuat
+            (event setelah seq_log hanya ada di snapshot mereka).
+        """
+        tabel = dict(self.tabel)
+        if nama_tabel is None or {"buku_besar", "neraca_saldo"} & set(nama_tabel):
+            tabel.update(self.tabel_turunan())
+        if nama_tabel is not None:
+            tabel = {nama: tabel[nama] for nama in nama_tabel}
+        tabel.update(tabel_lain or {})
+
+        log = buka_log(path_log(backend.path))
+        with log.kunci():
+            seq_log = seq_terakhir(log.path) if self.seq_log is None else self.seq_log
+            if seq_kompaksi(log.path) > seq_log:
+                raise ValueError("Log jurnal sudah dikompaksi sejak buku dimuat; muat ulang buku sebelum menyimpan")
+            ditulis = backend.simpan(tabel, meta={kunci_seq(nama): seq_log for nama in tabel})
+            if nama_tabel is None:
+                log.kosongkan(sampai=seq_log)
+        return ditulis
@@ -0,0 +1,97 @@
+"""
+Cache tingkat proses yang dipakai bersama oleh semua sesi Streamlit.
+
+Modul ini diimpor sekali per proses (tidak ikut dieksekusi ulang saat
+rerun), jadi objek CACHE di bawah bertahan lintas rerun dan lintas tab
+browser. Setiap kunci wajib menyertakan versi data penyimpanan sehingga
+entri lama otomatis tidak terpakai lagi setelah ada penulisan; invalidasi()
+membuang entri versi lama agar memori tidak menumpuk.
+"""
+
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+MAKS_ENTRI_DEFAULT = 128
+
+
+def salin(nilai):
+    """Salinan aman untuk dibagikan ke sesi: DataFrame/Series disalin, dict/list/tuple ditelusuri"""
+    if isinstance(nilai, (pd.DataFrame, pd.Series)):
+        return nilai.copy()
+    if isinstance(nilai, dict):
+        return {k: salin(v) for k, v in nilai.items()}
+    if isinstance(nilai, list):
+        return [salin(v) for v in nilai]
+    if isinstance(nilai, tuple):
+        return tuple(salin(v) for v in nilai)
+    return nilai
+
+
+class CacheProses:
+    """
+    Penyimpanan kunci -> nilai (LRU) yang aman dipakai banyak thread.
+
+    Kunci berbentuk tuple (path_database, versi, nama, ...). Hanya satu
+    thread yang menghitung nilai untuk kunci yang sama; thread lain menunggu
+    lalu memakai hasilnya.
+    """
+
+    def __init__(self, maks_entri=MAKS_ENTRI_DEFAULT):
+        self.maks_entri = maks_entri
+        self._data = OrderedDict()
+        self._kunci_lock = {}
+        self._lock = threading.Lock()
+        self.hit = 0
+        self.miss = 0
+
+    def _lock_untuk(self, kunci):
+        with self._lock:
+            return self._kunci_lock.setdefault(kunci, threading.Lock())
+
+    def ambil_atau_hitung(self, kunci, fungsi):
+        """
+        Kembalikan (nilai, dari_cache). Nilai yang dikembalikan selalu salinan,
+        sehingga sesi boleh mengubahnya tanpa memengaruhi sesi lain.
+        """
+        with self._lock:
+            if kunci in self._data:
+                self._data.move_to_end(kunci)
+                self.hit += 1
+                return salin(self._data[kunci]), True
+
+        with self._lock_untuk(kunci):
+            # Bisa jadi sudah dihitung thread lain selagi menunggu lock
+            with self._lock:
+                if kunci in self._data:
+                    self._data.move_to_end(kunci)
+                    self.hit += 1
+                    return salin(self._data[kunci]), True
+
+            nilai = fungsi()
+            with self._lock:
+                self.miss += 1
+                self._data[kunci] = salin(nilai)
+                while len(self._data) > self.maks_entri:
+                    self._data.popitem(last=False)
+                self._kunci_lock.pop(kunci, None)
+            return nilai, False
+
+    def invalidasi(self, path, versi_sekarang=None):
+        """Buang entri milik database `path` yang versinya bukan versi_sekarang"""
+        with self._lock:
+            for kunci in [k for k in self._data if k[0] == path and k[1] != versi_sekarang]:
+                del self._data[kunci]
+
+    def kosongkan(self):
+        with self._lock:
+            self._data.clear()
+
+    def statistik(self):
+        with self._lock:
+            return {"entri": len(self._data), "hit": self.hit, "miss": self.miss}
+
+
+# Satu instance per proses
+CACHE = CacheProses()
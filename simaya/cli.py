@@ -0,0 +1,188 @@
+"""
+Perintah baris SIMAYA untuk pekerjaan akhir bulan tanpa browser.
+
+    python -m simaya hitung-persediaan --metode FIFO
+    python -m simaya ekspor --keluaran laporan_januari.xlsx
+    python -m simaya tutup-periode --periode "Januari 2025" --tanggal-awal 2025-01-01
+    python -m simaya bulanan        # hitung-persediaan, ekspor, lalu tutup-periode
+    python -m simaya layani-pos --port 8765   # terima transaksi kasir lewat HTTP (simaya.layanan_pos)
+
+Penyimpanan dipilih seperti aplikasi (SIMAYA_STORAGE / SIMAYA_DB, atau
+--storage / --db); workbook database_keuangan.xlsx dimigrasi sekali ke
+SQLite jika database belum ada. Setiap tahap mencetak lama eksekusinya.
+
+Periode dan tanggal awal tidak tersimpan di database (di aplikasi keduanya
+milik sesi), jadi berikan lewat --periode / --tanggal-awal; default-nya sama
+dengan sesi baru. Jalankan saat aplikasi tidak dipakai: sesi yang sedang
+terbuka tidak melihat hasilnya sampai data dimuat ulang.
+"""
+
+import argparse
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from simaya.buku import Buku
+from simaya.ekspor import daftar_sheet, tulis_workbook
+from simaya.inventory import METODE_PERSEDIAAN
+from simaya.layanan_pos import MAKS_ANTREAN, layani
+from simaya.periode import catat_riwayat_periode, tutup_periode
+from simaya.pos import PencatatPOS
+from simaya.schema import terapkan_skema
+from simaya.storage import PATH_EXCEL_DEFAULT, buat_backend, migrasi_excel_ke_sqlite
+
+
+class PencatatWaktu:
+    """Lama setiap tahap (detik), dicetak saat tahap selesai dan sebagai ringkasan"""
+
+    def __init__(self):
+        self.tahap = []
+
+    @contextmanager
+    def ukur(self, nama):
+        mulai = time.perf_counter()
+        try:
+            yield
+        finally:
+            detik = time.perf_counter() - mulai
+            self.tahap.append((nama, detik))
+            print(f"⏱️ {nama}: {detik:.3f}s")
+
+    def cetak_ringkasan(self):
+        if not self.tahap:
+            return
+        lebar = max(len(nama) for nama, _ in self.tahap)
+        print(f"\n{'Tahap':<{lebar}} | {'Waktu (s)':>10}")
+        print("-" * (lebar + 13))
+        for nama, detik in self.tahap:
+            print(f"{nama:<{lebar}} | {detik:>10.3f}")
+        print(f"{'Total':<{lebar}} | {sum(detik for _, detik in self.tahap):>10.3f}")
+
+
+def buka_buku(args, waktu):
+    """(backend, Buku) dari penyimpanan, dengan migrasi workbook lama seperti init_database()"""
+    backend = buat_backend(args.storage, args.db)
+    if backend.jenis == "sqlite" and not backend.ada():
+        migrasi_excel_ke_sqlite(PATH_EXCEL_DEFAULT, backend.path)
+    if not backend.ada():
+        raise FileNotFoundError(f"Database tidak ditemukan: {backend.path}")
+
+    with waktu.ukur("muat data"):
+        buku = Buku.dari_storage(
+            backend, periode=args.periode, tanggal_awal_periode=args.tanggal_awal, metode_persediaan=args.metode
+        )
+    print(f"📂 {backend.jenis} {backend.path} - periode {buku.periode} (mulai {buku.tanggal_awal_periode}), "
+          f"{len(buku.tabel['jurnal_umum'])} baris jurnal umum")
+    return backend, buku
+
+
+def hitung_persediaan(backend, buku, waktu, args):
+    """Setara hitung_ulang_persediaan(): ringkasan persediaan dari riwayat, lalu simpan"""
+    if buku.tabel["riwayat_persediaan"].empty:
+        print("ℹ️ Riwayat persediaan kosong, tidak ada yang dihitung ulang")
+        return
+    with waktu.ukur("hitung ulang persediaan"):
+        buku.ganti_tabel("persediaan", buku.persediaan())
+    with waktu.ukur("simpan persediaan"):
+        buku.simpan(backend, ["persediaan"])
+    print(f"✅ Persediaan dihitung ulang ({buku.metode_persediaan}): {len(buku.tabel['persediaan'])} barang")
+
+
+def ekspor(backend, buku, waktu, args):
+    """Ekspor semua data ke workbook Excel (sheet yang sama dengan tombol Backup)"""
+    with waktu.ukur("buku besar"):
+        buku_besar_per_akun, _ = buku.buku_besar()
+        buku.neraca_saldo()
+    with waktu.ukur("laporan keuangan"):
+        laporan = buku.laporan()
+    for _, teks in laporan["pesan"]:
+        print(teks)
+
+    tabel = buku.tabel_sesi()
+    tabel["df_neraca_saldo_setelah_penutup"] = terapkan_skema(backend.muat_tabel("neraca_setelah_penutup"))
+    keluaran = args.keluaran or f"laporan_keuangan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    with waktu.ukur("tulis workbook"):
+        jumlah = tulis_workbook(keluaran, daftar_sheet(tabel, buku_besar_per_akun))
+    print(f"✅ Ekspor selesai: {keluaran} ({len(jumlah)} sheet, {sum(jumlah.values()):,} baris)")
+
+
+def tutup(backend, buku, waktu, args):
+    """Setara akhiri_periode(): neraca setelah penutup ke riwayat, buka periode baru, simpan"""
+    with waktu.ukur("tutup periode"):
+        hasil = tutup_periode(buku)
+
+    neraca = hasil["neraca_setelah_penutup"]
+    tabel_lain = {}
+    if not neraca.empty:
+        tabel_lain["neraca_setelah_penutup"] = neraca
+        tabel_lain["riwayat_periode"] = catat_riwayat_periode(
+            backend.muat_tabel("riwayat_periode"), hasil["periode"], neraca
+        )
+    with waktu.ukur("simpan periode baru"):
+        hasil["buku_baru"].simpan(backend, tabel_lain=tabel_lain)
+
+    if not neraca.empty:
+        print(f"✅ Neraca saldo periode {hasil['periode']} berhasil disimpan")
+    print(f"✅ Periode berhasil diakhiri. Periode baru: {hasil['periode_baru']} "
+          f"(mulai {hasil['tanggal_awal_periode']})")
+
+
+def layani_pos(backend, buku, waktu, args):
+    """Layanan HTTP transaksi POS sampai Ctrl+C (posting per batch, lihat simaya.layanan_pos)"""
+    with waktu.ukur("siapkan layanan POS"):
+        pencatat = PencatatPOS(backend, buku)
+    layani(pencatat, args.host, args.port, maks_antrean=args.maks_antrean)
+
+
+PERINTAH = {
+    "hitung-persediaan": [hitung_persediaan],
+    "ekspor": [ekspor],
+    "tutup-periode": [tutup],
+    # Urutan akhir bulan: persediaan final, arsip workbook, baru tutup periode
+    "bulanan": [hitung_persediaan, ekspor, tutup],
+    "layani-pos": [layani_pos],
+}
+
+
+def buat_parser():
+    umum = argparse.ArgumentParser(add_help=False)
+    umum.add_argument("--storage", choices=["sqlite", "excel"], help="Jenis penyimpanan (default SIMAYA_STORAGE / sqlite)")
+    umum.add_argument("--db", help="Path database (default SIMAYA_DB / database_keuangan.db)")
+    umum.add_argument("--periode", help='Nama periode berjalan, mis. "Januari 2025" (default bulan ini)')
+    umum.add_argument("--tanggal-awal", type=date.fromisoformat, help="Tanggal awal periode YYYY-MM-DD (default awal bulan ini)")
+    umum.add_argument("--metode", choices=METODE_PERSEDIAAN, default="Average", help="Metode persediaan")
+
+    parser = argparse.ArgumentParser(
+        prog="simaya", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    sub = parser.add_subparsers(dest="perintah", required=True)
+    sub.add_parser("hitung-persediaan", parents=[umum], help="Hitung ulang ringkasan persediaan dari riwayat")
+    for nama, bantuan in (("ekspor", "Ekspor semua data ke Excel"),
+                          ("bulanan", "hitung-persediaan, ekspor, lalu tutup-periode")):
+        sub.add_parser(nama, parents=[umum], help=bantuan).add_argument("--keluaran", help="Path file .xlsx")
+    sub.add_parser("tutup-periode", parents=[umum], help="Akhiri periode berjalan dan buka periode berikutnya")
+    pos = sub.add_parser("layani-pos", parents=[umum], help="Layanan HTTP lokal untuk transaksi kasir (POS)")
+    pos.add_argument("--host", default="127.0.0.1", help="Alamat yang didengarkan (default 127.0.0.1)")
+    pos.add_argument("--port", type=int, default=8765, help="Port HTTP (default 8765)")
+    pos.add_argument("--maks-antrean", type=int, default=MAKS_ANTREAN, help="Transaksi maksimal dalam antrean")
+    return parser
+
+
+def main(argv=None):
+    args = buat_parser().parse_args(argv)
+    waktu = PencatatWaktu()
+    try:
+        backend, buku = buka_buku(args, waktu)
+        for tahap in PERINTAH[args.perintah]:
+            tahap(backend, buku, waktu, args)
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        waktu.cetak_ringkasan()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+ID dokumen sumber SIMAYA.
+
+Setiap transaksi jurnal umum membawa kolom "ID Dokumen" yang stabil: tidak
+ikut berubah ketika kolom No dinomori ulang setelah penghapusan. Baris
+penjualan, pembelian dan riwayat persediaan yang berasal dari dokumen yang
+sama menyimpan ID yang sama, sehingga catatan terkait dapat ditemukan dengan
+tepat tanpa mencocokkan nominal.
+
+IndeksDokumen memetakan No transaksi -> ID dokumen -> posisi baris di setiap
+tabel. Indeks per tabel dibangun sekali per versi tabel (satu pengurutan) dan
+diperbarui di tempat saat baris ditambahkan atau satu dokumen dihapus, sehingga
+hapus berikutnya tidak perlu membangun ulang indeks.
+"""
+
+import bisect
+import uuid
+
+import numpy as np
+import pandas as pd
+
+KOLOM_ID = "ID Dokumen"
+
+# Awalan ID menurut asal dokumen
+AWALAN_JURNAL = "JU"
+AWALAN_PENJUALAN = "PJ"
+AWALAN_PEMBELIAN = "PB"
+
+
+def buat_id_dokumen(awalan=AWALAN_JURNAL):
+    """ID dokumen baru, mis. 'PJ-3F9A0C12B7DE'"""
+    return f"{awalan}-{uuid.uuid4().hex[:12].upper()}"
+
+
+def _ada_id(kolom):
+    """Mask baris yang sudah memiliki ID dokumen (bukan NaN/None/teks kosong)"""
+    return kolom.notna() & kolom.astype(str).str.strip().ne("")
+
+
+def tanpa_id(df):
+    """Mask baris df yang belum memiliki ID dokumen (semua baris jika kolomnya tidak ada)"""
+    if KOLOM_ID not in df.columns:
+        return pd.Series(True, index=df.index)
+    return ~_ada_id(df[KOLOM_ID].astype(object))
+
+
+def _id_dari_isi(df_jurnal, nomor, awalan):
+    """ID per No yang diturunkan dari No + isi baris transaksinya (sama di setiap sesi)"""
+    kolom = [k for k in df_jurnal.columns if k != KOLOM_ID]
+    hash_baris = pd.util.hash_pandas_object(df_jurnal[kolom].astype(str), index=False)
+    per_no = hash_baris.groupby(df_jurnal["No"].to_numpy()).sum()
+    return {no: f"{awalan}-{int(per_no[no]) & 0xFFFFFFFFFFFF:012X}" for no in nomor}
+
+
+def lengkapi_id_dokumen(df_jurnal, awalan=AWALAN_JURNAL, dari_isi=False):
+    """
+    Beri ID dokumen ke transaksi jurnal yang belum memilikinya. Semua baris
+    dengan No yang sama mendapat ID yang sama (ID yang sudah ada pada salah
+    satu baris transaksi dipakai ulang). df asli dikembalikan jika tidak ada
+    yang perlu diisi.
+
+    dari_isi=True: ID diturunkan dari No + isi transaksi alih-alih acak, sehingga
+    sesi-sesi yang memuat data lama yang sama memberi ID yang sama.
+    """
+    if df_jurnal is None or df_jurnal.empty or "No" not in df_jurnal.columns:
+        return df_jurnal
+    if KOLOM_ID in df_jurnal.columns:
+        kolom = df_jurnal[KOLOM_ID].astype(object)
+    else:
+        kolom = pd.Series(None, index=df_jurnal.index, dtype=object)
+    ada = _ada_id(kolom)
+    if ada.all():
+        return df_jurnal
+
+    isi = kolom.where(ada).groupby(df_jurnal["No"]).transform("first")
+    nomor_baru = df_jurnal.loc[isi.isna(), "No"].unique()
+    if dari_isi:
+        id_baru = _id_dari_isi(df_jurnal, nomor_baru, awalan)
+    else:
+        id_baru = {no: buat_id_dokumen(awalan) for no in nomor_baru}
+    isi = isi.fillna(df_jurnal["No"].map(id_baru))
+
+    df = df_jurnal.copy()
+    df[KOLOM_ID] = isi.to_numpy(dtype=object)
+    return df
+
+
+class IndeksTabel:
+    """
+    Posisi baris per ID dokumen untuk satu tabel.
+
+    Disimpan seperti CSR dalam koordinat saat indeks dibangun: kode[id] -> k,
+    posisi asli baris ID tersebut adalah urutan[awal[k]:awal[k + 1]]. Baris
+    yang ditambahkan sesudahnya dicatat di dict tambahan. Baris yang dihapus
+    tidak menggeser array; posisi aslinya disimpan urut di terhapus dan posisi
+    sekarang = posisi asli - jumlah baris terhapus sebelum posisi itu.
+    """
+
+    __slots__ = ("kode", "urutan", "awal", "tambahan", "terhapus", "panjang")
+
+    def __init__(self, df=None):
+        self.kode = {}
+        self.urutan = np.array([], dtype="int64")
+        self.awal = np.zeros(1, dtype="int64")
+        self.tambahan = {}
+        self.terhapus = []
+        self.panjang = 0 if df is None else len(df)
+        if df is None or df.empty or KOLOM_ID not in df.columns:
+            return
+        kolom = df[KOLOM_ID].astype(object)
+        ada = _ada_id(kolom).to_numpy()
+        if not ada.any():
+            return
+        # factorize + satu argsort stabil, tanpa groupby/split per ID
+        kode, id_unik = pd.factorize(kolom.to_numpy()[ada])
+        urutan = np.argsort(kode, kind="stable")
+        self.kode = dict(zip(id_unik.tolist(), range(len(id_unik))))
+        self.urutan = np.flatnonzero(ada)[urutan]
+        self.awal = np.concatenate([[0], np.cumsum(np.bincount(kode, minlength=len(id_unik)))])
+
+    def _asli(self, id_dokumen):
+        k = self.kode.get(id_dokumen)
+        posisi = self.urutan[self.awal[k]:self.awal[k + 1]].tolist() if k is not None else []
+        return posisi + self.tambahan.get(id_dokumen, [])
+
+    def baris(self, id_dokumen):
+        """Posisi baris sekarang milik id_dokumen (array kosong jika tidak ada)"""
+        return np.array(
+            [p - bisect.bisect_left(self.terhapus, p) for p in self._asli(id_dokumen)], dtype="int64"
+        )
+
+    def tambah(self, df_baris):
+        """Catat baris yang ditambahkan di akhir tabel"""
+        if KOLOM_ID in df_baris.columns:
+            kolom = df_baris[KOLOM_ID].astype(object)
+            for lokal in np.flatnonzero(_ada_id(kolom).to_numpy()).tolist():
+                self.tambahan.setdefault(kolom.iat[lokal], []).append(self.panjang + lokal)
+        self.panjang += len(df_baris)
+
+    def hapus(self, id_dokumen):
+        """Buang baris id_dokumen dari indeks; kembalikan posisi sekarang baris tersebut"""
+        posisi = self.baris(id_dokumen)
+        for p in self._asli(id_dokumen):
+            bisect.insort(self.terhapus, p)
+        self.kode.pop(id_dokumen, None)
+        self.tambahan.pop(id_dokumen, None)
+        return posisi
+
+
+class IndeksDokumen:
+    """
+    Indeks dokumen sumber untuk satu sesi.
+
+    Jurnal dipetakan No -> ID dokumen lewat list ID yang urut menurut No
+    (id_nomor). Selama No berurutan 1..n (selalu demikian setelah
+    hapus_transaksi_jurnal) nomor bernilai None dan ID transaksi No adalah
+    id_nomor[No - 1]; penomoran ulang setelah hapus cukup satu del pada list.
+    Jurnal lama dengan No berlubang memakai array nomor yang urut.
+
+    Tabel lain diindeks ID -> posisi baris (IndeksTabel). Setiap tabel
+    disertai tanda versinya; tabel yang berubah di luar tambah()/hapus()
+    diindeks ulang saat sinkron().
+    """
+
+    def __init__(self, tabel_jurnal):
+        self.tabel_jurnal = tabel_jurnal
+        self.tabel = {}
+        self.tanda = {}
+        self.nomor = None
+        self.id_nomor = []
+
+    def sinkron(self, nama, df, tanda):
+        """Indeks ulang satu tabel jika versinya berbeda dari yang terindeks"""
+        if nama in self.tanda and self.tanda[nama] == tanda:
+            return False
+        if nama == self.tabel_jurnal:
+            nomor, self.id_nomor = self._petakan_nomor(df)
+            self.nomor = self._ringkas(nomor)
+        else:
+            self.tabel[nama] = IndeksTabel(df)
+        self.tanda[nama] = tanda
+        return True
+
+    def tambah(self, nama, df_baris, tanda_lama, tanda_baru):
+        """
+        Perbarui indeks untuk baris yang ditambahkan di akhir tabel. Hanya
+        berlaku jika indeks sedang sinkron dengan versi sebelum penambahan;
+        selain itu indeks dibiarkan basi dan dibangun ulang saat sinkron().
+        """
+        if nama not in self.tanda or self.tanda[nama] != tanda_lama:
+            return False
+        if nama == self.tabel_jurnal:
+            nomor, id_nomor = self._petakan_nomor(df_baris)
+            n = len(self.id_nomor)
+            berurutan = len(nomor) == 0 or (nomor[0] == n + 1 and nomor[-1] == n + len(nomor))
+            if self.nomor is not None or not berurutan:
+                nomor_lama = self._nomor()
+                if len(nomor_lama) and len(nomor) and nomor[0] <= nomor_lama[-1]:
+                    # No baru tidak di akhir (jarang): bangun ulang saat sinkron()
+                    self.tanda.pop(nama)
+                    return False
+                self.nomor = self._ringkas(np.concatenate([nomor_lama, nomor]))
+            self.id_nomor.extend(id_nomor)
+        else:
+            self.tabel[nama].tambah(df_baris)
+        self.tanda[nama] = tanda_baru
+        return True
+
+    def hapus(self, nama, daftar_id, tanda_baru):
+        """
+        Buang baris dokumen-dokumen daftar_id dari indeks tabel nama. Dipanggil
+        setelah baris-baris tersebut dihapus dari tabel dalam satu langkah
+        (posisinya diambil dengan baris() sebelum penghapusan).
+        """
+        indeks = self.tabel[nama]
+        for id_dokumen in daftar_id:
+            indeks.hapus(id_dokumen)
+        self.tanda[nama] = tanda_baru
+
+    def hapus_transaksi(self, daftar_no, tanda_baru):
+        """Ikuti hapus_transaksi_jurnal: buang No dalam daftar lalu nomori ulang 1..n"""
+        posisi = [self._cari_nomor(no) for no in daftar_no]
+        if None in posisi:
+            # Ada No yang tidak terindeks: penomoran ulang tidak bisa diikuti, bangun ulang saat sinkron()
+            self.tanda.pop(self.tabel_jurnal, None)
+            return
+        if len(posisi) == 1:
+            del self.id_nomor[posisi[0]]
+        else:
+            dibuang = set(posisi)
+            self.id_nomor = [id_dokumen for i, id_dokumen in enumerate(self.id_nomor) if i not in dibuang]
+        self.nomor = None
+        self.tanda[self.tabel_jurnal] = tanda_baru
+
+    def id_transaksi(self, no):
+        """ID dokumen transaksi jurnal bernomor no (None untuk data lama tanpa ID)"""
+        i = self._cari_nomor(no)
+        return None if i is None else self.id_nomor[i]
+
+    def baris(self, nama, id_dokumen):
+        """Posisi baris tabel nama yang berasal dari id_dokumen"""
+        indeks = self.tabel.get(nama)
+        return np.array([], dtype="int64") if indeks is None else indeks.baris(id_dokumen)
+
+    def _cari_nomor(self, no):
+        if self.nomor is None:
+            return no - 1 if 1 <= no <= len(self.id_nomor) else None
+        i = int(np.searchsorted(self.nomor, no))
+        return i if i < len(self.nomor) and self.nomor[i] == no else None
+
+    def _nomor(self):
+        return np.arange(1, len(self.id_nomor) + 1) if self.nomor is None else self.nomor
+
+    @staticmethod
+    def _ringkas(nomor):
+        """None jika nomor tepat 1..n"""
+        return None if len(nomor) == 0 or (nomor[0] == 1 and nomor[-1] == len(nomor)) else nomor
+
+    @staticmethod
+    def _petakan_nomor(df):
+        """(No unik terurut, ID dokumen per No atau None)"""
+        if df is None or df.empty or "No" not in df.columns:
+            return np.array([], dtype="int64"), []
+        nomor, pertama = np.unique(df["No"].to_numpy(), return_index=True)
+        if KOLOM_ID not in df.columns:
+            return nomor, [None] * len(nomor)
+        kolom = df[KOLOM_ID].astype(object).iloc[pertama]
+        return nomor, kolom.where(_ada_id(kolom), None).tolist()
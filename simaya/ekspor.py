@@ -0,0 +1,239 @@
+"""
+Ekspor workbook Excel SIMAYA secara streaming.
+
+Workbook ditulis dengan xlsxwriter mode constant_memory: setiap baris
+langsung di-flush ke file sementara di disk sehingga memori yang dipakai
+tidak bertambah mengikuti jumlah baris. Nilai diambil per kolom langsung
+dari DataFrame bertipe (tanpa df.copy() / to_excel per sheet), lalu file
+selesai dipindahkan ke path tujuan secara atomik.
+"""
+
+import functools
+import numbers
+import os
+import re
+import tempfile
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+FOLDER_EKSPOR = os.path.join(tempfile.gettempdir(), "simaya_ekspor")
+
+# Batas Excel untuk nama sheet dan karakter yang tidak diizinkan
+PANJANG_NAMA_SHEET = 31
+_KARAKTER_TERLARANG = re.compile(r"[\[\]:*?/\\]")
+
+# Baris yang dikonversi ke nilai Python sekaligus (membatasi memori per sheet)
+UKURAN_BLOK = 10_000
+
+OPSI_WORKBOOK = {
+    "constant_memory": True,
+    # Teks dari data ditulis apa adanya (bukan rumus/URL)
+    "strings_to_formulas": False,
+    "strings_to_urls": False,
+}
+
+
+def nama_sheet(nama, terpakai):
+    """
+    Nama sheet yang sah dan unik (maks. 31 karakter, tanpa []:*?/\\).
+    Nama yang bentrok setelah dipotong diberi akhiran ' (2)', ' (3)', ...
+    terpakai (set, huruf kecil) diperbarui di tempat.
+    """
+    dasar = _KARAKTER_TERLARANG.sub("_", str(nama)).strip("'").strip() or "Sheet"
+    kandidat = dasar[:PANJANG_NAMA_SHEET]
+    ke = 2
+    while kandidat.lower() in terpakai:
+        akhiran = f" ({ke})"
+        kandidat = dasar[:PANJANG_NAMA_SHEET - len(akhiran)] + akhiran
+        ke += 1
+    terpakai.add(kandidat.lower())
+    return kandidat
+
+
+def _nilai_kolom(kolom):
+    """
+    List nilai sel satu kolom: angka tetap angka, tanggal/teks menjadi str,
+    kosong/NaN menjadi None (sel dilewati).
+    """
+    jenis = kolom.dtype.kind if isinstance(kolom.dtype, np.dtype) else None
+    if jenis in ("b", "i", "u"):
+        return kolom.to_numpy().tolist()
+    if jenis == "f":
+        nilai = kolom.to_numpy()
+        # NaN/inf tidak bisa ditulis sebagai angka Excel: sel dikosongkan
+        kosong = ~np.isfinite(nilai)
+        return np.where(kosong, None, nilai.astype(object)).tolist() if kosong.any() else nilai.tolist()
+    kosong = kolom.isna().tolist()
+    if jenis == "M":
+        teks = kolom.astype(str).tolist()
+        return [None if k else v for v, k in zip(teks, kosong)]
+    return [
+        None if k else v if isinstance(v, (str, numbers.Number)) else str(v)
+        for v, k in zip(kolom.tolist(), kosong)
+    ]
+
+
+def siapkan_blok(df, awal):
+    """Nilai sel per kolom untuk baris awal..awal + UKURAN_BLOK"""
+    blok = df.iloc[awal:awal + UKURAN_BLOK]
+    return [_nilai_kolom(blok.iloc[:, i]) for i in range(blok.shape[1])]
+
+
+def _penulis_kolom(worksheet, df):
+    """
+    Method tulis per kolom menurut dtype: kolom angka/teks murni langsung ke
+    write_number/write_string (tanpa deteksi tipe per sel), kolom campuran
+    lewat write().
+    """
+    penulis = []
+    for dtype in df.dtypes:
+        jenis = dtype.kind if isinstance(dtype, np.dtype) else None
+        if jenis in ("i", "u", "f"):
+            penulis.append(worksheet.write_number)
+        elif jenis == "b":
+            penulis.append(worksheet.write_boolean)
+        elif jenis == "M" or isinstance(dtype, pd.StringDtype):
+            penulis.append(worksheet.write_string)
+        else:
+            penulis.append(worksheet.write)
+    return list(enumerate(penulis))
+
+
+def _tulis_blok(penulis, kolom, baris_awal):
+    for baris, isi in enumerate(zip(*kolom), start=baris_awal):
+        for c, tulis in penulis:
+            nilai = isi[c]
+            if nilai is not None:
+                tulis(baris, c, nilai)
+
+
+def tulis_workbook(path, daftar_sheet, kemajuan=None):
+    """
+    Tulis workbook ke path dari iterable (nama, sumber). Sumber berupa
+    DataFrame atau fungsi tanpa argumen yang menghasilkan DataFrame (dihitung
+    saat sheet-nya ditulis, mis. ringkasan). Sheet None/kosong dilewati; nama
+    sheet dirapikan dengan nama_sheet(). File ditulis ke path sementara lalu
+    diganti atomik.
+
+    Nilai sel disiapkan per blok UKURAN_BLOK baris lalu langsung ditulis,
+    semuanya di thread pemanggil (menyiapkan blok di thread lain tidak lebih
+    cepat karena GIL, lihat benchmarks/bench_ekspor_buku_besar.py).
+
+    kemajuan (opsional) punya method baris(n) dan sheet(nama) untuk laporan
+    progres. Mengembalikan dict {nama sheet: jumlah baris}.
+    """
+    sementara = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    terpakai, jumlah = set(), {}
+    try:
+        workbook = xlsxwriter.Workbook(sementara, OPSI_WORKBOOK)
+        format_header = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        try:
+            for nama, df in daftar_sheet:
+                if callable(df):
+                    df = df()
+                if df is None or df.empty:
+                    continue
+                nama = nama_sheet(nama, terpakai)
+                worksheet = workbook.add_worksheet(nama)
+                worksheet.write_row(0, 0, [str(k) for k in df.columns], format_header)
+                penulis = _penulis_kolom(worksheet, df)
+                for awal in range(0, len(df), UKURAN_BLOK):
+                    _tulis_blok(penulis, siapkan_blok(df, awal), awal + 1)
+                    if kemajuan is not None:
+                        kemajuan.baris(min(UKURAN_BLOK, len(df) - awal))
+                jumlah[nama] = len(df)
+                if kemajuan is not None:
+                    kemajuan.sheet(nama)
+            if not jumlah:
+                workbook.add_worksheet("Info").write_row(0, 0, ["Pesan", "Tidak ada data untuk diexport"])
+        finally:
+            workbook.close()
+        os.replace(sementara, path)
+    finally:
+        if os.path.exists(sementara):
+            os.remove(sementara)
+    return jumlah
+
+
+# Tabel (key session_state) yang diekspor -> nama sheet
+SHEET_EKSPOR = {
+    "df_jurnal_umum": "Jurnal Umum",
+    "df_jurnal_penyesuaian": "Jurnal Penyesuaian",
+    "df_neraca_saldo_periode_sebelumnya": "Neraca Saldo Periode Sebelumnya",
+    "df_buku_besar": "Buku Besar",
+    "df_neraca_saldo": "Neraca Saldo",
+    "df_laporan_laba_rugi": "Laporan Laba Rugi",
+    "df_laporan_perubahan_modal": "Laporan Perubahan Modal",
+    "df_laporan_posisi_keuangan": "Laporan Posisi Keuangan",
+    "df_jurnal_penutup": "Jurnal Penutup",
+    "df_neraca_saldo_setelah_penutup": "Neraca Saldo Setelah Penutup",
+    "df_penjualan": "Penjualan",
+    "df_pembelian": "Pembelian",
+    "df_persediaan": "Persediaan",
+    "df_riwayat_persediaan": "Riwayat Persediaan"
+}
+
+
+def ringkasan_buku_besar(buku_besar_per_akun):
+    """Satu baris per akun: total debit/kredit, saldo akhir, jumlah transaksi dan posisi saldo"""
+    ringkasan_akun = []
+    for akun, df_akun in buku_besar_per_akun.items():
+        if not df_akun.empty:
+            saldo_akhir = df_akun["Saldo (Rp)"].iloc[-1]
+            ringkasan_akun.append({
+                "Nama Akun": akun,
+                "Total Debit": df_akun["Debit (Rp)"].sum(),
+                "Total Kredit": df_akun["Kredit (Rp)"].sum(),
+                "Saldo Akhir": saldo_akhir,
+                "Jumlah Transaksi": len(df_akun),
+                "Posisi": "Debit" if saldo_akhir > 0 else "Kredit" if saldo_akhir < 0 else "Nol"
+            })
+    return pd.DataFrame(ringkasan_akun)
+
+
+def daftar_sheet(tabel, buku_besar_per_akun=None):
+    """
+    (nama sheet, DataFrame atau fungsi penghasil DataFrame) untuk workbook
+    ekspor semua data. tabel: mapping key session_state -> DataFrame
+    (st.session_state atau Buku.tabel_sesi()); tabel tidak disalin.
+    """
+    for key, sheet_name in SHEET_EKSPOR.items():
+        df = tabel.get(key)
+        if isinstance(df, pd.DataFrame):
+            yield sheet_name, df
+    
+    # Buku besar per akun: satu sheet per akun; ringkasan dihitung saat sheet-nya ditulis
+    buku_besar_per_akun = buku_besar_per_akun or {}
+    for akun, df_akun in buku_besar_per_akun.items():
+        yield f"Buku Besar - {akun}", df_akun
+    yield "Ringkasan_Buku_Besar", functools.partial(ringkasan_buku_besar, buku_besar_per_akun)
+    
+    ringkasan = {
+        "Jenis Laporan": ["Jurnal Umum", "Jurnal Penyesuaian", "Buku Besar", "Neraca Saldo", "Penjualan", "Pembelian", "Persediaan"],
+        "Jumlah Transaksi": [
+            len(tabel.get(key, pd.DataFrame()))
+            for key in ("df_jurnal_umum", "df_jurnal_penyesuaian", "df_buku_besar", "df_neraca_saldo",
+                        "df_penjualan", "df_pembelian", "df_persediaan")
+        ],
+        "Tanggal Backup": [datetime.now().strftime("%Y-%m-%d %H:%M:%S")] * 7
+    }
+    yield "Ringkasan_Backup", pd.DataFrame(ringkasan)
+
+
+def path_ekspor_baru(awalan="ekspor"):
+    """Path unik di FOLDER_EKSPOR untuk artefak ekspor baru"""
+    os.makedirs(FOLDER_EKSPOR, exist_ok=True)
+    return os.path.join(FOLDER_EKSPOR, f"{awalan}_{uuid.uuid4().hex[:12]}.xlsx")
+
+
+def hapus_ekspor(path):
+    """Buang artefak ekspor lama (diam jika sudah tidak ada)"""
+    try:
+        if path and os.path.exists(path):
+            os.remove(path)
+    except OSError as e:
+        print(f"⚠️ Gagal menghapus file ekspor lama: {e}")
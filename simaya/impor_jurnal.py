@@ -0,0 +1,269 @@
+"""
+Impor massal baris jurnal umum dari CSV/XLSX.
+
+File dibaca per potongan (pd.read_csv chunksize / openpyxl read-only
+iter_rows), setiap potongan divalidasi secara vektor, dan hanya baris valid
+beserta jumlah debit/kredit per No yang disimpan sampai akhir. Setelah
+seluruh file terbaca, transaksi yang tidak seimbang atau memiliki baris tidak
+valid ditolak utuh; sisanya dinomori ulang melanjutkan No jurnal yang ada.
+
+Kesalahan dilaporkan per baris file (nomor baris termasuk header) tanpa
+menghentikan impor.
+"""
+
+import csv
+import io
+import os
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from simaya.rupiah import parse_rupiah_series
+
+KOLOM_IMPOR = ["No", "Tanggal", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)"]
+KOLOM_KESALAHAN = ["Baris", "No", "Kesalahan"]
+
+UKURAN_POTONGAN = 50_000
+
+# Selisih debit-kredit per transaksi yang masih dianggap seimbang (pembulatan)
+TOLERANSI_SEIMBANG = 0.5
+
+
+# ---------- pembacaan per potongan ----------
+
+def _buka(sumber):
+    """Path atau file upload -> objek file biner yang bisa di-seek"""
+    if isinstance(sumber, (str, os.PathLike)):
+        return open(sumber, "rb")
+    if hasattr(sumber, "seek"):
+        sumber.seek(0)
+    return sumber
+
+
+def _jenis_file(sumber, nama_file=None):
+    nama = nama_file or getattr(sumber, "name", None) or (sumber if isinstance(sumber, str) else "")
+    return "xlsx" if str(nama).lower().endswith((".xlsx", ".xlsm")) else "csv"
+
+
+def _pemisah_csv(f):
+    """Tebak pemisah CSV (',' atau ';') dari potongan awal file"""
+    contoh = f.read(64 * 1024)
+    f.seek(0)
+    if isinstance(contoh, bytes):
+        contoh = contoh.decode("utf-8-sig", errors="ignore")
+    try:
+        return csv.Sniffer().sniff(contoh, delimiters=",;\t").delimiter
+    except csv.Error:
+        return ","
+
+
+def _potongan_csv(f, ukuran):
+    teks = io.TextIOWrapper(f, encoding="utf-8-sig", newline="") if not isinstance(f, io.TextIOBase) else f
+    pemisah = _pemisah_csv(teks)
+    yield from pd.read_csv(teks, sep=pemisah, chunksize=ukuran, skipinitialspace=True)
+
+
+def _potongan_xlsx(f, ukuran):
+    workbook = load_workbook(f, read_only=True, data_only=True)
+    try:
+        baris = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(baris, None)
+        if header is None:
+            return
+        kolom = ["" if h is None else str(h) for h in header]
+        kumpulan = []
+        for isi in baris:
+            kumpulan.append(isi)
+            if len(kumpulan) >= ukuran:
+                yield pd.DataFrame(kumpulan, columns=kolom)
+                kumpulan = []
+        if kumpulan:
+            yield pd.DataFrame(kumpulan, columns=kolom)
+    finally:
+        workbook.close()
+
+
+def baca_potongan(sumber, nama_file=None, ukuran=UKURAN_POTONGAN):
+    """Iterasi DataFrame potongan file CSV/XLSX (kolom apa adanya dari header)"""
+    f = _buka(sumber)
+    try:
+        if _jenis_file(sumber, nama_file) == "xlsx":
+            yield from _potongan_xlsx(f, ukuran)
+        else:
+            yield from _potongan_csv(f, ukuran)
+    finally:
+        if isinstance(sumber, (str, os.PathLike)):
+            f.close()
+
+
+def _samakan_kolom(df):
+    """Cocokkan header tanpa memperhatikan huruf besar/spasi; ValueError jika ada kolom wajib yang hilang"""
+    peta = {str(k).strip().lower(): k for k in df.columns}
+    hilang = [k for k in KOLOM_IMPOR if k.lower() not in peta]
+    if hilang:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(hilang)}")
+    return df[[peta[k.lower()] for k in KOLOM_IMPOR]].set_axis(KOLOM_IMPOR, axis=1)
+
+
+# ---------- validasi ----------
+
+def _teks(kolom):
+    """Kolom akun -> teks ter-trim; kosong/NaN -> ''"""
+    return kolom.astype(object).where(kolom.notna(), "").astype(str).str.strip()
+
+
+def _kosong(kolom):
+    return kolom.isna().to_numpy() | kolom.astype(str).str.strip().eq("").to_numpy()
+
+
+def _tanggal(kolom):
+    """ISO (YYYY-MM-DD) lebih dulu; sisanya format Indonesia hari/bulan/tahun"""
+    hasil = pd.to_datetime(kolom, errors="coerce", format="ISO8601")
+    sisa = hasil.isna() & ~pd.Series(_kosong(kolom), index=kolom.index)
+    if sisa.any():
+        hasil[sisa] = pd.to_datetime(kolom[sisa], errors="coerce", format="mixed", dayfirst=True)
+    return hasil
+
+
+def _jumlah(kolom):
+    """(nilai float64 dengan kosong = 0, mask nilai tidak valid)"""
+    nilai = parse_rupiah_series(kolom, default=np.nan)
+    kosong = _kosong(kolom)
+    tidak_valid = nilai.isna().to_numpy() & ~kosong
+    return nilai.fillna(0.0).to_numpy(dtype="float64"), tidak_valid
+
+
+def validasi_potongan(df, daftar_akun, baris_awal=2):
+    """
+    Validasi satu potongan secara vektor.
+
+    Mengembalikan (df_valid, df_kesalahan, no_per_baris): df_valid berkolom
+    Baris + KOLOM_IMPOR dengan No asli dari file, df_kesalahan berkolom
+    KOLOM_KESALAHAN, no_per_baris No (float, NaN jika tidak valid) setiap
+    baris potongan. baris_awal adalah nomor baris file untuk baris pertama
+    potongan (baris 1 = header).
+    """
+    df = _samakan_kolom(df).reset_index(drop=True)
+    n = len(df)
+    akun_sah = set(daftar_akun)
+    pesan = [[] for _ in range(n)]
+
+    def tandai(mask, teks):
+        for i in np.flatnonzero(mask):
+            pesan[i].append(teks)
+
+    no = pd.to_numeric(df["No"], errors="coerce").to_numpy(dtype="float64")
+    tandai(np.isnan(no) | (no != np.round(no)) | (no < 1), "No tidak valid")
+
+    tanggal = _tanggal(df["Tanggal"])
+    tandai(tanggal.isna().to_numpy(), "Tanggal tidak valid")
+
+    akun_debit = _teks(df["Akun Debit"])
+    akun_kredit = _teks(df["Akun Kredit"])
+    debit, debit_salah = _jumlah(df["Debit (Rp)"])
+    kredit, kredit_salah = _jumlah(df["Kredit (Rp)"])
+    tandai(debit_salah, "Debit bukan angka")
+    tandai(kredit_salah, "Kredit bukan angka")
+    tandai((debit < 0) | (kredit < 0), "Jumlah tidak boleh negatif")
+    tandai((debit <= 0) & (kredit <= 0) & ~debit_salah & ~kredit_salah,
+           "Salah satu jumlah debit atau kredit harus lebih dari 0")
+
+    ada_debit = akun_debit.ne("").to_numpy()
+    ada_kredit = akun_kredit.ne("").to_numpy()
+    tandai((debit > 0) & ~ada_debit, "Akun debit kosong")
+    tandai((kredit > 0) & ~ada_kredit, "Akun kredit kosong")
+    tandai(ada_debit & ~akun_debit.isin(akun_sah).to_numpy(), "Akun debit tidak ada di daftar akun")
+    tandai(ada_kredit & ~akun_kredit.isin(akun_sah).to_numpy(), "Akun kredit tidak ada di daftar akun")
+    tandai(ada_debit & (akun_debit == akun_kredit).to_numpy(), "Akun debit dan kredit tidak boleh sama")
+
+    salah = np.fromiter((bool(p) for p in pesan), dtype=bool, count=n)
+    valid = ~salah
+    df_valid = pd.DataFrame({
+        "Baris": np.flatnonzero(valid) + baris_awal,
+        "No": no[valid].astype("int64"),
+        "Tanggal": tanggal[valid].dt.date.to_numpy(),
+        "Akun Debit": akun_debit[valid].to_numpy(),
+        "Debit (Rp)": debit[valid],
+        "Akun Kredit": akun_kredit[valid].to_numpy(),
+        "Kredit (Rp)": kredit[valid],
+    })
+    indeks_salah = np.flatnonzero(salah)
+    df_kesalahan = pd.DataFrame({
+        "Baris": indeks_salah + baris_awal,
+        "No": df["No"].to_numpy()[indeks_salah],
+        "Kesalahan": ["; ".join(pesan[i]) for i in indeks_salah],
+    }, columns=KOLOM_KESALAHAN)
+    return df_valid, df_kesalahan, no
+
+
+def _gabung_kesalahan(kesalahan):
+    if not kesalahan:
+        return pd.DataFrame(columns=KOLOM_KESALAHAN)
+    return pd.concat(kesalahan, ignore_index=True).sort_values("Baris", kind="stable").reset_index(drop=True)
+
+
+def impor_jurnal(sumber, daftar_akun, nomor_awal=0, nama_file=None, ukuran=UKURAN_POTONGAN):
+    """
+    Baca, validasi dan susun baris jurnal dari file CSV/XLSX.
+
+    Mengembalikan (df_jurnal, df_kesalahan, ringkasan):
+    - df_jurnal: baris transaksi yang diterima (KOLOM_IMPOR), No dinomori
+      ulang mulai nomor_awal + 1 menurut urutan kemunculan di file;
+    - df_kesalahan: kesalahan per baris file (Baris, No, Kesalahan);
+    - ringkasan: dict jumlah baris, baris/transaksi diterima dan ditolak,
+      jumlah potongan.
+    Kolom wajib yang hilang menghasilkan ValueError (seluruh file ditolak).
+    """
+    valid, kesalahan = [], []
+    total_debit = pd.Series(dtype="float64")
+    total_kredit = pd.Series(dtype="float64")
+    no_tidak_valid = set()
+    baris_awal, potongan = 2, 0
+
+    for df in baca_potongan(sumber, nama_file, ukuran):
+        df_valid, df_salah, no = validasi_potongan(df, daftar_akun, baris_awal)
+        valid.append(df_valid)
+        if not df_salah.empty:
+            kesalahan.append(df_salah)
+            # Transaksi yang memiliki baris tidak valid ditolak utuh
+            no_salah = no[df_salah["Baris"].to_numpy() - baris_awal]
+            no_tidak_valid.update(no_salah[~np.isnan(no_salah)].astype("int64").tolist())
+        # Hanya jumlah per No yang dibawa antar potongan untuk cek keseimbangan
+        jumlah = df_valid.groupby("No")[["Debit (Rp)", "Kredit (Rp)"]].sum()
+        total_debit = total_debit.add(jumlah["Debit (Rp)"], fill_value=0.0)
+        total_kredit = total_kredit.add(jumlah["Kredit (Rp)"], fill_value=0.0)
+        baris_awal += len(df)
+        potongan += 1
+
+    df = pd.concat(valid, ignore_index=True) if valid else pd.DataFrame(columns=["Baris"] + KOLOM_IMPOR)
+
+    selisih = (total_debit - total_kredit).abs()
+    tidak_seimbang = selisih.index[selisih > TOLERANSI_SEIMBANG].difference(list(no_tidak_valid))
+    ditolak = df["No"].isin(no_tidak_valid) | df["No"].isin(tidak_seimbang)
+    if ditolak.any():
+        df_tolak = df[ditolak]
+        pesan_seimbang = (
+            "Transaksi tidak seimbang: debit " + total_debit[tidak_seimbang].map("{:,.0f}".format)
+            + ", kredit " + total_kredit[tidak_seimbang].map("{:,.0f}".format)
+        )
+        kesalahan.append(pd.DataFrame({
+            "Baris": df_tolak["Baris"].to_numpy(),
+            "No": df_tolak["No"].to_numpy(),
+            "Kesalahan": df_tolak["No"].map(pesan_seimbang)
+                .fillna("Transaksi ditolak: ada baris lain yang tidak valid").to_numpy(),
+        }, columns=KOLOM_KESALAHAN))
+
+    df = df[~ditolak]
+    kode, _ = pd.factorize(df["No"])
+    df_jurnal = df[KOLOM_IMPOR].reset_index(drop=True)
+    df_jurnal["No"] = (kode + nomor_awal + 1).astype("int64")
+
+    ringkasan = {
+        "baris": baris_awal - 2,
+        "baris_diterima": len(df_jurnal),
+        "transaksi_diterima": int(kode.max()) + 1 if len(kode) else 0,
+        "transaksi_ditolak": len(no_tidak_valid) + len(tidak_seimbang),
+        "potongan": potongan,
+    }
+    return df_jurnal, _gabung_kesalahan(kesalahan), ringkasan
@@ -0,0 +1,417 @@
+"""
+Mesin persediaan perpetual SIMAYA.
+
+Satu objek MesinPersediaan memegang status semua barang dalam dict
+{barang: StokBarang}. Setiap barang menyimpan kuantitas dan nilai berjalan,
+plus lapisan biaya (deque [kuantitas, harga]) untuk FIFO/LIFO:
+
+- Average : penerimaan dan pengeluaran O(1) (kuantitas & nilai berjalan).
+- FIFO    : penerimaan di kanan deque, pengeluaran dari kiri.
+- LIFO    : penerimaan di kanan deque, pengeluaran dari kanan.
+  Setiap lapisan habis paling banyak sekali, jadi biaya per pergerakan O(1)
+  teramortisasi.
+
+Stok, harga rata-rata, HPP penjualan, tabel df_persediaan dan kartu stok per
+barang semuanya dibaca dari mesin ini; df_riwayat_persediaan adalah urutan
+pergerakan yang dipakai untuk membangunnya ulang.
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+METODE_PERSEDIAAN = ("Average", "FIFO", "LIFO")
+
+# Barang yang selalu ada di df_persediaan selama tabel itu masih kosong
+BARANG_DEFAULT = ["Ayam Jago", "Ayam Broiler", "Telur Ayam"]
+
+KOLOM_PERSEDIAAN = [
+    "Barang", "Stok Awal", "Nilai Awal", "Pembelian", "Penjualan", "Stok Akhir", "Harga Rata-rata", "Total Nilai"
+]
+
+KOLOM_KARTU_STOK = [
+    "Tanggal", "Keterangan",
+    "Kuantitas_Masuk", "Harga_Unit_Masuk", "Jumlah_Masuk",
+    "Kuantitas_Keluar", "Harga_Unit_Keluar", "Jumlah_Keluar",
+    "Kuantitas_Balance", "Harga_Rata_Balance", "Jumlah_Balance",
+]
+
+# Sisa kuantitas/nilai sekecil ini dianggap nol (galat pembulatan float)
+EPSILON = 1e-9
+
+
+class StokBarang:
+    """Status persediaan satu barang"""
+
+    __slots__ = (
+        "stok_awal", "nilai_awal", "pembelian", "penjualan", "qty", "nilai", "lapisan", "harga_terakhir",
+        "kartu", "cache_kartu",
+    )
+
+    def __init__(self):
+        self.stok_awal = 0.0
+        self.nilai_awal = 0.0
+        self.pembelian = 0.0
+        self.penjualan = 0.0
+        self.qty = 0.0
+        self.nilai = 0.0
+        self.lapisan = deque()
+        self.harga_terakhir = 0.0
+        # Baris kartu stok (tuple sesuai KOLOM_KARTU_STOK); cache_kartu = (DataFrame, tanggal)
+        # dibuat saat pertama dibaca dan dibuang setiap ada pergerakan baru
+        self.kartu = []
+        self.cache_kartu = None
+
+    @property
+    def harga_rata(self):
+        return self.nilai / self.qty if self.qty > 0 else 0.0
+
+    def _tambah_lapisan(self, jumlah, harga):
+        # Penerimaan berturut-turut dengan harga sama digabung dalam satu lapisan
+        if self.lapisan and self.lapisan[-1][1] == harga:
+            self.lapisan[-1][0] += jumlah
+        else:
+            self.lapisan.append([jumlah, harga])
+
+    def hpp(self, jumlah, metode):
+        """Total HPP untuk mengeluarkan jumlah unit tanpa mengubah status"""
+        if metode == "Average":
+            return jumlah * self.harga_rata
+        sisa, total = jumlah, 0.0
+        urutan = self.lapisan if metode == "FIFO" else reversed(self.lapisan)
+        for qty, harga in urutan:
+            ambil = min(sisa, qty)
+            total += ambil * harga
+            sisa -= ambil
+            if sisa <= EPSILON:
+                return total
+        # Stok kurang: kelebihan dinilai dengan harga penerimaan terakhir
+        return total + sisa * self.harga_terakhir
+
+
+class MesinPersediaan:
+    """Persediaan perpetual semua barang dengan metode Average, FIFO atau LIFO"""
+
+    def __init__(self, metode="Average", barang=()):
+        if metode not in METODE_PERSEDIAAN:
+            raise ValueError(f"Metode persediaan tidak dikenal: {metode}")
+        self.metode = metode
+        self.barang = {}
+        for nama in barang:
+            self._stok(nama)
+
+    def _stok(self, barang):
+        stok = self.barang.get(barang)
+        if stok is None:
+            stok = self.barang[barang] = StokBarang()
+        return stok
+
+    # ---------------------------------------------------------- pergerakan
+
+    def saldo_awal(self, barang, jumlah, harga, nilai=None):
+        """Isi stok awal barang (sebelum pergerakan apa pun)"""
+        stok = self._stok(barang)
+        if nilai is None:
+            nilai = jumlah * harga
+        stok.stok_awal += jumlah
+        stok.nilai_awal += nilai
+        stok.qty += jumlah
+        stok.nilai += nilai
+        if jumlah > 0:
+            stok.harga_terakhir = harga
+            if self.metode != "Average":
+                stok._tambah_lapisan(jumlah, harga)
+
+    def terima(self, barang, jumlah, harga, nilai=None, tanggal=None, keterangan=""):
+        """Catat penerimaan (pembelian); kembalikan stok setelahnya"""
+        stok = self._stok(barang)
+        if nilai is None:
+            nilai = jumlah * harga
+        stok.pembelian += jumlah
+        stok.qty += jumlah
+        stok.nilai += nilai
+        stok.harga_terakhir = harga
+        if self.metode != "Average":
+            stok._tambah_lapisan(jumlah, harga)
+        stok.kartu.append((
+            tanggal, keterangan, jumlah, harga, nilai, 0.0, 0.0, 0.0,
+            stok.qty, stok.harga_rata, stok.nilai
+        ))
+        stok.cache_kartu = None
+        return stok.qty
+
+    def keluarkan(self, barang, jumlah, tanggal=None, keterangan=""):
+        """Catat pengeluaran (penjualan); kembalikan total HPP sesuai metode"""
+        stok = self._stok(barang)
+        metode = self.metode
+        if metode == "Average":
+            total = jumlah * stok.harga_rata
+        else:
+            lapisan = stok.lapisan
+            ambil_dari = lapisan.popleft if metode == "FIFO" else lapisan.pop
+            indeks = 0 if metode == "FIFO" else -1
+            sisa, total = jumlah, 0.0
+            while sisa > EPSILON and lapisan:
+                lapis = lapisan[indeks]
+                if lapis[0] <= sisa + EPSILON:
+                    ambil_dari()
+                    total += lapis[0] * lapis[1]
+                    sisa -= lapis[0]
+                else:
+                    lapis[0] -= sisa
+                    total += sisa * lapis[1]
+                    sisa = 0.0
+            if sisa > EPSILON:
+                total += sisa * stok.harga_terakhir
+
+        stok.penjualan += jumlah
+        stok.qty -= jumlah
+        stok.nilai -= total
+        if abs(stok.qty) <= EPSILON:
+            stok.qty = 0.0
+        if abs(stok.nilai) <= EPSILON * max(1.0, abs(total)):
+            stok.nilai = 0.0
+        harga_unit = total / jumlah if jumlah else 0.0
+        stok.kartu.append((
+            tanggal, keterangan, 0.0, 0.0, 0.0, jumlah, harga_unit, total,
+            stok.qty, stok.harga_rata, stok.nilai
+        ))
+        stok.cache_kartu = None
+        return total
+
+    # ---------------------------------------------------------- pembacaan
+
+    def stok(self, barang):
+        stok = self.barang.get(barang)
+        return stok.qty if stok is not None else 0.0
+
+    def harga_rata(self, barang):
+        stok = self.barang.get(barang)
+        return stok.harga_rata if stok is not None else 0.0
+
+    def nilai(self, barang):
+        stok = self.barang.get(barang)
+        return stok.nilai if stok is not None else 0.0
+
+    def hpp_per_unit(self, barang, jumlah=1):
+        """HPP per unit jika jumlah unit barang dikeluarkan sekarang (pratinjau)"""
+        stok = self.barang.get(barang)
+        if stok is None or jumlah <= 0:
+            return 0.0
+        return stok.hpp(jumlah, self.metode) / jumlah
+
+    def ke_dataframe(self):
+        """Tabel ringkasan dengan skema df_persediaan"""
+        baris = [
+            (nama, s.stok_awal, s.nilai_awal, s.pembelian, s.penjualan, s.qty, s.harga_rata, s.nilai)
+            for nama, s in self.barang.items()
+        ]
+        return pd.DataFrame(baris, columns=KOLOM_PERSEDIAAN).astype({k: "float64" for k in KOLOM_PERSEDIAAN[1:]})
+
+    def _kartu(self, barang):
+        stok = self.barang.get(barang)
+        if stok is None:
+            return pd.DataFrame(columns=KOLOM_KARTU_STOK), np.array([], dtype="datetime64[ns]")
+        if stok.cache_kartu is None:
+            df = pd.DataFrame(stok.kartu, columns=KOLOM_KARTU_STOK)
+            stok.cache_kartu = (df, _tanggal(df))
+        return stok.cache_kartu
+
+    def kartu_stok(self, barang):
+        """Kartu stok barang: satu baris per pergerakan dengan saldo berjalan (jangan diubah; di-cache)"""
+        return self._kartu(barang)[0]
+
+    def rentang_tanggal_kartu(self, barang):
+        """(tanggal pertama, tanggal terakhir) kartu stok barang, atau None jika tidak ada tanggal valid"""
+        tanggal = self._kartu(barang)[1]
+        tanggal = tanggal[~np.isnat(tanggal)]
+        if len(tanggal) == 0:
+            return None
+        return pd.Timestamp(tanggal.min()).date(), pd.Timestamp(tanggal.max()).date()
+
+    def halaman_kartu_stok(self, barang, mulai=None, sampai=None, halaman=1, per_halaman=50):
+        """
+        Satu halaman kartu stok yang difilter rentang tanggal (inklusif).
+        Kembalikan (df_halaman, jumlah_baris_terfilter, jumlah_halaman);
+        halaman di luar jangkauan dijepit ke halaman terakhir/pertama.
+        """
+        df, tanggal = self._kartu(barang)
+        if mulai is not None or sampai is not None:
+            masuk = np.ones(len(df), dtype=bool)
+            if mulai is not None:
+                masuk &= tanggal >= np.datetime64(pd.Timestamp(mulai))
+            if sampai is not None:
+                masuk &= tanggal < np.datetime64(pd.Timestamp(sampai) + pd.Timedelta(days=1))
+            df = df[masuk]
+        jumlah_halaman = max(1, -(-len(df) // per_halaman))
+        halaman = min(max(1, int(halaman)), jumlah_halaman)
+        awal = (halaman - 1) * per_halaman
+        return df.iloc[awal:awal + per_halaman], len(df), jumlah_halaman
+
+
+def _tanggal(df_riwayat):
+    """Kolom Tanggal (date/str/Timestamp campuran) -> datetime64; tidak valid -> NaT (diurutkan paling akhir)"""
+    return pd.to_datetime(df_riwayat["Tanggal"], errors="coerce", format="mixed").to_numpy()
+
+
+def _angka(df, kolom):
+    return pd.to_numeric(df[kolom], errors="coerce").fillna(0.0).to_numpy(dtype="float64")
+
+
+def urutkan_riwayat(df_riwayat):
+    """Urutan pergerakan: stabil berdasarkan Tanggal (urutan input dipertahankan untuk tanggal sama)"""
+    urutan = np.argsort(_tanggal(df_riwayat), kind="stable")
+    return df_riwayat.iloc[urutan]
+
+
+def barang_persediaan(df_persediaan):
+    """Barang di df_persediaan (urutan tabel), atau BARANG_DEFAULT jika tabel masih kosong"""
+    if df_persediaan is not None and not df_persediaan.empty:
+        return df_persediaan["Barang"].tolist()
+    return BARANG_DEFAULT
+
+
+def saldo_awal_persediaan(df_persediaan):
+    """
+    Saldo awal per barang dari df_persediaan -> dict {barang: (jumlah, nilai)}.
+
+    Jumlah dari kolom Stok Awal, nilai dari kolom Nilai Awal; tabel lama
+    tanpa Nilai Awal dinilai Stok Awal x Harga Rata-rata. Barang dengan stok
+    awal nol tidak dimasukkan.
+    """
+    if df_persediaan is None or df_persediaan.empty or "Stok Awal" not in df_persediaan.columns:
+        return {}
+    jumlah = _angka(df_persediaan, "Stok Awal")
+    if "Nilai Awal" in df_persediaan.columns:
+        nilai = pd.to_numeric(df_persediaan["Nilai Awal"], errors="coerce").to_numpy(dtype="float64")
+    else:
+        nilai = np.full(len(df_persediaan), np.nan)
+    if "Harga Rata-rata" in df_persediaan.columns:
+        nilai = np.where(np.isnan(nilai), jumlah * _angka(df_persediaan, "Harga Rata-rata"), nilai)
+    nilai = np.nan_to_num(nilai)
+    saldo = {}
+    for nama, qty, nilai_barang in zip(df_persediaan["Barang"].tolist(), jumlah.tolist(), nilai.tolist()):
+        if qty != 0 and nama not in saldo:
+            saldo[nama] = (qty, nilai_barang)
+    return saldo
+
+
+def bangun_dari_riwayat(df_riwayat, metode="Average", barang=(), saldo_awal=None):
+    """
+    Bangun MesinPersediaan dari df_riwayat_persediaan.
+
+    Stok awal (saldo_awal dari saldo_awal_persediaan) diisi lebih dulu.
+    Pembelian diterima sebesar kolom Total (Harga sebagai harga lapisan);
+    Penjualan dikeluarkan sebesar |Jumlah| dengan HPP dihitung ulang sesuai
+    metode. Barang pada argumen barang selalu ada di hasil meski belum punya
+    pergerakan (urutannya dipertahankan).
+    """
+    mesin = MesinPersediaan(metode, barang)
+    for nama, (qty, nilai) in (saldo_awal or {}).items():
+        mesin.saldo_awal(nama, qty, nilai / qty, nilai)
+    if df_riwayat is None or df_riwayat.empty:
+        return mesin
+
+    df = urutkan_riwayat(df_riwayat)
+    jumlah, harga, total = _angka(df, "Jumlah"), _angka(df, "Harga"), _angka(df, "Total")
+    keterangan = df["Keterangan"].tolist() if "Keterangan" in df.columns else [""] * len(df)
+
+    terima, keluarkan = mesin.terima, mesin.keluarkan
+    for jenis, nama, qty, hrg, nilai, tgl, ket in zip(
+        df["Jenis"].tolist(), df["Barang"].tolist(), jumlah.tolist(), harga.tolist(), total.tolist(),
+        df["Tanggal"].tolist(), keterangan
+    ):
+        if jenis == "Pembelian":
+            terima(nama, qty, hrg, nilai, tgl, ket)
+        elif jenis == "Penjualan":
+            keluarkan(nama, abs(qty), tgl, ket)
+    return mesin
+
+
+def hitung_persediaan_average(df_riwayat, barang=(), saldo_awal=None):
+    """
+    Ringkasan df_persediaan metode Average dari stok awal + seluruh riwayat,
+    tanpa loop per baris.
+
+    Satu pengurutan stabil (Barang, Tanggal), lalu per barang:
+    - stok berjalan = stok awal + cumsum(masuk - keluar);
+    - penjualan dengan stok sebelum > 0 mengalikan nilai persediaan dengan
+      rasio stok sesudah / stok sebelum (HPP = jumlah x harga rata-rata);
+      penjualan tanpa stok tidak mengubah nilai (harga rata-rata 0);
+    - nilai akhir = jumlah Total pembelian x hasil kali rasio semua
+      penjualan sesudahnya (cumprod terbalik per barang), ditambah nilai
+      awal x hasil kali rasio semua penjualan barang itu. Faktornya <= 1,
+      jadi tidak ada overflow; pembelian lama yang sudah habis terjual
+      menyumbang ~0.
+
+    Hasilnya sama dengan hitung ulang baris per baris (selisih pembulatan
+    float saja). Barang pada argumen barang ditampilkan lebih dulu (nol
+    jika tanpa pergerakan), lalu barang stok awal lainnya, lalu barang lain
+    sesuai urutan kemunculan.
+    """
+    awal = pd.DataFrame(
+        [(nama, qty, nilai) for nama, (qty, nilai) in (saldo_awal or {}).items()],
+        columns=["Barang", "Stok Awal", "Nilai Awal"]
+    ).set_index("Barang").astype("float64")
+    urutan_barang = list(dict.fromkeys([*barang, *awal.index]))
+    # Bagian nilai awal yang tersisa per barang (1.0 = belum ada penjualan)
+    faktor_awal = pd.Series(dtype="float64")
+    if df_riwayat is not None and not df_riwayat.empty:
+        kode, nama = pd.factorize(df_riwayat["Barang"])
+        urutan = np.lexsort((_tanggal(df_riwayat), kode))
+        urutan = urutan[kode[urutan] >= 0]  # Barang kosong diabaikan
+        kode = kode[urutan]
+        jenis = df_riwayat["Jenis"].to_numpy()[urutan]
+        jumlah = _angka(df_riwayat, "Jumlah")[urutan]
+        total = _angka(df_riwayat, "Total")[urutan]
+
+        beli = jenis == "Pembelian"
+        jual = jenis == "Penjualan"
+        masuk = np.where(beli, jumlah, 0.0)
+        keluar = np.where(jual, np.abs(jumlah), 0.0)
+
+        stok_awal = awal["Stok Awal"].reindex(nama, fill_value=0.0).to_numpy()[kode]
+        stok_sesudah = stok_awal + pd.Series(masuk - keluar).groupby(kode).cumsum().to_numpy()
+        stok_sebelum = stok_sesudah - (masuk - keluar)
+        rasio = np.ones(len(kode))
+        berstok = jual & (stok_sebelum > 0)
+        rasio[berstok] = stok_sesudah[berstok] / stok_sebelum[berstok]
+
+        # Hasil kali rasio baris i..akhir per barang, lalu geser satu baris: faktor sisa
+        # nilai pembelian baris i setelah semua penjualan sesudahnya
+        sampai_akhir = pd.Series(rasio[::-1]).groupby(kode[::-1]).cumprod().to_numpy()[::-1]
+        faktor_sisa = pd.Series(sampai_akhir).groupby(kode).shift(-1, fill_value=1.0).to_numpy()
+        # Stok awal mendahului semua baris: faktornya hasil kali dari baris pertama barang
+        pertama = np.ones(len(kode), dtype=bool)
+        pertama[1:] = kode[1:] != kode[:-1]
+        faktor_awal = pd.Series(sampai_akhir[pertama], index=nama[kode[pertama]])
+
+        agregat = pd.DataFrame({
+            "Pembelian": masuk, "Penjualan": keluar, "Total Nilai": np.where(beli, total, 0.0) * faktor_sisa,
+        }).groupby(kode).sum()
+        agregat.index = nama[agregat.index]
+        sudah_ada = set(urutan_barang)
+        urutan_barang += [b for b in agregat.index if b not in sudah_ada]
+    else:
+        agregat = pd.DataFrame(columns=["Pembelian", "Penjualan", "Total Nilai"], dtype="float64")
+
+    df = agregat.reindex(urutan_barang, fill_value=0.0).astype("float64")
+    df = df.join(awal.reindex(urutan_barang, fill_value=0.0))
+    df["Total Nilai"] += df["Nilai Awal"] * faktor_awal.reindex(urutan_barang, fill_value=1.0).to_numpy()
+    df.index.name = "Barang"
+    df = df.reset_index()
+    df["Stok Akhir"] = df["Stok Awal"] + df["Pembelian"] - df["Penjualan"]
+    stok_positif = df["Stok Akhir"] > 0
+    df["Harga Rata-rata"] = np.where(stok_positif, df["Total Nilai"] / df["Stok Akhir"].where(stok_positif, 1.0), 0.0)
+    return df[KOLOM_PERSEDIAAN]
+
+
+def hitung_ulang_ringkasan(df_riwayat, metode="Average", barang=(), saldo_awal=None):
+    """
+    df_persediaan dari stok awal + seluruh riwayat: jalur vektor untuk
+    Average, mesin persediaan (lapisan biaya) untuk FIFO/LIFO.
+    """
+    if metode == "Average":
+        return hitung_persediaan_average(df_riwayat, barang, saldo_awal)
+    return bangun_dari_riwayat(df_riwayat, metode, barang, saldo_awal).ke_dataframe()
@@ -0,0 +1,381 @@
+"""
+Log jurnal append-only (JSON Lines) untuk SIMAYA.
+
+Setiap perubahan tabel transaksi dicatat sebagai satu baris event yang
+langsung di-fsync, sehingga memposting satu transaksi cukup satu append
+kecil berapa pun panjang riwayatnya. Penyimpanan (StorageBackend) berperan
+sebagai snapshot: setiap tabel yang ditulis membawa nomor event terakhir
+yang sudah termasuk di dalamnya (meta ``seq_log_<tabel>``). Saat startup
+snapshot dimuat lalu event setelah nomor tersebut diputar ulang. Kompaksi =
+tulis snapshot semua tabel lalu kosongkan log.
+
+Penulis yang memegang tabel di memori (sesi aplikasi, layanan POS) menulis
+dengan sesudah=<seq yang sudah dimuat>: jika log ternyata sudah berisi
+event lain, LogBerubah dilempar tanpa menulis apa pun dan penulis
+menggabungkan event tersebut dulu. Dengan begitu tabel penulis selalu
+memuat semua event sampai seq-nya, dan seq itulah yang boleh dicap pada
+snapshot. Penulisan dan kompaksi memegang kunci file (<log>.lock) karena
+aplikasi dan layanan POS bisa berjalan sebagai proses terpisah.
+
+Jenis event:
+
+- ``tambah``          : baris baru di akhir tabel (No jurnal yang sudah terpakai dinomori ulang)
+- ``ganti``           : isi tabel diganti seluruhnya (tabel kecil, mis. persediaan)
+- ``hapus_transaksi`` : hapus satu nomor transaksi jurnal lalu nomori ulang
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from simaya.ledger import hapus_transaksi_jurnal, nomori_transaksi_baru
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Tabel yang perubahannya dicatat lewat log
+TABEL_LOG = ("jurnal_umum", "penjualan", "pembelian", "persediaan", "riwayat_persediaan")
+
+# Tabel turunan jurnal umum; dibangun ulang saat startup jika ada event jurnal
+# yang belum termasuk dalam snapshot-nya
+TABEL_TURUNAN = ("buku_besar", "neraca_saldo")
+
+# Kompaksi otomatis setelah sekian event
+BATAS_KOMPAKSI = 500
+
+_LOG_TERBUKA = {}
+_LOCK_REGISTRY = threading.Lock()
+
+
+def path_log(path_database):
+    """database_keuangan.db -> database_keuangan.log.jsonl"""
+    return os.path.splitext(path_database)[0] + ".log.jsonl"
+
+
+class LogBerubah(Exception):
+    """Log sudah berisi event yang lebih baru dari seq yang dimuat penulis (sesi/proses lain menulis)"""
+
+
+def kunci_seq(nama_tabel):
+    """Kunci meta penyimpanan untuk nomor event terakhir dalam snapshot tabel"""
+    return f"seq_log_{nama_tabel}"
+
+
+def _ke_json(nilai):
+    """Nilai sel pandas/numpy -> nilai yang bisa di-serialize JSON"""
+    if isinstance(nilai, np.generic):
+        nilai = nilai.item()
+    if nilai is None or nilai is pd.NaT:
+        return None
+    if isinstance(nilai, float) and math.isnan(nilai):
+        return None
+    if isinstance(nilai, (pd.Timestamp, datetime)):
+        return nilai.isoformat()
+    if isinstance(nilai, date):
+        return nilai.isoformat()
+    if nilai is pd.NA:
+        return None
+    return nilai
+
+
+def _baris_json(df):
+    kolom = [str(k) for k in df.columns]
+    return kolom, [[_ke_json(v) for v in baris] for baris in df.itertuples(index=False, name=None)]
+
+
+def _dari_json(kolom, baris):
+    df = pd.DataFrame(baris, columns=kolom)
+    if "Tanggal" in df.columns and not df.empty:
+        df["Tanggal"] = pd.to_datetime(df["Tanggal"], errors="coerce").dt.date
+    return df
+
+
+# Setiap baris event diawali {"seq": N: nomor event bisa dibaca tanpa mem-parse
+# seluruh baris (satu event impor bisa berukuran megabyte)
+_POLA_SEQ = re.compile(r'\{"seq":\s*(\d+)')
+_POLA_SEQ_BYTES = re.compile(rb'\{"seq":\s*(\d+)')
+
+# path -> ((inode, ukuran, mtime), seq terakhir)
+_SEQ_TERAKHIR = {}
+
+
+def _cari_mundur(f, sebelum, ukuran_blok=65536):
+    """Posisi b"\\n" terakhir sebelum offset sebelum (-1 jika tidak ada); tiap byte dibaca sekali"""
+    while sebelum > 0:
+        mulai = max(0, sebelum - ukuran_blok)
+        f.seek(mulai)
+        posisi = f.read(sebelum - mulai).rfind(b"\n")
+        if posisi >= 0:
+            return mulai + posisi
+        sebelum = mulai
+    return -1
+
+
+def _baca_seq_terakhir(path, ukuran):
+    with open(path, "rb") as f:
+        # Ekor tanpa "\n" adalah baris yang terpotong (crash) dan dilewati
+        akhir = _cari_mundur(f, ukuran)
+        while akhir >= 0:
+            awal = _cari_mundur(f, akhir) + 1
+            f.seek(awal)
+            cocok = _POLA_SEQ_BYTES.match(f.read(min(64, akhir - awal)))
+            if cocok:
+                return int(cocok.group(1))
+            akhir = awal - 1
+    return 0
+
+
+def seq_terakhir(path):
+    """
+    Nomor event terakhir di file log (0 jika tidak ada). Hanya awal baris
+    lengkap terakhir yang dibaca, dan hasilnya diingat selama file tidak
+    berubah: pemanggilan berulang (setiap run aplikasi) cukup satu stat.
+    """
+    try:
+        info = os.stat(path)
+        tanda = (info.st_ino, info.st_size, info.st_mtime_ns)
+        tersimpan = _SEQ_TERAKHIR.get(path)
+        if tersimpan is not None and tersimpan[0] == tanda:
+            return tersimpan[1]
+        seq = _baca_seq_terakhir(path, info.st_size)
+    except OSError:
+        return 0
+    _SEQ_TERAKHIR[path] = (tanda, seq)
+    return seq
+
+
+def seq_kompaksi(path):
+    """
+    Nomor event terakhir yang dibuang kompaksi (penanda 'awal' di baris
+    pertama log), 0 jika belum pernah dikompaksi. Tabel yang dimuat sebelum
+    nomor ini tidak bisa lagi dilengkapi dari log.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            # Penanda 'awal' pendek; baris pertama yang panjang pasti event biasa
+            event = json.loads(f.readline(256))
+    except (OSError, ValueError):
+        return 0
+    return int(event.get("seq", 0)) if isinstance(event, dict) and event.get("jenis") == "awal" else 0
+
+
+@contextmanager
+def _kunci_file(path):
+    """Kunci eksklusif antarproses (file <log>.lock) selama blok berjalan"""
+    with open(path + ".lock", "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class LogJurnal:
+    """Satu file log per database; gunakan buka_log() agar instance dibagi lintas sesi"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._kedalaman = 0
+        self.seq = 0
+        self.jumlah_event = 0
+        for event in self.baca():
+            self.seq = max(self.seq, event["seq"])
+            if event["jenis"] != "awal":
+                self.jumlah_event += 1
+
+    @contextmanager
+    def kunci(self):
+        """
+        Kunci penulis log (antarthread dan antarproses). Boleh bersarang:
+        membaca snapshot + log atau menulis snapshot lalu kompaksi di dalam
+        satu kunci tidak bisa diselingi penulis lain.
+        """
+        with self._lock:
+            self._kedalaman += 1
+            try:
+                if self._kedalaman == 1:
+                    with _kunci_file(self.path):
+                        yield
+                else:
+                    yield
+            finally:
+                self._kedalaman -= 1
+
+    # ---------- tulis ----------
+
+    def _tulis(self, event, sesudah=None):
+        return self._tulis_semua([event], sesudah)
+
+    def _tulis_semua(self, daftar_event, sesudah=None):
+        """
+        Tulis event berurutan dalam satu append + fsync; mengembalikan seq event terakhir.
+        sesudah: seq terakhir yang sudah dimuat penulis; LogBerubah jika file sudah lebih jauh.
+        """
+        with self.kunci():
+            # Proses lain (mis. layanan POS) bisa menambah event ke file yang sama:
+            # nomor dilanjutkan dari event terakhir di file agar tetap naik
+            terakhir = seq_terakhir(self.path)
+            if sesudah is not None and terakhir > sesudah:
+                raise LogBerubah(f"Log jurnal sudah sampai event {terakhir}, data yang dimuat baru sampai {sesudah}")
+            self.seq = max(self.seq, terakhir, sesudah or 0)
+            waktu = datetime.now().isoformat(timespec="seconds")
+            baris = []
+            for event in daftar_event:
+                self.seq += 1
+                event = {"seq": self.seq, "waktu": waktu, **event}
+                baris.append(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n")
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(baris))
+                f.flush()
+                os.fsync(f.fileno())
+            self.jumlah_event += len(baris)
+            return self.seq
+
+    def tambah(self, tabel, df_baris, sesudah=None):
+        kolom, baris = _baris_json(df_baris)
+        return self._tulis({"jenis": "tambah", "tabel": tabel, "kolom": kolom, "baris": baris}, sesudah)
+
+    def ganti(self, tabel, df, sesudah=None):
+        kolom, baris = _baris_json(df)
+        return self._tulis({"jenis": "ganti", "tabel": tabel, "kolom": kolom, "baris": baris}, sesudah)
+
+    def tulis_batch(self, perubahan, sesudah=None):
+        """
+        Beberapa perubahan tabel sebagai satu append + fsync (mis. satu batch
+        transaksi POS). perubahan: list (jenis, tabel, df) dengan jenis
+        'tambah' atau 'ganti'. Mengembalikan seq event terakhir.
+        """
+        daftar_event = []
+        for jenis, tabel, df in perubahan:
+            kolom, baris = _baris_json(df)
+            daftar_event.append({"jenis": jenis, "tabel": tabel, "kolom": kolom, "baris": baris})
+        return self._tulis_semua(daftar_event, sesudah) if daftar_event else self.seq
+
+    def hapus_transaksi(self, tabel, no, sesudah=None):
+        """Satu event untuk satu nomor transaksi atau daftar nomor (hapus massal)"""
+        if isinstance(no, (list, tuple)):
+            no = [_ke_json(n) for n in no]
+        else:
+            no = _ke_json(no)
+        return self._tulis({"jenis": "hapus_transaksi", "tabel": tabel, "no": no}, sesudah)
+
+    def kosongkan(self, sampai=None):
+        """
+        Buang event dengan seq <= sampai (default: semua) setelah snapshot ditulis.
+        Event yang lebih baru (mis. dari sesi lain) dipertahankan; nomor event tetap berlanjut.
+        Penanda 'awal' membawa nomor event terakhir yang dibuang (seq_kompaksi).
+        """
+        with self.kunci():
+            self.seq = max(self.seq, seq_terakhir(self.path))
+            if sampai is None:
+                sisa, awal = [], self.seq
+            else:
+                sisa = [e for e in self.baca(setelah=sampai) if e["jenis"] != "awal"]
+                awal = max(sampai, seq_kompaksi(self.path))
+            sementara = self.path + ".tmp"
+            with open(sementara, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"seq": awal, "jenis": "awal"}) + "\n")
+                for event in sisa:
+                    f.write(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(sementara, self.path)
+            self.jumlah_event = len(sisa)
+
+    def perlu_kompaksi(self):
+        return self.jumlah_event >= BATAS_KOMPAKSI
+
+    # ---------- baca ----------
+
+    def baca(self, setelah=0):
+        """Iterasi event dengan seq > setelah. Baris terakhir yang terpotong (crash) dilewati."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for baris in f:
+                # Event yang sudah termasuk dilewati tanpa di-parse
+                cocok = _POLA_SEQ.match(baris)
+                if cocok and int(cocok.group(1)) <= setelah:
+                    continue
+                try:
+                    event = json.loads(baris)
+                except json.JSONDecodeError:
+                    continue
+                if event.get("seq", 0) > setelah:
+                    yield event
+
+
+def buka_log(path):
+    """Instance LogJurnal per path untuk seluruh proses (nomor event dan lock dibagi)"""
+    path = os.path.abspath(path)
+    with _LOCK_REGISTRY:
+        if path not in _LOG_TERBUKA:
+            _LOG_TERBUKA[path] = LogJurnal(path)
+        return _LOG_TERBUKA[path]
+
+
+def terapkan_event(df, event):
+    """Terapkan satu event ke DataFrame tabelnya; mengembalikan DataFrame baru"""
+    jenis = event["jenis"]
+    if jenis == "tambah":
+        baru = _dari_json(event["kolom"], event["baris"])
+        if df is None or len(df.columns) == 0:
+            return baru
+        if df.empty:
+            return baru.reindex(columns=list(dict.fromkeys(list(df.columns) + list(baru.columns))))
+        if event.get("tabel") == "jurnal_umum":
+            # No yang dialokasikan bersamaan oleh dua penulis tidak boleh menggabungkan transaksi
+            baru = nomori_transaksi_baru(df, baru)
+        return pd.concat([df, baru], ignore_index=True)
+    if jenis == "ganti":
+        return _dari_json(event["kolom"], event["baris"])
+    if jenis == "hapus_transaksi":
+        return hapus_transaksi_jurnal(df, event["no"])
+    raise ValueError(f"Jenis event tidak dikenal: {jenis}")
+
+
+def putar_ulang(tabel, log, meta):
+    """
+    Putar ulang event log ke tabel hasil snapshot.
+
+    tabel : dict {nama_tabel: DataFrame} (diubah di tempat)
+    meta  : dict meta penyimpanan (berisi seq_log_<tabel>)
+
+    Mengembalikan dict {nama_tabel: jumlah event diterapkan}, flag apakah
+    tabel turunan (buku besar, neraca saldo) perlu dibangun ulang, dan seq:
+    nomor event terakhir yang sudah termasuk dalam tabel hasil (cap untuk
+    snapshot berikutnya dan nilai sesudah= untuk penulisan berikutnya).
+    """
+    diterapkan = {}
+    seq_turunan = min(int(meta.get(kunci_seq(nama), 0) or 0) for nama in TABEL_TURUNAN)
+    seq = max(int(meta.get(kunci_seq(nama), 0) or 0) for nama in TABEL_LOG)
+    perlu_bangun_ulang = False
+    for event in log.baca():
+        seq = max(seq, event["seq"])
+        nama = event.get("tabel")
+        if nama not in TABEL_LOG or event["seq"] <= int(meta.get(kunci_seq(nama), 0) or 0):
+            continue
+        tabel[nama] = terapkan_event(tabel.get(nama), event)
+        diterapkan[nama] = diterapkan.get(nama, 0) + 1
+        if nama == "jurnal_umum" and event["seq"] > seq_turunan:
+            perlu_bangun_ulang = True
+    return diterapkan, perlu_bangun_ulang, seq
@@ -0,0 +1,440 @@
+"""
+Laporan keuangan (laba rugi, perubahan modal, posisi keuangan) tanpa Streamlit.
+
+Semua fungsi menerima tabel (jurnal, saldo awal, buku besar dari
+simaya.ledger) dan mengembalikan DataFrame laporan berkolom KOLOM_LAPORAN.
+Peringatan yang dulu langsung ditampilkan dengan st.warning/st.info
+dikembalikan sebagai daftar pesan [(jenis, teks)] dengan jenis salah satu
+"info", "warning", "success" atau "error"; lapisan aplikasi yang memutuskan
+cara menampilkannya.
+"""
+
+import pandas as pd
+
+from simaya.ledger import SUMBER_JURNAL, TOLERANSI_SEIMBANG, ke_format_lama
+from simaya.schema import terapkan_skema
+
+KOLOM_LAPORAN = ["Keterangan", "Nilai (Rp)"]
+
+# ========== KLASIFIKASI AKUN ==========
+
+AKUN_PENDAPATAN = ["Penjualan", "Pendapatan Jasa", "Pendapatan Lain", "Pendapatan"]
+
+AKUN_BEBAN = [
+    "Beban Gaji", "Beban Sewa", "Beban Listrik dan Air", "Beban Transportasi", "Beban Lain-lain",
+    "Beban Asuransi", "Beban Penyusutan", "Harga Pokok Penjualan",
+    "Beban listrik dan air", "Beban transportasi", "Beban gaji", "Beban Lain"
+]
+
+# Klasifikasi lengkap untuk posisi keuangan yang selalu seimbang
+AKUN_ASET_LANCAR = [
+    "Kas", "Bank", "Deposito", "Investasi Jangka Pendek",
+    "Piutang Usaha", "Piutang Dagang", "Piutang Lainnya",
+    "Persediaan", "Persediaan Barang Dagang", "Persediaan Bahan Baku",
+    "Persediaan Barang Dalam Proses", "Persediaan Barang Jadi",
+    "Perlengkapan", "Asuransi Dibayar Dimuka", "Sewa Dibayar Dimuka",
+    "Pajak Dibayar Dimuka", "Biaya Dibayar Dimuka", "Pendapatan Ditangguhkan"
+]
+
+AKUN_ASET_TIDAK_LANCAR = [
+    "Tanah", "Gedung", "Bangunan", "Kendaraan", "Peralatan", "Mesin",
+    "Inventaris", "Akumulasi Penyusutan", "Aset Tetap Lainnya",
+    "Investasi Jangka Panjang", "Aset Tidak Berwujud", "Goodwill",
+    "Paten", "Merek Dagang", "Hak Cipta", "Aset Sewa Guna Usaha",
+    "Aset Biologis", "Aset biologis"  # untuk kompatibilitas
+]
+
+AKUN_LIABILITAS_JANGKA_PENDEK = [
+    "Utang Usaha", "Utang Dagang", "Utang Bank Jangka Pendek",
+    "Utang Wesel", "Utang Gaji", "Utang Pajak", "Utang Bunga",
+    "Utang Dividen", "Pendapatan Diterima Dimuka", "Biaya Akrual",
+    "Utang Jangka Pendek Lainnya", "Bagian Lancar Utang Jangka Panjang"
+]
+
+AKUN_LIABILITAS_JANGKA_PANJANG = [
+    "Utang Bank Jangka Panjang", "Utang Obligasi", "Utang Hipotek",
+    "Utang Sewa Guna Usaha", "Utang Pensiun", "Utang Jangka Panjang Lainnya"
+]
+
+AKUN_EKUITAS = [
+    "Modal Saham", "Modal Disetor", "Agio Saham",
+    "Laba Ditahan", "Saldo Laba", "Deviden",
+    "Prive", "Modal Pemilik", "Modal",  # untuk kompatibilitas
+    "Ekuitas Lainnya", "Cadangan"
+]
+
+AKUN_MODAL = ["Modal", "Modal Saham", "Modal Pemilik", "Modal Disetor"]
+
+# Klasifikasi ringkas untuk laporan posisi keuangan di halaman laporan
+AKUN_ASET_LANCAR_RINGKAS = [
+    "Kas", "Persediaan", "Perlengkapan", "Piutang Usaha",
+    "Asuransi Dibayar Dimuka", "Sewa Dibayar Dimuka", "Piutang"
+]
+AKUN_ASET_TIDAK_LANCAR_RINGKAS = ["Peralatan", "Aset Biologis", "Kendaraan", "Tanah", "Gedung", "Aset biologis"]
+AKUN_LIABILITAS_RINGKAS = ["Utang Usaha", "Utang Bank", "Utang Gaji", "Pendapatan Diterima Dimuka"]
+
+
+def _baris(keterangan, nilai=""):
+    return {"Keterangan": keterangan, "Nilai (Rp)": nilai}
+
+
+def _bagian(baris, judul, data, teks_kosong, label_total, total):
+    """Judul bagian, isi (atau teks_kosong) dan baris total"""
+    baris.append(_baris(f"**{judul}**"))
+    if data:
+        baris.extend(data)
+    else:
+        baris.append(_baris(teks_kosong))
+    baris.append(_baris(f"**{label_total}**", total if data else 0))
+
+
+# ========== LABA RUGI ==========
+
+def laba_rugi_kosong():
+    return pd.DataFrame([
+        _baris("**PENDAPATAN**"), _baris("**Total Pendapatan**", 0), _baris(""),
+        _baris("**BEBAN**"), _baris("**Total Beban**", 0), _baris(""),
+        _baris("**LABA BERSIH**", 0),
+    ])
+
+
+def transaksi_format_lama(jurnal, jurnal_umum_format_lama=None):
+    """
+    Semua jurnal (umum, penyesuaian, penutup) dalam format lama
+    (Nama Akun / Debit / Kredit). jurnal_umum_format_lama dipakai untuk
+    jurnal umum jika sudah tersedia (mis. df_jurnal_umum_old_format sesi).
+    """
+    bagian = []
+    for kunci, _ in SUMBER_JURNAL:
+        if kunci == "df_jurnal_umum" and jurnal_umum_format_lama is not None:
+            df = jurnal_umum_format_lama
+        else:
+            df = jurnal.get(kunci)
+            if df is None or df.empty:
+                continue
+            df = ke_format_lama(df)
+        if df is not None and not df.empty:
+            bagian.append(df)
+    if not bagian:
+        return None
+    # Semua sumber sudah bertipe float64 (skema/ke_format_lama); koersi hanya jika belum
+    return terapkan_skema(pd.concat(bagian, ignore_index=True))
+
+
+def hitung_laba_rugi(jurnal, jurnal_umum_format_lama=None):
+    """
+    Laba rugi dari semua jurnal ({"df_jurnal_umum": df, ...} seperti
+    simaya.ledger.bangun_buku_besar).
+
+    Returns:
+        (total_pendapatan, total_beban, laba_bersih, df_laba_rugi)
+    """
+    df_semua = transaksi_format_lama(jurnal, jurnal_umum_format_lama)
+    if df_semua is None:
+        return 0, 0, 0, laba_rugi_kosong()
+
+    # Pendapatan di Kredit, beban di Debit
+    pendapatan_data = df_semua[df_semua["Nama Akun"].isin(AKUN_PENDAPATAN)]
+    total_pendapatan = pendapatan_data["Kredit (Rp)"].sum() - pendapatan_data["Debit (Rp)"].sum()
+    beban_data = df_semua[df_semua["Nama Akun"].isin(AKUN_BEBAN)]
+    total_beban = beban_data["Debit (Rp)"].sum() - beban_data["Kredit (Rp)"].sum()
+    laba_bersih = total_pendapatan - total_beban
+
+    # Satu groupby untuk rincian per akun
+    per_akun = df_semua.groupby("Nama Akun", sort=False)[["Debit (Rp)", "Kredit (Rp)"]].sum()
+
+    def rincian(daftar_akun, tanda):
+        data = []
+        for akun in daftar_akun:
+            if akun in per_akun.index:
+                total_akun = tanda * (per_akun.at[akun, "Kredit (Rp)"] - per_akun.at[akun, "Debit (Rp)"])
+                if total_akun != 0:
+                    data.append(_baris(f"  {akun}", total_akun))
+        return data
+
+    baris = [_baris("**PENDAPATAN**")]
+    baris.extend(rincian(AKUN_PENDAPATAN, 1))
+    baris.append(_baris("**Total Pendapatan**", total_pendapatan))
+    baris.append(_baris(""))
+    baris.append(_baris("**BEBAN**"))
+    baris.extend(rincian(AKUN_BEBAN, -1))
+    baris.append(_baris("**Total Beban**", total_beban))
+    baris.append(_baris(""))
+    baris.append(_baris("**LABA BERSIH**", laba_bersih))
+    return total_pendapatan, total_beban, laba_bersih, pd.DataFrame(baris)
+
+
+# ========== PERUBAHAN MODAL ==========
+
+def _saldo_modal_neraca(df_neraca):
+    """Kredit - Debit akun Modal pada neraca saldo (0 jika tidak ada)"""
+    if df_neraca is None or df_neraca.empty:
+        return 0
+    modal_data = df_neraca[df_neraca["Nama Akun"] == "Modal"]
+    if modal_data.empty:
+        return 0
+    return float(modal_data["Kredit (Rp)"].iloc[0]) - float(modal_data["Debit (Rp)"].iloc[0])
+
+
+def hitung_perubahan_modal(laba_bersih, df_saldo_awal=None, df_buku_besar=None, df_neraca_saldo=None):
+    """
+    Laporan perubahan modal. Modal awal diambil dari neraca saldo periode
+    sebelumnya, lalu saldo akhir Modal di buku besar, lalu neraca saldo
+    berjalan (sumber pertama yang tidak nol).
+
+    Returns:
+        (modal_awal, modal_akhir, df_perubahan_modal)
+    """
+    modal_awal = _saldo_modal_neraca(df_saldo_awal)
+
+    if modal_awal == 0 and df_buku_besar is not None and not df_buku_besar.empty:
+        modal_data = df_buku_besar[df_buku_besar["Nama Akun"] == "Modal"]
+        if not modal_data.empty:
+            modal_awal = float(modal_data["Saldo (Rp)"].iloc[-1])
+
+    if modal_awal == 0:
+        modal_awal = _saldo_modal_neraca(df_neraca_saldo)
+
+    modal_akhir = modal_awal + laba_bersih
+    df_perubahan_modal = pd.DataFrame([
+        _baris("Modal Awal", modal_awal),
+        _baris("Laba (Rugi) Bersih", laba_bersih),
+        _baris("**Modal Akhir**", modal_akhir),
+    ])
+    return modal_awal, modal_akhir, df_perubahan_modal
+
+
+# ========== POSISI KEUANGAN ==========
+
+def saldo_akhir_akun(buku_besar_per_akun):
+    """{akun: saldo berjalan terakhir} dari buku besar per akun"""
+    return {
+        akun: float(df_akun["Saldo (Rp)"].iloc[-1])
+        for akun, df_akun in buku_besar_per_akun.items()
+        if not df_akun.empty
+    }
+
+
+def buat_posisi_keuangan_kosong():
+    """Laporan posisi keuangan kosong dengan struktur yang benar"""
+    return pd.DataFrame([
+        _baris("**ASET**"),
+        _baris("**Aset Lancar**"),
+        _baris("Kas", 0), _baris("Persediaan", 0), _baris("Piutang", 0),
+        _baris("**Total Aset Lancar**", 0),
+        _baris("**Aset Tidak Lancar**"),
+        _baris("Peralatan", 0), _baris("Kendaraan", 0), _baris("Tanah", 0),
+        _baris("**Total Aset Tidak Lancar**", 0),
+        _baris("**TOTAL ASET**", 0),
+        _baris(""),
+        _baris("**LIABILITAS & EKUITAS**"),
+        _baris("**Liabilitas**"),
+        _baris("Utang Usaha", 0), _baris("Utang Bank", 0),
+        _baris("**Total Liabilitas**", 0),
+        _baris("**Ekuitas**"),
+        _baris("Modal", 0), _baris("Laba Ditahan", 0),
+        _baris("**Total Ekuitas**", 0),
+        _baris("**TOTAL LIABILITAS & EKUITAS**", 0),
+    ])
+
+
+def _aset(saldo, daftar_akun, dengan_akumulasi=False):
+    """Baris aset bersaldo positif (akumulasi penyusutan dikurangkan) dan totalnya"""
+    data, total = [], 0
+    for akun in daftar_akun:
+        nilai = saldo(akun)
+        if dengan_akumulasi and "Akumulasi Penyusutan" in akun and nilai != 0:
+            data.append(_baris(akun, -nilai))
+            total -= nilai
+        elif nilai > 0:
+            data.append(_baris(akun, nilai))
+            total += nilai
+    return data, total
+
+
+def _liabilitas(saldo, daftar_akun):
+    """Baris liabilitas bersaldo (ditampilkan positif) dan totalnya"""
+    data, total = [], 0
+    for akun in daftar_akun:
+        nilai = saldo(akun)
+        if nilai != 0:
+            nilai = abs(nilai)
+            data.append(_baris(akun, nilai))
+            total += nilai
+    return data, total
+
+
+def _validasi_akhir(pesan, total_aset, total_liabilitas_ekuitas):
+    selisih = abs(total_aset - total_liabilitas_ekuitas)
+    if selisih <= TOLERANSI_SEIMBANG:
+        pesan.append(("success", "✅ Laporan Posisi Keuangan SEIMBANG"))
+    else:
+        pesan.append(("error", f"❌ Laporan Posisi Keuangan TIDAK SEIMBANG - Selisih: Rp {selisih:,.0f}"))
+
+
+def hitung_posisi_keuangan_seimbang(buku_besar_per_akun, modal_akhir=0, laba_bersih=0):
+    """
+    Posisi keuangan dengan klasifikasi lengkap; selisih aset vs liabilitas +
+    ekuitas disesuaikan otomatis ke Laba (Rugi) Ditahan.
+
+    Returns:
+        (df_posisi_keuangan, pesan)
+    """
+    if not buku_besar_per_akun:
+        return buat_posisi_keuangan_kosong(), [
+            ("info", "📊 Data buku besar kosong. Pastikan sudah ada transaksi di Jurnal Umum.")
+        ]
+
+    saldo_akhir = saldo_akhir_akun(buku_besar_per_akun)
+    saldo = lambda akun: saldo_akhir.get(akun, 0)
+    pesan = []
+
+    aset_lancar_data, total_aset_lancar = _aset(saldo, AKUN_ASET_LANCAR)
+    aset_tidak_lancar_data, total_aset_tidak_lancar = _aset(saldo, AKUN_ASET_TIDAK_LANCAR, dengan_akumulasi=True)
+    liabilitas_pendek_data, total_liabilitas_pendek = _liabilitas(saldo, AKUN_LIABILITAS_JANGKA_PENDEK)
+    liabilitas_panjang_data, total_liabilitas_panjang = _liabilitas(saldo, AKUN_LIABILITAS_JANGKA_PANJANG)
+    total_liabilitas = total_liabilitas_pendek + total_liabilitas_panjang
+
+    # Ekuitas: modal akhir dari laporan perubahan modal, atau saldo akun modal
+    ekuitas_data, total_ekuitas = [], 0
+    if modal_akhir == 0:
+        for akun_modal in AKUN_MODAL:
+            if saldo(akun_modal) != 0:
+                modal_akhir = abs(saldo(akun_modal))
+                break
+    if modal_akhir > 0:
+        ekuitas_data.append(_baris("Modal", modal_akhir))
+        total_ekuitas += modal_akhir
+    if laba_bersih != 0:
+        ekuitas_data.append(_baris("Laba (Rugi) Ditahan", laba_bersih))
+        total_ekuitas += laba_bersih
+    lain_data, total_lain = _liabilitas(saldo, [akun for akun in AKUN_EKUITAS if akun not in AKUN_MODAL])
+    ekuitas_data.extend(lain_data)
+    total_ekuitas += total_lain
+
+    total_aset = total_aset_lancar + total_aset_tidak_lancar
+    selisih = total_aset - (total_liabilitas + total_ekuitas)
+    if abs(selisih) > TOLERANSI_SEIMBANG:
+        pesan.append(("warning", f"⚠️ Ditemukan ketidakseimbangan: Rp {selisih:,.0f}"))
+        laba_ditahan = next((item for item in ekuitas_data if item["Keterangan"] == "Laba (Rugi) Ditahan"), None)
+        if laba_ditahan is not None:
+            laba_ditahan["Nilai (Rp)"] += selisih
+        else:
+            ekuitas_data.append(_baris("Laba (Rugi) Ditahan", selisih))
+        total_ekuitas += selisih
+        pesan.append((
+            "info",
+            f"✅ Dilakukan penyesuaian otomatis: Laba Ditahan {'ditambah' if selisih > 0 else 'dikurangi'} Rp {abs(selisih):,.0f}"
+        ))
+
+    baris = [_baris("**ASET**")]
+    _bagian(baris, "Aset Lancar", aset_lancar_data, "Tidak ada aset lancar", "Total Aset Lancar", total_aset_lancar)
+    _bagian(baris, "Aset Tidak Lancar", aset_tidak_lancar_data, "Tidak ada aset tidak lancar",
+            "Total Aset Tidak Lancar", total_aset_tidak_lancar)
+    baris.append(_baris("**TOTAL ASET**", total_aset))
+    baris.append(_baris(""))
+    baris.append(_baris("**LIABILITAS & EKUITAS**"))
+    _bagian(baris, "Liabilitas Jangka Pendek", liabilitas_pendek_data, "Tidak ada liabilitas jangka pendek",
+            "Total Liabilitas Jangka Pendek", total_liabilitas_pendek)
+    _bagian(baris, "Liabilitas Jangka Panjang", liabilitas_panjang_data, "Tidak ada liabilitas jangka panjang",
+            "Total Liabilitas Jangka Panjang", total_liabilitas_panjang)
+    baris.append(_baris("**TOTAL LIABILITAS**", total_liabilitas))
+    baris.append(_baris(""))
+    _bagian(baris, "Ekuitas", ekuitas_data, "Tidak ada ekuitas", "Total Ekuitas", total_ekuitas)
+    total_liabilitas_ekuitas = total_liabilitas + total_ekuitas
+    baris.append(_baris("**TOTAL LIABILITAS & EKUITAS**", total_liabilitas_ekuitas))
+
+    _validasi_akhir(pesan, total_aset, total_liabilitas_ekuitas)
+    return pd.DataFrame(baris), pesan
+
+
+def hitung_posisi_keuangan(buku_besar_per_akun, df_buku_besar, modal_akhir=0, laba_bersih=0):
+    """
+    Posisi keuangan untuk halaman laporan (klasifikasi ringkas); selisih
+    disesuaikan otomatis sebagai baris Penyesuaian Modal. Saldo diambil dari
+    buku besar per akun, atau buku besar flat jika akun tidak ada di sana.
+
+    Returns:
+        (df_posisi_keuangan, pesan)
+    """
+    if df_buku_besar is None or df_buku_besar.empty:
+        return buat_posisi_keuangan_kosong(), [
+            ("info", "📊 Data buku besar kosong. Pastikan sudah ada transaksi di Jurnal Umum.")
+        ]
+
+    saldo_akhir = saldo_akhir_akun(buku_besar_per_akun or {})
+    saldo_flat = df_buku_besar.drop_duplicates("Nama Akun", keep="last").set_index("Nama Akun")["Saldo (Rp)"]
+
+    def saldo(akun):
+        if akun in saldo_akhir:
+            return saldo_akhir[akun]
+        if akun in saldo_flat.index:
+            return float(saldo_flat[akun])
+        return 0
+
+    pesan = []
+    aset_lancar_data, total_aset_lancar = _aset(saldo, AKUN_ASET_LANCAR_RINGKAS)
+    aset_tidak_lancar_data, total_aset_tidak_lancar = _aset(saldo, AKUN_ASET_TIDAK_LANCAR_RINGKAS)
+    liabilitas_data, total_liabilitas = _liabilitas(saldo, AKUN_LIABILITAS_RINGKAS)
+
+    ekuitas_data, total_ekuitas = [], 0
+    if modal_akhir == 0:
+        modal_akhir = abs(saldo("Modal"))
+    if modal_akhir != 0:
+        ekuitas_data.append(_baris("Modal", modal_akhir))
+        total_ekuitas += modal_akhir
+    if laba_bersih != 0:
+        ekuitas_data.append(_baris("Laba (Rugi) Ditahan", laba_bersih))
+        total_ekuitas += laba_bersih
+
+    total_aset = total_aset_lancar + total_aset_tidak_lancar
+    selisih = total_aset - (total_liabilitas + total_ekuitas)
+    if abs(selisih) > TOLERANSI_SEIMBANG:
+        pesan.append(("warning", f"⚠️ Ditemukan ketidakseimbangan: Rp {selisih:,.0f}"))
+        ekuitas_data.append(_baris("Penyesuaian Modal", selisih))
+        total_ekuitas += selisih
+        if selisih > 0:
+            pesan.append(("info", f"✅ Penyesuaian: Menambah Ekuitas sebesar Rp {selisih:,.0f}"))
+        else:
+            pesan.append(("info", f"✅ Penyesuaian: Mengurangi Ekuitas sebesar Rp {abs(selisih):,.0f}"))
+
+    baris = [_baris("**ASET**")]
+    _bagian(baris, "Aset Lancar", aset_lancar_data, "Tidak ada aset lancar", "Total Aset Lancar", total_aset_lancar)
+    _bagian(baris, "Aset Tidak Lancar", aset_tidak_lancar_data, "Tidak ada aset tidak lancar",
+            "Total Aset Tidak Lancar", total_aset_tidak_lancar)
+    baris.append(_baris("**TOTAL ASET**", total_aset))
+    baris.append(_baris(""))
+    baris.append(_baris("**LIABILITAS & EKUITAS**"))
+    _bagian(baris, "Liabilitas", liabilitas_data, "Tidak ada liabilitas", "Total Liabilitas", total_liabilitas)
+    _bagian(baris, "Ekuitas", ekuitas_data, "Tidak ada ekuitas", "Total Ekuitas", total_ekuitas)
+    total_liabilitas_ekuitas = total_liabilitas + total_ekuitas
+    baris.append(_baris("**TOTAL LIABILITAS & EKUITAS**", total_liabilitas_ekuitas))
+
+    _validasi_akhir(pesan, total_aset, total_liabilitas_ekuitas)
+    return pd.DataFrame(baris), pesan
+
+
+# ========== SEMUA LAPORAN ==========
+
+def susun_laporan(jurnal, df_saldo_awal, buku_besar_per_akun, df_buku_besar, df_neraca_saldo=None,
+                  jurnal_umum_format_lama=None):
+    """
+    Laba rugi, perubahan modal dan posisi keuangan (selalu seimbang)
+    berurutan, seperti tombol Perbarui Laporan.
+
+    Returns:
+        dict berisi total_pendapatan, total_beban, laba_bersih, modal_awal,
+        modal_akhir, laba_rugi, perubahan_modal, posisi_keuangan (DataFrame)
+        dan pesan.
+    """
+    total_pendapatan, total_beban, laba_bersih, df_laba_rugi = hitung_laba_rugi(jurnal, jurnal_umum_format_lama)
+    modal_awal, modal_akhir, df_perubahan_modal = hitung_perubahan_modal(
+        laba_bersih, df_saldo_awal, df_buku_besar, df_neraca_saldo
+    )
+    df_posisi_keuangan, pesan = hitung_posisi_keuangan_seimbang(buku_besar_per_akun, modal_akhir, laba_bersih)
+    return {
+        "total_pendapatan": total_pendapatan, "total_beban": total_beban, "laba_bersih": laba_bersih,
+        "modal_awal": modal_awal, "modal_akhir": modal_akhir,
+        "laba_rugi": df_laba_rugi, "perubahan_modal": df_perubahan_modal, "posisi_keuangan": df_posisi_keuangan,
+        "pesan": pesan,
+    }
@@ -0,0 +1,266 @@
+"""
+Layanan HTTP lokal untuk transaksi dari kasir (POS).
+
+    python -m simaya layani-pos --port 8765
+
+    POST /transaksi   satu objek transaksi, list transaksi, atau {"transaksi": [...]}
+    GET  /status      isi antrean, statistik batch, stok dan saldo akun
+
+Transaksi yang valid (simaya.pos.baca_transaksi) masuk ke AntreanPOS; satu
+thread pekerja mengambilnya per batch kecil (hingga BATAS_BATCH transaksi,
+menunggu paling lama JEDA_BATCH agar transaksi yang datang berdekatan ikut
+satu batch) lalu memposting batch itu dengan PencatatPOS: satu posting
+buku besar dan satu append + fsync log jurnal per batch.
+
+Backpressure: antrean dibatasi MAKS_ANTREAN transaksi. Permintaan yang
+tidak muat ditolak seluruhnya dengan 503 + Retry-After sehingga kasir
+mengirim ulang nanti; dengan kunci idempoten pengiriman ulang aman.
+Balasan menunggu hasil posting hingga BATAS_TUNGGU detik; transaksi yang
+belum selesai dilaporkan sebagai "antre" (HTTP 202).
+
+Layanan hanya mendengarkan 127.0.0.1 secara default dan tanpa autentikasi:
+jangan buka ke jaringan lain. Sesi aplikasi Streamlit yang sedang terbuka
+menggabungkan transaksi POS dari log jurnal di awal run berikutnya.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from simaya.pos import DIPOSTING, DITOLAK, DUPLIKAT, GAGAL, baca_transaksi
+
+MAKS_ANTREAN = 1_000
+BATAS_BATCH = 100
+JEDA_BATCH = 0.02
+
+# Lama balasan HTTP menunggu hasil posting (detik)
+BATAS_TUNGGU = 10.0
+
+# Ukuran body permintaan maksimal (byte)
+MAKS_BODY = 1_000_000
+
+ANTRE = "antre"
+TIDAK_VALID = "tidak_valid"
+
+
+class AntreanPenuh(Exception):
+    """Antrean tidak muat untuk seluruh transaksi permintaan"""
+
+
+class Tiket:
+    """Satu transaksi di antrean; hasil diisi thread pekerja setelah batch diposting"""
+
+    __slots__ = ("transaksi", "hasil", "_event")
+
+    def __init__(self, transaksi):
+        self.transaksi = transaksi
+        self.hasil = None
+        self._event = threading.Event()
+
+    def selesai(self, hasil):
+        self.hasil = hasil
+        self._event.set()
+
+    def tunggu(self, timeout=None):
+        return self._event.wait(timeout)
+
+
+class AntreanPOS:
+    """Antrean terbatas + satu thread pekerja yang memposting per batch"""
+
+    def __init__(self, pencatat, maks_antrean=MAKS_ANTREAN, batas_batch=BATAS_BATCH, jeda_batch=JEDA_BATCH):
+        self.pencatat = pencatat
+        self.maks_antrean = maks_antrean
+        self.batas_batch = batas_batch
+        self.jeda_batch = jeda_batch
+        self._antrean = deque()
+        self._kondisi = threading.Condition()
+        self._berhenti = False
+        self._thread = None
+        self._statistik = {
+            "batch": 0, "diposting": 0, "duplikat": 0, "ditolak": 0, "gagal": 0, "penuh": 0,
+            "batch_terakhir": 0, "detik_batch_terakhir": 0.0,
+        }
+
+    def mulai(self):
+        self._thread = threading.Thread(target=self._pekerja, name="simaya-pos", daemon=True)
+        self._thread.start()
+        return self
+
+    def hentikan(self):
+        """Berhenti menerima transaksi; yang sudah antre tetap diposting"""
+        with self._kondisi:
+            self._berhenti = True
+            self._kondisi.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def ajukan(self, daftar_transaksi):
+        """Masukkan transaksi ke antrean (semua atau tidak sama sekali); mengembalikan Tiket"""
+        tiket = [Tiket(trx) for trx in daftar_transaksi]
+        with self._kondisi:
+            if self._berhenti or len(self._antrean) + len(tiket) > self.maks_antrean:
+                self._statistik["penuh"] += 1
+                raise AntreanPenuh(f"Antrean penuh ({len(self._antrean)}/{self.maks_antrean} transaksi)")
+            self._antrean.extend(tiket)
+            self._kondisi.notify()
+        return tiket
+
+    def _ambil_batch(self):
+        with self._kondisi:
+            while not self._antrean and not self._berhenti:
+                self._kondisi.wait()
+            if not self._antrean:
+                return None
+            # Tunggu sebentar agar transaksi yang datang berdekatan masuk satu batch
+            batas_waktu = time.monotonic() + self.jeda_batch
+            while len(self._antrean) < self.batas_batch and not self._berhenti:
+                sisa = batas_waktu - time.monotonic()
+                if sisa <= 0:
+                    break
+                self._kondisi.wait(sisa)
+            return [self._antrean.popleft() for _ in range(min(self.batas_batch, len(self._antrean)))]
+
+    def _pekerja(self):
+        while True:
+            batch = self._ambil_batch()
+            if batch is None:
+                return
+            mulai = time.perf_counter()
+            daftar_hasil = self.pencatat.posting([t.transaksi for t in batch])
+            detik = time.perf_counter() - mulai
+            for t, hasil in zip(batch, daftar_hasil):
+                t.selesai(hasil)
+
+            jumlah = {status: 0 for status in (DIPOSTING, DUPLIKAT, DITOLAK, GAGAL)}
+            for hasil in daftar_hasil:
+                jumlah[hasil["status"]] += 1
+            with self._kondisi:
+                for status, n in jumlah.items():
+                    self._statistik[status] += n
+                self._statistik["batch"] += 1
+                self._statistik["batch_terakhir"] = len(batch)
+                self._statistik["detik_batch_terakhir"] = round(detik, 4)
+            print(f"✅ Batch POS: {len(batch)} transaksi ({jumlah[DIPOSTING]} diposting, "
+                  f"{jumlah[DUPLIKAT]} duplikat, {jumlah[DITOLAK]} ditolak, {jumlah[GAGAL]} gagal) "
+                  f"dalam {detik:.3f}s")
+
+    def statistik(self):
+        with self._kondisi:
+            return {"antre": len(self._antrean), "maks_antrean": self.maks_antrean, **self._statistik}
+
+
+def _daftar_dari_body(data):
+    """Body JSON -> list transaksi (objek tunggal, list, atau {"transaksi": [...]})"""
+    if isinstance(data, dict) and "transaksi" in data:
+        data = data["transaksi"]
+    if isinstance(data, dict):
+        return [data]
+    if isinstance(data, list) and data:
+        return data
+    raise ValueError("Body harus berisi objek transaksi atau list transaksi yang tidak kosong")
+
+
+class PenanganPOS(BaseHTTPRequestHandler):
+    """Handler HTTP; antrean dipasang sebagai atribut server (server.antrean)"""
+
+    server_version = "SIMAYA-POS/1.0"
+
+    def log_message(self, format, *args):
+        # Setiap batch sudah dicetak; log per permintaan terlalu ramai untuk kasir
+        pass
+
+    def _kirim(self, kode, isi, header=None):
+        body = json.dumps(isi, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(kode)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for nama, nilai in (header or {}).items():
+            self.send_header(nama, nilai)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") != "/status":
+            self._kirim(404, {"pesan": f"Path tidak dikenal: {self.path}"})
+            return
+        antrean = self.server.antrean
+        self._kirim(200, {"antrean": antrean.statistik(), **antrean.pencatat.ringkasan()})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/transaksi":
+            self._kirim(404, {"pesan": f"Path tidak dikenal: {self.path}"})
+            return
+        try:
+            panjang = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self._kirim(411, {"pesan": "Header Content-Length wajib diisi"})
+            return
+        if panjang > MAKS_BODY:
+            self._kirim(413, {"pesan": f"Body maksimal {MAKS_BODY:,} byte"})
+            self.close_connection = True
+            return
+        try:
+            daftar = _daftar_dari_body(json.loads(self.rfile.read(panjang) or b"null"))
+        except ValueError as e:
+            self._kirim(400, {"pesan": f"JSON tidak valid: {e}"})
+            return
+
+        antrean = self.server.antrean
+        barang = antrean.pencatat.barang()
+        hasil = [None] * len(daftar)
+        valid = []
+        for i, data in enumerate(daftar):
+            try:
+                valid.append((i, baca_transaksi(data, barang)))
+            except ValueError as e:
+                kunci = data.get("kunci") if isinstance(data, dict) else None
+                hasil[i] = {"kunci": kunci, "status": TIDAK_VALID, "id_dokumen": None, "no": None, "pesan": str(e)}
+
+        try:
+            tiket = antrean.ajukan([trx for _, trx in valid])
+        except AntreanPenuh as e:
+            self._kirim(503, {"pesan": f"{e}, coba lagi nanti"}, {"Retry-After": "1"})
+            return
+
+        batas_waktu = time.monotonic() + BATAS_TUNGGU
+        semua_selesai = True
+        for (i, trx), t in zip(valid, tiket):
+            if t.tunggu(max(0.0, batas_waktu - time.monotonic())):
+                hasil[i] = t.hasil
+            else:
+                semua_selesai = False
+                hasil[i] = {"kunci": trx["kunci"], "status": ANTRE, "id_dokumen": None, "no": None,
+                            "pesan": "Belum diposting; kirim ulang dengan kunci yang sama untuk memeriksa"}
+        self._kirim(200 if semua_selesai else 202, {"hasil": hasil})
+
+
+class ServerPOS(ThreadingHTTPServer):
+    daemon_threads = True
+    # Banyak kasir bisa tersambung bersamaan; backlog default (5) memutus sambungan
+    request_queue_size = 128
+
+
+def buat_server(pencatat, host="127.0.0.1", port=8765, **opsi_antrean):
+    """ServerPOS dengan AntreanPOS yang sudah berjalan (server.antrean)"""
+    server = ServerPOS((host, port), PenanganPOS)
+    server.antrean = AntreanPOS(pencatat, **opsi_antrean).mulai()
+    return server
+
+
+def layani(pencatat, host="127.0.0.1", port=8765, **opsi_antrean):
+    """Jalankan layanan sampai Ctrl+C; transaksi yang sudah antre diposting sebelum keluar"""
+    server = buat_server(pencatat, host, port, **opsi_antrean)
+    print(f"🧾 Layanan POS berjalan di http://{host}:{server.server_address[1]} (Ctrl+C untuk berhenti)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ Menghentikan layanan POS...")
+    finally:
+        server.server_close()
+        server.antrean.hentikan()
+        statistik = server.antrean.statistik()
+        print(f"✅ Layanan POS berhenti: {statistik['diposting']} transaksi diposting dalam "
+              f"{statistik['batch']} batch")
@@ -0,0 +1,578 @@
+"""
+Mesin buku besar vektor.
+
+Semua jurnal (saldo awal, jurnal umum, penyesuaian, penutup) diubah menjadi
+satu tabel posting, diurutkan sekali, lalu saldo berjalan dihitung dengan
+cumsum per akun. Tidak ada iterrows di jalur ini.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from simaya.rupiah import parse_rupiah_array
+
+KOLOM_BUKU_BESAR = [
+    "No", "Tanggal", "Sumber", "Keterangan", "Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"
+]
+KOLOM_BUKU_BESAR_AKUN = [
+    "No", "Tanggal", "Sumber", "Keterangan", "No_Transaksi", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"
+]
+KOLOM_POSTING = [
+    "Tanggal", "Sumber", "Keterangan", "Nama Akun", "No_Transaksi", "Debit (Rp)", "Kredit (Rp)", "_urutan"
+]
+
+# Urutan sumber menentukan urutan posting bila tanggal dan nomor transaksi sama
+SUMBER_JURNAL = [
+    ("df_jurnal_umum", "Jurnal Umum"),
+    ("df_jurnal_penyesuaian", "Jurnal Penyesuaian"),
+    ("df_jurnal_penutup", "Jurnal Penutup"),
+]
+
+
+def _kolom(df, nama, default=None):
+    """Ambil kolom jika ada, atau Series berisi default"""
+    if nama in df.columns:
+        return df[nama]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def _nama_akun(nilai):
+    """Normalisasi nama akun: NaN menjadi string kosong"""
+    return nilai.astype(object).where(nilai.notna(), "").astype(str).str.strip()
+
+
+def _posting_kosong():
+    return pd.DataFrame({
+        "Tanggal": pd.Series(dtype="datetime64[ns]"),
+        "Sumber": pd.Series(dtype=object),
+        "Keterangan": pd.Series(dtype=object),
+        "Nama Akun": pd.Series(dtype=object),
+        "No_Transaksi": pd.Series(dtype="int64"),
+        "Debit (Rp)": pd.Series(dtype="float64"),
+        "Kredit (Rp)": pd.Series(dtype="float64"),
+        "_urutan": pd.Series(dtype="int64"),
+    })
+
+
+def posting_saldo_awal(df_saldo_awal, tanggal_awal_periode, periode, urutan_awal=0):
+    """Ubah neraca saldo periode sebelumnya menjadi posting 'Saldo Awal'"""
+    if df_saldo_awal is None or df_saldo_awal.empty:
+        return _posting_kosong()
+
+    saldo = (
+        parse_rupiah_array(_kolom(df_saldo_awal, "Debit (Rp)", 0.0))
+        - parse_rupiah_array(_kolom(df_saldo_awal, "Kredit (Rp)", 0.0))
+    )
+    akun = _nama_akun(_kolom(df_saldo_awal, "Nama Akun", "")).to_numpy()
+    ada = saldo != 0
+    saldo = saldo[ada]
+    n = len(saldo)
+
+    return pd.DataFrame({
+        "Tanggal": pd.Series([tanggal_awal_periode] * n, dtype=object),
+        "Sumber": "Saldo Awal",
+        "Keterangan": f"Saldo Awal Periode {periode}",
+        "Nama Akun": akun[ada],
+        "No_Transaksi": np.zeros(n, dtype="int64"),
+        "Debit (Rp)": np.where(saldo > 0, saldo, 0.0),
+        "Kredit (Rp)": np.where(saldo < 0, -saldo, 0.0),
+        "_urutan": np.arange(urutan_awal, urutan_awal + n, dtype="int64"),
+    })
+
+
+def posting_jurnal(df_jurnal, sumber, urutan_awal=0):
+    """
+    Ubah satu jurnal (format Akun Debit / Akun Kredit per baris) menjadi posting.
+
+    Setiap baris menghasilkan maksimal dua posting: sisi debit lalu sisi kredit,
+    sama seperti urutan loop lama.
+    """
+    if df_jurnal is None or df_jurnal.empty:
+        return _posting_kosong()
+
+    n = len(df_jurnal)
+    debit = parse_rupiah_array(_kolom(df_jurnal, "Debit (Rp)", 0.0))
+    kredit = parse_rupiah_array(_kolom(df_jurnal, "Kredit (Rp)", 0.0))
+    nomor = _kolom(df_jurnal, "No", 0)
+    no_transaksi = parse_rupiah_array(nomor).astype("int64")
+
+    if sumber == "Jurnal Umum":
+        keterangan = ("Transaksi No " + nomor.astype(str)).to_numpy(dtype=object)
+    else:
+        ket = _kolom(df_jurnal, "Keterangan", "")
+        keterangan = ket.astype(object).where(ket.notna(), "").astype(str).to_numpy(dtype=object)
+
+    tanggal = _kolom(df_jurnal, "Tanggal").to_numpy(dtype=object)
+    urutan = urutan_awal + 2 * np.arange(n, dtype="int64")
+
+    bagian = []
+    for sisi, nilai, kolom_akun, geser in (("debit", debit, "Akun Debit", 0), ("kredit", kredit, "Akun Kredit", 1)):
+        ada = nilai > 0
+        if not ada.any():
+            continue
+        akun = _nama_akun(_kolom(df_jurnal, kolom_akun, "")).to_numpy(dtype=object)
+        jumlah = ada.sum()
+        bagian.append(pd.DataFrame({
+            "Tanggal": tanggal[ada],
+            "Sumber": sumber,
+            "Keterangan": keterangan[ada],
+            "Nama Akun": akun[ada],
+            "No_Transaksi": no_transaksi[ada],
+            "Debit (Rp)": nilai[ada] if sisi == "debit" else np.zeros(jumlah),
+            "Kredit (Rp)": nilai[ada] if sisi == "kredit" else np.zeros(jumlah),
+            "_urutan": urutan[ada] + geser,
+        }))
+
+    if not bagian:
+        return _posting_kosong()
+    return pd.concat(bagian, ignore_index=True)
+
+
+def kumpulkan_posting(df_saldo_awal, jurnal, tanggal_awal_periode, periode):
+    """
+    Gabungkan saldo awal dan semua jurnal menjadi satu tabel posting.
+
+    ``jurnal`` adalah dict {"df_jurnal_umum": df, "df_jurnal_penyesuaian": df, ...}.
+    Kolom Tanggal dikembalikan sebagai datetime64 agar bisa diurutkan cepat.
+    """
+    bagian = [posting_saldo_awal(df_saldo_awal, tanggal_awal_periode, periode)]
+    urutan = len(bagian[0])
+    for kunci, sumber in SUMBER_JURNAL:
+        df = jurnal.get(kunci)
+        bagian.append(posting_jurnal(df, sumber, urutan_awal=urutan))
+        if df is not None:
+            urutan += 2 * len(df)
+
+    bagian = [b for b in bagian if not b.empty]
+    if not bagian:
+        return _posting_kosong()
+
+    posting = pd.concat(bagian, ignore_index=True)
+    posting["Tanggal"] = pd.to_datetime(posting["Tanggal"], errors="coerce")
+    posting = posting[posting["Nama Akun"] != ""]
+    return posting.reset_index(drop=True)
+
+
+def hitung_saldo_berjalan(posting):
+    """
+    Urutkan posting per akun (Tanggal, No_Transaksi, urutan input) dengan sort
+    stabil lalu hitung nomor baris dan saldo berjalan per akun.
+    """
+    posting = posting.sort_values(
+        ["Nama Akun", "Tanggal", "No_Transaksi", "_urutan"],
+        kind="mergesort",
+        na_position="last",
+    ).reset_index(drop=True)
+
+    mutasi = posting["Debit (Rp)"] - posting["Kredit (Rp)"]
+    grup = posting.groupby("Nama Akun", sort=False)
+    posting["Saldo (Rp)"] = mutasi.groupby(posting["Nama Akun"], sort=False).cumsum()
+    posting["No"] = grup.cumcount() + 1
+    return posting
+
+
+def _tanggal_ke_date(tanggal):
+    """datetime64 -> objek date (NaT tetap NaT) seperti .dt.date pada versi lama"""
+    return tanggal.dt.date
+
+
+def bangun_buku_besar(df_saldo_awal, jurnal, tanggal_awal_periode=None, periode=""):
+    """
+    Bangun buku besar per akun dan buku besar flat dalam satu lintasan.
+
+    Returns:
+        (buku_besar_per_akun, df_buku_besar) - dict {akun: DataFrame} dengan
+        kolom KOLOM_BUKU_BESAR_AKUN dan DataFrame flat KOLOM_BUKU_BESAR.
+    """
+    if tanggal_awal_periode is None:
+        tanggal_awal_periode = date.today().replace(day=1)
+
+    posting = kumpulkan_posting(df_saldo_awal, jurnal, tanggal_awal_periode, periode)
+    if posting.empty:
+        return {}, pd.DataFrame(columns=KOLOM_BUKU_BESAR)
+
+    posting = hitung_saldo_berjalan(posting)
+    posting["Tanggal"] = _tanggal_ke_date(posting["Tanggal"])
+
+    df_buku_besar = posting[KOLOM_BUKU_BESAR].reset_index(drop=True)
+
+    # Posting sudah terurut per akun, jadi tiap akun adalah potongan berurutan
+    akun = posting["Nama Akun"].to_numpy(dtype=object)
+    batas = np.flatnonzero(akun[1:] != akun[:-1]) + 1
+    awal = np.concatenate(([0], batas))
+    akhir = np.concatenate((batas, [len(posting)]))
+
+    tabel_akun = posting[KOLOM_BUKU_BESAR_AKUN]
+    buku_besar_per_akun = {
+        akun[a]: tabel_akun.iloc[a:b].reset_index(drop=True)
+        for a, b in zip(awal, akhir)
+    }
+    return buku_besar_per_akun, df_buku_besar
+
+
+# ========== NERACA SALDO ==========
+
+KOLOM_NERACA_SALDO = ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"]
+
+# Selisih debit-kredit di bawah batas ini dianggap pembulatan
+TOLERANSI_SEIMBANG = 1.0
+
+
+def _ringkasan(total_debit, total_kredit):
+    selisih = abs(total_debit - total_kredit)
+    return {
+        "total_debit": total_debit,
+        "total_kredit": total_kredit,
+        "selisih": selisih,
+        "seimbang": selisih < TOLERANSI_SEIMBANG,
+    }
+
+
+def _angka_akun(kolom):
+    """Kolom buku besar -> array float (kosong = 0); kolom float64 dibaca langsung tanpa parsing"""
+    if kolom.dtype == "float64":
+        nilai = kolom.to_numpy()
+        return np.where(np.isnan(nilai), 0.0, nilai)
+    return parse_rupiah_array(kolom)
+
+
+def _agregat_per_akun(buku_besar_per_akun):
+    """
+    Jumlah debit, jumlah kredit dan saldo terakhir langsung dari buku besar per
+    akun (satu penjumlahan vektor per kolom, tanpa menggabungkan semua posting)
+    """
+    agregat = {}
+    for akun, df in buku_besar_per_akun.items():
+        if df is None or df.empty:
+            continue
+        nama = "" if akun is None else str(akun).strip()
+        if nama in ("", "TOTAL"):
+            continue
+        debit = _angka_akun(df["Debit (Rp)"]).sum()
+        kredit = _angka_akun(df["Kredit (Rp)"]).sum()
+        saldo = _angka_akun(df["Saldo (Rp)"].iloc[-1:])[0]
+        if nama in agregat:
+            debit += agregat[nama][0]
+            kredit += agregat[nama][1]
+        agregat[nama] = (debit, kredit, saldo)
+    return pd.DataFrame(
+        [(nama, *nilai) for nama, nilai in sorted(agregat.items())],
+        columns=["Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"],
+    )
+
+
+def bangun_neraca_saldo(buku_besar_per_akun=None, df_buku_besar=None):
+    """
+    Neraca saldo dari buku besar tanpa loop per baris.
+
+    Sumber data adalah buku besar per akun (penjumlahan per akun tanpa
+    penggabungan) jika diberikan, atau buku besar flat (df_buku_besar, satu
+    groupby). Per akun: jumlah debit, jumlah kredit dan saldo terakhir (baris
+    terakhir akun sesuai urutan buku besar).
+
+    Returns:
+        (df_neraca_saldo, ringkasan) - df_neraca_saldo berkolom
+        KOLOM_NERACA_SALDO dengan baris TOTAL di akhir; ringkasan berisi
+        total_debit, total_kredit, selisih dan seimbang.
+    """
+    if buku_besar_per_akun:
+        akun_rows = _agregat_per_akun(buku_besar_per_akun)
+    elif df_buku_besar is not None and not df_buku_besar.empty:
+        posting = df_buku_besar[["Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"]]
+        posting = pd.DataFrame({
+            "Nama Akun": _nama_akun(posting["Nama Akun"]),
+            "Debit (Rp)": parse_rupiah_array(posting["Debit (Rp)"]),
+            "Kredit (Rp)": parse_rupiah_array(posting["Kredit (Rp)"]),
+            "Saldo (Rp)": parse_rupiah_array(posting["Saldo (Rp)"]),
+        })
+        posting = posting[(posting["Nama Akun"] != "") & (posting["Nama Akun"] != "TOTAL")]
+        akun_rows = posting.groupby("Nama Akun", sort=True).agg({
+            "Debit (Rp)": "sum",
+            "Kredit (Rp)": "sum",
+            "Saldo (Rp)": "last",
+        }).reset_index()
+    else:
+        akun_rows = _agregat_per_akun({})
+    if akun_rows.empty:
+        return pd.DataFrame(columns=KOLOM_NERACA_SALDO), _ringkasan(0.0, 0.0)
+
+    akun_rows.insert(0, "No", np.arange(1, len(akun_rows) + 1))
+
+    ringkasan = _ringkasan(float(akun_rows["Debit (Rp)"].sum()), float(akun_rows["Kredit (Rp)"].sum()))
+    total_row = {
+        "No": "",
+        "Nama Akun": "TOTAL",
+        "Debit (Rp)": ringkasan["total_debit"],
+        "Kredit (Rp)": ringkasan["total_kredit"],
+        "Saldo (Rp)": "",
+    }
+    return pd.concat([akun_rows, pd.DataFrame([total_row])], ignore_index=True), ringkasan
+
+
+def ringkas_neraca_saldo(df_neraca_saldo):
+    """Total debit/kredit dan cek keseimbangan dari tabel neraca saldo yang sudah ada (tanpa baris TOTAL)"""
+    if df_neraca_saldo is None or df_neraca_saldo.empty or "Nama Akun" not in df_neraca_saldo.columns:
+        return _ringkasan(0.0, 0.0)
+    akun_rows = df_neraca_saldo[df_neraca_saldo["Nama Akun"] != "TOTAL"]
+    return _ringkasan(
+        float(parse_rupiah_array(akun_rows["Debit (Rp)"]).sum()),
+        float(parse_rupiah_array(akun_rows["Kredit (Rp)"]).sum()),
+    )
+
+
+# ========== POSTING INKREMENTAL ==========
+
+def ke_format_lama(df_jurnal):
+    """Jurnal umum -> format lama (Tanggal, Nama Akun, Debit, Kredit) per sisi"""
+    posting = posting_jurnal(df_jurnal, "Jurnal Umum")
+    return posting[["Tanggal", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"]].reset_index(drop=True)
+
+
+def hapus_transaksi_jurnal(df_jurnal, no):
+    """
+    Hapus semua baris satu nomor transaksi (atau daftar nomor) lalu nomori
+    ulang kolom No secara berurutan, sekali untuk seluruh daftar.
+    """
+    daftar_no = list(no) if isinstance(no, (list, tuple, set, np.ndarray, pd.Series)) else [no]
+    df = df_jurnal[~df_jurnal["No"].isin(daftar_no)].reset_index(drop=True)
+    # Peringkat No lama di antara No yang tersisa = No baru
+    _, peringkat = np.unique(df["No"].to_numpy(), return_inverse=True)
+    df["No"] = (peringkat + 1).astype("int64")
+    return df
+
+
+def nomori_transaksi_baru(df_jurnal, df_baru):
+    """
+    Baris jurnal baru yang No-nya sudah dipakai di df_jurnal (dialokasikan
+    bersamaan oleh penulis lain) dinomori ulang mulai nomor terbesar + 1
+    dengan urutan transaksi dipertahankan. Tanpa bentrok df_baru dikembalikan apa adanya.
+    """
+    if df_jurnal is None or df_baru.empty or "No" not in df_jurnal.columns or "No" not in df_baru.columns:
+        return df_baru
+    no_lama = pd.to_numeric(df_jurnal["No"], errors="coerce")
+    no_baru = pd.to_numeric(df_baru["No"], errors="coerce")
+    if not no_baru.isin(no_lama.dropna()).any():
+        return df_baru
+    # Kode per No baru sesuai urutan kemunculan (-1 untuk No kosong, dibiarkan)
+    kode, _ = pd.factorize(no_baru)
+    terbesar = no_lama.max()
+    mulai = 1 if pd.isna(terbesar) else int(terbesar) + 1
+    df_baru = df_baru.copy()
+    ada = kode >= 0
+    df_baru.loc[ada, "No"] = mulai + kode[ada]
+    return df_baru
+
+
+def _kunci_urut(df_akun):
+    """(Tanggal, No_Transaksi) baris terakhir sebuah akun, None jika tidak bisa dibandingkan"""
+    if df_akun is None or df_akun.empty:
+        return None
+    tanggal = pd.to_datetime(df_akun["Tanggal"].iloc[-1], errors="coerce")
+    if pd.isna(tanggal):
+        return None
+    return tanggal, int(df_akun["No_Transaksi"].iloc[-1])
+
+
+def _susun_ulang_akun(df_akun, posting_baru):
+    """Gabung posting lama + baru lalu urutkan ulang satu akun (untuk transaksi mundur tanggal)"""
+    lama = df_akun[["Tanggal", "Sumber", "Keterangan", "No_Transaksi", "Debit (Rp)", "Kredit (Rp)"]].copy()
+    lama["_urutan"] = np.arange(len(lama), dtype="int64")
+    baru = posting_baru.drop(columns=["Nama Akun"]).copy()
+    baru["_urutan"] = np.arange(len(lama), len(lama) + len(baru), dtype="int64")
+
+    gabung = pd.concat([lama, baru], ignore_index=True)
+    gabung["Tanggal"] = pd.to_datetime(gabung["Tanggal"], errors="coerce")
+    gabung = gabung.sort_values(
+        ["Tanggal", "No_Transaksi", "_urutan"], kind="mergesort", na_position="last"
+    ).reset_index(drop=True)
+    gabung["Tanggal"] = _tanggal_ke_date(gabung["Tanggal"])
+    gabung["Saldo (Rp)"] = (gabung["Debit (Rp)"] - gabung["Kredit (Rp)"]).cumsum()
+    gabung["No"] = np.arange(1, len(gabung) + 1)
+    return gabung[KOLOM_BUKU_BESAR_AKUN]
+
+
+def posting_inkremental(buku_besar_per_akun, df_buku_besar, df_jurnal_baru, sumber="Jurnal Umum"):
+    """
+    Posting baris jurnal baru ke buku besar yang sudah ada tanpa membangun ulang.
+
+    Hanya akun yang tersentuh yang diperbarui: posting baru diurutkan (Tanggal,
+    No transaksi, urutan input), ditambahkan di akhir akun dan saldo berjalan
+    dilanjutkan dari saldo terakhir. Jika posting paling awal lebih dulu dari
+    baris terakhir akun tersebut, hanya akun itu yang diurutkan ulang. Baris baru pada buku besar flat ditambahkan di bagian akhir (urutan
+    per akun kembali rapi setelah rekonsiliasi penuh).
+
+    Returns:
+        (buku_besar_per_akun, df_buku_besar, mutasi) - mutasi adalah DataFrame
+        per akun berisi total Debit/Kredit baru untuk update neraca saldo.
+    """
+    posting = posting_jurnal(df_jurnal_baru, sumber)
+    posting = posting[posting["Nama Akun"] != ""]
+    buku_besar_per_akun = dict(buku_besar_per_akun or {})
+    if posting.empty:
+        return buku_besar_per_akun, df_buku_besar, pd.DataFrame(columns=["Nama Akun", "Debit (Rp)", "Kredit (Rp)"])
+
+    # Urutan yang sama dengan rekonsiliasi penuh (hitung_saldo_berjalan): batch
+    # boleh berisi tanggal campuran, mis. transaksi POS yang dikirim belakangan
+    posting = posting.copy()
+    posting["Tanggal"] = pd.to_datetime(posting["Tanggal"], errors="coerce")
+    posting = posting.sort_values(["Tanggal", "No_Transaksi", "_urutan"], kind="mergesort", na_position="last")
+    posting["Tanggal"] = _tanggal_ke_date(posting["Tanggal"])
+    posting = posting.drop(columns=["_urutan"])
+
+    baris_flat = []
+    akun_disusun_ulang = []
+    for akun, baru in posting.groupby("Nama Akun", sort=False):
+        lama = buku_besar_per_akun.get(akun)
+        kunci_lama = _kunci_urut(lama)
+        # baru sudah terurut: baris pertama adalah posting paling awal
+        kunci_baru = (pd.Timestamp(baru["Tanggal"].iloc[0]), int(baru["No_Transaksi"].iloc[0]))
+
+        if lama is not None and not lama.empty and (kunci_lama is None or kunci_baru < kunci_lama):
+            # Transaksi mundur tanggal: susun ulang akun ini saja
+            buku_besar_per_akun[akun] = _susun_ulang_akun(lama, baru)
+            akun_disusun_ulang.append(akun)
+            continue
+
+        saldo_terakhir = float(lama["Saldo (Rp)"].iloc[-1]) if lama is not None and not lama.empty else 0.0
+        no_terakhir = len(lama) if lama is not None else 0
+        tambahan = baru.drop(columns=["Nama Akun"]).reset_index(drop=True)
+        tambahan["Saldo (Rp)"] = saldo_terakhir + (tambahan["Debit (Rp)"] - tambahan["Kredit (Rp)"]).cumsum()
+        tambahan["No"] = np.arange(no_terakhir + 1, no_terakhir + len(tambahan) + 1)
+        tambahan = tambahan[KOLOM_BUKU_BESAR_AKUN]
+
+        buku_besar_per_akun[akun] = (
+            tambahan if lama is None or lama.empty
+            else pd.concat([lama, tambahan], ignore_index=True)
+        )
+        flat = tambahan.drop(columns=["No_Transaksi"])
+        flat.insert(4, "Nama Akun", akun)
+        baris_flat.append(flat)
+
+    if df_buku_besar is None or df_buku_besar.empty:
+        df_buku_besar = pd.DataFrame(columns=KOLOM_BUKU_BESAR)
+    if akun_disusun_ulang:
+        df_buku_besar = df_buku_besar[~df_buku_besar["Nama Akun"].isin(akun_disusun_ulang)]
+        for akun in akun_disusun_ulang:
+            flat = buku_besar_per_akun[akun].drop(columns=["No_Transaksi"])
+            flat.insert(4, "Nama Akun", akun)
+            baris_flat.append(flat)
+    bagian = [df_buku_besar] + baris_flat if not df_buku_besar.empty else baris_flat
+    df_buku_besar = pd.concat(bagian, ignore_index=True)[KOLOM_BUKU_BESAR]
+
+    mutasi = posting.groupby("Nama Akun", sort=False)[["Debit (Rp)", "Kredit (Rp)"]].sum().reset_index()
+    return buku_besar_per_akun, df_buku_besar, mutasi
+
+
+def perbarui_neraca_saldo_inkremental(df_neraca_saldo, buku_besar_per_akun, mutasi):
+    """
+    Tambahkan mutasi debit/kredit ke baris akun pada neraca saldo dan hitung
+    ulang baris TOTAL. Akun baru disisipkan sesuai urutan nama.
+    """
+    kolom = ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"]
+    if df_neraca_saldo is None or df_neraca_saldo.empty or "Nama Akun" not in df_neraca_saldo.columns:
+        akun_rows = pd.DataFrame(columns=kolom[1:])
+    else:
+        akun_rows = df_neraca_saldo[df_neraca_saldo["Nama Akun"] != "TOTAL"].copy()
+        for nama in kolom[1:]:
+            if nama not in akun_rows.columns:
+                akun_rows[nama] = 0.0
+        akun_rows = akun_rows[kolom[1:]]
+
+    akun_rows = akun_rows.set_index("Nama Akun")
+    akun_rows["Debit (Rp)"] = parse_rupiah_array(akun_rows["Debit (Rp)"])
+    akun_rows["Kredit (Rp)"] = parse_rupiah_array(akun_rows["Kredit (Rp)"])
+    akun_rows["Saldo (Rp)"] = parse_rupiah_array(akun_rows["Saldo (Rp)"])
+
+    ada_akun_baru = False
+    for akun, debit, kredit in mutasi[["Nama Akun", "Debit (Rp)", "Kredit (Rp)"]].itertuples(index=False):
+        saldo = float(buku_besar_per_akun[akun]["Saldo (Rp)"].iloc[-1])
+        if akun in akun_rows.index:
+            akun_rows.loc[akun, "Debit (Rp)"] += debit
+            akun_rows.loc[akun, "Kredit (Rp)"] += kredit
+            akun_rows.loc[akun, "Saldo (Rp)"] = saldo
+        else:
+            akun_rows.loc[akun] = [debit, kredit, saldo]
+            ada_akun_baru = True
+
+    if ada_akun_baru:
+        akun_rows = akun_rows.sort_index()
+    akun_rows = akun_rows.reset_index()
+    akun_rows.insert(0, "No", range(1, len(akun_rows) + 1))
+
+    total_row = {
+        "No": "",
+        "Nama Akun": "TOTAL",
+        "Debit (Rp)": akun_rows["Debit (Rp)"].sum(),
+        "Kredit (Rp)": akun_rows["Kredit (Rp)"].sum(),
+        "Saldo (Rp)": "",
+    }
+    return pd.concat([akun_rows, pd.DataFrame([total_row])], ignore_index=True)
+
+
+# ========== RINGKASAN TRANSAKSI ==========
+
+KOLOM_RINGKASAN_TRANSAKSI = ["No", "Tanggal", "Entri", "Total (Rp)", "Akun"]
+
+
+def ringkasan_transaksi(df_jurnal):
+    """
+    Indeks satu baris per nomor transaksi jurnal umum: tanggal, jumlah entri,
+    total debit dan daftar akun (debit lalu kredit, tanpa duplikat). Dibangun
+    dengan satu groupby, bukan menyaring jurnal per nomor.
+    """
+    if df_jurnal is None or df_jurnal.empty:
+        return pd.DataFrame(columns=KOLOM_RINGKASAN_TRANSAKSI)
+
+    no = df_jurnal["No"].to_numpy()
+    ringkasan = pd.DataFrame({
+        "No": no,
+        "Tanggal": df_jurnal["Tanggal"].to_numpy(),
+        "Debit": parse_rupiah_array(df_jurnal["Debit (Rp)"]),
+    }).groupby("No", sort=True).agg(
+        Tanggal=("Tanggal", "first"), Entri=("Debit", "size"), Total=("Debit", "sum")
+    )
+
+    # Akun debit semua baris lalu akun kredit; urut stabil per No menjaga urutan itu
+    akun = pd.DataFrame({
+        "No": np.concatenate([no, no]),
+        "Akun": np.concatenate([
+            _nama_akun(df_jurnal["Akun Debit"]).to_numpy(), _nama_akun(df_jurnal["Akun Kredit"]).to_numpy()
+        ]),
+    })
+    akun = akun[akun["Akun"] != ""].drop_duplicates().sort_values("No", kind="stable")
+    nomor, awal = np.unique(akun["No"].to_numpy(), return_index=True)
+    nama = akun["Akun"].tolist()
+    batas = list(awal[1:]) + [len(nama)]
+    daftar_akun = pd.Series(
+        [", ".join(nama[a:b]) for a, b in zip(awal, batas)], index=nomor, dtype=object
+    )
+
+    ringkasan = ringkasan.reset_index()
+    ringkasan["Tanggal"] = pd.to_datetime(ringkasan["Tanggal"], errors="coerce")
+    ringkasan["Akun"] = ringkasan["No"].map(daftar_akun).fillna("")
+    return ringkasan.rename(columns={"Total": "Total (Rp)"})[KOLOM_RINGKASAN_TRANSAKSI]
+
+
+def saring_transaksi(ringkasan, cari="", tanggal_dari=None, tanggal_sampai=None, nominal_min=None, nominal_maks=None):
+    """
+    Saring hasil ringkasan_transaksi(). cari dicocokkan ke nama akun (tanpa
+    beda huruf besar/kecil) atau sama dengan No; filter yang None diabaikan.
+    """
+    cocok = np.ones(len(ringkasan), dtype=bool)
+    cari = (cari or "").strip()
+    if cari:
+        cocok_cari = ringkasan["Akun"].str.contains(cari, case=False, regex=False).to_numpy()
+        if cari.isdigit():
+            cocok_cari |= (ringkasan["No"] == int(cari)).to_numpy()
+        cocok &= cocok_cari
+    if tanggal_dari is not None:
+        cocok &= (ringkasan["Tanggal"] >= pd.Timestamp(tanggal_dari)).to_numpy()
+    if tanggal_sampai is not None:
+        cocok &= (ringkasan["Tanggal"] < pd.Timestamp(tanggal_sampai) + pd.Timedelta(days=1)).to_numpy()
+    if nominal_min is not None:
+        cocok &= (ringkasan["Total (Rp)"] >= nominal_min).to_numpy()
+    if nominal_maks is not None:
+        cocok &= (ringkasan["Total (Rp)"] <= nominal_maks).to_numpy()
+    return ringkasan[cocok]
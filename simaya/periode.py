@@ -0,0 +1,150 @@
+"""
+Periode akuntansi tanpa Streamlit: nama periode, neraca saldo setelah
+penutup, riwayat periode dan penutupan periode atas simaya.buku.Buku.
+"""
+
+from datetime import datetime
+from io import StringIO
+
+import pandas as pd
+
+from simaya.buku import Buku
+from simaya.laporan import saldo_akhir_akun
+from simaya.schema import terapkan_skema
+from simaya.storage import KOLOM_TABEL
+
+NAMA_BULAN = [
+    "Januari", "Februari", "Maret", "April", "Mei", "Juni",
+    "Juli", "Agustus", "September", "Oktober", "November", "Desember"
+]
+
+# Akun nominal yang tidak ikut neraca saldo akun riil setelah penutupan
+AKUN_NOMINAL = [
+    "Pendapatan Jasa", "Pendapatan Lain", "Beban Gaji", "Beban Sewa",
+    "Beban Listrik dan Air", "Beban Transportasi", "Beban Lain-lain", "Ikhtisar Laba Rugi"
+]
+
+
+def dapatkan_periode_sebelumnya(periode_sekarang):
+    """Nama periode sebelumnya ("Maret 2025" -> "Februari 2025")"""
+    try:
+        bulan_tahun = periode_sekarang.split()
+        if len(bulan_tahun) == 2 and bulan_tahun[0] in NAMA_BULAN:
+            bulan, tahun = NAMA_BULAN.index(bulan_tahun[0]) + 1, int(bulan_tahun[1])
+            if bulan == 1:
+                return f"Desember {tahun - 1}"
+            return f"{NAMA_BULAN[bulan - 2]} {tahun}"
+    except Exception as e:
+        print(f"Error mendapatkan periode sebelumnya: {e}")
+
+    return "Periode Sebelumnya"
+
+
+def periode_berikutnya(sekarang=None):
+    """
+    (nama periode, tanggal awal) bulan setelah `sekarang` (default hari ini),
+    seperti periode baru yang dibuka saat periode diakhiri.
+    """
+    sekarang = sekarang or datetime.now()
+    if sekarang.month == 12:
+        bulan, tahun = 1, sekarang.year + 1
+    else:
+        bulan, tahun = sekarang.month + 1, sekarang.year
+    return f"{datetime(1900, bulan, 1).strftime('%B')} {tahun}", datetime(tahun, bulan, 1).date()
+
+
+def neraca_setelah_penutup(buku_besar_per_akun):
+    """
+    Neraca saldo setelah penutup dari saldo akhir setiap akun: saldo positif
+    di Debit, negatif di Kredit (urutan akun buku besar).
+    """
+    saldo = pd.Series(saldo_akhir_akun(buku_besar_per_akun), dtype="float64")
+    return pd.DataFrame({
+        "No": range(1, len(saldo) + 1),
+        "Nama Akun": saldo.index,
+        "Debit (Rp)": saldo.where(saldo >= 0, 0.0).abs().to_numpy(),
+        "Kredit (Rp)": saldo.where(saldo < 0, 0.0).abs().to_numpy(),
+    })
+
+
+def neraca_akun_riil(buku_besar_per_akun):
+    """
+    Neraca akun riil setelah penutupan (tanpa AKUN_NOMINAL): total debit,
+    total kredit dan saldo akhir per akun, urut nama akun. None jika kosong.
+    """
+    neraca_data = [
+        {
+            "Nama Akun": akun,
+            "Debit (Rp)": df_akun["Debit (Rp)"].sum(),
+            "Kredit (Rp)": df_akun["Kredit (Rp)"].sum(),
+            "Saldo (Rp)": df_akun["Saldo (Rp)"].iloc[-1],
+        }
+        for akun, df_akun in buku_besar_per_akun.items()
+        if akun not in AKUN_NOMINAL and not df_akun.empty
+    ]
+    if not neraca_data:
+        return None
+    neraca_saldo = pd.DataFrame(neraca_data).sort_values("Nama Akun").reset_index(drop=True)
+    neraca_saldo.insert(0, "No", range(1, len(neraca_saldo) + 1))
+    return neraca_saldo
+
+
+# ========== RIWAYAT PERIODE ==========
+
+def catat_riwayat_periode(df_riwayat, periode, df_neraca, waktu=None):
+    """Tabel riwayat_periode baru dengan neraca periode (JSON) ditambah atau diganti"""
+    waktu = (waktu or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    data_json = df_neraca.to_json()
+    if df_riwayat is None or len(df_riwayat.columns) == 0:
+        df_riwayat = pd.DataFrame(columns=KOLOM_TABEL["riwayat_periode"])
+    if periode in df_riwayat["Periode"].values:
+        df_riwayat = df_riwayat.copy()
+        df_riwayat.loc[df_riwayat["Periode"] == periode, ["Tanggal_Simpan", "Data"]] = [waktu, data_json]
+        return df_riwayat
+    baris = pd.DataFrame([{"Periode": periode, "Tanggal_Simpan": waktu, "Data": data_json}])
+    return pd.concat([df_riwayat, baris], ignore_index=True)
+
+
+def baca_riwayat_periode(df_riwayat, periode):
+    """Neraca saldo setelah penutup periode dari tabel riwayat_periode (kosong jika tidak ada)"""
+    if df_riwayat is None or df_riwayat.empty or periode not in df_riwayat["Periode"].values:
+        return pd.DataFrame()
+    data_json = df_riwayat[df_riwayat["Periode"] == periode]["Data"].iloc[0]
+    return terapkan_skema(pd.read_json(StringIO(data_json)))
+
+
+# ========== PENUTUPAN PERIODE ==========
+
+def tutup_periode(buku, sekarang=None):
+    """
+    Akhiri periode buku: bangun buku besar dan laporan, susun neraca saldo
+    setelah penutup, lalu buka periode berikutnya dengan neraca itu sebagai
+    saldo awal dan jurnal yang kosong (penjualan, pembelian dan persediaan
+    tetap dibawa).
+
+    Returns:
+        dict berisi periode, neraca_setelah_penutup, laporan, periode_baru,
+        tanggal_awal_periode dan buku_baru (Buku periode berikutnya).
+
+    Raises:
+        ValueError jika jurnal penutup masih kosong.
+    """
+    if buku.tabel["jurnal_penutup"].empty:
+        raise ValueError("Belum ada jurnal penutup. Silakan buat jurnal penutup terlebih dahulu.")
+
+    buku_besar_per_akun, _ = buku.buku_besar()
+    laporan = buku.laporan()
+    neraca = neraca_setelah_penutup(buku_besar_per_akun)
+    periode_baru, tanggal_awal = periode_berikutnya(sekarang)
+
+    tabel = dict(buku.tabel)
+    for nama in ("jurnal_umum", "jurnal_penyesuaian", "jurnal_penutup"):
+        tabel[nama] = None
+    if not neraca.empty:
+        tabel["neraca_saldo_sebelumnya"] = neraca
+    buku_baru = Buku(tabel, periode_baru, tanggal_awal, buku.metode_persediaan, buku.seq_log)
+
+    return {
+        "periode": buku.periode, "neraca_setelah_penutup": neraca, "laporan": laporan,
+        "periode_baru": periode_baru, "tanggal_awal_periode": tanggal_awal, "buku_baru": buku_baru,
+    }
@@ -0,0 +1,392 @@
+"""
+Posting transaksi POS (kasir) per batch tanpa Streamlit.
+
+Transaksi penjualan/pembelian dari kasir dicatat sama seperti form
+"Penjualan & Pembelian" (4 entri jurnal penjualan, 2 entri pembelian, baris
+penjualan/pembelian, riwayat persediaan dan ringkasan persediaan), tetapi
+satu batch berisi banyak transaksi hanya memerlukan satu posting inkremental
+buku besar dan satu append + fsync log jurnal (simaya.jurnal_log).
+
+Aplikasi dan layanan POS bisa menulis ke log yang sama. Batch ditulis
+dengan sesudah=<seq yang sudah dimuat>: jika ada event dari penulis lain di
+antaranya, log menolak (LogBerubah), data dimuat ulang dan batch diulang
+sehingga nomor transaksi dan stok selalu dihitung dari data terbaru.
+
+Setiap transaksi membawa kunci idempoten dari kasir. ID Dokumen diturunkan
+dari kunci itu (id_dokumen_pos), sehingga transaksi yang dikirim ulang
+(mis. kasir tidak menerima balasan) dikenali sebagai duplikat, juga setelah
+layanan dijalankan ulang.
+"""
+
+import hashlib
+import os
+import threading
+from datetime import date
+
+import pandas as pd
+
+from simaya.buku import Buku
+from simaya.dokumen import AWALAN_PEMBELIAN, AWALAN_PENJUALAN, KOLOM_ID
+from simaya.inventory import EPSILON, bangun_dari_riwayat, barang_persediaan, saldo_awal_persediaan
+from simaya.jurnal_log import LogBerubah, buka_log, path_log, seq_terakhir
+from simaya.ledger import posting_inkremental
+from simaya.schema import terapkan_skema
+from simaya.storage import KOLOM_TABEL
+
+JENIS_TRANSAKSI = ("penjualan", "pembelian")
+
+# Pilihan akun pada form penjualan / pembelian
+AKUN_PENERIMAAN = ("Kas", "Piutang Usaha")
+AKUN_PEMBAYARAN = ("Kas", "Utang Usaha")
+
+KETERANGAN_DEFAULT = {
+    "penjualan": "Penjualan kepada pelanggan",
+    "pembelian": "Pembelian dari supplier",
+}
+
+# Status hasil per transaksi
+DIPOSTING = "diposting"
+DUPLIKAT = "duplikat"
+DITOLAK = "ditolak"
+GAGAL = "gagal"
+
+MAKS_PANJANG_KUNCI = 200
+
+# Batch diulang paling banyak sekian kali jika penulis lain terus mendahului
+BATAS_PERCOBAAN = 5
+
+
+def id_dokumen_pos(jenis, kunci):
+    """ID Dokumen deterministik dari kunci idempoten kasir (PJ-/PB- + 12 hex)"""
+    awalan = AWALAN_PENJUALAN if jenis == "penjualan" else AWALAN_PEMBELIAN
+    return f"{awalan}-{hashlib.sha1(kunci.encode('utf-8')).hexdigest()[:12].upper()}"
+
+
+def _angka(data, nama, wajib=True):
+    nilai = data.get(nama)
+    if nilai is None:
+        if wajib:
+            raise ValueError(f"Field '{nama}' wajib diisi")
+        return None
+    if isinstance(nilai, bool):
+        raise ValueError(f"Field '{nama}' harus berupa angka")
+    try:
+        nilai = float(nilai)
+    except (TypeError, ValueError):
+        raise ValueError(f"Field '{nama}' harus berupa angka") from None
+    if nilai != nilai or nilai in (float("inf"), float("-inf")):
+        raise ValueError(f"Field '{nama}' harus berupa angka")
+    return nilai
+
+
+def baca_transaksi(data, barang):
+    """
+    Validasi satu transaksi JSON dari kasir; mengembalikan dict ternormalisasi
+    atau ValueError dengan pesan yang bisa dikirim balik ke kasir.
+
+    Field: kunci (wajib, unik per transaksi), jenis (penjualan/pembelian),
+    barang, jumlah, harga (per unit), tanggal (YYYY-MM-DD, default hari ini),
+    akun (Kas/Piutang Usaha untuk penjualan, Kas/Utang Usaha untuk pembelian)
+    dan keterangan.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Transaksi harus berupa objek JSON")
+
+    kunci = data.get("kunci")
+    if not isinstance(kunci, str) or not kunci.strip():
+        raise ValueError("Field 'kunci' (kunci idempoten) wajib diisi")
+    kunci = kunci.strip()
+    if len(kunci) > MAKS_PANJANG_KUNCI:
+        raise ValueError(f"Field 'kunci' maksimal {MAKS_PANJANG_KUNCI} karakter")
+
+    jenis = data.get("jenis", "penjualan")
+    if jenis not in JENIS_TRANSAKSI:
+        raise ValueError(f"Jenis transaksi tidak dikenal: {jenis}")
+
+    nama_barang = data.get("barang")
+    if nama_barang not in barang:
+        raise ValueError(f"Barang tidak dikenal: {nama_barang}")
+
+    jumlah = _angka(data, "jumlah")
+    if jumlah <= 0:
+        raise ValueError("Jumlah harus lebih dari 0")
+    harga = _angka(data, "harga")
+    if jenis == "penjualan" and harga < 0:
+        raise ValueError("Harga jual tidak boleh negatif")
+    if jenis == "pembelian" and harga <= 0:
+        raise ValueError("Harga beli harus lebih dari 0")
+
+    tanggal = data.get("tanggal")
+    if tanggal is None:
+        tanggal = date.today()
+    else:
+        try:
+            tanggal = date.fromisoformat(str(tanggal)[:10])
+        except ValueError:
+            raise ValueError(f"Tanggal tidak valid (format YYYY-MM-DD): {tanggal}") from None
+
+    pilihan_akun = AKUN_PENERIMAAN if jenis == "penjualan" else AKUN_PEMBAYARAN
+    akun = data.get("akun") or "Kas"
+    if akun not in pilihan_akun:
+        raise ValueError(f"Akun {jenis} harus salah satu dari: {', '.join(pilihan_akun)}")
+
+    keterangan = data.get("keterangan") or KETERANGAN_DEFAULT[jenis]
+    return {
+        "kunci": kunci, "jenis": jenis, "barang": nama_barang, "jumlah": jumlah, "harga": harga,
+        "tanggal": tanggal, "akun": akun, "keterangan": str(keterangan),
+    }
+
+
+def _hasil(trx, status, id_dokumen=None, no=None, pesan=""):
+    return {"kunci": trx["kunci"], "status": status, "id_dokumen": id_dokumen, "no": no, "pesan": pesan}
+
+
+def _id_tercatat(tabel):
+    id_dokumen = set()
+    for nama in ("jurnal_umum", "penjualan", "pembelian"):
+        df = tabel[nama]
+        if KOLOM_ID in df.columns:
+            id_dokumen.update(df[KOLOM_ID].dropna().astype(str))
+    return id_dokumen
+
+
+def _no_berikutnya(df):
+    """Nomor berikutnya = nomor terbesar + 1 (seperti transaction_counter)"""
+    if df.empty or "No" not in df.columns:
+        return 1
+    no = pd.to_numeric(df["No"], errors="coerce").max()
+    return 1 if pd.isna(no) else int(no) + 1
+
+
+class PencatatPOS:
+    """
+    Keadaan satu database untuk posting POS: tabel transaksi, mesin
+    persediaan dan buku besar per akun di memori, dimuat dari penyimpanan
+    dan diperbarui per batch. Aman dipanggil dari beberapa thread.
+    """
+
+    def __init__(self, backend, buku=None, metode_persediaan="Average", periode=None, tanggal_awal_periode=None):
+        """buku: Buku yang sudah dimuat dari backend (opsional; periode dan metode diambil darinya)"""
+        self.backend = backend
+        if buku is not None:
+            metode_persediaan, periode, tanggal_awal_periode = (
+                buku.metode_persediaan, buku.periode, buku.tanggal_awal_periode
+            )
+        self.metode_persediaan = metode_persediaan
+        self.periode = periode
+        self.tanggal_awal_periode = tanggal_awal_periode
+        self.log = buka_log(path_log(backend.path))
+        self._lock = threading.Lock()
+        # Buku tanpa nomor event log (tidak dimuat dari log) tidak bisa dilanjutkan: muat dari penyimpanan
+        self._muat(buku if buku is not None and buku.seq_log is not None else None)
+
+    # ---------------------------------------------------------- muat
+
+    def _tanda(self):
+        """Versi snapshot + nomor event terakhir log: berubah jika proses lain menulis"""
+        return self.backend.versi(), seq_terakhir(self.log.path)
+
+    def _muat(self, buku=None):
+        versi = self.backend.versi()
+        if buku is None:
+            buku = Buku.dari_storage(
+                self.backend, periode=self.periode, tanggal_awal_periode=self.tanggal_awal_periode,
+                metode_persediaan=self.metode_persediaan,
+            )
+        self.buku = buku
+        # Nomor event terakhir yang sudah termasuk dalam self.tabel
+        self.seq_log = buku.seq_log
+        self.tabel = dict(buku.tabel)
+        self.mesin = bangun_dari_riwayat(
+            self.tabel["riwayat_persediaan"], self.metode_persediaan, barang_persediaan(self.tabel["persediaan"]),
+            saldo_awal_persediaan(self.tabel["persediaan"])
+        )
+        self.buku_besar_per_akun, self.df_buku_besar = buku.buku_besar()
+        self.id_tercatat = _id_tercatat(self.tabel)
+        self.no_berikutnya = _no_berikutnya(self.tabel["jurnal_umum"])
+        self.tanda = (versi, self.seq_log)
+
+    def _muat_ulang_jika_berubah(self):
+        if self._tanda() != self.tanda:
+            self._muat()
+            print("🔄 Data POS dimuat ulang dari penyimpanan")
+            return True
+        return False
+
+    def muat_ulang_jika_berubah(self):
+        """Muat ulang jika aplikasi / proses lain menulis ke database sejak batch terakhir"""
+        with self._lock:
+            return self._muat_ulang_jika_berubah()
+
+    def barang(self):
+        return list(self.mesin.barang)
+
+    # ---------------------------------------------------------- posting
+
+    def posting(self, daftar_transaksi):
+        """
+        Posting satu batch transaksi (hasil baca_transaksi) berurutan.
+        Mengembalikan satu hasil per transaksi: {kunci, status, id_dokumen, no, pesan}
+        dengan status diposting / duplikat / ditolak / gagal.
+        """
+        with self._lock:
+            pesan = "log jurnal terus berubah"
+            for _ in range(BATAS_PERCOBAAN):
+                try:
+                    self._muat_ulang_jika_berubah()
+                    return self._posting(daftar_transaksi)
+                except LogBerubah as e:
+                    # Penulis lain mendahului: tidak ada yang ditulis, ulangi dari data terbaru
+                    print(f"🔄 {str(e)}, batch POS diulang")
+                    pesan = str(e)
+                    self._muat()
+                except Exception as e:
+                    # Keadaan memori mungkin sudah berubah sebagian: muat ulang dari penyimpanan
+                    print(f"❌ Error posting batch POS: {str(e)}")
+                    self._muat()
+                    return [_hasil(trx, GAGAL, pesan=f"Gagal memposting batch: {str(e)}") for trx in daftar_transaksi]
+            return [_hasil(trx, GAGAL, pesan=f"Gagal memposting batch: {pesan}") for trx in daftar_transaksi]
+
+    def _posting(self, daftar_transaksi):
+        mesin = self.mesin
+        hasil = []
+        jurnal, penjualan, pembelian, riwayat = [], [], [], []
+        id_batch = set()
+        no = self.no_berikutnya
+        no_penjualan = len(self.tabel["penjualan"]) + 1
+        no_pembelian = len(self.tabel["pembelian"]) + 1
+
+        for trx in daftar_transaksi:
+            id_dokumen = id_dokumen_pos(trx["jenis"], trx["kunci"])
+            if id_dokumen in self.id_tercatat or id_dokumen in id_batch:
+                hasil.append(_hasil(trx, DUPLIKAT, id_dokumen, pesan="Transaksi sudah pernah dicatat"))
+                continue
+            barang, jumlah, harga, tanggal = trx["barang"], trx["jumlah"], trx["harga"], trx["tanggal"]
+            if barang not in mesin.barang:
+                hasil.append(_hasil(trx, DITOLAK, pesan=f"Barang tidak ada di persediaan: {barang}"))
+                continue
+
+            if trx["jenis"] == "penjualan":
+                stok = mesin.stok(barang)
+                if jumlah > stok + EPSILON:
+                    hasil.append(_hasil(trx, DITOLAK, pesan=f"Stok tidak mencukupi! Stok tersedia: {stok:,.0f} unit"))
+                    continue
+                total_penjualan = jumlah * harga
+                total_hpp = mesin.keluarkan(barang, jumlah, tanggal, trx["keterangan"])
+                hpp = total_hpp / jumlah
+                jurnal += [
+                    (no, tanggal, trx["akun"], total_penjualan, "", 0.0, id_dokumen),
+                    (no, tanggal, "", 0.0, "Penjualan", total_penjualan, id_dokumen),
+                    (no, tanggal, "Harga Pokok Penjualan", total_hpp, "", 0.0, id_dokumen),
+                    (no, tanggal, "", 0.0, "Persediaan Barang Dagang", total_hpp, id_dokumen),
+                ]
+                penjualan.append({
+                    "No": no_penjualan, "Tanggal": tanggal, "Keterangan": trx["keterangan"], "Barang": barang,
+                    "Jumlah": jumlah, "Harga Jual": harga, "Total Penjualan": total_penjualan,
+                    "HPP": hpp, "Total HPP": total_hpp, "ID Dokumen": id_dokumen,
+                })
+                no_penjualan += 1
+                riwayat.append((tanggal, "Penjualan", barang, -jumlah, hpp, -total_hpp, mesin.stok(barang),
+                                trx["keterangan"], id_dokumen))
+            else:
+                total_pembelian = jumlah * harga
+                mesin.terima(barang, jumlah, harga, total_pembelian, tanggal, trx["keterangan"])
+                jurnal += [
+                    (no, tanggal, "Persediaan", total_pembelian, "", 0.0, id_dokumen),
+                    (no, tanggal, "", 0.0, trx["akun"], total_pembelian, id_dokumen),
+                ]
+                pembelian.append({
+                    "No": no_pembelian, "Tanggal": tanggal, "Keterangan": trx["keterangan"], "Barang": barang,
+                    "Jumlah": jumlah, "Harga Beli": harga, "Total Pembelian": total_pembelian,
+                    "ID Dokumen": id_dokumen,
+                })
+                no_pembelian += 1
+                riwayat.append((tanggal, "Pembelian", barang, jumlah, harga, total_pembelian, mesin.stok(barang),
+                                trx["keterangan"], id_dokumen))
+
+            id_batch.add(id_dokumen)
+            hasil.append(_hasil(trx, DIPOSTING, id_dokumen, no))
+            no += 1
+
+        if not id_batch:
+            return hasil
+
+        baru = {
+            "jurnal_umum": pd.DataFrame(jurnal, columns=KOLOM_TABEL["jurnal_umum"]),
+            "penjualan": pd.DataFrame(penjualan),
+            "pembelian": pd.DataFrame(pembelian),
+            "riwayat_persediaan": pd.DataFrame(riwayat, columns=KOLOM_TABEL["riwayat_persediaan"]),
+        }
+        baru = {nama: terapkan_skema(df) for nama, df in baru.items() if not df.empty}
+        df_persediaan = mesin.ke_dataframe()
+
+        # Satu posting inkremental buku besar untuk seluruh batch
+        buku_besar_per_akun, df_buku_besar, _ = posting_inkremental(
+            self.buku_besar_per_akun, self.df_buku_besar, baru["jurnal_umum"]
+        )
+
+        # Satu append + fsync log jurnal untuk seluruh batch, hanya jika log belum
+        # berisi event yang tidak ada di self.tabel (dicek di bawah kunci log)
+        perubahan = [("tambah", nama, df) for nama, df in baru.items()]
+        perubahan.append(("ganti", "persediaan", df_persediaan))
+        seq = self.log.tulis_batch(perubahan, sesudah=self.seq_log)
+
+        for nama, df in baru.items():
+            # Sama seperti event 'tambah' diputar ulang (simaya.jurnal_log.terapkan_event)
+            lama = self.tabel[nama]
+            if lama.empty:
+                df = df.reindex(columns=list(dict.fromkeys(list(lama.columns) + list(df.columns))))
+            else:
+                df = pd.concat([lama, df], ignore_index=True)
+            self.tabel[nama] = terapkan_skema(df)
+        self.tabel["persediaan"] = terapkan_skema(df_persediaan)
+        self.buku_besar_per_akun, self.df_buku_besar = buku_besar_per_akun, df_buku_besar
+        self.id_tercatat |= id_batch
+        self.no_berikutnya = no
+        self.seq_log = seq
+        self.tanda = (self.tanda[0], seq)
+
+        if self.log.perlu_kompaksi():
+            self._kompaksi()
+        return hasil
+
+    def _kompaksi(self):
+        """
+        Snapshot lengkap seperti kompaksi_log() di aplikasi, hanya jika
+        self.tabel memuat semua data: tidak ada event baru di log dan
+        snapshot tidak ditulis penulis lain sejak dimuat. Jika tidak,
+        kompaksi diserahkan ke penulis berikutnya.
+        """
+        with self.log.kunci():
+            if seq_terakhir(self.log.path) != self.seq_log or self.backend.versi() != self.tanda[0]:
+                return False
+            buku = Buku(
+                self.tabel, self.buku.periode, self.buku.tanggal_awal_periode, self.metode_persediaan,
+                seq_log=self.seq_log
+            )
+            try:
+                buku.simpan(self.backend)
+            except Exception as e:
+                print(f"⚠️ Kompaksi log jurnal dilewati: {str(e)}")
+                return False
+            self.buku = buku
+            self.tanda = (self.backend.versi(), self.seq_log)
+        print(f"✅ Log jurnal dikompaksi ke {os.path.basename(self.backend.path)}")
+        return True
+
+    # ---------------------------------------------------------- status
+
+    def ringkasan(self):
+        """Stok per barang dan saldo akhir per akun (untuk GET /status)"""
+        with self._lock:
+            stok = {nama: self.mesin.stok(nama) for nama in self.mesin.barang}
+            saldo = {
+                akun: float(df["Saldo (Rp)"].iloc[-1])
+                for akun, df in sorted(self.buku_besar_per_akun.items()) if not df.empty
+            }
+            return {
+                "transaksi_berikutnya": self.no_berikutnya,
+                "baris_jurnal_umum": len(self.tabel["jurnal_umum"]),
+                "stok": stok,
+                "saldo": saldo,
+            }
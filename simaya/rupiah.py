@@ -0,0 +1,123 @@
+"""
+Konversi nilai Rupiah secara vektor (per kolom, bukan per sel).
+
+Parsing: parse_rupiah_series / parse_rupiah_array.
+Format tampilan: format_rupiah_series ("Rp 1.250.000") untuk seluruh kolom
+tabel sekaligus. Jika pyarrow tersedia (terpasang bersama Streamlit) string
+dibangun dengan kernel pyarrow.compute; tanpa pyarrow dipakai format Python
+per nilai tanpa lambda.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - pyarrow selalu ada bersama streamlit
+    pa = pc = None
+
+# Di atas batas ini (atau NaN/inf) angka diformat lewat jalur Python biasa
+BATAS_FORMAT_VEKTOR = 1e15
+
+
+def parse_rupiah_series(nilai, default=0.0):
+    """
+    Versi vektor dari safe_float_convert untuk satu kolom.
+
+    Angka dibiarkan apa adanya, sedangkan teks diperlakukan sebagai format
+    Rupiah: "Rp", spasi dan titik ribuan dibuang, koma menjadi desimal.
+    Nilai kosong/tidak valid diganti ``default``.
+    """
+    if not isinstance(nilai, pd.Series):
+        nilai = pd.Series(nilai)
+
+    if is_numeric_dtype(nilai) and not is_bool_dtype(nilai):
+        return nilai.astype("float64").fillna(default)
+
+    nilai = nilai.astype(object)
+    adalah_teks = nilai.map(type).eq(str).to_numpy()
+
+    angka = pd.to_numeric(nilai.where(~adalah_teks), errors="coerce").astype("float64")
+
+    if adalah_teks.any():
+        teks = nilai[adalah_teks].astype(str)
+        teks = (
+            teks.str.replace("Rp", "", regex=False)
+            .str.replace(".", "", regex=False)
+            .str.replace(",", ".", regex=False)
+            .str.replace(r"[^0-9.\-]", "", regex=True)
+        )
+        angka[adalah_teks] = pd.to_numeric(teks, errors="coerce").to_numpy(dtype="float64")
+
+    return angka.fillna(default)
+
+
+def parse_rupiah_array(nilai, default=0.0):
+    """Sama seperti parse_rupiah_series tetapi mengembalikan numpy array float64"""
+    return np.asarray(parse_rupiah_series(nilai, default), dtype="float64")
+
+
+def _ribuan_arrow(mutlak):
+    """int64 >= 0 -> pyarrow StringArray dengan titik pemisah ribuan"""
+    grup = []
+    sisa = mutlak
+    while True:
+        grup.append(sisa % 1000)
+        sisa = sisa // 1000
+        if not sisa.any():
+            break
+    # Semua grup 3 digit digabung dengan titik, lalu nol/titik di depan dibuang:
+    # 1234 -> "000.001.234" -> "1.234"
+    bagian = [pc.utf8_lpad(pa.array(g).cast(pa.string()), 3, "0") for g in reversed(grup)]
+    teks = pc.binary_join_element_wise(*bagian, ".") if len(bagian) > 1 else bagian[0]
+    teks = pc.utf8_ltrim(teks, "0.")
+    return pc.if_else(pc.equal(teks, ""), "0", teks)
+
+
+def format_rupiah_series(nilai, awalan="Rp ", pemisah=".", teks_nol="0", teks_kosong=None):
+    """
+    Format satu kolom angka menjadi teks Rupiah, mis. 1250000 -> "Rp 1.250.000".
+
+    Hasil sama dengan f"{awalan}{x:,.0f}" per sel (dengan "," diganti
+    ``pemisah``). Teks format Rupiah diurai dulu seperti safe_float_convert.
+
+    teks_nol    : teks untuk nilai 0; None = tetap diformat ("Rp 0")
+    teks_kosong : teks untuk sel kosong (NaN/None/""); None = sama seperti 0
+    """
+    if not isinstance(nilai, pd.Series):
+        nilai = pd.Series(nilai)
+    if nilai.empty:
+        return pd.Series([], index=nilai.index, dtype=object)
+
+    kosong = nilai.isna().to_numpy()
+    if nilai.dtype == object or pd.api.types.is_string_dtype(nilai):
+        kosong = kosong | nilai.astype(str).str.strip().eq("").to_numpy()
+    angka = parse_rupiah_array(nilai)
+    nol = angka == 0
+    if teks_kosong is None:
+        teks_kosong = teks_nol
+
+    if pc is not None and np.isfinite(angka).all() and (np.abs(angka) < BATAS_FORMAT_VEKTOR).all():
+        # Seluruh string dibangun di pyarrow; hasil tetap berupa kolom string Arrow
+        # sehingga st.dataframe bisa memakainya tanpa konversi ulang
+        mutlak = np.abs(np.rint(angka)).astype("int64")
+        teks = _ribuan_arrow(mutlak)
+        if pemisah != ".":
+            teks = pc.replace_substring(teks, ".", pemisah)
+        teks = pc.binary_join_element_wise(pc.if_else(pa.array(angka < 0), awalan + "-", awalan), teks, "")
+        if teks_nol is not None:
+            teks = pc.if_else(pa.array(nol), teks_nol, teks)
+        if teks_kosong is not None:
+            teks = pc.if_else(pa.array(kosong), teks_kosong, teks)
+        return pd.Series(pd.arrays.ArrowStringArray(teks), index=nilai.index)
+
+    hasil = np.array([f"{awalan}{v:,.0f}" for v in angka.tolist()], dtype=object)
+    if pemisah != ",":
+        hasil = np.array([t.replace(",", pemisah) for t in hasil], dtype=object)
+    if teks_nol is not None:
+        hasil[nol] = teks_nol
+    if teks_kosong is not None:
+        hasil[kosong] = teks_kosong
+    return pd.Series(hasil, index=nilai.index, dtype=object)
@@ -0,0 +1,90 @@
+"""
+Skema tipe kolom SIMAYA.
+
+Tipe numerik ditegakkan sekali, pada saat data masuk ke session state
+(load penyimpanan, replay log, form input, impor), sehingga kode hilir boleh
+langsung memakai .sum()/operasi vektor tanpa konversi per sel.
+
+- Kolom uang/kuantitas ("... (Rp)", "Jumlah...", "Harga...", "Total...",
+  kolom stok persediaan) -> float64. Teks format Rupiah lama
+  ("Rp 1.000.000") diurai secara vektor dengan parse_rupiah_series;
+  kosong/tidak valid -> 0.0.
+- Kolom nomor ("No", "No_Transaksi") -> int64 jika tidak ada nilai kosong.
+
+Tabel ringkasan yang memiliki baris TOTAL (neraca saldo) dibiarkan apa
+adanya: isinya dibentuk dari buku besar yang sudah bertipe, dan sel kosong
+pada baris TOTAL memang disengaja.
+"""
+
+import pandas as pd
+from pandas.api.types import is_float_dtype, is_integer_dtype
+
+from simaya.rupiah import parse_rupiah_series
+
+# Awalan nama kolom numerik
+AWALAN_FLOAT = ("Jumlah", "Harga", "Total")
+
+# Kolom numerik yang namanya tidak mengikuti pola "(Rp)" / AWALAN_FLOAT
+KOLOM_FLOAT_LAIN = {"HPP", "Stok", "Stok Awal", "Nilai Awal", "Stok Akhir", "Pembelian", "Penjualan"}
+
+KOLOM_INT = {"No", "No_Transaksi"}
+
+
+def tipe_kolom(nama_kolom):
+    """'float64', 'int64' atau None (kolom bukan numerik)"""
+    nama = str(nama_kolom)
+    if nama in KOLOM_INT:
+        return "int64"
+    if "(Rp)" in nama or nama.startswith(AWALAN_FLOAT) or nama in KOLOM_FLOAT_LAIN:
+        return "float64"
+    return None
+
+
+def _ada_baris_total(df):
+    return "Nama Akun" in df.columns and df["Nama Akun"].eq("TOTAL").any()
+
+
+def _ke_int(kolom):
+    """Kolom nomor -> int64; None jika ada nilai kosong (mis. baris TOTAL)"""
+    angka = pd.to_numeric(kolom, errors="coerce")
+    if angka.isna().any():
+        return None
+    return angka.astype("int64")
+
+
+def terapkan_skema(df):
+    """
+    Kembalikan DataFrame dengan tipe kolom sesuai skema.
+
+    Kolom yang tipenya sudah benar tidak disentuh; jika tidak ada yang perlu
+    diubah (atau df adalah tabel ringkasan ber-TOTAL), objek yang sama
+    dikembalikan tanpa salinan.
+    """
+    if df is None or _ada_baris_total(df):
+        return df
+    perubahan = {}
+    for kolom in df.columns:
+        tipe = tipe_kolom(kolom)
+        seri = df[kolom]
+        if tipe == "float64" and not is_float_dtype(seri):
+            perubahan[kolom] = parse_rupiah_series(seri).to_numpy(dtype="float64")
+        elif tipe == "int64" and not is_integer_dtype(seri):
+            hasil = _ke_int(seri)
+            if hasil is not None:
+                perubahan[kolom] = hasil.to_numpy()
+        elif tipe == "float64" and seri.hasnans:
+            perubahan[kolom] = seri.fillna(0.0).to_numpy()
+    if not perubahan:
+        return df
+    df = df.copy()
+    for kolom, nilai in perubahan.items():
+        df[kolom] = nilai
+    return df
+
+
+def terapkan_skema_tabel(tabel):
+    """Terapkan skema ke dict {nama: DataFrame} (diubah di tempat, juga dikembalikan)"""
+    for nama, df in list(tabel.items()):
+        if isinstance(df, pd.DataFrame):
+            tabel[nama] = terapkan_skema(df)
+    return tabel
@@ -0,0 +1,433 @@
+"""
+Lapisan penyimpanan SIMAYA.
+
+Semua akses ke data tersimpan lewat satu antarmuka (StorageBackend) dengan
+dua implementasi:
+
+- SQLiteBackend (default): satu tabel per sheet lama, WAL mode, dan hanya
+  baris yang berubah yang ditulis ulang.
+- ExcelBackend: perilaku lama (satu workbook), tetap ada untuk kompatibilitas.
+
+Excel selanjutnya hanya dipakai sebagai format impor/ekspor; workbook lama
+dipindahkan sekali ke SQLite lewat migrasi_excel_ke_sqlite().
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# Nama tabel/sheet -> key session_state
+TABEL_DATABASE = {
+    "jurnal_umum": "df_jurnal_umum",
+    "jurnal_penyesuaian": "df_jurnal_penyesuaian",
+    "neraca_saldo_sebelumnya": "df_neraca_saldo_periode_sebelumnya",
+    "buku_besar": "df_buku_besar",
+    "neraca_saldo": "df_neraca_saldo",
+    "jurnal_penutup": "df_jurnal_penutup",
+    "neraca_setelah_penutup": "df_neraca_saldo_setelah_penutup",
+    "penjualan": "df_penjualan",
+    "pembelian": "df_pembelian",
+    "persediaan": "df_persediaan",
+    "riwayat_persediaan": "df_riwayat_persediaan",
+}
+
+# Struktur kolom awal setiap tabel (sama dengan workbook dari init_database)
+KOLOM_TABEL = {
+    "jurnal_umum": ["No", "Tanggal", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)", "ID Dokumen"],
+    "jurnal_penyesuaian": ["No", "Tanggal", "Keterangan", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)"],
+    "neraca_saldo_sebelumnya": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+    "buku_besar": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)", "Saldo (Rp)"],
+    "neraca_saldo": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+    "jurnal_penutup": ["No", "Tanggal", "Keterangan", "Akun Debit", "Debit (Rp)", "Akun Kredit", "Kredit (Rp)"],
+    "neraca_setelah_penutup": ["No", "Nama Akun", "Debit (Rp)", "Kredit (Rp)"],
+    "penjualan": ["No", "Tanggal", "Keterangan", "Akun Debit 1", "Debit 1 (Rp)", "Akun Debit 2", "Debit 2 (Rp)",
+                  "Akun Kredit 1", "Kredit 1 (Rp)", "Akun Kredit 2", "Kredit 2 (Rp)", "Barang", "Jumlah", "Harga Jual", "HPP", "ID Dokumen"],
+    "pembelian": ["No", "Tanggal", "Keterangan", "Barang", "Jumlah", "Harga Beli", "Total Pembelian", "ID Dokumen"],
+    "persediaan": ["Barang", "Stok Awal", "Nilai Awal", "Pembelian", "Penjualan", "Stok Akhir", "Harga Rata-rata", "Total Nilai"],
+    "riwayat_persediaan": ["Tanggal", "Jenis", "Barang", "Jumlah", "Harga", "Total", "Stok", "Keterangan", "ID Dokumen"],
+    "riwayat_periode": ["Periode", "Tanggal_Simpan", "Data"],
+}
+
+# Kolom yang diberi index di SQLite (periode / nomor transaksi / tanggal)
+KOLOM_INDEX = ("No", "Tanggal", "Periode", "Barang")
+
+# Sheet tambahan berisi meta (hanya ExcelBackend; SQLite memakai tabel _meta)
+SHEET_META = "_meta"
+
+PATH_EXCEL_DEFAULT = "database_keuangan.xlsx"
+PATH_SQLITE_DEFAULT = "database_keuangan.db"
+
+
+def _ke_nilai_sql(nilai):
+    """Konversi satu nilai pandas/numpy ke tipe yang diterima sqlite3"""
+    if nilai is None:
+        return None
+    if isinstance(nilai, float) and np.isnan(nilai):
+        return None
+    if isinstance(nilai, (pd.Timestamp, datetime)):
+        if pd.isna(nilai):
+            return None
+        return nilai.date().isoformat() if nilai == pd.Timestamp(nilai).normalize() else nilai.isoformat(sep=" ")
+    if isinstance(nilai, date):
+        return nilai.isoformat()
+    if isinstance(nilai, np.generic):
+        nilai = nilai.item()
+        return None if isinstance(nilai, float) and np.isnan(nilai) else nilai
+    if nilai is pd.NaT or nilai is pd.NA:
+        return None
+    return nilai
+
+
+def _baris_sql(df):
+    """DataFrame -> list tuple siap executemany"""
+    kolom = [df[c].astype(object).to_numpy() for c in df.columns]
+    return [tuple(_ke_nilai_sql(v) for v in baris) for baris in zip(*kolom)]
+
+
+def hash_baris(df):
+    """Hash per baris (int64) untuk mendeteksi baris yang berubah"""
+    if df.empty:
+        return np.array([], dtype="int64")
+    try:
+        hasil = pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        hasil = pd.util.hash_pandas_object(df.astype(str), index=False)
+    return hasil.to_numpy().view("int64")
+
+
+def _tanggal_ke_date(df):
+    """Kolom Tanggal -> objek date seperti load_from_database lama"""
+    if "Tanggal" in df.columns and not df.empty:
+        df["Tanggal"] = pd.to_datetime(df["Tanggal"], errors="coerce").dt.date
+    return df
+
+
+class StorageBackend:
+    """Antarmuka penyimpanan: muat/simpan tabel berdasarkan nama sheet lama"""
+
+    jenis = "abstrak"
+
+    def __init__(self, path):
+        self.path = path
+        # Lama muat per tabel (detik) dari pemanggilan muat_semua() terakhir
+        self.waktu_muat = {}
+
+    def ada(self):
+        return os.path.exists(self.path)
+
+    def siapkan(self):
+        """Buat penyimpanan kosong jika belum ada"""
+        raise NotImplementedError
+
+    def muat_semua(self, nama_tabel=None):
+        """Muat tabel -> dict {nama_tabel: DataFrame}"""
+        raise NotImplementedError
+
+    def simpan(self, tabel, meta=None):
+        """
+        Simpan dict {nama_tabel: DataFrame}; mengembalikan jumlah baris yang ditulis per tabel.
+        meta (dict kunci -> nilai) ditulis dalam penulisan yang sama.
+        """
+        raise NotImplementedError
+
+    def muat_meta(self):
+        """dict kunci -> nilai (teks) yang disimpan lewat simpan(..., meta=...)"""
+        raise NotImplementedError
+
+    def muat_tabel(self, nama):
+        return self.muat_semua([nama]).get(nama, pd.DataFrame(columns=KOLOM_TABEL.get(nama, [])))
+
+    def simpan_tabel(self, nama, df):
+        return self.simpan({nama: df})
+
+    def versi(self):
+        """Nomor versi data; berubah setiap kali ada penulisan (kunci cache lintas sesi)"""
+        if not self.ada():
+            return None
+        stat = os.stat(self.path)
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def hapus(self):
+        """Hapus seluruh penyimpanan (dipakai oleh menu Reset)"""
+        if self.ada():
+            os.remove(self.path)
+
+    def info(self):
+        if not self.ada():
+            return None
+        return {
+            "jenis": self.jenis,
+            "path": self.path,
+            "ukuran_kb": os.path.getsize(self.path) / 1024,
+            "diubah": datetime.fromtimestamp(os.path.getmtime(self.path)),
+        }
+
+
+class ExcelBackend(StorageBackend):
+    """Penyimpanan lama: satu workbook, setiap simpan menulis ulang seluruh sheet"""
+
+    jenis = "excel"
+
+    def siapkan(self):
+        if self.ada():
+            return
+        with pd.ExcelWriter(self.path, engine="openpyxl") as writer:
+            for nama, kolom in KOLOM_TABEL.items():
+                pd.DataFrame(columns=kolom).to_excel(writer, sheet_name=nama, index=False)
+        print("✅ Database Excel berhasil dibuat!")
+
+    def muat_semua(self, nama_tabel=None):
+        if not self.ada():
+            self.waktu_muat = {}
+            return {}
+        hasil, self.waktu_muat = baca_sheet(self.path, nama_tabel)
+        return hasil
+
+    def simpan(self, tabel, meta=None):
+        # Sheet yang tidak ikut disimpan dipertahankan agar tidak hilang
+        lama = self.muat_semua() if self.ada() else {}
+        lama.update(tabel)
+        if meta:
+            data_meta = {**self.muat_meta(), **{k: str(v) for k, v in meta.items()}}
+            lama[SHEET_META] = pd.DataFrame({"kunci": list(data_meta), "nilai": list(data_meta.values())})
+        ditulis = {}
+        with pd.ExcelWriter(self.path, engine="openpyxl") as writer:
+            for nama, df in lama.items():
+                df_simpan = df.copy()
+                if "Tanggal" in df_simpan.columns:
+                    df_simpan["Tanggal"] = df_simpan["Tanggal"].astype(str)
+                df_simpan.to_excel(writer, sheet_name=nama, index=False)
+                if nama in tabel:
+                    ditulis[nama] = len(df_simpan)
+        return ditulis
+
+    def muat_meta(self):
+        if not self.ada():
+            return {}
+        with pd.ExcelFile(self.path, engine="openpyxl") as workbook:
+            if SHEET_META not in workbook.sheet_names:
+                return {}
+            df = workbook.parse(SHEET_META, dtype=str)
+        return dict(zip(df["kunci"], df["nilai"]))
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Penyimpanan SQLite (WAL). Setiap tabel punya kolom internal:
+    _urutan (posisi baris, PRIMARY KEY) dan _hash (hash isi baris).
+    Saat simpan hanya posisi yang hash-nya berubah yang ditulis ulang.
+    """
+
+    jenis = "sqlite"
+
+    @contextmanager
+    def _koneksi(self):
+        """Koneksi singkat: commit jika sukses, rollback jika gagal, selalu ditutup"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def siapkan(self):
+        baru = not self.ada()
+        with self._koneksi() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS _meta (kunci TEXT PRIMARY KEY, nilai TEXT)")
+            for nama, kolom in KOLOM_TABEL.items():
+                if not self._tabel_ada(conn, nama):
+                    self._buat_tabel(conn, nama, kolom)
+        if baru:
+            print(f"✅ Database SQLite berhasil dibuat: {self.path}")
+
+    # ---------- util skema ----------
+
+    @staticmethod
+    def _q(nama):
+        return '"' + str(nama).replace('"', '""') + '"'
+
+    def _tabel_ada(self, conn, nama):
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (nama,)
+        ).fetchone() is not None
+
+    def _kolom_tabel(self, conn, nama):
+        return [r[1] for r in conn.execute(f"PRAGMA table_info({self._q(nama)})") if not r[1].startswith("_")]
+
+    def _buat_tabel(self, conn, nama, kolom):
+        kolom_sql = ", ".join(self._q(k) for k in kolom)
+        pemisah = ", " if kolom_sql else ""
+        conn.execute(
+            f"CREATE TABLE {self._q(nama)} (_urutan INTEGER PRIMARY KEY, _hash INTEGER{pemisah}{kolom_sql})"
+        )
+        for k in kolom:
+            if k in KOLOM_INDEX:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self._q(f'idx_{nama}_{k}')} ON {self._q(nama)} ({self._q(k)})"
+                )
+
+    # ---------- muat ----------
+
+    def muat_semua(self, nama_tabel=None):
+        if not self.ada():
+            return {}
+        hasil = {}
+        self.waktu_muat = {}
+        with self._koneksi() as conn:
+            daftar = nama_tabel or [
+                r[0] for r in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE '\\_%' ESCAPE '\\'"
+                )
+            ]
+            for nama in daftar:
+                if not self._tabel_ada(conn, nama):
+                    continue
+                mulai = time.perf_counter()
+                kolom = self._kolom_tabel(conn, nama)
+                df = pd.read_sql_query(f"SELECT * FROM {self._q(nama)} ORDER BY _urutan", conn)
+                df = df.drop(columns=["_urutan", "_hash"])[kolom]
+                hasil[nama] = _tanggal_ke_date(df)
+                self.waktu_muat[nama] = time.perf_counter() - mulai
+        return hasil
+
+    # ---------- simpan ----------
+
+    def simpan(self, tabel, meta=None):
+        ditulis = {}
+        with self._koneksi() as conn:
+            for nama, df in tabel.items():
+                if df is None:
+                    continue
+                ditulis[nama] = self._simpan_satu(conn, nama, df)
+            if meta:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO _meta (kunci, nilai) VALUES (?, ?)",
+                    [(k, str(v)) for k, v in meta.items()]
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO _meta (kunci, nilai) VALUES ('terakhir_disimpan', ?)",
+                (datetime.now().isoformat(sep=" ", timespec="seconds"),)
+            )
+            conn.execute(
+                "INSERT INTO _meta (kunci, nilai) VALUES ('versi_data', '1') "
+                "ON CONFLICT(kunci) DO UPDATE SET nilai = CAST(nilai AS INTEGER) + 1"
+            )
+        return ditulis
+
+    def muat_meta(self):
+        if not self.ada():
+            return {}
+        with self._koneksi() as conn:
+            return dict(conn.execute("SELECT kunci, nilai FROM _meta").fetchall())
+
+    def versi(self):
+        if not self.ada():
+            return None
+        with self._koneksi() as conn:
+            baris = conn.execute("SELECT nilai FROM _meta WHERE kunci = 'versi_data'").fetchone()
+        return int(baris[0]) if baris else 0
+
+    def _simpan_satu(self, conn, nama, df):
+        kolom = [str(k) for k in df.columns]
+        if not self._tabel_ada(conn, nama):
+            self._buat_tabel(conn, nama, kolom)
+        elif self._kolom_tabel(conn, nama) != kolom:
+            # Struktur kolom berubah: tulis ulang tabel ini seluruhnya
+            conn.execute(f"DROP TABLE {self._q(nama)}")
+            self._buat_tabel(conn, nama, kolom)
+
+        hash_baru = hash_baris(df)
+        lama = dict(conn.execute(f"SELECT _urutan, _hash FROM {self._q(nama)}").fetchall())
+
+        posisi_berubah = [i for i, h in enumerate(hash_baru.tolist()) if lama.get(i) != h]
+        conn.execute(f"DELETE FROM {self._q(nama)} WHERE _urutan >= ?", (len(df),))
+        if not posisi_berubah:
+            return 0
+
+        subset = df.iloc[posisi_berubah]
+        baris = _baris_sql(subset)
+        data = [(pos, int(hash_baru[pos])) + b for pos, b in zip(posisi_berubah, baris)]
+        placeholder = ", ".join(["?"] * (len(kolom) + 2))
+        kolom_sql = ", ".join(["_urutan", "_hash"] + [self._q(k) for k in kolom])
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {self._q(nama)} ({kolom_sql}) VALUES ({placeholder})", data
+        )
+        return len(data)
+
+    def hapus(self):
+        for akhiran in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + akhiran):
+                os.remove(self.path + akhiran)
+
+
+def buat_backend(jenis=None, path=None):
+    """
+    Pilih backend dari argumen atau environment:
+    SIMAYA_STORAGE=sqlite|excel dan SIMAYA_DB=<path>.
+    """
+    jenis = (jenis or os.environ.get("SIMAYA_STORAGE", "sqlite")).lower()
+    if jenis == "excel":
+        return ExcelBackend(path or os.environ.get("SIMAYA_DB", PATH_EXCEL_DEFAULT))
+    return SQLiteBackend(path or os.environ.get("SIMAYA_DB", PATH_SQLITE_DEFAULT))
+
+
+def baca_sheet(sumber, nama_tabel=None):
+    """
+    Buka workbook sekali (openpyxl read-only) lalu parse setiap sheet dari
+    handle yang sama. Mengembalikan ({nama: DataFrame}, {nama: detik}).
+    """
+    tabel, waktu = {}, {}
+    with pd.ExcelFile(sumber, engine="openpyxl") as workbook:
+        for nama in workbook.sheet_names:
+            if nama_tabel is not None and nama not in nama_tabel:
+                continue
+            mulai = time.perf_counter()
+            tabel[nama] = _tanggal_ke_date(workbook.parse(nama))
+            waktu[nama] = time.perf_counter() - mulai
+    return tabel, waktu
+
+
+def baca_workbook(sumber):
+    """Baca seluruh sheet workbook (path atau file upload) sekaligus"""
+    semua, _ = baca_sheet(sumber, list(KOLOM_TABEL))
+    tabel = {}
+    for nama, df in semua.items():
+        # Sheet kosong tanpa header (hasil simpan versi lama) diberi kolom default
+        if len(df.columns) == 0:
+            df = pd.DataFrame(columns=KOLOM_TABEL[nama])
+        tabel[nama] = df
+    return tabel
+
+
+def impor_excel(sumber, backend):
+    """Impor workbook berformat init_database() ke backend mana pun"""
+    tabel = baca_workbook(sumber)
+    backend.siapkan()
+    backend.simpan(tabel)
+    return {nama: len(df) for nama, df in tabel.items()}
+
+
+def migrasi_excel_ke_sqlite(path_excel=PATH_EXCEL_DEFAULT, path_sqlite=PATH_SQLITE_DEFAULT):
+    """
+    Migrasi satu kali dari workbook lama ke SQLite. Tidak melakukan apa-apa
+    jika database SQLite sudah ada. Workbook asli tidak diubah.
+    """
+    backend = SQLiteBackend(path_sqlite)
+    if backend.ada() or not os.path.exists(path_excel):
+        return None
+
+    jumlah = impor_excel(path_excel, backend)
+    with backend._koneksi() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO _meta (kunci, nilai) VALUES ('migrasi_dari', ?)",
+            (os.path.abspath(path_excel),)
+        )
+    print(f"✅ Migrasi {path_excel} -> {path_sqlite}: {sum(jumlah.values())} baris dari {len(jumlah)} sheet")
+    return jumlah